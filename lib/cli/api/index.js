@@ -55,6 +55,17 @@ export const builder = function(yargs) {
             describe: 'The URL to the storage unit.',
             type: 'string'
         })
+        .option('compression', {
+            describe: 'Compress responses with the encoding the client accepts (gzip or deflate). ' +
+            'Use --no-compression when a proxy in front of the API compresses them.',
+            type: 'boolean',
+            default: true
+        })
+        .option('compression-threshold', {
+            describe: 'Responses smaller than this many bytes are sent uncompressed.',
+            type: 'number',
+            default: 1024
+        })
         .epilog('Each option can be be overwritten with an environment variable ' +
         'by converting the option to uppercase, replacing dashes with ' +
         'underscores and prefixing it with `STF_API_` (e.g. ' +
@@ -66,6 +77,8 @@ export const handler = function(argv) {
         ssid: argv.ssid,
         secret: argv.secret,
         storageUrl: argv.storageUrl,
+        compression: argv.compression,
+        compressionThreshold: argv.compressionThreshold,
         endpoints: {
             push: argv.connectPush,
             sub: argv.connectSub,
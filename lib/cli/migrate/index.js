@@ -19,6 +19,9 @@ export const builder = function(yargs) {
 
 export const handler = function() {
     return db.setup()
+        .then(function() {
+            return dbapi.generateIndexes()
+        })
         .then(function() {
             return new Promise(function(resolve, reject) {
                 setTimeout(function() {
@@ -106,6 +106,10 @@ export default class DbClient {
         return DbClient.collection('devices')
     }
 
+    static get deviceChanges() {
+        return DbClient.collection('deviceChanges')
+    }
+
     static get teams() {
         return DbClient.collection('teams')
     }
@@ -845,38 +845,53 @@ export const saveDeviceIdentity = function(serial, identity) {
     )
 }
 
-const findWithFields = function(collection, condition, fields) {
-    return collection.find(condition).project(fields).toArray()
+/**
+ * @typedef {Object} Page
+ * @property {string=} after - Only documents whose serial sorts after this one.
+ * @property {number=} limit - The maximum number of documents.
+ * @property {boolean=} stream - Return the Mongo cursor instead of an array.
+ */
+const findWithFields = function(collection, condition, fields, page) {
+    if (!page) {
+        return collection.find(condition).project(fields).toArray()
+    }
+    const query = page.after ? {$and: [condition, {serial: {$gt: page.after}}]} : condition
+    let cursor = collection.find(query).project(fields).sort({serial: 1})
+    if (page.limit) {
+        cursor = cursor.limit(page.limit)
+    }
+    return page.stream ? cursor : cursor.toArray()
 }
 
 const findOneWithFields = function(collection, condition) {
     return collection.findOne(condition)
 }
 
-const findDevice = function(condition, fields) {
+// filter is an additional condition from the query of the listing, see apiutil.getDeviceFilter
+const findDevice = function(condition, fields, page, filter) {
     if (Object.keys(condition).includes('serial')) {
         return findOneWithFields(db.devices, condition)
     }
-    return findWithFields(db.devices, condition, fields)
+    return findWithFields(db.devices, filter ? {$and: [condition, filter]} : condition, fields, page)
 }
 
 // dbapi.loadDevices = function(groups) {
-export const loadDevices = function(groups, fields) {
+export const loadDevices = function(groups, fields, page, filter) {
     if (groups && groups.length > 0) {
-        return findDevice({'group.id': {$in: groups}}, fields)
+        return findDevice({'group.id': {$in: groups}}, fields, page, filter)
     }
     else {
-        return findDevice({}, fields)
+        return findDevice({}, fields, page, filter)
     }
 }
 
 // dbapi.loadDevicesByOrigin = function(groups) {
-export const loadDevicesByOrigin = function(groups, fields) {
-    return findDevice({'group.origin': {$in: groups}}, fields)
+export const loadDevicesByOrigin = function(groups, fields, page, filter) {
+    return findDevice({'group.origin': {$in: groups}}, fields, page, filter)
 }
 
 // dbapi.loadBookableDevices = function(groups) {
-export const loadBookableDevices = function(groups, fields) {
+export const loadBookableDevices = function(groups, fields, page, filter) {
     return findDevice({
         $and: [
             {'group.origin': {$in: groups}},
@@ -884,7 +899,7 @@ export const loadBookableDevices = function(groups, fields) {
             {ready: {$eq: true}},
             {owner: {$eq: null}}
         ]
-    }, fields)
+    }, fields, page, filter)
 }
 
 export const loadBookableDevicesWithFiltersLock = function(groups, filters, devicesFunc, limit = null) {
@@ -944,11 +959,11 @@ export const loadBookableDevicesWithFiltersLock = function(groups, filters, devi
 }
 
 // dbapi.loadStandardDevices = function(groups) {
-export const loadStandardDevices = function(groups, fields) {
+export const loadStandardDevices = function(groups, fields, page, filter) {
     return findDevice({
         'group.class': apiutil.STANDARD,
         'group.id': {$in: groups}
-    }, fields)
+    }, fields, page, filter)
 }
 
 // dbapi.loadDevice = function(groups, serial) {
@@ -1089,6 +1104,13 @@ export const sendEvent = function(eventType, eventDetails, linkedEntities, times
     })
 }
 
+/**
+ * @param events {{eventType: string, eventDetails: Object, linkedEntities: LinkedEntities, timestamp: number}[]}
+ */
+export const sendEvents = function(events) {
+    return db.collection('statistics').insertMany(events, {ordered: false})
+}
+
 // dbapi.isPortExclusive = function(newPort) {
 export const isPortExclusive = function(newPort) {
     return DeviceModel.getAllocatedAdbPorts().then((ports) => {
@@ -37,8 +37,9 @@ export const loadDeviceBySerial = function(serial) {
 }
 
 // dbapi.loadDevicesBySerials = function(serials) {
-export const loadDevicesBySerials = function(serials) {
-    return db.devices.find({serial: {$in: serials}}).toArray()
+export const loadDevicesBySerials = function(serials, filter) {
+    const condition = {serial: {$in: serials}}
+    return db.devices.find(filter ? {$and: [condition, filter]} : condition).toArray()
 }
 
 // dbapi.getDevicesCount = function() {
@@ -110,13 +111,70 @@ export const getDeadDevice = function(time = 60_000) {
     ).project({serial: 1, present: 1, presenceChangedAt: 1}).toArray()
 }
 
+// Indexes of the device listings: serial, the group conditions with serial for the pages ordered by serial,
+// and the fields of the filters of apiutil.getDeviceFilter. Created by the migrate command and refreshed by the
+// groups scheduler, createIndexes leaves the existing ones alone
 // dbapi.generateIndexes = function() {
 export const generateIndexes = function() {
-    db.devices.createIndex({serial: -1}).then((result) => {
+    return db.devices.createIndexes([
+        {key: {serial: -1}},
+        {key: {'group.id': 1, serial: 1}},
+        {key: {'group.origin': 1, serial: 1}},
+        {key: {'group.name': 1}},
+        {key: {'owner.email': 1}},
+        {key: {'owner.name': 1}},
+        {key: {status: 1}},
+        {key: {abi: 1}},
+        {key: {sdk: 1}},
+        {key: {model: 1}},
+        {key: {platform: 1}}
+    ]).then((result) => {
         log.info('Created indexes with result - ' + result)
     })
 }
 
+/*
+===========================================================
+=================== device change feed ====================
+===========================================================
+*/
+
+// Changes older than this are dropped, clients holding an older cursor have to reload the device list
+export const DEVICE_CHANGES_TTL = 24 * 60 * 60
+
+export const generateDeviceChangesIndexes = function() {
+    return Promise.all([
+        db.deviceChanges.createIndex({ts: 1, id: 1}),
+        db.deviceChanges.createIndex({changedAt: 1}, {expireAfterSeconds: DEVICE_CHANGES_TTL})
+    ])
+}
+
+// Upserted so that a change recorded again after the feed stream was resumed is kept once
+export const insertDeviceChange = function(change) {
+    return db.deviceChanges.updateOne({id: change.id}, {$setOnInsert: change}, {upsert: true})
+}
+
+export const loadLastDeviceChange = function() {
+    return db.deviceChanges.find({}, {projection: {_id: 0, ts: 1, id: 1}}).sort({ts: -1, id: -1}).limit(1).next()
+}
+
+export const hasDeviceChange = function(position) {
+    return db.deviceChanges.countDocuments({ts: position.ts, id: position.id}, {limit: 1}).then(count => count > 0)
+}
+
+// Changes in feed order after position, several changes can share the cluster time of a transaction so the id
+// (the resume token of the change, ordered like the oplog) breaks ties
+export const loadDeviceChanges = function(groups, position, limit) {
+    const query = {
+        ts: {$gte: position.ts},
+        $or: [{ts: {$gt: position.ts}}, {id: {$gt: position.id}}]
+    }
+    if (groups && groups.length > 0) {
+        query.groups = {$in: groups}
+    }
+    return db.deviceChanges.find(query, {projection: {_id: 0}}).sort({ts: 1, id: 1}).limit(limit).toArray()
+}
+
 /*
 ====================================================================
 ==================== changing DB - use handlers ====================
@@ -83,4 +83,7 @@ export default {
     stats: {
         primaryKey: 'id',
     },
+    deviceChanges: {
+        primaryKey: 'id',
+    },
 } as const
@@ -16,12 +16,13 @@ import useDevice, {UseDeviceError} from '../helpers/useDevice.js'
 import * as Sentry from '@sentry/node'
 import {accessTokenAuth} from '../helpers/securityHandlers.js'
 import {DeviceOriginGroupMessage} from '../../../wire/wire.js'
+import {Timestamp} from 'mongodb'
 const log = logger.createLogger('api:controllers:devices')
 
 /* ------------------------------------ PRIVATE FUNCTIONS ------------------------------- */
 function filterGenericDevices(req, res, devices) {
     if (req.headers.is_generator === '1') {
-        apiutil.respond(res, 200, 'Devices Information', {
+        apiutil.respondWithETag(req, res, 'Devices Information', {
             devices: devices.map(function(device) {
                 return apiutil.filterDevice(req, device)
             }).filter(function(dev) {
@@ -30,15 +31,113 @@ function filterGenericDevices(req, res, devices) {
         })
     }
     else {
-        apiutil.respond(res, 200, 'Devices Information', {
+        apiutil.respondWithETag(req, res, 'Devices Information', {
             devices: devices.map(function(device) {
                 return apiutil.filterDevice(req, device)
             })
         })
     }
 }
-function getGenericDevices(req, res, loadDevices) {
+const DEVICES_PAGE_MAX = 5000
+const NDJSON = 'application/x-ndjson'
+
+function formatDevicesCursor(serial) {
+    return Buffer.from(serial).toString('base64url')
+}
+function parseDevicesCursor(cursor) {
+    const serial = Buffer.from(cursor, 'base64url').toString()
+    return serial && formatDevicesCursor(serial) === cursor ? serial : null
+}
+
+// limit, cursor and Accept: application/x-ndjson select a page of devices ordered by serial, null for the whole list
+// and {error} for invalid parameters
+function getDevicesPage(req) {
+    const stream = req.accepts(['application/json', NDJSON]) === NDJSON
+    if (typeof req.query.limit === 'undefined' && typeof req.query.cursor === 'undefined' && !stream) {
+        return null
+    }
+    const page = {stream}
+    if (typeof req.query.limit !== 'undefined') {
+        page.limit = Number(req.query.limit)
+        if (!Number.isInteger(page.limit) || page.limit < 1 || page.limit > DEVICES_PAGE_MAX) {
+            return {error: `Bad Request (limit must be between 1 and ${DEVICES_PAGE_MAX})`}
+        }
+    }
+    if (typeof req.query.cursor !== 'undefined') {
+        page.after = parseDevicesCursor(req.query.cursor)
+        if (!page.after) {
+            return {error: 'Bad Request (invalid cursor)'}
+        }
+    }
+    return page
+}
+
+// the cursor of the next page needs the serial of the last device even if fields leaves it out
+function pageFields(fields) {
+    return fields ? {...fields, serial: 1} : fields
+}
+
+async function respondDevicesPage(req, res, loadDevices, page) {
+    const fields = pageFields(apiutil.prepareFieldsForMongoDb(req.query.fields))
+    const devices = await loadDevices(req.user.groups.subscribed, fields, {...page, limit: page.limit + 1})
+    const hasMore = devices.length > page.limit
+    if (hasMore) {
+        devices.length = page.limit
+    }
+    apiutil.respondWithETag(req, res, 'Devices Information', {
+        devices: devices.map(device => apiutil.filterDevice(req, device)),
+        cursor: hasMore ? formatDevicesCursor(devices[devices.length - 1].serial) : null,
+        hasMore
+    })
+}
+
+// one device per line, written as the Mongo cursor yields them and paused while the socket buffer is full
+async function streamDevices(req, res, loadDevices, page) {
+    const cursor = loadDevices(req.user.groups.subscribed, apiutil.prepareFieldsForMongoDb(req.query.fields), page)
+    let closed = false
+    res.on('close', () => {
+        closed = true
+        cursor.close()
+    })
+    res.status(200)
+    res.setHeader('Content-Type', NDJSON)
+    res.setHeader('Cache-Control', 'no-cache')
+    try {
+        for await (const device of cursor) {
+            if (closed) {
+                return
+            }
+            if (!res.write(JSON.stringify(apiutil.filterDevice(req, device)) + '\n')) {
+                await new Promise(resolve => {
+                    res.once('drain', resolve)
+                    res.once('close', resolve)
+                })
+            }
+        }
+        res.end()
+    }
+    catch (err) {
+        log.error('Failed to stream device list: ', err.stack)
+        res.destroy(err)
+    }
+}
+
+function getGenericDevices(req, res, loadDevicesInGroups, filter) {
     log.info('getGenericDevices: %s', JSON.stringify(req.user))
+    const page = getDevicesPage(req)
+    if (page && page.error) {
+        return apiutil.respond(res, 400, page.error)
+    }
+    const loadDevices = (groups, fields, page) => loadDevicesInGroups(groups, fields, page, filter)
+    if (page && page.stream) {
+        return streamDevices(req, res, loadDevices, page)
+    }
+    if (page) {
+        return respondDevicesPage(req, res, loadDevices, {...page, limit: page.limit || DEVICES_PAGE_MAX})
+            .catch(function(err) {
+                apiutil.internalError(res, 'Failed to load device list: ', err.stack)
+            })
+    }
     loadDevices(req.user.groups.subscribed, apiutil.prepareFieldsForMongoDb(req.query.fields)).then(function(devices) {
         let isGenerator = false // req.headers.is_generator === '1'
         if (isGenerator) {
@@ -119,8 +218,9 @@ function extractStandardizableDevices(devices) {
             })
     })
 }
-function getStandardizableDevices(req, res) {
-    dbapi.loadDevicesByOrigin(req.user.groups.subscribed, apiutil.prepareFieldsForMongoDb(req.query.fields)).then(function(devices) {
+function getStandardizableDevices(req, res, filter) {
+    const fields = apiutil.prepareFieldsForMongoDb(req.query.fields)
+    dbapi.loadDevicesByOrigin(req.user.groups.subscribed, fields, undefined, filter).then(function(devices) {
         extractStandardizableDevices(devices).then(function(devices) {
             filterGenericDevices(req, res, devices)
         })
@@ -129,6 +229,15 @@ function getStandardizableDevices(req, res) {
             apiutil.internalError(res, 'Failed to load device list: ', err.stack)
         })
 }
+// Cursors of the change feed are the position of the last change, its cluster time and id (a hex resume token),
+// as "<seconds>.<increment>.<id>"
+function formatChangeCursor(change) {
+    return change ? `${change.ts.t}.${change.ts.i}.${change.id}` : '0.0.'
+}
+function parseChangeCursor(cursor) {
+    const match = /^(\d+)\.(\d+)(?:\.([0-9A-Fa-f]*))?$/.exec(cursor)
+    return match ? {ts: new Timestamp({t: Number(match[1]), i: Number(match[2])}), id: match[3]} : null
+}
 function removeDevice(serial, req, res) {
     const presentState = req.query.present
     const bookingState = req.query.booked
@@ -219,21 +328,69 @@ function removeDevice(serial, req, res) {
 /* ------------------------------------ PUBLIC FUNCTIONS ------------------------------- */
 function getDevices(req, res) {
     const target = req.query.target
+    const {filter, error} = apiutil.getDeviceFilter(req)
+    if (error) {
+        return apiutil.respond(res, 400, error)
+    }
     switch (target) {
     case apiutil.BOOKABLE:
-        getGenericDevices(req, res, dbapi.loadBookableDevices)
+        getGenericDevices(req, res, dbapi.loadBookableDevices, filter)
         break
     case apiutil.ORIGIN:
-        getGenericDevices(req, res, dbapi.loadDevicesByOrigin)
+        getGenericDevices(req, res, dbapi.loadDevicesByOrigin, filter)
         break
     case apiutil.STANDARD:
-        getGenericDevices(req, res, dbapi.loadStandardDevices)
+        getGenericDevices(req, res, dbapi.loadStandardDevices, filter)
         break
     case apiutil.STANDARDIZABLE:
-        getStandardizableDevices(req, res)
+        getStandardizableDevices(req, res, filter)
         break
     default:
-        getGenericDevices(req, res, dbapi.loadDevices)
+        getGenericDevices(req, res, dbapi.loadDevices, filter)
+    }
+}
+async function getDeviceChanges(req, res) {
+    const limit = req.query.limit || 1000
+    const groups = req.user.groups.subscribed
+    try {
+        if (typeof req.query.cursor === 'undefined') {
+            const last = await dbapi.loadLastDeviceChange()
+            return apiutil.respond(res, 200, 'Device Changes', {
+                cursor: formatChangeCursor(last),
+                hasMore: false,
+                changes: []
+            })
+        }
+        const since = parseChangeCursor(req.query.cursor)
+        if (!since) {
+            return apiutil.respond(res, 400, 'Bad Request (invalid cursor)')
+        }
+        // Cursors without an id come from before changes sharing a cluster time were told apart
+        if (typeof since.id === 'undefined' || (since.id && !await dbapi.hasDeviceChange(since))) {
+            return apiutil.respond(res, 410, 'Gone (cursor expired, reload the device list)')
+        }
+        const changes = await dbapi.loadDeviceChanges(groups, since, limit + 1)
+        const hasMore = changes.length > limit
+        if (hasMore) {
+            changes.pop()
+        }
+        apiutil.respond(res, 200, 'Device Changes', {
+            cursor: changes.length ? formatChangeCursor(changes[changes.length - 1]) : req.query.cursor,
+            hasMore: hasMore,
+            changes: changes.map(function(change) {
+                // A device moved out of the groups of the user is gone from its point of view
+                const visible = !groups?.length || groups.indexOf(change.device.group?.id) > -1
+                return {
+                    serial: change.serial,
+                    action: visible ? change.action : 'deleted',
+                    changedAt: change.changedAt,
+                    device: apiutil.publishDevice(change.device, req)
+                }
+            })
+        })
+    }
+    catch (err) {
+        apiutil.internalError(res, 'Failed to load device changes: ', err.stack)
     }
 }
 function getDeviceBySerial(req, res) {
@@ -689,6 +846,7 @@ async function useDeviceByUser(req, res) {
 export {getDevices}
 export {putDeviceBySerial}
 export {getDeviceBySerial}
+export {getDeviceChanges}
 export {getDeviceSize}
 export {getDeviceOwner}
 export {getDeviceGroups}
@@ -709,6 +867,7 @@ export default {
     getDevices: getDevices,
     putDeviceBySerial: putDeviceBySerial,
     getDeviceBySerial: getDeviceBySerial,
+    getDeviceChanges: getDeviceChanges,
     getDeviceSize: getDeviceSize,
     getDeviceOwner: getDeviceOwner,
     getDeviceGroups: getDeviceGroups,
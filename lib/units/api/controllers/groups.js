@@ -624,7 +624,7 @@ function getGroups(req, res) {
     }
 
     getGenericGroups.then(function(groups) {
-        return apiutil.respond(res, 200, 'Groups Information', {
+        return apiutil.respondWithETag(req, res, 'Groups Information', {
             groups: groups?.map(function(group) {
                 if (fields) {
                     return _.pick(apiutil.publishGroup(group), fields.split(','))
@@ -959,6 +959,10 @@ function updateGroup(req, res) {
 function getGroupDevices(req, res) {
     const id = req.params.id
     const bookable = req.query.bookable
+    const {filter, error} = apiutil.getDeviceFilter(req)
+    if (error) {
+        return apiutil.respond(res, 400, error)
+    }
     dbapi.getUserGroup(req.user.email, id).then(function(group) {
         if (!group) {
             apiutil.respond(res, 404, 'Not Found (group)')
@@ -973,7 +977,7 @@ function getGroupDevices(req, res) {
                 groupApiWrapper(group.owner.email, getGroupDevices, req, res)
                 return
             }
-            dbapi.loadBookableDevices(req.user.groups.subscribed).then(function(devices) {
+            dbapi.loadBookableDevices(req.user.groups.subscribed, undefined, undefined, filter).then(function(devices) {
                 Promise.all(devices.map(function(device) {
                     return device.serial
                 }))
@@ -994,15 +998,15 @@ function getGroupDevices(req, res) {
                                 deviceList.push(apiutil.filterDevice(req, device))
                             }
                         })
-                        apiutil.respond(res, 200, 'Devices Information', {devices: deviceList})
+                        apiutil.respondWithETag(req, res, 'Devices Information', {devices: deviceList})
                     })
             })
         }
         else {
-            DeviceModel.loadDevicesBySerials(group.devices)
+            DeviceModel.loadDevicesBySerials(group.devices, filter)
                 .then(function(devices) {
                     devices = devices.map(device => apiutil.filterDevice(req, device))
-                    apiutil.respond(res, 200, 'Devices Information', {devices: devices})
+                    apiutil.respondWithETag(req, res, 'Devices Information', {devices: devices})
                 })
                 .catch(function(err) {
                     apiutil.internalError(res, 'Failed to get group devices: ', err.stack)
@@ -1,5 +1,8 @@
 import * as apiutil from '../../../util/apiutil.js'
 import dbapi from '../../../db/api.js'
+
+const STATS_BATCH_MAX = 5000
+
 function writeStats(req, res) {
     const user = req.user.name
     const serial = req.query.serial
@@ -13,7 +16,66 @@ function writeStats(req, res) {
             apiutil.internalError(res, 'Failed')
         })
 }
+
+// the body is a JSON array of events or NDJSON, one event per line
+function parseStatsEvents(body) {
+    if (Array.isArray(body)) {
+        return body
+    }
+    if (typeof body === 'string') {
+        return body.split('\n')
+            .filter(line => line.trim())
+            .map(line => JSON.parse(line))
+    }
+    return null
+}
+
+function isStatsEvent(event) {
+    return event !== null && typeof event === 'object' &&
+        typeof event.serial === 'string' && event.serial !== '' &&
+        typeof event.action === 'string' && event.action !== '' &&
+        (typeof event.timestamp === 'undefined' || Number.isFinite(event.timestamp))
+}
+
+function writeStatsBatch(req, res) {
+    let events
+    try {
+        events = parseStatsEvents(req.body)
+    }
+    catch (err) {
+        return apiutil.respond(res, 400, 'Bad Request (invalid NDJSON line)')
+    }
+    if (events === null) {
+        return apiutil.respond(res, 400, 'Bad Request (expected an array or NDJSON of stats events)')
+    }
+    if (events.length > STATS_BATCH_MAX) {
+        return apiutil.respond(res, 413, `Payload Too Large (more than ${STATS_BATCH_MAX} stats events)`)
+    }
+    const invalid = events.findIndex(event => !isStatsEvent(event))
+    if (invalid !== -1) {
+        return apiutil.respond(res, 400, `Bad Request (invalid stats event at index ${invalid})`)
+    }
+    if (!events.length) {
+        return apiutil.respond(res, 200, 'Stats written', {written: 0})
+    }
+    const now = Date.now()
+    dbapi.sendEvents(events.map(event => ({
+        eventType: event.action,
+        eventDetails: {},
+        linkedEntities: {deviceSerial: event.serial, userEmail: req.user.email},
+        timestamp: typeof event.timestamp === 'undefined' ? now : event.timestamp
+    })))
+        .then((result) => {
+            apiutil.respond(res, 200, 'Stats written', {written: result.insertedCount})
+        })
+        .catch((err) => {
+            apiutil.internalError(res, 'Failed to write stats: ', err.stack)
+        })
+}
+
 export {writeStats}
+export {writeStatsBatch}
 export default {
-    writeStats: writeStats
+    writeStats: writeStats,
+    writeStatsBatch: writeStatsBatch
 }
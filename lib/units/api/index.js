@@ -8,9 +8,11 @@ import lifecycle from '../../util/lifecycle.js'
 import rateLimitConfig from '../ratelimit/index.js'
 import bodyParser from 'body-parser'
 import {accessTokenAuth} from './helpers/securityHandlers.js'
+import compression from 'compression'
 import db from '../../db/index.js'
 
 const basePath = '/api/v1'
+const STATS_BATCH_BODY_LIMIT = '2mb'
 const expressOpenapiUse = (app, handler) => (['get', 'post', 'put', 'delete', 'patch', 'options', 'head']).forEach(method => {
     const appMethod = app[method].bind(app)
     app[method] = (path, ...handlers) => {
@@ -62,6 +64,16 @@ export default (async function(options) {
 
     channelRouter.setMaxListeners(100)
 
+    // ETags of listings stay weak: the gzip and deflate representations of a listing share its ETag
+    app.set('etag', 'weak')
+    // device listings of large farms run to megabytes, they are compressed for the clients accepting it
+    if (options.compression !== false) {
+        app.use(basePath, compression({threshold: options.compressionThreshold}))
+    }
+
+    // stats batches are larger than the default 100kb and may come as NDJSON
+    app.use(`${basePath}/stats/batch`, bodyParser.json({limit: STATS_BATCH_BODY_LIMIT}))
+    app.use(`${basePath}/stats/batch`, bodyParser.text({type: 'application/x-ndjson', limit: STATS_BATCH_BODY_LIMIT}))
     app.use(bodyParser.json())
     app.use(rateLimitConfig)
 
@@ -0,0 +1,10 @@
+// Generated by /lib/units/api/gen_routes.py. DO NOT EDIT MANUALLY
+// Generated for controller devices
+
+import {getDeviceChanges} from '../../controllers/devices.js'
+
+export function get(req, res) {
+    return getDeviceChanges(req, res)
+}
+
+
@@ -0,0 +1,10 @@
+// Generated by /lib/units/api/gen_routes.py. DO NOT EDIT MANUALLY
+// Generated for controller stats
+
+import {writeStatsBatch} from '../../controllers/stats.js'
+
+export function post(req, res) {
+    return writeStatsBatch(req, res)
+}
+
+
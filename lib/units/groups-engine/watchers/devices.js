@@ -9,6 +9,21 @@ import wire from '../../../wire/index.js'
 import dbapi from '../../../db/api.js'
 import db from '../../../db/index.js'
 import {LeaveGroupMessage} from '../../../wire/wire.js'
+// Fields watched for the device change feed (GET /devices/changes)
+const FEED_FIELDS = [
+    'serial', 'present', 'status', 'ready', 'usage', 'owner', 'model', 'manufacturer', 'marketName', 'operator',
+    'platform', 'version', 'sdk', 'abi', 'provider.name', 'group.id', 'group.name', 'group.origin',
+    'group.originName', 'group.owner'
+]
+// Projected only for the feed, they are not part of DeviceField
+const FEED_ONLY_FIELDS = ['present', 'status', 'ready', 'usage', 'platform']
+const FEED_ACTIONS = {insert: 'created', update: 'updated', delete: 'deleted'}
+// Delay before the feed stream is reopened after a failed insert
+const FEED_RETRY_DELAY = 5000
+// Code of the error raised when the change to resume after is no longer in the oplog
+const CHANGE_STREAM_HISTORY_LOST = 286
+const WATCH_OPTIONS = {fullDocument: 'whenAvailable', fullDocumentBeforeChange: 'whenAvailable'}
+
 export default (function(push, pushdev, channelRouter) {
     const log = logger.createLogger('watcher-devices')
     function sendReleaseDeviceControl(serial, channel) {
@@ -30,7 +45,7 @@ export default (function(push, pushdev, channelRouter) {
     }
     function sendDeviceChange(device1, device2, action) {
         function publishDevice() {
-            const device = _.cloneDeep(device1)
+            const device = _.cloneDeep(_.omit(device1, FEED_ONLY_FIELDS))
             delete device.channel
             delete device.owner
             delete device.group.id
@@ -42,6 +57,53 @@ export default (function(push, pushdev, channelRouter) {
             wireutil.envelope(new wire.DeviceChangeMessage(publishDevice(), action, device2.group.origin, timeutil.now('nano')))
         ])
     }
+    async function recordDeviceChange(change) {
+        const action = FEED_ACTIONS[change.operationType]
+        const newDoc = change.fullDocument || null
+        const oldDoc = change.fullDocumentBeforeChange || null
+        if (!action || (newDoc === null && oldDoc === null)) {
+            return
+        }
+        const device = _.pick(newDoc || oldDoc, FEED_FIELDS)
+        if (action === 'updated' && _.isEqual(device, _.pick(oldDoc, FEED_FIELDS))) {
+            return
+        }
+        await dbapi.insertDeviceChange({
+            id: change._id._data,
+            ts: change.clusterTime,
+            serial: device.serial,
+            action: action,
+            groups: _.uniq(_.compact([newDoc?.group?.id, oldDoc?.group?.id])),
+            changedAt: new Date(),
+            device: device
+        })
+    }
+    // The feed has its own change stream, recorded one change at a time in stream order so that it has no holes:
+    // when an insert fails the stream is reopened after the last recorded change
+    function watchDeviceChanges(devices, pipeline, resumeAfter) {
+        const stream = devices.watch(pipeline, resumeAfter ? {...WATCH_OPTIONS, resumeAfter} : WATCH_OPTIONS)
+        let last = resumeAfter
+        async function record() {
+            try {
+                for await (const change of stream) {
+                    await recordDeviceChange(change)
+                    last = change._id
+                }
+            }
+            catch (err) {
+                await stream.close().catch(() => {})
+                if (err.code === CHANGE_STREAM_HISTORY_LOST) {
+                    log.error('Device change feed lost its position, changes were not recorded: %s', err)
+                    last = null
+                }
+                else {
+                    log.error('Failed to record device change, retrying in %dms: %s', FEED_RETRY_DELAY, err)
+                }
+                setTimeout(() => watchDeviceChanges(devices, pipeline, last), FEED_RETRY_DELAY)
+            }
+        }
+        record()
+    }
     function sendReleaseDeviceControlAndDeviceGroupChange(device, sendDeviceGroupChangeWrapper) {
         let messageListener
         const responseTimer = setTimeout(function() {
@@ -63,11 +125,17 @@ export default (function(push, pushdev, channelRouter) {
     }
     let changeStream
     db.connect().then(client => {
+        dbapi.generateDeviceChangesIndexes()
+            .catch(err => log.error('Failed to create device changes indexes: %s', err))
         const devices = client.collection('devices')
-        changeStream = devices.watch([
+        const pipeline = [
             {
                 $project: {
                     'fullDocument.serial': 1,
+                    'fullDocument.present': 1,
+                    'fullDocument.status': 1,
+                    'fullDocument.ready': 1,
+                    'fullDocument.usage': 1,
                     'fullDocument.channel': 1,
                     'fullDocument.owner': 1,
                     'fullDocument.model': 1,
@@ -91,16 +159,23 @@ export default (function(push, pushdev, channelRouter) {
                     'fullDocument.openGLESVersion': 1,
                     'fullDocument.phone.imei': 1,
                     'fullDocument.marketName': 1,
+                    'fullDocument.platform': 1,
                     'fullDocumentBeforeChange.serial': 1,
+                    'fullDocumentBeforeChange.present': 1,
+                    'fullDocumentBeforeChange.status': 1,
+                    'fullDocumentBeforeChange.ready': 1,
+                    'fullDocumentBeforeChange.usage': 1,
                     'fullDocumentBeforeChange.channel': 1,
                     'fullDocumentBeforeChange.owner': 1,
                     'fullDocumentBeforeChange.model': 1,
                     'fullDocumentBeforeChange.operator': 1,
                     'fullDocumentBeforeChange.manufacturer': 1,
                     'fullDocumentBeforeChange.group.id': 1,
+                    'fullDocumentBeforeChange.group.name': 1,
                     'fullDocumentBeforeChange.group.origin': 1,
                     'fullDocumentBeforeChange.group.originName': 1,
                     'fullDocumentBeforeChange.group.lifeTime': 1,
+                    'fullDocumentBeforeChange.group.owner': 1,
                     'fullDocumentBeforeChange.provider.name': 1,
                     'fullDocumentBeforeChange.network.type': 1,
                     'fullDocumentBeforeChange.network.subtype': 1,
@@ -113,10 +188,14 @@ export default (function(push, pushdev, channelRouter) {
                     'fullDocumentBeforeChange.openGLESVersion': 1,
                     'fullDocumentBeforeChange.phone.imei': 1,
                     'fullDocumentBeforeChange.marketName': 1,
-                    operationType: 1
+                    'fullDocumentBeforeChange.platform': 1,
+                    operationType: 1,
+                    clusterTime: 1
                 }
             }
-        ], {fullDocument: 'whenAvailable', fullDocumentBeforeChange: 'whenAvailable'})
+        ]
+        watchDeviceChanges(devices, pipeline, null)
+        changeStream = devices.watch(pipeline, WATCH_OPTIONS)
         changeStream.on('change', async(next) => {
             log.info('Devices watcher next: %s', JSON.stringify(next))
             try {
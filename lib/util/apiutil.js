@@ -105,6 +105,25 @@ export const respond = function(res, code, message, data) {
     res.status(code).json(response)
     return res
 }
+/**
+ * Respond to a listing api call which can be revalidated, Express adds the weak ETag of the payload
+ * and answers 304 Not Modified without a body if the caller already holds it (If-None-Match)
+ * @param {*} req Express js request object
+ * @param {*} res Express js response object
+ * @param {string} message Description of the listing
+ * @param {object} data Listing to append to the response object
+ * @returns {*} res
+ */
+export const respondWithETag = function(req, res, message, data) {
+    if (res.headersSent) {
+        log.error('Headers already sent when trying to respond with', message)
+        return res
+    }
+    res.setHeader('Cache-Control', 'no-cache')
+    res.status(200).json({success: true, description: message, ...data})
+    log.info('Responding with %s %s', res.statusCode, message)
+    return res
+}
 export const internalError = function(res, ...args) {
     log.error.apply(log, args)
     console.trace('error occured here')
@@ -148,6 +167,50 @@ export const filterDevice = function(req, device) {
     }
     return publishDevice(device, req, isGenerator)
 }
+// query parameters of the device listings and the device fields they match, lists are matched with $in
+const DEVICE_FILTER_FIELDS = {
+    owner: 'owner.email',
+    ownerName: 'owner.name',
+    groupId: 'group.id',
+    groupName: 'group.name',
+    status: 'status',
+    abi: 'abi',
+    sdk: 'sdk',
+    model: 'model',
+    platform: 'platform'
+}
+const isTrue = value => value === true || value === 'true'
+
+// {filter} with the Mongo condition selecting the devices matching the filters of the query, {} without filters
+// and {error} for invalid values
+export const getDeviceFilter = function(req) {
+    const conditions = []
+    for (const [param, field] of Object.entries(DEVICE_FILTER_FIELDS)) {
+        if (typeof req.query[param] === 'undefined') {
+            continue
+        }
+        let values = [].concat(req.query[param]).map(String)
+        if (param === 'status') {
+            values = values.map(Number)
+            if (!values.every(Number.isInteger)) {
+                return {error: 'Bad Request (status must be an integer)'}
+            }
+        }
+        conditions.push({[field]: values.length === 1 ? values[0] : {$in: values}})
+    }
+    if (typeof req.query.present !== 'undefined') {
+        conditions.push({present: isTrue(req.query.present)})
+    }
+    if (typeof req.query.using !== 'undefined') {
+        // same rule as datautil.applyOwner, administrators use every owned device
+        const using = req.user.privilege === ADMIN ? {owner: {$ne: null}} : {'owner.email': req.user.email}
+        conditions.push(isTrue(req.query.using) ? using : {$nor: [using]})
+    }
+    if (!conditions.length) {
+        return {}
+    }
+    return {filter: conditions.length === 1 ? conditions[0] : {$and: conditions}}
+}
 export const computeDuration = function(group, deviceNumber) {
     return (group.devices.length + deviceNumber) *
         (group.dates[0].stop - group.dates[0].start) *
@@ -351,6 +414,7 @@ export default {
     isOriginGroup,
     isAdminGroup,
     respond,
+    respondWithETag,
     internalError,
     publishGroup,
     publishDevice,
@@ -1,24 +1,13 @@
-import asyncio
-import itertools
 import json
-import random
 
 import pytest
 from pytest_check import equal, is_, is_not_none, is_none
 
 from devicehub_client.api.autotests import capture_devices, free_devices
+from devicehub_client.loadgen import HoldTime, LoadGenerator, LoadProfile, Requirement
 from devicehub_client.types import UNSET
 
 
-def raise_multiple(errors):
-    if not errors:  # list emptied, recursion ends
-        return
-    try:
-        raise errors.pop()  # pop removes list entries
-    finally:
-        raise_multiple(errors)  # recursion
-
-
 pytest_plugins = ('pytest_asyncio',)
 
 @pytest.mark.smoke
@@ -26,33 +15,15 @@ class TestAutotestsMethods:
     @pytest.mark.asyncio
     @pytest.mark.xfail
     async def test_get_groups(self, api_client):
-        async def load_work(worker_number: int):
-            async def shielded_load_work(test_num: int):
-                test_name = f"test_worker_{worker_number}.{test_num}"
-                print(f"Starting {test_name}")
-                devices = await capture_devices.asyncio_detailed(client=api_client, amount=2, run=test_name, timeout=1200)
-                assert devices.status_code in range(200, 300), devices.content
-                assert devices.parsed
-                assert devices.parsed.group
-                group_id = devices.parsed.group.to_dict()["id"]
-                await asyncio.sleep(random.uniform(0.2, 0.5))
-                freed = await free_devices.asyncio_detailed(client=api_client, group=group_id)
-                assert freed.status_code in range(200, 300), devices.content
-
-            for test_num in itertools.count():
-                await asyncio.shield(shielded_load_work(test_num))
-                if test_num > 5:
-                    break
-
-        tasks = [asyncio.create_task(load_work(i)) for i in range(2)]
-        done, pending = await asyncio.wait(tasks, timeout=None, return_when=asyncio.FIRST_EXCEPTION)
-        exceptions = []
-        for coro in done:
-            if exception := coro.exception():
-                exceptions.append(exception)
-        for coro in pending:
-            coro.cancel()
-        raise_multiple(exceptions)
+        # two CI runs capturing two devices each, back to back
+        profile = LoadProfile(runs=2, duration=10, requirements=[Requirement(amount=2)],
+                              hold=HoldTime.uniform(0.2, 0.5), capture_deadline=60, group_timeout=1200, seed=0)
+        report = await LoadGenerator(api_client, profile).run()
+        print(report.report())
+        errors = [run for run in report.runs if run.outcome not in ('captured', 'abandoned')]
+        assert not errors, errors
+        assert report.free_failures == 0
+        assert report.count('captured') > 2
 
 
     def test_create_connect_delete_autotest_group(self, api_client, random_str):
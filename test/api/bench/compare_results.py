@@ -0,0 +1,59 @@
+"""Compare two bench-results.json files written by the API stack benchmarks
+
+    python bench/compare_results.py baseline.json candidate.json [--threshold 10]
+
+Prints the relative change of rps and p50/p90/p99 (and of the bytes per response of the compression benchmarks)
+per fleet size and benchmark, and exits with 1 if any p99 grew or any rps dropped by more than the threshold (in
+percent).
+"""
+
+import argparse
+import json
+import re
+import sys
+
+METRICS = ('rps', 'p50_ms', 'p90_ms', 'p99_ms')
+
+
+def scale_order(scale):
+    # stack scales are plain fleet sizes, stand-in ones are prefixed with "standin"
+    match = re.search(r'\d+', scale)
+    return (scale[:match.start()] if match else scale, int(match.group()) if match else 0)
+
+
+def change(old, new):
+    return (new - old) / old * 100 if old else 0.0
+
+
+def compare(baseline, candidate, threshold):
+    regressions = []
+    print(f'{baseline.get("commit")} -> {candidate.get("commit")}')
+    for scale, benches in sorted(candidate['results'].items(), key=lambda item: scale_order(item[0])):
+        for name, new in sorted(benches.items()):
+            old = baseline['results'].get(scale, {}).get(name)
+            if old is None:
+                print(f'{scale:>6} {name:<45} new')
+                continue
+            metrics = METRICS + (('bytes',) if 'bytes' in old and 'bytes' in new else ())
+            deltas = {metric: change(old[metric], new[metric]) for metric in metrics}
+            print(f'{scale:>6} {name:<45} ' + ' '.join(f'{metric} {deltas[metric]:+6.1f}%' for metric in metrics))
+            if deltas['rps'] < -threshold or deltas['p99_ms'] > threshold:
+                regressions.append(f'{scale} {name}')
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=10.0)
+    args = parser.parse_args(argv)
+    with open(args.baseline) as baseline, open(args.candidate) as candidate:
+        regressions = compare(json.load(baseline), json.load(candidate), args.threshold)
+    for regression in regressions:
+        print(f'regression: {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""Fixtures and hooks of the benchmarks, registered as a plugin by the root conftest"""
+
+import asyncio
+import json
+import os
+import subprocess
+import time
+from datetime import datetime, timezone
+
+import httpx
+import pytest
+
+from devicehub_client import AuthenticatedClient, projection
+from devicehub_client.api.devices import generate_fake_device
+from devicehub_client.bulk import BulkExecutor
+from devicehub_client.standin import FakeFarm, Latency, StandIn
+
+FAKE_DEVICES_BATCH = 250
+# largest stand-in fleet benchmarked without --run-bench, parsing bigger listings takes seconds per request
+STANDIN_QUICK_SCALE = 500
+
+
+class LatencySummary:
+    def __init__(self, name, samples, wall_time):
+        ordered = sorted(samples)
+        self.name = name
+        self.requests = len(ordered)
+        self.wall_time = wall_time
+        self.rps = self.requests / wall_time if wall_time else 0.0
+        self.p50 = self.percentile(ordered, 50)
+        self.p90 = self.percentile(ordered, 90)
+        self.p99 = self.percentile(ordered, 99)
+
+    @staticmethod
+    def percentile(ordered, pct):
+        if not ordered:
+            return 0.0
+        index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered) + 0.5) - 1))
+        return ordered[index]
+
+    def to_dict(self):
+        return {
+            'requests': self.requests,
+            'wall_time': round(self.wall_time, 4),
+            'rps': round(self.rps, 1),
+            'p50_ms': round(self.p50 * 1000, 2),
+            'p90_ms': round(self.p90 * 1000, 2),
+            'p99_ms': round(self.p99 * 1000, 2),
+        }
+
+    def __str__(self):
+        return (f'{self.name:<40} {self.requests:>7} req {self.rps:>9.1f} req/s '
+                f'p50={self.p50 * 1000:.1f}ms p90={self.p90 * 1000:.1f}ms p99={self.p99 * 1000:.1f}ms')
+
+
+class TransferSummary:
+    """A LatencySummary with the mean bytes received per response, as sent on the wire (compressed)"""
+
+    def __init__(self, summary, timings):
+        self.summary = summary
+        self.name = summary.name
+        self.bytes = round(sum(timing.received for timing in timings) / len(timings)) if timings else 0
+
+    def to_dict(self):
+        return {**self.summary.to_dict(), 'bytes': self.bytes}
+
+    def __str__(self):
+        return f'{self.summary} {self.bytes / 1024:.1f}KiB/response'
+
+
+@pytest.fixture()
+def latency_summary():
+    return LatencySummary
+
+
+@pytest.fixture()
+def transfer_summary():
+    return TransferSummary
+
+
+# method run async request factory with limited concurrency and summarize per-request latency
+@pytest.fixture()
+def measure_async():
+    async def measure_async_func(name, request_factory, requests, concurrency):
+        samples = []
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def timed(i):
+            async with semaphore:
+                started = time.perf_counter()
+                await request_factory(i)
+                samples.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(timed(i) for i in range(requests)))
+        summary = LatencySummary(name, samples, time.perf_counter() - started)
+        print(summary)
+        return summary
+
+    return measure_async_func
+
+
+# fleet sizes of the benchmarks against the API stack, the stack starts with the 5 devices of generate-fake-device
+def bench_scales(config):
+    return sorted({int(scale) for scale in config.option.bench_scales.split(',') if scale.strip()})
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.option.run_bench:
+        return
+    skip = pytest.mark.skip(reason='API stack benchmarks need --run-bench')
+    for item in items:
+        if 'fleet' in getattr(item, 'fixturenames', ()):
+            item.add_marker(skip)
+
+
+class BenchResults:
+    """Summaries per fleet size, written as JSON so runs of different commits can be compared"""
+
+    def __init__(self, path, base_url):
+        self.path = path
+        self.base_url = base_url
+        self.results = {}
+
+    def add(self, scale, summary):
+        self.results.setdefault(str(scale), {})[summary.name] = summary.to_dict()
+
+    @staticmethod
+    def commit():
+        if os.environ.get('GITHUB_SHA'):
+            return os.environ['GITHUB_SHA']
+        try:
+            return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def write(self):
+        with open(self.path, 'w') as file:
+            json.dump({
+                'commit': self.commit(),
+                'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+                'base_url': self.base_url,
+                'results': self.results,
+            }, file, indent=2, sort_keys=True)
+
+
+@pytest.fixture(scope='session')
+def bench_results(request):
+    results = BenchResults(request.config.option.bench_results, request.config.option.base_url)
+    yield results
+    if results.results and request.config.option.run_bench:
+        results.write()
+
+
+class FakeFleet:
+    """Grows the fake devices of the stack with /devices/fake and deletes the generated ones at the end"""
+
+    def __init__(self, client):
+        self.client = client
+        self.generated = []
+
+    def serials(self):
+        devices = projection.sync(client=self.client, fields='serial')
+        assert devices is not None, 'Failed to list devices'
+        return [device.serial for device in devices]
+
+    def grow_to(self, size):
+        before = self.serials()
+        missing = size - len(before)
+        while missing > 0:
+            number = min(missing, FAKE_DEVICES_BATCH)
+            response = generate_fake_device.sync_detailed(client=self.client, number=number)
+            assert response.status_code == 200, response.content
+            missing -= number
+        known = set(before)
+        self.generated += [serial for serial in self.serials() if serial not in known]
+        return self.serials()
+
+    def remove_generated(self):
+        if self.generated:
+            report = asyncio.run(self._delete_generated())
+            assert report.ok, report.failed
+
+    async def _delete_generated(self):
+        # the async httpx client belongs to the loop of this asyncio.run, close it before the loop goes away
+        try:
+            return await BulkExecutor(self.client).delete_devices(self.generated)
+        finally:
+            await self.client.aclose()
+
+
+@pytest.fixture(scope='session')
+def fake_fleet(request, token_from_params):
+    client = AuthenticatedClient(base_url=f'{request.config.option.base_url}/api/v1', token=token_from_params,
+                                 timeout=httpx.Timeout(600))
+    fleet = FakeFleet(client)
+    yield fleet
+    fleet.remove_generated()
+    client.close()
+
+
+# the fleet grown to the size of the current scale, tests using it run once per --bench-scales entry
+@pytest.fixture(scope='session')
+def fleet(request, fake_fleet):
+    return fake_fleet.grow_to(request.param)
+
+
+# in-process stand-in of the API with a fake fleet of the current scale and a few ms of latency per response
+@pytest.fixture(scope='session')
+def standin(request):
+    return StandIn(FakeFarm(devices=request.param, seed=request.param), latency=Latency(base=0.002, seed=1))
+
+
+def pytest_generate_tests(metafunc):
+    if 'fleet' in metafunc.fixturenames:
+        scales = bench_scales(metafunc.config)
+        metafunc.parametrize('fleet', scales, indirect=True, scope='session', ids=[f'fleet{scale}' for scale in scales])
+    if 'standin' in metafunc.fixturenames:
+        scales = bench_scales(metafunc.config)
+        if not metafunc.config.option.run_bench:
+            scales = [scale for scale in scales if scale <= STANDIN_QUICK_SCALE]
+        metafunc.parametrize('standin', scales, indirect=True, scope='session',
+                             ids=[f'standin{scale}' for scale in scales])
@@ -0,0 +1,99 @@
+import time
+import uuid
+
+import pytest
+from pytest_check import equal
+
+from devicehub_client.api.autotests import capture_devices, free_devices
+from devicehub_client.api.devices import get_devices
+from devicehub_client.api.groups import get_groups
+from devicehub_client.bulk import BulkExecutor
+from devicehub_client.models import GroupPayloadClass
+
+REQUESTS = 100
+CONCURRENCY = 10
+CAPTURE_CYCLES = 20
+CAPTURE_CONCURRENCY = 2
+MOVES = 5
+MOVE_SIZE = 1000
+PROJECTION = 'serial,present,status,ready,group.id,owner.email'
+
+
+def scale_of(fleet):
+    return f'{len(fleet)}'
+
+
+def check_ok(response, status_code=200):
+    assert response.status_code == status_code, response.content
+    return response
+
+
+@pytest.mark.bench
+@pytest.mark.integration
+class TestApiEndpointsBench:
+    """Throughput and tail latency of the busiest endpoints, once per fake fleet size (--bench-scales)"""
+
+    @pytest.mark.asyncio
+    async def test_get_devices(self, api_client, fleet, measure_async, bench_results):
+        async def request(_):
+            check_ok(await get_devices.asyncio_detailed(client=api_client))
+
+        bench_results.add(scale_of(fleet), await measure_async('GET /devices', request, REQUESTS, CONCURRENCY))
+
+    @pytest.mark.asyncio
+    async def test_get_devices_with_fields(self, api_client, fleet, measure_async, bench_results):
+        async def request(_):
+            check_ok(await get_devices.asyncio_detailed(client=api_client, fields=PROJECTION))
+
+        summary = await measure_async('GET /devices?fields', request, REQUESTS, CONCURRENCY)
+        bench_results.add(scale_of(fleet), summary)
+
+    @pytest.mark.asyncio
+    async def test_get_groups(self, api_client, fleet, measure_async, bench_results):
+        async def request(_):
+            check_ok(await get_groups.asyncio_detailed(client=api_client))
+
+        bench_results.add(scale_of(fleet), await measure_async('GET /groups', request, REQUESTS, CONCURRENCY))
+
+    @pytest.mark.asyncio
+    async def test_autotests_capture_free(self, api_client, fleet, measure_async, latency_summary, bench_results):
+        captures, frees = [], []
+
+        async def cycle(i):
+            started = time.perf_counter()
+            response = check_ok(await capture_devices.asyncio_detailed(
+                client=api_client, amount=1, timeout=60, run=f'bench-{uuid.uuid4().hex}'
+            ))
+            captured = time.perf_counter()
+            captures.append(captured - started)
+            check_ok(await free_devices.asyncio_detailed(client=api_client, group=response.parsed.group.id))
+            frees.append(time.perf_counter() - captured)
+
+        cycles = await measure_async('autotests capture+free', cycle, CAPTURE_CYCLES, CAPTURE_CONCURRENCY)
+        bench_results.add(scale_of(fleet), cycles)
+        bench_results.add(scale_of(fleet), latency_summary('GET /autotests', captures, cycles.wall_time))
+        bench_results.add(scale_of(fleet), latency_summary('DELETE /autotests', frees, cycles.wall_time))
+
+    @pytest.mark.asyncio
+    async def test_group_devices_bulk_move(self, api_client, fleet, group_creating, latency_summary, bench_results):
+        group = group_creating(group_class=GroupPayloadClass.BOOKABLE)
+        serials = fleet[:MOVE_SIZE]
+        executor = BulkExecutor(api_client)
+        adds, removes = [], []
+        started = time.perf_counter()
+        for _ in range(MOVES):
+            moved = time.perf_counter()
+            report = await executor.add_origin_group_devices(group.id, serials)
+            adds.append(time.perf_counter() - moved)
+            equal(report.failed, [])
+            moved = time.perf_counter()
+            report = await executor.remove_origin_group_devices(group.id, serials)
+            removes.append(time.perf_counter() - moved)
+            equal(report.failed, [])
+        wall_time = time.perf_counter() - started
+
+        for name, samples in ((f'PUT /devices/groups/{{id}} x{len(serials)}', adds),
+                              (f'DELETE /devices/groups/{{id}} x{len(serials)}', removes)):
+            summary = latency_summary(name, samples, wall_time)
+            print(summary)
+            bench_results.add(scale_of(fleet), summary)
@@ -0,0 +1,74 @@
+import pytest
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.devices import get_devices
+from devicehub_client.compression import PREFERENCE, available_encodings
+from devicehub_client.standin import ENCODERS, Latency, StandIn
+
+REQUESTS = 20
+CONCURRENCY = 4
+# the stand-in sends over loopback, its latency adds the transfer time of a 100 Mbit/s link
+LINK_PER_KB = 1024 * 8 / 100e6
+CODECS = ('identity',) + PREFERENCE
+# encodings of the compression middleware of the API unit
+API_ENCODINGS = ('gzip', 'deflate')
+
+
+def compression_of(codec):
+    return False if codec == 'identity' else [codec]
+
+
+def skip_unavailable(codec, encoders=None):
+    if codec == 'identity':
+        return
+    if codec not in available_encodings():
+        pytest.skip(f'httpx cannot decode {codec}, install devicehub_client[compression]')
+    if encoders is not None and codec not in encoders:
+        pytest.skip(f'the stand-in cannot encode {codec}')
+    if encoders is None and codec not in API_ENCODINGS:
+        pytest.skip(f'the API does not encode {codec}')
+
+
+async def measure_get_devices(name, client, timings, measure_async, transfer_summary):
+    async def request(_):
+        response = await get_devices.asyncio_detailed(client=client)
+        assert response.status_code == 200, response.content
+
+    summary = await measure_async(name, request, REQUESTS, CONCURRENCY)
+    transfer = transfer_summary(summary, timings)
+    print(transfer)
+    return transfer
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize('codec', CODECS)
+class TestCompressionBench:
+    """Bytes on the wire and wall time of GET /devices per content encoding, once per fleet size (--bench-scales)
+
+    The 1k and 5k device figures come from --bench-scales 1000,5000.
+    """
+
+    @pytest.mark.asyncio
+    async def test_standin_get_devices(self, standin, codec, measure_async, transfer_summary, bench_results):
+        skip_unavailable(codec, ENCODERS)
+        server = StandIn(standin.farm, latency=Latency(base=0.002, per_kb=LINK_PER_KB, seed=1),
+                         compression_threshold=1024)
+        timings = []
+        with server.serve() as base_url:
+            async with AuthenticatedClient(base_url=base_url, token='t', compression=compression_of(codec),
+                                           on_response=timings.append) as client:
+                summary = await measure_get_devices(f'stand-in GET /devices {codec}', client, timings, measure_async,
+                                                    transfer_summary)
+        bench_results.add(f'standin{len(standin.farm.devices)}', summary)
+
+    @pytest.mark.integration
+    @pytest.mark.asyncio
+    async def test_get_devices(self, base_url, token_from_params, fleet, codec, measure_async, transfer_summary,
+                               bench_results):
+        skip_unavailable(codec)
+        timings = []
+        async with AuthenticatedClient(base_url=base_url, token=token_from_params, compression=compression_of(codec),
+                                       on_response=timings.append) as client:
+            summary = await measure_get_devices(f'GET /devices {codec}', client, timings, measure_async,
+                                                transfer_summary)
+        bench_results.add(f'{len(fleet)}', summary)
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import pytest
+from pytest_check import equal, greater
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.devices import get_devices
+
+hypercorn_asyncio = pytest.importorskip('hypercorn.asyncio')
+pytest.importorskip('h2')
+from hypercorn.config import Config  # noqa: E402
+
+REQUESTS = 400
+CONCURRENCY = 50
+SERVER_LATENCY = 0.01
+
+
+def devices_app(devices_number=20):
+    body = json.dumps({
+        'success': True,
+        'description': 'Devices Information',
+        'devices': [{'serial': f'fake-{i}', 'present': True, 'status': 3} for i in range(devices_number)],
+    }).encode()
+
+    async def app(scope, receive, send):
+        if scope['type'] != 'http':
+            return
+        await asyncio.sleep(SERVER_LATENCY)
+        await send({
+            'type': 'http.response.start',
+            'status': 200,
+            'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    return app
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_port(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.1).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    pytest.fail(f'Local server did not start on port {port}')
+
+
+@pytest.fixture(scope='module')
+def local_h2_server():
+    port = free_port()
+    config = Config()
+    config.bind = [f'127.0.0.1:{port}']
+    config.h2_max_concurrent_streams = CONCURRENCY * 2
+    config.loglevel = 'WARNING'
+    loop = asyncio.new_event_loop()
+    shutdown = asyncio.Event()
+    serve = hypercorn_asyncio.serve(devices_app(), config, shutdown_trigger=shutdown.wait)
+    thread = threading.Thread(target=loop.run_until_complete, args=(serve,), daemon=True)
+    thread.start()
+    wait_for_port(port)
+    yield f'http://127.0.0.1:{port}/api/v1'
+    loop.call_soon_threadsafe(shutdown.set)
+    thread.join(10)
+
+
+@pytest.mark.bench
+@pytest.mark.asyncio
+async def test_http2_multiplexing_against_http1(local_h2_server, measure_async):
+    http1_client = AuthenticatedClient(base_url=local_h2_server, token='bench')
+    http2_client = AuthenticatedClient(
+        base_url=local_h2_server,
+        token='bench',
+        http2=True,
+        max_concurrent_streams=CONCURRENCY,
+    )
+
+    async def http1_request(_):
+        response = await get_devices.asyncio_detailed(client=http1_client)
+        equal(response.status_code, 200)
+
+    async def http2_request(_):
+        response = await get_devices.asyncio_detailed(client=http2_client)
+        equal(response.status_code, 200)
+        equal(len(response.parsed.devices), 20)
+
+    http1 = await measure_async('GET /devices HTTP/1.1', http1_request, REQUESTS, CONCURRENCY)
+    http2 = await measure_async('GET /devices HTTP/2', http2_request, REQUESTS, CONCURRENCY)
+
+    probe = await http2_client.get_async_httpx_client().get('/devices')
+    equal(probe.http_version, 'HTTP/2')
+    await http1_client.aclose()
+    await http2_client.aclose()
+
+    greater(http1.rps, 0)
+    greater(http2.rps, 0)
@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+from pytest_check import equal, less_equal
+
+MODELS = 'devicehub_client.models.'
+
+
+def import_times(statement):
+    """Run ``statement`` in a fresh interpreter with -X importtime, return {module: (self_us, cumulative_us)}"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        times[module.strip()] = (int(self_us), int(cumulative_us))
+    return times
+
+
+def summarize(name, times):
+    own = sum(self_us for module, (self_us, _) in times.items() if module.startswith('devicehub_client'))
+    models = sorted(module for module in times if module.startswith(MODELS))
+    total = max(cumulative for _, cumulative in times.values())
+    print(f'\n{name:<50} total={total / 1000:.1f}ms devicehub_client={own / 1000:.1f}ms models={len(models)}')
+    return models
+
+
+@pytest.mark.bench
+def test_models_package_imports_no_model():
+    times = import_times('import devicehub_client.models')
+    equal(summarize('import devicehub_client.models', times), [])
+
+
+@pytest.mark.bench
+@pytest.mark.parametrize('endpoint, max_models', [
+    ('devicehub_client.api.devices.get_devices', 2),
+    ('devicehub_client.api.groups.get_groups', 2),
+    ('devicehub_client.api.devices.get_device_by_serial', 2),
+])
+def test_endpoint_imports_only_its_models(endpoint, max_models):
+    times = import_times(f'import {endpoint}')
+    less_equal(len(summarize(f'import {endpoint}', times)), max_models)
+
+
+@pytest.mark.bench
+def test_lazy_names_resolve():
+    times = import_times(
+        'import devicehub_client.api as api; from devicehub_client.models import Device; api.devices.get_devices'
+    )
+    models = summarize('lazy attribute access', times)
+    less_equal(len(models), 3)
@@ -0,0 +1,102 @@
+import uuid
+
+import pytest
+from pytest_check import equal, greater
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.autotests import capture_devices, free_devices
+from devicehub_client.api.devices import get_devices
+from devicehub_client.cache import ResponseCache
+from devicehub_client.standin import STANDIN_URL
+
+REQUESTS = 20
+CONCURRENCY = 10
+CAPTURE_CYCLES = 50
+PROJECTION = 'serial,present,status,ready,group.id,owner.email'
+
+
+def scale_of(standin):
+    return f'standin{len(standin.farm.devices)}'
+
+
+def standin_client(standin, **kwargs):
+    return AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': standin.transport()}, **kwargs)
+
+
+def check_ok(response, status_code=200):
+    assert response.status_code == status_code, response.content
+    return response
+
+
+@pytest.mark.bench
+class TestStandInBench:
+    """Client side throughput against the in-process API stand-in, once per fleet size (--bench-scales)
+
+    Listings larger than 500 devices are only benchmarked with --run-bench.
+    """
+
+    @pytest.mark.asyncio
+    async def test_get_devices(self, standin, measure_async, bench_results):
+        client = standin_client(standin)
+
+        async def request(_):
+            response = check_ok(await get_devices.asyncio_detailed(client=client))
+            assert len(response.parsed.devices) == len(standin.farm.devices)
+
+        bench_results.add(scale_of(standin), await measure_async('stand-in GET /devices', request, REQUESTS,
+                                                                 CONCURRENCY))
+
+    @pytest.mark.asyncio
+    async def test_get_devices_with_fields(self, standin, measure_async, bench_results):
+        client = standin_client(standin)
+
+        async def request(_):
+            check_ok(await get_devices.asyncio_detailed(client=client, fields=PROJECTION))
+
+        bench_results.add(scale_of(standin), await measure_async('stand-in GET /devices?fields', request, REQUESTS,
+                                                                 CONCURRENCY))
+
+    @pytest.mark.asyncio
+    async def test_get_devices_revalidated(self, standin, measure_async, bench_results):
+        client = standin_client(standin, response_cache=ResponseCache())
+        check_ok(await get_devices.asyncio_detailed(client=client))
+
+        async def request(_):
+            check_ok(await get_devices.asyncio_detailed(client=client), 304)
+
+        bench_results.add(scale_of(standin), await measure_async('stand-in GET /devices 304', request, REQUESTS,
+                                                                 CONCURRENCY))
+
+    @pytest.mark.asyncio
+    async def test_connection_pooling(self, standin, measure_async, bench_results):
+        with standin.serve() as base_url:
+            async with AuthenticatedClient(base_url=base_url, token='t') as shared:
+                async def pooled(_):
+                    check_ok(await get_devices.asyncio_detailed(client=shared, fields='serial'))
+
+                reused = await measure_async('stand-in pooled connections', pooled, REQUESTS, CONCURRENCY)
+
+            async def unpooled(_):
+                async with AuthenticatedClient(base_url=base_url, token='t') as client:
+                    check_ok(await get_devices.asyncio_detailed(client=client, fields='serial'))
+
+            fresh = await measure_async('stand-in connection per request', unpooled, REQUESTS, CONCURRENCY)
+
+        bench_results.add(scale_of(standin), reused)
+        bench_results.add(scale_of(standin), fresh)
+
+    @pytest.mark.asyncio
+    async def test_autotests_capture_free(self, standin, measure_async, bench_results):
+        client = standin_client(standin)
+        free = len(standin.farm.free_devices())
+
+        async def cycle(_):
+            response = check_ok(await capture_devices.asyncio_detailed(
+                client=client, amount=1, timeout=60, run=f'bench-{uuid.uuid4().hex}'
+            ))
+            check_ok(await free_devices.asyncio_detailed(client=client, group=response.parsed.group.id))
+
+        summary = await measure_async('stand-in autotests capture+free', cycle, CAPTURE_CYCLES, 1)
+        bench_results.add(scale_of(standin), summary)
+        equal(len(standin.farm.free_devices()), free)
+        greater(summary.rps, 0)
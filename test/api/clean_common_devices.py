@@ -1,51 +1,74 @@
 import asyncio
 import os
-import uuid
-from time import sleep
+import statistics
+from time import perf_counter
 
 import pytest
-import websockets
 from pytest_check import is_not_none, equal
 
 from devicehub_client.api.devices import get_devices
 from devicehub_client.api.user import get_access_token
+from devicehub_client.wire import TransactionTimeout, WireClient, socket_url
 
+# devices released at the same time over one socket
+CONCURRENCY = 16
+TX_TIMEOUT = 5
+KICK_ATTEMPTS = 3
+BACKOFF_BASE = 0.5
 
-def get_bool_res(response):
-    first_pos = response.find('success') + 9
-    last_pos = response.find(',', first_pos)
-    return True if response[first_pos:last_pos] == 'true' else False
 
-async def get_result_from_ws(ws, tx_id):
+async def send_tx(serial, step, tx):
     try:
-        async with asyncio.timeout(5):
-            async for resp in ws:
-                if str(tx_id) in resp:
-                    print(resp)
-                    res = get_bool_res(resp)
-                    return res
-            return False
-    except asyncio.TimeoutError:
-        print(f'Timeout occurred while waiting for the response with tx_uuid: {tx_id}\n{"-" * 50}')
-        return None
+        result = await tx
+    except TransactionTimeout as e:
+        print(f'Device:{serial} - {step} - timeout while waiting for the response on {e.channel}')
+        return False
+    print(f'Device:{serial} - {step} - {"success" if result.success else "failure"} ({result.channel})')
+    return result.success
+
+
+async def release_device(wire, semaphore, serial, channel):
+    """Kick the device, if that fails take it with an invite and kick it again with exponential backoff"""
+    async with semaphore:
+        start = perf_counter()
+        released = await send_tx(serial, '#1 group kick', wire.group_kick(channel, serial, timeout=TX_TIMEOUT))
+        if not released and await send_tx(serial, '#2 group invite', wire.group_invite(channel, serial, timeout=TX_TIMEOUT)):
+            for attempt in range(KICK_ATTEMPTS):
+                await asyncio.sleep(BACKOFF_BASE * 2 ** attempt)
+                step = f'#3 group kick (attempt {attempt + 1}/{KICK_ATTEMPTS})'
+                released = await send_tx(serial, step, wire.group_kick(channel, serial, timeout=TX_TIMEOUT))
+                if released:
+                    break
+        latency = perf_counter() - start
+        print(f'Device:{serial} - {"was released" if released else "was NOT released"} in {latency:.2f}s\n{"-"*50}')
+        return released, latency
+
+
+def print_summary(results, elapsed):
+    latencies = sorted(latency for _, latency in results)
+    released = sum(ok for ok, _ in results)
+    print(f'\n{"="*50}\n{{{released}(from {len(results)})}} QA Common Devices was released in {elapsed:.2f}s')
+    if latencies:
+        p90 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.9))]
+        print(f'Throughput: {len(results) / elapsed:.2f} devices/s (concurrency {CONCURRENCY})')
+        print(f'Latency per device: p50 {statistics.median(latencies):.2f}s, p90 {p90:.2f}s, max {latencies[-1]:.2f}s')
+    print('=' * 50)
+    return released
+
 
 @pytest.mark.asyncio
 @pytest.mark.skipif(
     os.environ.get("RUN_CLEAN_TEST") != "true",
     reason="It's service test for clean QA common device on production stand. Run only manually."
 )
-async def test_clean_common_devices(api_client, successful_response_check, base_ws_uri, token_from_params, admin_user):
-    ## Firstly get list of QA common devices through api
-    response = get_devices.sync_detailed(client=api_client)
+async def test_clean_common_devices(api_client, successful_response_check, base_url, token_from_params, admin_user):
+    ## Firstly get list of QA common devices through api, filtered by the server
+    response = get_devices.sync_detailed(client=api_client, fields='serial,channel',
+                                         owner_name=['Core QA', admin_user.name], group_name=['Common'], status=[3])
     successful_response_check(response, description='Devices Information')
     is_not_none(response.parsed.devices)
-    qa_common_devices = []
-    for device in response.parsed.devices:
-        if (device.owner and (device.owner.name == 'Core QA' or device.owner.name == admin_user.name) and
-                device.group.name == 'Common' and device.status == 3):
-            qa_common_devices.append((device.serial, device.channel))
+    qa_common_devices = [(device.serial, device.channel) for device in response.parsed.devices]
     count_qa_common_devices = len(qa_common_devices)
-    released_devices = 0
     print(f'\n{"="*50}\nFind {{{count_qa_common_devices}}} QA Common Devices.\n{"="*50}\n')
 
     if len(token_from_params) > 100:
@@ -55,41 +78,13 @@ async def test_clean_common_devices(api_client, successful_response_check, base_
         successful_response_check(response, description='Access Token Information')
         jwt = response.parsed.token.jwt
 
-    ## Then try release devices through websocket
-    async with websockets.connect(base_ws_uri) as websocket:
-        message = f'40{{"token":"{jwt}"}}'
-        await websocket.send(message)
-
-        for serial, channel in qa_common_devices:
-            tx_uuid = uuid.uuid4()
-            print(f'Device:{serial} - #1 - just send group kick(uuid:{tx_uuid})')
-            sleep(1)
-
-            await websocket.send(f'42["group.kick","{channel}","tx.{tx_uuid}",{{"requirements":{{"serial":{{"value":"{serial}","match":"exact"}}}}}}]')
-            result = await get_result_from_ws(websocket, tx_uuid)
-
-            if result:
-                released_devices += 1
-                print(f'Device:{serial} - #2 - was released\n{"-"*50}')
-                continue
-            else:
-                tx_uuid = uuid.uuid4()
-                print(f'Device:{serial} - #2 - try invite de kick device(uuid:{tx_uuid})')
-                await websocket.send(f'42["group.invite","{channel}","tx.{tx_uuid}",{{"requirements":{{"serial":{{"value":"{serial}","match":"exact"}}}},"timeout": 900000}}]')
-                result = await get_result_from_ws(websocket, tx_uuid)
-
-                if result:
-                    tx_uuid = uuid.uuid4()
-                    print(f'Device:{serial} - #3 - added to channel:{channel}. Now try to kick(3 attempts).')
-                    ## Make three attempt to kick device, it should be enough.
-                    for _ in range(3):
-                        await websocket.send(f'42["group.kick","{channel}","tx.{tx_uuid}",{{"requirements":{{"serial":{{"value":"{serial}","match":"exact"}}}}}}]')
-                        result = await get_result_from_ws(websocket, tx_uuid)
-
-                        if result:
-                            released_devices += 1
-                            print(f'Device:{serial} - #4 - was released\n{"-"*50}')
-                            break
+    ## Then release devices through websocket, several at a time
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+    start = perf_counter()
+    async with WireClient(socket_url(base_url), jwt, timeout=TX_TIMEOUT) as wire:
+        results = await asyncio.gather(*(
+            release_device(wire, semaphore, serial, channel) for serial, channel in qa_common_devices
+        ))
+    released_devices = print_summary(results, perf_counter() - start)
 
-        print(f'\n{"="*50}\n{{{released_devices}(from {count_qa_common_devices})}} QA Common Devices was released.\n{"="*50}')
-        equal(released_devices, count_qa_common_devices, 'Not all QA Common Devices were released.')
\ No newline at end of file
+    equal(released_devices, count_qa_common_devices, 'Not all QA Common Devices were released.')
@@ -0,0 +1,103 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from pytest_check import equal, is_false, is_true, less_equal
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.bulk import BulkExecutor
+
+
+def bulk_client(handler):
+    return AuthenticatedClient(
+        base_url='http://devicehub.local/api/v1',
+        token='token',
+        httpx_args={'transport': httpx.MockTransport(handler)},
+    )
+
+
+@pytest.mark.asyncio
+async def test_bulk_sends_one_request_per_group():
+    in_flight = {'all': 0, 'max': 0, 'group-1': 0, 'group-1-max': 0}
+    bodies = []
+
+    async def handler(request):
+        group = request.url.path.split('/')[-2]
+        in_flight['all'] += 1
+        in_flight[group] = in_flight.get(group, 0) + 1
+        in_flight['max'] = max(in_flight['max'], in_flight['all'])
+        in_flight[f'{group}-max'] = max(in_flight.get(f'{group}-max', 0), in_flight[group])
+        bodies.append(json.loads(request.content)['serials'].split(','))
+        await asyncio.sleep(0.01)
+        in_flight['all'] -= 1
+        in_flight[group] -= 1
+        return httpx.Response(200, json={'success': True, 'description': 'Added (group devices)', 'group': {}})
+
+    executor = BulkExecutor(bulk_client(handler), chunk_size=10, concurrency=3)
+    serials = [f'fake-{i}' for i in range(45)]
+    reports = await asyncio.gather(
+        executor.add_group_devices('group-1', serials + serials[:5]),
+        executor.add_group_devices('group-1', serials[:5]),
+        *(executor.add_group_devices(f'group-{i}', serials[:10]) for i in range(2, 6)),
+    )
+
+    is_true(reports[0].ok)
+    equal(list(reports[0].results), serials)
+    equal(sorted(len(body) for body in bodies), [5] + [10] * 4 + [45])
+    equal(in_flight['group-1-max'], 1)
+    less_equal(in_flight['max'], 3)
+    is_true(in_flight['max'] > 1)
+
+
+@pytest.mark.asyncio
+async def test_bulk_reports_failures_per_item():
+    async def handler(request):
+        serials = json.loads(request.content)['serials'].split(',')
+        if '/groups/' in request.url.path:
+            return httpx.Response(409, json={
+                'success': False,
+                'description': 'Conflicts Information',
+                'conflicts': [{'devices': ['fake-1'], 'group': 'other'}],
+            })
+        if 'fake-2' in serials:
+            raise httpx.ConnectError('connection refused')
+        if 'fake-0' in serials:
+            return httpx.Response(404, json={'success': False, 'description': 'Not Found (devices)'})
+        return httpx.Response(200, json={'success': True, 'description': 'Deleted (devices)'})
+
+    executor = BulkExecutor(bulk_client(handler), chunk_size=2)
+    report = await executor.add_group_devices('group-1', ['fake-0', 'fake-1', 'fake-2'])
+
+    equal(report.failed, ['fake-0', 'fake-1', 'fake-2'])
+    equal(report.results['fake-1'].status_code, 409)
+    equal(report.results['fake-1'].description, 'Conflicts Information (conflicting booking)')
+    equal(report.results['fake-0'].description, 'Conflicts Information')
+
+    report = await executor.delete_devices(['fake-0', 'fake-1', 'fake-2', 'fake-3', 'fake-4'])
+
+    is_false(report.ok)
+    equal(report.succeeded, ['fake-4'])
+    equal(report.failed, ['fake-0', 'fake-1', 'fake-2', 'fake-3'])
+    equal(report.results['fake-1'].status_code, 404)
+    equal(report.results['fake-1'].description, 'Not Found (devices)')
+    equal(report.results['fake-3'].status_code, None)
+
+    empty = await executor.delete_devices([])
+    equal(empty.results, {})
+    empty = await executor.add_group_devices('group-1', [])
+    equal(empty.results, {})
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_groups():
+    bodies = []
+
+    def handler(request):
+        bodies.append((request.method, request.url.path, json.loads(request.content)['ids']))
+        return httpx.Response(200, json={'success': True, 'description': 'Deleted (groups)'})
+
+    report = await BulkExecutor(bulk_client(handler), chunk_size=2).delete_groups(['g1', 'g2', 'g3', 'g1'])
+
+    is_true(report.ok)
+    equal(sorted(bodies), [('DELETE', '/api/v1/groups', 'g1,g2'), ('DELETE', '/api/v1/groups', 'g3')])
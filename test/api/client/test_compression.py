@@ -0,0 +1,51 @@
+import httpx
+import pytest
+from pytest_check import equal, greater, is_in, is_true, less
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.devices import get_devices
+from devicehub_client.compression import accept_encoding, available_encodings
+from devicehub_client.standin import ENCODERS, STANDIN_URL, FakeFarm, StandIn
+
+
+def test_accept_encoding():
+    available = available_encodings()
+    is_in('gzip', available)
+    equal(accept_encoding(True).split(', ')[0], available[0])
+    equal(accept_encoding(False), 'identity')
+    equal(accept_encoding(['gzip', 'deflate', 'gzip']), 'gzip, deflate;q=0.9')
+    with pytest.raises(ValueError):
+        accept_encoding(['lz4'])
+
+
+def test_client_advertises_encodings():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers['accept-encoding'])
+        return httpx.Response(200, json={'success': True, 'description': 'Devices Information', 'devices': []})
+
+    transport = httpx.MockTransport(handler)
+    get_devices.sync(client=AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': transport}))
+    get_devices.sync(client=AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': transport},
+                                                compression=['deflate']))
+    get_devices.sync(client=AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': transport},
+                                                compression=False))
+    equal(seen, [accept_encoding(), 'deflate', 'identity'])
+
+
+@pytest.mark.parametrize('encoding', list(ENCODERS))
+def test_compressed_responses_are_decoded(encoding):
+    standin = StandIn(FakeFarm(devices=50, seed=7), compression_threshold=1024)
+    timings = []
+    client = AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': standin.transport()},
+                                 compression=[encoding], on_response=timings.append)
+
+    response = get_devices.sync_detailed(client=client)
+    equal(response.headers['content-encoding'], encoding)
+    equal(len(response.parsed.devices), 50)
+    less(timings[0].received * 5, len(response.content))
+
+    small = get_devices.sync_detailed(client=client, fields='serial', limit=1)
+    is_true('content-encoding' not in small.headers)
+    greater(timings[1].received, 0)
@@ -0,0 +1,90 @@
+import json
+
+import httpx
+import pytest
+from pytest_check import equal, is_, is_instance
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.devices import get_devices
+from devicehub_client.api.user import get_user
+from devicehub_client.decoders import get_decoder, stdlib_decoder
+from devicehub_client.models import UserResponse
+
+DEVICES_PAYLOAD = {
+    'success': True,
+    'description': 'Devices Information',
+    'devices': [{
+        '_id': '1',
+        'serial': 'fake-1',
+        'status': 3,
+        'ram': 0,
+        'sdk': '25',
+        'logs_enabled': False,
+        'openGLESVersion': '3.1',
+        'statusChangedAt': '2025-01-01T10:00:00.000Z',
+        'group': {'id': 'common', 'name': 'Common', 'class': 'bookable', 'owner': {'name': 'administrator'}},
+        'display': {'width': 1080},
+    }],
+}
+
+
+@pytest.mark.parametrize('backend', ['auto', 'json', 'orjson', 'msgspec'])
+def test_client_decodes_with_configured_backend(backend):
+    if backend in ('orjson', 'msgspec'):
+        pytest.importorskip(backend)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, json=DEVICES_PAYLOAD))
+    client = AuthenticatedClient(
+        base_url='http://devicehub.local/api/v1',
+        token='token',
+        json_decoder=get_decoder(backend),
+        httpx_args={'transport': transport},
+    )
+
+    devices = get_devices.sync(client=client).devices
+
+    equal(devices[0].serial, 'fake-1')
+    equal(devices[0].group.name, 'Common')
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        get_decoder('yaml')
+    is_(get_decoder('json'), stdlib_decoder)
+
+
+def test_struct_decode():
+    structs = pytest.importorskip('devicehub_client.structs')
+
+    response = structs.decode(structs.DeviceListResponseStruct, json.dumps(DEVICES_PAYLOAD).encode())
+
+    device = response.devices[0]
+    is_instance(device, structs.DeviceStruct)
+    equal(device.field_id, '1')
+    equal(device.open_gles_version, '3.1')
+    is_(device.logs_enabled, False)
+    equal(device.group.class_, 'bookable')
+    equal(device.group.owner.name, 'administrator')
+    equal(device.status_changed_at.year, 2025)
+    equal(device.display, {'width': 1080})
+
+
+def test_client_parses_listings_into_structs():
+    structs = pytest.importorskip('devicehub_client.structs')
+    decoded = []
+
+    def handler(request):
+        if request.url.path.endswith('/user'):
+            return httpx.Response(200, json={'success': True, 'description': 'User Information', 'user': {}})
+        return httpx.Response(200, json=DEVICES_PAYLOAD)
+
+    client = AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='token', structs=True,
+                                 json_decoder=lambda content: decoded.append(content) or json.loads(content),
+                                 httpx_args={'transport': httpx.MockTransport(handler)})
+
+    response = get_devices.sync(client=client)
+    is_instance(response, structs.DeviceListResponseStruct)
+    equal(response.devices[0].group.class_, 'bookable')
+    equal(decoded, [])
+
+    is_instance(get_user.sync(client=client), UserResponse)
+    equal(len(decoded), 1)
@@ -0,0 +1,94 @@
+import httpx
+from pytest_check import equal, is_false, is_in, is_none, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.mirror import DeviceMirror
+
+
+def device_dict(serial, abi='arm64-v8a', owner=None):
+    return {
+        'serial': serial,
+        'present': True,
+        'ready': True,
+        'abi': abi,
+        'owner': owner,
+        'battery': {'level': 50},
+        'group': {'id': 'common', 'name': 'Common', 'class': 'bookable'},
+    }
+
+
+def change_page(cursor, changes, has_more=False):
+    return {'success': True, 'description': 'Device Changes', 'cursor': cursor, 'hasMore': has_more, 'changes': changes}
+
+
+def change(serial, action, device):
+    return {'serial': serial, 'action': action, 'changedAt': '2025-01-01T10:00:00.000Z', 'device': device}
+
+
+def fake_server(pages, gone=()):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.url.path.endswith('/devices'):
+            return httpx.Response(200, json={
+                'success': True,
+                'description': 'Devices Information',
+                'devices': [device_dict('fake-1'), device_dict('fake-2', abi='x86'), device_dict('fake-3')],
+            })
+        cursor = request.url.params.get('cursor')
+        if cursor is None:
+            return httpx.Response(200, json=change_page('1.0', []))
+        if cursor in gone:
+            return httpx.Response(410, json={'success': False, 'description': 'Gone'})
+        return httpx.Response(200, json=pages[cursor])
+
+    client = AuthenticatedClient(
+        base_url='http://devicehub.local/api/v1',
+        token='token',
+        httpx_args={'transport': httpx.MockTransport(handler)},
+    )
+    return client, requests
+
+
+def test_mirror_applies_changes_and_updates_indexes():
+    owner = {'email': 'user@example.com', 'name': 'user', 'group': 'common'}
+    client, requests = fake_server({
+        '1.0': change_page('2.1', [
+            change('fake-1', 'updated', {'serial': 'fake-1', 'owner': owner, 'group': {'id': 'common', 'name': 'Renamed'}}),
+            change('fake-3', 'deleted', {'serial': 'fake-3'}),
+        ], has_more=True),
+        '2.1': change_page('2.2', [change('fake-4', 'created', device_dict('fake-4', abi='x86'))]),
+    })
+    mirror = DeviceMirror(client)
+    mirror.reload()
+
+    equal(mirror.cursor, '1.0')
+    equal({d.serial for d in mirror.find(free=True, abi='arm64-v8a')}, {'fake-1', 'fake-3'})
+
+    equal(mirror.refresh(), 3)
+    equal(mirror.cursor, '2.2')
+    equal(len(mirror), 3)
+    is_false('fake-3' in mirror)
+    equal(mirror.find(free=True, abi='arm64-v8a'), [])
+    equal({d.serial for d in mirror.find(abi='x86')}, {'fake-2', 'fake-4'})
+    equal([d.serial for d in mirror.find(owner_email='user@example.com')], ['fake-1'])
+
+    device = mirror.get('fake-1')
+    equal(device.group.name, 'Renamed')
+    equal(device.group.class_, 'bookable')
+    equal(device.battery.level, 50)
+    is_none(mirror.get('fake-3'))
+    equal(sum(r.url.path.endswith('/devices') for r in requests), 1)
+
+
+def test_mirror_reloads_when_cursor_expired():
+    client, requests = fake_server({}, gone={'1.0'})
+    mirror = DeviceMirror(client)
+    mirror.reload()
+
+    equal(mirror.refresh(), -1)
+    equal(mirror.cursor, '1.0')
+    equal(sum(r.url.path.endswith('/devices') for r in requests), 2)
+    is_in('fake-2', mirror)
+    is_true(mirror.find(present=True))
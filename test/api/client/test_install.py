@@ -0,0 +1,136 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from pytest_check import equal, is_false, is_in, is_true, less_equal
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.install import async_upload_apk, install_apk, storage_url, upload_and_install, upload_apk
+
+BASE_URL = 'http://devicehub.local/api/v1'
+
+
+class FakeStorage:
+    """Storage upload and autotests install endpoints"""
+
+    def __init__(self):
+        self.uploads = []
+        self.installs = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def upload(self, request, body):
+        self.uploads.append((request, body))
+        resource = {'date': '2026-10-18T00:00:00Z', 'plugin': 'apk', 'id': 'id-1', 'name': 'md5name',
+                    'href': '/s/apk/id-1/md5name'}
+        return httpx.Response(201, json={'success': True, 'resources': {'file': resource}})
+
+    def install(self, request):
+        serial = request.url.path.rsplit('/', 1)[-1]
+        self.installs.append((serial, json.loads(request.content)))
+        if serial == 'offline':
+            return httpx.Response(504, json={'success': False, 'description': 'Device is not responding'})
+        return httpx.Response(200, json={'success': True, 'description': 'Installed successfully'})
+
+    def sync_handler(self, request):
+        if request.url.path == '/s/upload/apk':
+            return self.upload(request, b''.join(request.stream))
+        return self.install(request)
+
+    async def async_handler(self, request):
+        if request.url.path == '/s/upload/apk':
+            return self.upload(request, b''.join([chunk async for chunk in request.stream]))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.install(request)
+
+
+@pytest.fixture()
+def apk(tmp_path):
+    path = tmp_path / 'app-release.apk'
+    path.write_bytes(bytes(range(256)) * 1000)
+    return path
+
+
+def storage_client(handler):
+    return AuthenticatedClient(base_url=BASE_URL, token='token', httpx_args={'transport': httpx.MockTransport(handler)})
+
+
+def test_upload_streams_multipart_from_disk(apk):
+    storage = FakeStorage()
+    progress = []
+    stored = upload_apk(storage_client(storage.sync_handler), apk, progress=lambda *sent: progress.append(sent),
+                        chunk_size=64 * 1024)
+
+    equal(stored.href, '/s/apk/id-1/md5name')
+    request, body = storage.uploads[0]
+    equal(str(request.url), 'http://devicehub.local/s/upload/apk')
+    equal(request.headers['authorization'], 'Bearer token')
+    equal(int(request.headers['content-length']), len(body))
+    is_true(request.headers['content-type'].startswith('multipart/form-data; boundary='))
+    is_in(b'name="file"; filename="app-release.apk"', body)
+    is_in(apk.read_bytes(), body)
+    equal(progress, [(65536, 256000), (131072, 256000), (196608, 256000), (256000, 256000)])
+
+
+@pytest.mark.asyncio
+async def test_upload_once_and_install_concurrently(apk):
+    storage = FakeStorage()
+    installed = []
+    serials = [f'fake-{i}' for i in range(10)] + ['offline', 'fake-0']
+    stored, report = await upload_and_install(storage_client(storage.async_handler), apk, serials,
+                                              install_flags=['-r', '-g'], concurrency=4,
+                                              on_installed=installed.append)
+
+    equal(len(storage.uploads), 1)
+    is_in(apk.read_bytes(), storage.uploads[0][1])
+    is_false(report.ok)
+    equal(report.failed, ['offline'])
+    equal(report.results['offline'].status_code, 504)
+    equal(report.results['offline'].description, 'Device is not responding')
+    equal(len(storage.installs), 11)
+    equal(storage.installs[0][1], {'url': stored.href, 'installFlags': ['-r', '-g']})
+    equal(sorted(result.item for result in installed), sorted(set(serials)))
+    less_equal(storage.max_in_flight, 4)
+    is_true(storage.max_in_flight > 1)
+
+
+@pytest.mark.asyncio
+async def test_upload_errors_and_storage_url(apk):
+    client = storage_client(lambda request: httpx.Response(500, json={'success': False, 'error': 'ServerError'}))
+    equal(storage_url(client), 'http://devicehub.local')
+    with pytest.raises(Exception, match='500'):
+        await async_upload_apk(client, apk)
+
+    report = await install_apk(client, '/s/apk/id-1/md5name', ['fake-0'])
+    equal(report.results['fake-0'].status_code, 500)
+
+
+class Resend(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Sends every request body twice like a retrying transport, httpx.MockTransport reads it once up front"""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def handle_request(self, request):
+        equal(b''.join(request.stream), b''.join(request.stream))
+        return self.storage.upload(request, b''.join(request.stream))
+
+    async def handle_async_request(self, request):
+        first = b''.join([chunk async for chunk in request.stream])
+        equal(b''.join([chunk async for chunk in request.stream]), first)
+        return self.storage.upload(request, first)
+
+
+@pytest.mark.asyncio
+async def test_upload_body_can_be_sent_again(apk):
+    storage = FakeStorage()
+    client = AuthenticatedClient(base_url=BASE_URL, token='token', httpx_args={'transport': Resend(storage)})
+    upload_apk(client, apk)
+    await async_upload_apk(client, apk)
+    equal(len(storage.uploads), 2)
+    is_in(apk.read_bytes(), storage.uploads[0][1])
+    is_in(apk.read_bytes(), storage.uploads[1][1])
@@ -0,0 +1,139 @@
+import pkgutil
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+from pytest_check import equal, greater, greater_equal, is_true, less
+
+from devicehub_client import AuthenticatedClient, api
+from devicehub_client.api.devices import get_device_by_serial, get_device_changes
+from devicehub_client.api.users import get_users
+from devicehub_client.instrumentation import LatencyHistogram, LatencyRecorder
+from devicehub_client.operations import OPERATIONS, operation_id
+
+USERS = b'{"success": true, "description": "Users Information", "users": []}'
+DELAY = 0.05
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        time.sleep(DELAY)
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(USERS)))
+        self.end_headers()
+        self.wfile.write(USERS)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def slow_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), SlowHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://127.0.0.1:{server.server_port}/api/v1'
+    server.shutdown()
+    server.server_close()
+
+
+def test_operations_cover_the_endpoint_modules():
+    # the tables are generated with the endpoint modules, `just check-schema` compares both with the spec
+    for tag in pkgutil.iter_modules(api.__path__):
+        package = getattr(api, tag.name)
+        modules = {module.name for module in pkgutil.iter_modules(package.__path__)}
+        equal({re.sub(r'(?<!^)(?=[A-Z])', '_', name).lower() for name in package.OPERATIONS}, modules, tag.name)
+    equal(OPERATIONS['getDeviceChanges'], ('GET', '/devices/changes'))
+
+
+@pytest.mark.parametrize('method, path, expected', [
+    ('GET', '/api/v1/devices/changes', 'getDeviceChanges'),
+    ('GET', '/api/v1/devices/R58M', 'getDeviceBySerial'),
+    ('put', '/api/v1/groups/5f1/devices/R58M', 'addGroupDevice'),
+    ('GET', '/devices', 'getDevices'),
+    ('GET', '/api/v1/unknown', None),
+])
+def test_operation_id(method, path, expected):
+    equal(operation_id(method, path), expected)
+
+
+def test_histogram_percentiles_within_precision():
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-4, 1.5) for _ in range(20000)]
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+    values.sort()
+    for percent in (50, 90, 99):
+        exact = values[int(len(values) * percent / 100) - 1]
+        less(abs(histogram.percentile(percent) - exact) / exact, 0.01)
+    equal(histogram.count, len(values))
+    equal(histogram.max, values[-1])
+
+
+def test_hooks_split_network_and_parse(slow_server):
+    events = []
+    first = []
+    recorder = LatencyRecorder()
+
+    def on_request(timings):
+        events.append(('request', timings.operation_id))
+        first.append(timings)
+
+    def on_response(timings):
+        events.append(('response', timings.operation_id))
+        recorder.record_response(timings)
+
+    def on_parse_done(timings):
+        events.append(('parse', timings.operation_id))
+        recorder.record_parse(timings)
+
+    client = AuthenticatedClient(base_url=slow_server, token='t',
+                                 on_request=on_request, on_response=on_response, on_parse_done=on_parse_done)
+    get_users.sync_detailed(client=client)
+    get_users.sync_detailed(client=client)
+    client.close()
+
+    equal(events, [('request', 'getUsers'), ('response', 'getUsers'), ('parse', 'getUsers')] * 2)
+    greater(first[0].connect, 0)
+    equal(first[1].connect, 0)
+    for timings in first:
+        equal(timings.status_code, 200)
+        greater_equal(timings.ttfb, DELAY)
+        greater_equal(timings.download, 0)
+        is_true(timings.parse is not None and timings.parse > 0)
+
+    summary = recorder.summary()['getUsers']
+    equal(list(summary), ['network', 'connect', 'ttfb', 'download', 'parse'])
+    equal(summary['network']['count'], 2)
+    greater_equal(summary['ttfb']['p50'], DELAY)
+    is_true('getUsers' in recorder.report())
+
+
+@pytest.mark.asyncio
+async def test_async_hooks_with_unparsed_responses():
+    recorder = LatencyRecorder()
+    transport = httpx.MockTransport(lambda request: httpx.Response(404, json={'success': False}))
+    client = AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='t',
+                                 httpx_args={'transport': transport}, **recorder.hooks())
+    await get_device_by_serial.asyncio_detailed('R58M', client=client)
+    await get_device_changes.asyncio_detailed(client=client)
+
+    summary = recorder.summary()
+    equal(sorted(summary), ['getDeviceBySerial', 'getDeviceChanges'])
+    equal(summary['getDeviceBySerial']['network']['count'], 1)
+
+
+def test_clients_without_hooks_are_not_instrumented():
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=USERS))
+    client = AuthenticatedClient(base_url='http://devicehub.local', token='t', httpx_args={'transport': transport})
+    response = get_users.sync_detailed(client=client)
+    equal(response.parsed.users, [])
+    is_true(client.get_httpx_client()._transport is transport)
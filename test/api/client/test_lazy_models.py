@@ -0,0 +1,43 @@
+import datetime
+
+from pytest_check import equal, is_instance, is_true
+
+from devicehub_client.lazy import LazyDevice, LazyList
+from devicehub_client.models import Device, DeviceListResponse
+
+
+def device_dict(i):
+    return {
+        'serial': f'fake-{i}',
+        'present': True,
+        'status': 3,
+        'presenceChangedAt': '2025-01-01T10:00:00.000Z',
+        'createdAt': '2025-01-01T09:00:00.000Z',
+        'group': {'id': 'common', 'name': 'Common'},
+    }
+
+
+def test_lazy_device_list_materializes_on_access():
+    payload = {'success': True, 'description': 'Devices Information', 'devices': [device_dict(i) for i in range(100)]}
+    response = DeviceListResponse.from_dict(payload, lazy=True)
+
+    is_instance(response.devices, LazyList)
+    equal(len(response.devices), 100)
+    equal(response.devices.materialized, 0)
+    equal(response.devices.raw(3)['serial'], 'fake-3')
+
+    device = response.devices[42]
+    is_instance(device, Device)
+    equal(device.serial, 'fake-42')
+    equal(response.devices.materialized, 1)
+    is_true(response.devices[42] is device)
+    equal(response.devices, DeviceListResponse.from_dict(payload).devices)
+
+
+def test_lazy_device_parses_timestamps_on_first_read():
+    device = LazyDevice.from_dict(device_dict(0))
+
+    equal(Device.__dict__['created_at'].__get__(device), '2025-01-01T09:00:00.000Z')
+    equal(device.created_at, datetime.datetime(2025, 1, 1, 9, tzinfo=datetime.timezone.utc))
+    is_instance(Device.__dict__['created_at'].__get__(device), datetime.datetime)
+    equal(device.to_dict(), Device.from_dict(device_dict(0)).to_dict())
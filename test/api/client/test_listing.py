@@ -0,0 +1,95 @@
+import asyncio
+
+import httpx
+import pytest
+from pytest_check import equal, is_true
+
+from devicehub_client import AuthenticatedClient, errors
+from devicehub_client.api.devices import get_devices
+from devicehub_client.api.groups import get_group_devices
+from devicehub_client.listing import aiter_devices, iter_devices
+from devicehub_client.models import Device, GetDevicesTarget
+from devicehub_client.standin import STANDIN_URL, FakeFarm, StandIn
+
+
+def standin_client(standin, **kwargs):
+    return AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': standin.transport()}, **kwargs)
+
+
+def test_iter_devices_streams_ndjson():
+    standin = StandIn(FakeFarm(devices=30, seed=3))
+    client = standin_client(standin)
+
+    devices = list(iter_devices(client))
+    equal(len(devices), 30)
+    is_true(all(isinstance(device, Device) for device in devices))
+    equal([device.serial for device in devices], sorted(standin.farm.devices))
+
+    records = list(iter_devices(client, target=GetDevicesTarget.ORIGIN, fields='serial,group.id'))
+    equal(records[0].serial, devices[0].serial)
+    equal(records[0].group_id, devices[0].group.id)
+
+
+def test_aiter_devices_streams_ndjson():
+    standin = StandIn(FakeFarm(devices=12, seed=4))
+    client = standin_client(standin)
+
+    async def collect():
+        return [device.serial async for device in aiter_devices(client, fields='serial')]
+
+    equal(asyncio.run(collect()), sorted(standin.farm.devices))
+
+
+def test_iter_devices_pages_with_cursor():
+    standin = StandIn(FakeFarm(devices=25, seed=5))
+    client = standin_client(standin)
+
+    serials = [device.serial for device in iter_devices(client, page_size=10)]
+    equal(serials, sorted(standin.farm.devices))
+    equal(standin.requests['getDevices'], 3)
+
+    async def collect():
+        return [device.serial async for device in aiter_devices(client, page_size=25)]
+
+    equal(asyncio.run(collect()), serials)
+    equal(standin.requests['getDevices'], 4)
+
+
+def test_iter_devices_falls_back_to_json_and_raises():
+    documents = {'status': 200}
+
+    def handler(request):
+        equal(request.headers['accept'].split(',')[0], 'application/x-ndjson')
+        if documents['status'] != 200:
+            return httpx.Response(documents['status'], json={'success': False, 'description': 'Unauthorized'})
+        return httpx.Response(200, json={'success': True, 'description': 'Devices Information',
+                                         'devices': [{'serial': 'fake-1'}, {'serial': 'fake-2'}]})
+
+    client = AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': httpx.MockTransport(handler)})
+    equal([record.serial for record in iter_devices(client, fields='serial')], ['fake-1', 'fake-2'])
+
+    documents['status'] = 401
+    with pytest.raises(errors.UnexpectedStatus):
+        list(iter_devices(client))
+
+
+def test_device_filters():
+    standin = StandIn(FakeFarm(devices=40, seed=6))
+    client = standin_client(standin)
+    devices = list(standin.farm.devices.values())
+    sdks = sorted({device['sdk'] for device in devices})[:2]
+    expected = sorted(device['serial'] for device in devices if device['sdk'] in sdks)
+
+    response = get_devices.sync(client=client, sdk=sdks, status=[3], present=True, group_name=['Common'])
+    equal(sorted(device.serial for device in response.devices), expected)
+    equal(get_devices.sync(client=client, using=True).devices, [])
+    equal(get_devices.sync(client=client, present=False).devices, [])
+
+    equal([device.serial for device in iter_devices(client, fields='serial', sdk=sdks)], expected)
+    equal([device.serial for device in iter_devices(client, page_size=3, sdk=sdks)], expected)
+
+    group = standin.farm.create_group('filtered')
+    standin.farm.move(expected, group)
+    response = get_group_devices.sync(group['id'], client=client, sdk=sdks[:1], group_id=[group['id']])
+    equal(sorted(device.serial for device in response.devices),
+          sorted(device['serial'] for device in devices if device['sdk'] == sdks[0]))
@@ -0,0 +1,125 @@
+import json
+import uuid
+
+import httpx
+import pytest
+from pytest_check import equal, greater, greater_equal, is_true, less_equal
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.loadgen import HoldTime, LoadGenerator, LoadProfile, Requirement
+
+BASE_URL = 'http://devicehub.local/api/v1'
+
+
+class FakeFarm:
+    """Autotests endpoints over an in-memory pool of devices"""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.groups = {}
+        self.max_held = 0
+
+    def free(self):
+        held = {serial for serials in self.groups.values() for serial in serials}
+        return [serial for serial in self.devices if serial not in held]
+
+    def __call__(self, request):
+        if request.url.path.endswith('/devices'):
+            devices = [{'serial': serial, 'present': True, 'ready': True, 'status': 3, 'owner': None,
+                        'group': {'class': 'bookable'}} for serial in self.devices]
+            return httpx.Response(200, json={'success': True, 'description': 'Devices Information',
+                                             'devices': devices})
+        params = request.url.params
+        if request.method == 'DELETE':
+            self.groups.pop(params['group'])
+            return httpx.Response(200, json={'success': True, 'description': 'Deleted (groups)'})
+        amount = int(params['amount'])
+        matching = [serial for serial in self.free() if self.devices[serial] == params.get('abi', self.devices[serial])]
+        if len(matching) < amount:
+            return httpx.Response(409, json={'success': False, 'description': 'Cant create group. Not enough free devices'})
+        group_id = uuid.uuid4().hex
+        self.groups[group_id] = matching[:amount]
+        self.max_held = max(self.max_held, len(self.devices) - len(self.free()))
+        return httpx.Response(200, json={'success': True, 'description': 'Added (group devices)',
+                                         'group': {'id': group_id,
+                                                   'devices': [{'serial': serial} for serial in matching[:amount]]}})
+
+
+def _client(farm):
+    return AuthenticatedClient(base_url=BASE_URL, token='t', httpx_args={'transport': httpx.MockTransport(farm)})
+
+
+def test_parse_profile_specs():
+    equal(HoldTime.parse('exp:30'), HoldTime.exponential(30))
+    equal(HoldTime.parse('12'), HoldTime.fixed(12))
+    equal(str(HoldTime.uniform(1, 2.5)), 'uniform:1:2.5')
+    equal(Requirement.parse('amount=2,abi=arm64-v8a,sdk=34*3'),
+          Requirement(amount=2, abi='arm64-v8a', sdk='34', weight=3))
+    with pytest.raises(ValueError):
+        HoldTime.parse('uniform:1')
+    with pytest.raises(ValueError):
+        Requirement.parse('color=red')
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_contention():
+    farm = FakeFarm({f'emulator-{i}': 'x86_64' for i in range(3)})
+    profile = LoadProfile(runs=4, duration=0.5, requirements=[Requirement(amount=2)], hold=HoldTime.fixed(0.05),
+                          capture_deadline=5, retry_interval=0.01, sample_interval=0.02, seed=1)
+    report = await LoadGenerator(_client(farm), profile).run()
+
+    equal(report.pool_size, 3)
+    equal(farm.groups, {})
+    less_equal(farm.max_held, 2)
+    greater(report.count('captured'), 4)
+    equal(report.count('error') + report.count('timeout') + report.free_failures, 0)
+    equal(report.capture_latency.count, sum(run.attempts for run in report.runs))
+    greater(report.capture_latency.count, report.count('captured'))
+    greater_equal(report.elapsed, profile.duration)
+    utilisation = [sample['utilisation'] for sample in report.utilisation()]
+    less_equal(max(utilisation), 2 / 3)
+    greater(max(utilisation), 0)
+    is_true(all(sample['active'] <= profile.runs for sample in report.utilisation()))
+
+
+@pytest.mark.asyncio
+async def test_open_loop_timeouts_and_dump(tmp_path):
+    farm = FakeFarm({'R58M': 'arm64-v8a', 'emulator-1': 'x86_64'})
+    profile = LoadProfile(runs=8, duration=0.3, arrival_rate=50, hold=HoldTime.fixed(1),
+                          requirements=[Requirement(abi='arm64-v8a'), Requirement(abi='armeabi-v7a')],
+                          capture_deadline=0.05, retry_interval=0.01, sample_interval=0.05, seed=3)
+    report = await LoadGenerator(_client(farm), profile, pool_size=2).run()
+
+    equal(farm.groups, {})
+    equal(report.count('captured'), 1)
+    greater(report.count('timeout'), 0)
+    equal(report.rate('captured') + report.rate('timeout'), 1)
+    is_true(all(run.requirement.abi == 'arm64-v8a' for run in report.runs if run.outcome == 'captured'))
+
+    path = tmp_path / 'loadgen.json'
+    report.dump(str(path))
+    dumped = json.loads(path.read_text())
+    equal(dumped['outcomes']['captured'], 1)
+    equal(dumped['profile']['requirements'], {'amount=1,abi=arm64-v8a': 1.0, 'amount=1,abi=armeabi-v7a': 1.0})
+    equal(len(dumped['results']), len(report.runs))
+    is_true('success' in report.report())
+
+
+@pytest.mark.asyncio
+async def test_closed_loop_backs_off_and_stops_when_rejected():
+    captures = []
+
+    def quota(request):
+        if request.method == 'DELETE':
+            return httpx.Response(200, json={'success': True, 'description': 'Deleted (groups)'})
+        captures.append(request)
+        return httpx.Response(403, json={'success': False, 'description': 'No more groups allowed'})
+
+    profile = LoadProfile(runs=2, duration=5, retry_interval=0.01, sample_interval=0.05, seed=1)
+    report = await LoadGenerator(_client(quota), profile, pool_size=2).run()
+
+    equal(report.count('rejected'), 2 * 5)
+    equal(len(captures), 2 * 5)
+    equal(report.stopped_workers, 2)
+    less_equal(report.elapsed, 1)
+    is_true('2 of 2 runs stopped after 5 rejections' in report.report())
@@ -0,0 +1,56 @@
+
+import httpx
+from pytest_check import equal, is_, is_false
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.projection import record_type, sync
+from devicehub_client.types import UNSET
+
+FIELDS = 'present,present,status,serial,group.owner.name,using,somefields'
+
+
+def test_projection_sends_fields_and_builds_compact_records():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json={
+            'success': True,
+            'description': 'Devices Information',
+            'devices': [{
+                'present': True,
+                'status': 3,
+                'serial': 'fake-1',
+                'group': {'owner': {'name': 'administrator'}},
+                'using': False,
+            }],
+        })
+
+    client = AuthenticatedClient(
+        base_url='http://devicehub.local/api/v1',
+        token='token',
+        httpx_args={'transport': httpx.MockTransport(handler)},
+    )
+
+    devices = sync(client=client, fields=FIELDS)
+
+    equal(requests[0].url.params['fields'], 'present,status,serial,group.owner.name,using,somefields')
+    device = devices[0]
+    equal(device.serial, 'fake-1')
+    equal(device.group_owner_name, 'administrator')
+    is_false(device.using)
+    is_(device.somefields, UNSET)
+    is_(type(device), record_type(FIELDS))
+    equal(device.to_dict(), {
+        'present': True,
+        'status': 3,
+        'serial': 'fake-1',
+        'group': {'owner': {'name': 'administrator'}},
+        'using': False,
+    })
+    is_false(hasattr(device, '__dict__'))
+
+
+def test_record_names():
+    record = record_type(['_id', 'presenceChangedAt', 'group.class', 'class'])
+    equal(record.__slots__, ('field_id', 'presence_changed_at', 'group_class', 'class_'))
@@ -0,0 +1,121 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from pytest_check import almost_equal, equal, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.users import get_users
+from devicehub_client.ratelimit import RateLimiter, get_rate_limiter
+
+USERS = {'success': True, 'description': 'Users Information', 'users': []}
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_burst_then_nominal_pace():
+    clock = FakeClock()
+    limiter = RateLimiter(limit=60, window=60, burst=3, clock=clock)
+    delays = [limiter.reserve() for _ in range(5)]
+    equal(delays, [0, 0, 0, 1, 2])
+    clock.now += 10
+    equal(limiter.reserve(), 0)
+
+
+def test_spreads_remaining_budget_until_reset():
+    clock = FakeClock()
+    limiter = RateLimiter(limit=2800, window=60, burst=1, clock=clock)
+    limiter.update(200, {'RateLimit': 'limit=2800, remaining=10, reset=20'})
+    limiter.reserve()
+    almost_equal(limiter.reserve(), 2)
+    clock.now += 30
+    limiter.reserve()
+    almost_equal(limiter.reserve(), 60 / 2800)
+
+
+def test_separate_headers_and_policy():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update(200, {'RateLimit-Policy': '100;w=10', 'RateLimit-Remaining': '0', 'RateLimit-Reset': '4'})
+    equal((limiter.limit, limiter.window, limiter.burst), (100, 10, 5))
+    almost_equal(limiter.reserve(), 4)
+
+
+def test_throttled_response_holds_requests():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.update(429, {'Retry-After': '7'})
+    equal(limiter.throttled, 1)
+    almost_equal(limiter.reserve(), 7)
+
+
+def test_clients_of_a_host_share_limiter():
+    first = AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='a', rate_limit=True)
+    second = AuthenticatedClient(base_url='http://devicehub.local:80/api/v1/', token='b', rate_limit=True)
+    other = AuthenticatedClient(base_url='http://other.local/api/v1', token='a', rate_limit=True)
+    is_true(first.rate_limiter is second.rate_limiter is get_rate_limiter('http://devicehub.local'))
+    is_true(first.rate_limiter is not other.rate_limiter)
+    equal(AuthenticatedClient(base_url='http://devicehub.local', token='c').rate_limiter, None)
+
+
+class FixedWindow:
+    """express-rate-limit: ``limit`` requests per ``window`` seconds, counted from the first request"""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.started = None
+        self.hits = 0
+
+    def __call__(self, request):
+        now = time.monotonic()
+        if self.started is None or now - self.started >= self.window:
+            self.started, self.hits = now, 0
+        self.hits += 1
+        reset = self.window - (now - self.started)
+        headers = {
+            'RateLimit-Policy': f'{self.limit};w={self.window}',
+            'RateLimit': f'limit={self.limit}, remaining={max(self.limit - self.hits, 0)}, reset={reset:.3f}',
+        }
+        if self.hits > self.limit:
+            return httpx.Response(429, headers=headers, json={'success': False})
+        return httpx.Response(200, headers=headers, json=USERS)
+
+
+def test_sync_client_is_paced():
+    limiter = RateLimiter(limit=20, window=1, burst=1)
+    client = AuthenticatedClient(base_url='http://devicehub.local', token='t', rate_limit=limiter,
+                                 httpx_args={'transport': httpx.MockTransport(FixedWindow(20, 1))})
+    started = time.monotonic()
+    statuses = [get_users.sync_detailed(client=client).status_code for _ in range(5)]
+    equal(statuses, [200] * 5)
+    is_true(time.monotonic() - started >= 0.19)
+    equal(limiter.waits, 4)
+
+
+async def _storm(rate_limit):
+    server = FixedWindow(10, 0.5)
+    clients = [
+        AuthenticatedClient(base_url='http://devicehub.local', token=str(i), rate_limit=rate_limit,
+                            httpx_args={'transport': httpx.MockTransport(server)})
+        for i in range(3)
+    ]
+    responses = []
+    for _ in range(10):
+        responses += await asyncio.gather(*(get_users.asyncio_detailed(client=client) for client in clients))
+    return [response.status_code for response in responses].count(429)
+
+
+@pytest.mark.asyncio
+async def test_async_clients_stay_within_budget():
+    is_true(await _storm(False) > 0)
+    limiter = RateLimiter(limit=10, window=0.5)
+    equal(await _storm(limiter), 0)
+    is_true(limiter.waited > 0)
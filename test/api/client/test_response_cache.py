@@ -0,0 +1,66 @@
+import httpx
+from pytest_check import equal, is_, is_none, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.devices import get_devices
+from devicehub_client.cache import ResponseCache
+
+ETAG = '"devices-v1"'
+
+
+def test_response_cache_revalidates_with_etag():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        if request.headers.get('If-None-Match') == ETAG:
+            return httpx.Response(304, headers={'ETag': ETAG})
+        return httpx.Response(200, headers={'ETag': ETAG}, json={
+            'success': True,
+            'description': 'Devices Information',
+            'devices': [{'serial': 'fake-1', 'present': True}],
+        })
+
+    cache = ResponseCache()
+    client = AuthenticatedClient(
+        base_url='http://devicehub.local/api/v1',
+        token='token',
+        response_cache=cache,
+        httpx_args={'transport': httpx.MockTransport(handler)},
+    )
+
+    first = get_devices.sync_detailed(client=client)
+    second = get_devices.sync_detailed(client=client)
+
+    is_none(requests[0].headers.get('If-None-Match'))
+    equal(requests[1].headers.get('If-None-Match'), ETAG)
+    equal(first.status_code, 200)
+    equal(second.status_code, 304)
+    is_(second.parsed, first.parsed)
+    equal(second.parsed.devices[0].serial, 'fake-1')
+    equal((cache.hits, cache.misses), (1, 1))
+
+    get_devices.sync_detailed(client=client, fields='serial')
+    equal(len(cache), 2)
+    is_true('If-None-Match' not in requests[2].headers)
+
+
+def test_response_cache_keeps_servers_apart():
+    # two farms can hand out the same ETag, a 304 of one must not serve the listing of the other
+    def handler(request):
+        if request.headers.get('If-None-Match') == ETAG:
+            return httpx.Response(304, headers={'ETag': ETAG})
+        return httpx.Response(200, headers={'ETag': ETAG}, json={
+            'success': True, 'description': 'Devices Information', 'devices': [{'serial': request.url.host}],
+        })
+
+    cache = ResponseCache()
+    clients = [AuthenticatedClient(base_url=f'http://{host}/api/v1', token='token', response_cache=cache,
+                                   httpx_args={'transport': httpx.MockTransport(handler)})
+               for host in ('farm-a.local', 'farm-b.local')]
+
+    serials = [get_devices.sync(client=client).devices[0].serial for client in clients]
+    equal(serials, ['farm-a.local', 'farm-b.local'])
+    equal(len(cache), 2)
+    equal(get_devices.sync(client=clients[1]).devices[0].serial, 'farm-b.local')
+    equal(cache.hits, 1)
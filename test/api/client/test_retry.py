@@ -0,0 +1,123 @@
+import random
+
+import httpx
+import pytest
+from pytest_check import equal, is_false, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.autotests import capture_devices
+from devicehub_client.api.groups import create_group
+from devicehub_client.api.users import get_users
+from devicehub_client.models import GroupPayload
+from devicehub_client.retry import RetryBudget, RetryPolicy, is_idempotent
+
+USERS = {'success': True, 'description': 'Users Information', 'users': []}
+
+
+class Flaky:
+    """Fails the first ``failures`` requests with ``failure`` (a status code or an exception type)"""
+
+    def __init__(self, failures, failure):
+        self.failures = failures
+        self.failure = failure
+        self.calls = 0
+
+    def __call__(self, request):
+        self.calls += 1
+        if self.calls <= self.failures:
+            if isinstance(self.failure, int):
+                return httpx.Response(self.failure, headers={'Retry-After': '0'}, json={'success': False})
+            raise self.failure('flaky', request=request)
+        return httpx.Response(200, json=USERS)
+
+
+def _client(handler, **policy):
+    policy.setdefault('backoff_base', 0.001)
+    return AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='t', retry=RetryPolicy(**policy),
+                               httpx_args={'transport': httpx.MockTransport(handler)})
+
+
+@pytest.mark.parametrize('method, path, headers, expected', [
+    ('GET', '/api/v1/devices', {}, True),
+    ('DELETE', '/api/v1/groups/abc', {}, True),
+    ('GET', '/api/v1/autotests', {}, False),
+    ('POST', '/api/v1/groups', {}, False),
+    ('POST', '/api/v1/groups', {'Idempotency-Key': 'k'}, True),
+    ('POST', '/api/v1/user/accessTokens/byTitle', {}, True),
+])
+def test_idempotency_classification(method, path, headers, expected):
+    equal(is_idempotent(httpx.Request(method, f'http://devicehub.local{path}', headers=headers)), expected)
+
+
+def test_transient_failures_of_idempotent_requests_are_retried():
+    for failure in (503, httpx.ReadTimeout, httpx.ConnectError):
+        handler = Flaky(2, failure)
+        equal(get_users.sync_detailed(client=_client(handler)).status_code, 200)
+        equal(handler.calls, 3)
+
+
+def test_attempts_are_bounded():
+    handler = Flaky(5, httpx.ReadTimeout)
+    with pytest.raises(httpx.ReadTimeout):
+        get_users.sync_detailed(client=_client(handler, max_attempts=3))
+    equal(handler.calls, 3)
+
+
+def test_non_idempotent_operations_are_not_repeated_once_sent():
+    handler = Flaky(1, 503)
+    equal(capture_devices.sync_detailed(client=_client(handler), timeout=60, amount=1, run='run').status_code, 503)
+    equal(handler.calls, 1)
+
+    handler = Flaky(1, httpx.ReadTimeout)
+    with pytest.raises(httpx.ReadTimeout):
+        create_group.sync_detailed(client=_client(handler), body=GroupPayload(name='g'))
+    equal(handler.calls, 1)
+
+    # neither a refused connection nor a 429 reached the handlers of the server
+    for failure in (httpx.ConnectError, 429):
+        handler = Flaky(1, failure)
+        create_group.sync_detailed(client=_client(handler), body=GroupPayload(name='g'))
+        equal(handler.calls, 2)
+
+
+def test_idempotency_key_makes_post_retryable():
+    handler = Flaky(1, 503)
+    client = _client(handler).with_headers({'Idempotency-Key': 'capture-1'})
+    create_group.sync_detailed(client=client, body=GroupPayload(name='g'))
+    equal(handler.calls, 2)
+
+
+def test_budget_limits_retries():
+    budget = RetryBudget(ratio=0.5, reserve=2)
+    is_true(budget.withdraw())
+    is_true(budget.withdraw())
+    is_false(budget.withdraw())
+    budget.deposit()
+    budget.deposit()
+    is_true(budget.withdraw())
+
+    handler = Flaky(100, 500)
+    policy = RetryPolicy(max_attempts=5, backoff_base=0.001, budget=RetryBudget(ratio=0.1, reserve=3))
+    client = AuthenticatedClient(base_url='http://devicehub.local', token='t', retry=policy,
+                                 httpx_args={'transport': httpx.MockTransport(handler)})
+    for _ in range(4):
+        get_users.sync_detailed(client=client)
+    equal(policy.retries, 3)
+    equal(handler.calls, 7)
+    is_true(policy.exhausted > 0)
+
+
+def test_backoff_is_jittered_and_capped():
+    policy = RetryPolicy(backoff_base=1, backoff_max=4, rng=random.Random(1))
+    delays = [policy.backoff(attempt) for attempt in range(1, 8) for _ in range(50)]
+    is_true(all(0 <= delay <= 4 for delay in delays))
+    is_true(len(set(delays)) == len(delays))
+    equal(policy.backoff(1, retry_after=3), 3)
+
+
+@pytest.mark.asyncio
+async def test_async_requests_are_retried():
+    handler = Flaky(2, 502)
+    response = await get_users.asyncio_detailed(client=_client(handler))
+    equal(response.status_code, 200)
+    equal(handler.calls, 3)
@@ -0,0 +1,87 @@
+import pytest
+from pytest_check import equal, greater, is_in, is_true, less
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.api.autotests import capture_devices, free_devices
+from devicehub_client.api.devices import generate_fake_device, get_device_by_serial, get_devices
+from devicehub_client.api.groups import get_group_devices
+from devicehub_client.cache import ResponseCache
+from devicehub_client.models import AutoTestResponse, GetDevicesTarget
+from devicehub_client.standin import STANDIN_URL, FakeFarm, Latency, StandIn
+
+
+def standin_client(standin, **kwargs):
+    return AuthenticatedClient(base_url=STANDIN_URL, token='t', httpx_args={'transport': standin.transport()}, **kwargs)
+
+
+def test_standin_serves_fake_devices():
+    standin = StandIn(FakeFarm(devices=20, seed=1))
+    client = standin_client(standin)
+
+    devices = get_devices.sync(client=client).devices
+    equal(len(devices), 20)
+    device = devices[0]
+    equal(device.provider.name, 'FAKE/1')
+    equal(device.display.width, 1080)
+    equal(device.group.name, 'Common')
+    is_true(8 <= int(device.sdk) <= 19)
+
+    equal(get_device_by_serial.sync(device.serial, client=client).device.serial, device.serial)
+    equal(get_device_by_serial.sync_detailed('fake-missing', client=client).status_code, 404)
+
+    projected = get_devices.sync_detailed(client=client, fields='serial,group.id')
+    equal(projected.content.count(b'"serial"'), 20)
+    equal(projected.content.count(b'"model"'), 0)
+
+    is_true(generate_fake_device.sync(client=client, number=5).success)
+    equal(len(get_devices.sync(client=client).devices), 25)
+
+
+def test_standin_etag_and_capture():
+    standin = StandIn(FakeFarm(devices=4, seed=1))
+    client = standin_client(standin, response_cache=ResponseCache())
+
+    first = get_devices.sync_detailed(client=client, target=GetDevicesTarget.BOOKABLE)
+    second = get_devices.sync_detailed(client=client, target=GetDevicesTarget.BOOKABLE)
+    equal(second.status_code, 304)
+    is_true(second.parsed is first.parsed)
+
+    captured = capture_devices.sync(client=client, timeout=60, amount=3, run='run-1')
+    is_true(isinstance(captured, AutoTestResponse))
+    equal(len(captured.group.devices), 3)
+    equal(len(get_group_devices.sync(captured.group.id, client=client).devices), 3)
+    equal(capture_devices.sync_detailed(client=client, timeout=60, amount=2, need_amount=True,
+                                        run='run-2').status_code, 409)
+
+    equal(get_devices.sync_detailed(client=client, target=GetDevicesTarget.BOOKABLE).status_code, 200)
+    equal(free_devices.sync_detailed(client=client, group=captured.group.id).status_code, 200)
+    equal(len(standin.farm.free_devices()), 4)
+    equal(standin.requests['captureDevices'], 2)
+
+
+def test_standin_synthesizes_other_operations():
+    standin = StandIn(FakeFarm(devices=1))
+    response = standin_client(standin).get_httpx_client().get('/user')
+    equal(response.status_code, 200)
+    is_in('user', response.json())
+    is_true(response.json()['success'])
+
+    offline = StandIn(FakeFarm(devices=1), spec=None)
+    equal(standin_client(offline).get_httpx_client().get('/user').status_code, 501)
+
+
+@pytest.mark.asyncio
+async def test_standin_latency_and_sockets():
+    standin = StandIn(FakeFarm(devices=50, seed=1), latency=Latency(base=0.01, per_kb=0.001, sigma=0, seed=1))
+    equal(standin.latency.delay(2048), pytest.approx(0.012))
+
+    response = await get_devices.asyncio_detailed(client=standin_client(standin))
+    equal(response.status_code, 200)
+    equal(len(response.parsed.devices), 50)
+
+    with standin.serve() as base_url:
+        client = AuthenticatedClient(base_url=base_url, token='t')
+        devices = get_devices.sync(client=client).devices
+    equal(len(devices), 50)
+    greater(len(response.content), 50 * 1024)
+    less(standin.latency.delay(0), 0.011)
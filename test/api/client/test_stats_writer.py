@@ -0,0 +1,130 @@
+import json
+import threading
+
+import httpx
+import pytest
+from pytest_check import equal, is_false, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.stats import Overflow, StatsWriter
+
+
+class StatsServer:
+    """POST /stats/batch answering with the number of events, optionally held until released"""
+
+    def __init__(self, status_code=200):
+        self.batches = []
+        self.status_code = status_code
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, request):
+        self.release.wait(5)
+        events = json.loads(request.content)
+        self.batches.append(events)
+        if self.status_code != 200:
+            return httpx.Response(self.status_code, json={'success': False, 'description': 'Bad Request (invalid)'})
+        return httpx.Response(200, json={'success': True, 'description': 'Stats written', 'written': len(events)})
+
+    def client(self):
+        return AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='t',
+                                   httpx_args={'transport': httpx.MockTransport(self)})
+
+
+def test_stats_writer_flushes_by_size_and_on_close():
+    server = StatsServer()
+    with StatsWriter(server.client(), batch_size=10, flush_interval=60) as stats:
+        for i in range(25):
+            stats.write(f'fake-{i % 3}', 'test_started', timestamp=1700000000 + i)
+        is_true(stats.flush(timeout=5))
+        equal(stats.pending, 0)
+
+    equal([len(batch) for batch in server.batches], [10, 10, 5])
+    equal(server.batches[0][1], {'serial': 'fake-1', 'action': 'test_started', 'timestamp': 1700000001000})
+    equal(stats.written, 25)
+    equal(stats.batches, 3)
+
+
+def test_stats_writer_flushes_by_time():
+    server = StatsServer()
+    stats = StatsWriter(server.client(), batch_size=100, flush_interval=0.05)
+    stats.write('fake-0', 'install')
+    done = threading.Event()
+    for _ in range(100):
+        if server.batches:
+            done.set()
+            break
+        done.wait(0.02)
+    is_true(done.is_set())
+    stats.close()
+    equal(server.batches, [[{'serial': 'fake-0', 'action': 'install', 'timestamp': server.batches[0][0]['timestamp']}]])
+
+
+def test_stats_writer_overflow_policies():
+    server = StatsServer()
+    server.release.clear()
+    stats = StatsWriter(server.client(), batch_size=2, flush_interval=60, max_pending=2,
+                        overflow=Overflow.DROP_OLDEST)
+    for i in range(2):
+        stats.write('fake-0', f'held-{i}')
+    for _ in range(100):
+        if stats.pending == 2 and not stats._pending:
+            break
+        server.release.wait(0.01)
+    for i in range(4):
+        is_true(stats.write('fake-0', f'action-{i}'))
+    equal(stats.dropped, 2)
+    server.release.set()
+    stats.close()
+    equal([[event['action'] for event in batch] for batch in server.batches], [['held-0', 'held-1'],
+                                                                                ['action-2', 'action-3']])
+
+    server = StatsServer()
+    server.release.clear()
+    blocking = StatsWriter(server.client(), batch_size=1, flush_interval=60, max_pending=1, block_timeout=0.05)
+    blocking.write('fake-0', 'sent')
+    blocking.write('fake-0', 'queued')
+    is_false(blocking.write('fake-0', 'timed out'))
+    equal(blocking.dropped, 1)
+    server.release.set()
+    is_true(blocking.write('fake-0', 'after release'))
+    blocking.close()
+    equal(blocking.written, 3)
+
+
+def test_stats_writer_reports_failed_batches():
+    server = StatsServer(status_code=400)
+    errors = []
+    with StatsWriter(server.client(), batch_size=5, on_error=lambda batch, error: errors.append((len(batch), error))) \
+            as stats:
+        for i in range(7):
+            stats.write(f'fake-{i}', 'test_finished')
+
+    equal(stats.failed, 7)
+    equal(stats.written, 0)
+    equal(errors, [(5, 'Bad Request (invalid)'), (2, 'Bad Request (invalid)')])
+
+
+@pytest.mark.filterwarnings('ignore::pytest.PytestUnhandledThreadExceptionWarning')
+def test_stats_writer_survives_hook_errors_and_reports_a_dead_thread(caplog):
+    def hook(batch, error):
+        raise ValueError('hook failed')
+
+    with StatsWriter(StatsServer(status_code=400).client(), batch_size=2, on_error=hook) as stats:
+        for i in range(4):
+            stats.write(f'fake-{i}', 'test_finished')
+        is_true(stats.flush(5))
+    equal(stats.failed, 4)
+    equal(len([record for record in caplog.records if 'on_error hook failed' in record.message]), 2)
+
+    stats = StatsWriter(StatsServer().client(), batch_size=2)
+
+    def stop(batch):
+        raise SystemExit
+
+    stats._send = stop
+    stats.write('fake-0', 'test_started')
+    with pytest.raises(RuntimeError, match='stopped with 1 actions'):
+        stats.flush(5)
+    with pytest.raises(RuntimeError, match='thread stopped'):
+        stats.write('fake-1', 'test_started')
@@ -0,0 +1,90 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from pytest_check import equal, is_false
+
+from devicehub_client import AuthenticatedClient, TransportPool
+from devicehub_client.api.users import get_users
+from devicehub_client.pool import get_default_pool
+
+
+class RecordingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.seen.append((self.client_address[1], self.headers.get('Authorization')))
+        body = b'{"success": true, "description": "Users Information", "users": []}'
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def local_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), RecordingHandler)
+    server.seen = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_clients_with_different_tokens_share_connection(local_server):
+    base_url = f'http://127.0.0.1:{local_server.server_port}/api/v1'
+    with TransportPool() as pool:
+        for token in ('first', 'second', 'third'):
+            client = AuthenticatedClient(base_url=base_url, token=token, transport_pool=pool)
+            equal(get_users.sync_detailed(client=client).status_code, 200)
+            client.close()
+        equal(len(pool), 1)
+
+    ports = {port for port, _ in local_server.seen}
+    equal(len(ports), 1)
+    equal([auth for _, auth in local_server.seen], ['Bearer first', 'Bearer second', 'Bearer third'])
+
+
+def test_closed_pool_refuses_new_clients(local_server):
+    pool = TransportPool()
+    pool.close()
+    client = AuthenticatedClient(base_url=f'http://127.0.0.1:{local_server.server_port}', token='t', transport_pool=pool)
+    with pytest.raises(RuntimeError):
+        client.get_httpx_client()
+
+
+def test_async_transports_are_pooled_per_loop_and_closed(local_server):
+    base_url = f'http://127.0.0.1:{local_server.server_port}/api/v1'
+    pool = TransportPool()
+
+    async def get_users_twice():
+        client = AuthenticatedClient(base_url=base_url, token='t', transport_pool=pool)
+        for _ in range(2):
+            equal((await get_users.asyncio_detailed(client=client)).status_code, 200)
+        await client.aclose()
+
+    asyncio.run(get_users_twice())
+    loop = asyncio.new_event_loop()
+    loop.run_until_complete(get_users_twice())
+    # the transport of the first loop went with it, the one of the open loop is closed by close()
+    equal(len(pool), 1)
+    transport = next(iter(pool._async_transports.values()))
+    equal(len(transport._pool.connections), 1)
+    pool.close()
+    loop.close()
+
+    equal(len(transport._pool.connections), 0)
+    equal(len({port for port, _ in local_server.seen}), 2)
+
+
+def test_default_pool_is_shared_until_closed():
+    pool = get_default_pool()
+    equal(get_default_pool(), pool)
+    pool.close()
+    is_false(get_default_pool() is pool)
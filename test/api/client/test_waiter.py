@@ -0,0 +1,81 @@
+import httpx
+import pytest
+from pytest_check import equal, is_false, is_true
+
+from devicehub_client import AuthenticatedClient
+from devicehub_client.waiter import async_device_groups, async_wait_until, device_groups, wait_until
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def test_wait_until_returns_as_soon_as_condition_holds():
+    clock = FakeClock()
+    values = iter(range(10))
+    convergence = wait_until(lambda: next(values), lambda value: value == 4, timeout=10, interval=0.1,
+                             max_interval=0.3, clock=clock, sleep=clock.sleep)
+
+    is_true(convergence.converged)
+    equal(convergence.value, 4)
+    equal(convergence.attempts, 5)
+    equal(clock.sleeps, [0.1, 0.2, 0.3, 0.3])
+    equal(convergence.elapsed, pytest.approx(0.9))
+
+
+def test_wait_until_gives_up_at_the_deadline():
+    clock = FakeClock()
+    convergence = wait_until(lambda: 'moving', lambda value: value == 'moved', timeout=1, interval=0.4,
+                             clock=clock, sleep=clock.sleep)
+
+    is_false(convergence.converged)
+    equal(convergence.value, 'moving')
+    equal(clock.sleeps, [0.4, pytest.approx(0.6)])
+    equal(convergence.attempts, 3)
+
+
+def propagating_farm(moves_after):
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        group = 'group-2' if len(requests) > moves_after else 'group-1'
+        devices = [
+            {'serial': 'R58M', 'group': {'id': group, 'name': group.title()}},
+            {'serial': 'emulator-1', 'group': {'id': 'group-1', 'name': 'Group-1'}},
+        ]
+        return httpx.Response(200, json={'success': True, 'description': 'Devices Information', 'devices': devices})
+
+    client = AuthenticatedClient(base_url='http://devicehub.local/api/v1', token='t',
+                                 httpx_args={'transport': httpx.MockTransport(handler)})
+    return client, requests
+
+
+def test_device_groups_in_one_request():
+    client, requests = propagating_farm(moves_after=0)
+    groups = device_groups(client, ['R58M', 'emulator-1', 'unknown'])
+
+    equal(groups, {'R58M': ('group-2', 'Group-2'), 'emulator-1': ('group-1', 'Group-1'), 'unknown': None})
+    equal(len(requests), 1)
+    equal(requests[0].url.params['fields'], 'serial,group.id,group.name')
+    equal(requests[0].url.params['target'], 'origin')
+
+
+@pytest.mark.asyncio
+async def test_async_wait_for_device_move():
+    client, requests = propagating_farm(moves_after=2)
+    convergence = await async_wait_until(lambda: async_device_groups(client, ['R58M']),
+                                         lambda groups: groups['R58M'][0] == 'group-2', interval=0.001)
+
+    is_true(convergence.converged)
+    equal(convergence.attempts, 3)
+    equal(len(requests), 3)
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import random
+
+import pytest
+import pytest_asyncio
+from pytest_check import equal, is_false, is_true
+
+pytest.importorskip('websockets')
+
+from websockets.asyncio.server import serve  # noqa: E402
+
+from devicehub_client.wire import TransactionTimeout, WireClient, WireError, socket_url  # noqa: E402
+
+SILENT_CHANNEL = 'silent'
+
+
+class FakeSocketIO:
+    """Socket.IO endpoint of the websocket unit answering group.invite/kick in random order"""
+
+    def __init__(self):
+        self.pongs = 0
+        self.cleanups = []
+
+    async def handler(self, ws):
+        await ws.send('0' + json.dumps({'sid': 'engine', 'upgrades': [], 'pingInterval': 25000, 'pingTimeout': 20000}))
+        auth = json.loads((await ws.recv())[2:])
+        if auth['token'] != 'jwt':
+            await ws.send('44{"message":"Invalid user"}')
+            return
+        await ws.send('40{"sid":"socket"}')
+        await ws.send('2')
+        async for packet in ws:
+            if packet == '3':
+                self.pongs += 1
+                continue
+            event, *args = json.loads(packet[2:])
+            if event == 'tx.cleanup':
+                self.cleanups.append(args[0])
+            elif args[0] != SILENT_CHANNEL:
+                asyncio.create_task(self.reply(ws, event, *args))
+
+    async def reply(self, ws, event, channel, response_channel, data):
+        await asyncio.sleep(random.uniform(0, 0.05))
+        serial = data['requirements']['serial']['value']
+        await ws.send('42' + json.dumps(['tx.progress', response_channel, {'source': channel, 'seq': 0, 'progress': 50}]))
+        await ws.send('42' + json.dumps(['tx.done', response_channel, {
+            'source': channel,
+            'seq': 1,
+            'success': event == 'group.kick' or serial != 'busy',
+            'data': event,
+            'body': serial,
+        }]))
+
+
+@pytest_asyncio.fixture
+async def fake_socket():
+    fake = FakeSocketIO()
+    async with serve(fake.handler, '127.0.0.1', 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        fake.url = socket_url(f'http://127.0.0.1:{port}/api/v1')
+        yield fake
+
+
+def test_socket_url():
+    equal(socket_url('https://devicehub.local/api/v1/'), 'wss://devicehub.local/socket.io/?EIO=4&transport=websocket')
+
+
+@pytest.mark.asyncio
+async def test_wire_client_pipelines_transactions(fake_socket):
+    progress = []
+    async with WireClient(fake_socket.url, 'jwt', timeout=2) as wire:
+        kicks = await asyncio.gather(*(wire.group_kick(f'channel-{i}', f'serial-{i}') for i in range(200)))
+        invite = await wire.group_invite('channel-x', 'busy')
+        tracked = await wire.transaction('group.kick', 'channel-y', {'requirements': {'serial': {'value': 'y'}}},
+                                         on_progress=progress.append)
+        equal(wire.pending, 0)
+
+    equal([result.body for result in kicks], [f'serial-{i}' for i in range(200)])
+    is_true(all(result.success for result in kicks))
+    equal(kicks[7].source, 'channel-7')
+    is_false(invite.success)
+    equal(invite.data, 'group.invite')
+    is_true(tracked.success)
+    equal(progress, [{'source': 'channel-y', 'seq': 0, 'progress': 50}])
+    equal(fake_socket.pongs, 1)
+    equal(len(fake_socket.cleanups), 202)
+
+
+@pytest.mark.asyncio
+async def test_wire_client_timeout_and_refused_token(fake_socket):
+    async with WireClient(fake_socket.url, 'jwt') as wire:
+        with pytest.raises(TransactionTimeout):
+            await wire.group_kick(SILENT_CHANNEL, 'serial', timeout=0.1)
+        equal((await wire.group_kick('channel', 'serial', timeout=1)).success, True)
+
+    with pytest.raises(WireError, match='Invalid user'):
+        await WireClient(fake_socket.url, 'bad').connect()
@@ -0,0 +1,158 @@
+import asyncio
+import json
+
+import pytest
+import pytest_asyncio
+from pytest_check import equal, is_true
+
+pytest.importorskip('websockets')
+
+from websockets.asyncio.server import serve  # noqa: E402
+
+from devicehub_client.wire import TransactionTimeout, WireClient, WireError, socket_url  # noqa: E402
+
+LOGCAT = [
+    {'tag': 'ActivityManager', 'priority': 4, 'message': 'Start proc'},
+    {'tag': 'ActivityManager', 'priority': 2, 'message': 'verbose'},
+    {'tag': 'chatty', 'priority': 6, 'message': 'noise'},
+]
+
+
+class FakeDevice:
+    """Shell and logcat handlers of the websocket unit for a single device"""
+
+    def __init__(self, entries=200):
+        self.entries = entries
+        self.keepalives = 0
+        self.stopped = asyncio.Event()
+
+    async def handler(self, ws):
+        await ws.send('0' + json.dumps({'sid': 'engine', 'upgrades': [], 'pingInterval': 25000, 'pingTimeout': 20000}))
+        await ws.recv()
+        await ws.send('40{"sid":"socket"}')
+        async for packet in ws:
+            event, *args = json.loads(packet[2:])
+            if event == 'shell.command':
+                asyncio.create_task(self.shell(ws, *args))
+            elif event == 'shell.keepalive':
+                self.keepalives += 1
+            elif event == 'logcat.start':
+                await self.done(ws, args[1], True)
+                asyncio.create_task(self.logcat(ws, args[2]['filters']))
+            elif event == 'logcat.stop':
+                self.stopped.set()
+                await self.done(ws, args[1], True)
+            elif event == 'group.kick':
+                await self.done(ws, args[1], True)
+
+    @staticmethod
+    async def done(ws, response_channel, success, data=None):
+        await ws.send('42' + json.dumps(['tx.done', response_channel, {'source': 'dev', 'success': success, 'data': data}]))
+
+    async def shell(self, ws, channel, response_channel, data):
+        if data['command'] == 'fail':
+            await self.done(ws, response_channel, False, 'fail: not found')
+            return
+        if data['command'] == 'silent':
+            # the websocket unit does not reply when the device is not in use by the user
+            return
+        if data['command'] == 'flood':
+            for i in range(50):
+                await ws.send('42' + json.dumps(['tx.progress', response_channel, {'source': 'dev', 'data': f'{i}\n'}]))
+            await self.done(ws, response_channel, True)
+            return
+        # chunks do not end on line boundaries
+        for chunk in ['ro.product', '.model=Pixel\nro.build', '.version.sdk=34\nlast']:
+            await ws.send('42' + json.dumps(['tx.progress', response_channel, {'source': 'dev', 'data': chunk}]))
+            await asyncio.sleep(0.02)
+        await self.done(ws, response_channel, True)
+
+    async def logcat(self, ws, filters):
+        minimum = {f['tag']: f['priority'] for f in filters}
+        for i in range(self.entries):
+            entry = LOGCAT[i % len(LOGCAT)]
+            if minimum and entry['priority'] < minimum.get(entry['tag'], 8):
+                continue
+            for serial in ('other', 'serial'):
+                await ws.send('42' + json.dumps(['logcat.entry', dict(
+                    entry, serial=serial, date=1700000000.0 + i, pid=1, tid=i,
+                )]))
+
+
+@pytest_asyncio.fixture
+async def fake_device():
+    fake = FakeDevice()
+    async with serve(fake.handler, '127.0.0.1', 0) as server:
+        port = server.sockets[0].getsockname()[1]
+        fake.url = socket_url(f'http://127.0.0.1:{port}/api/v1')
+        yield fake
+
+
+@pytest.mark.asyncio
+async def test_shell_yields_lines(fake_device):
+    async with WireClient(fake_device.url, 'jwt', timeout=2) as wire:
+        device = wire.device('serial', 'channel')
+        lines = [line async for line in device.shell('getprop', timeout=100, keepalive=True)]
+        with pytest.raises(WireError):
+            [line async for line in device.shell('fail')]
+        with pytest.raises(TransactionTimeout):
+            [line async for line in device.shell('silent', reply_timeout=0.1)]
+        equal(wire._streams, {})
+
+    equal(lines, ['ro.product.model=Pixel', 'ro.build.version.sdk=34', 'last'])
+    is_true(fake_device.keepalives >= 1)
+
+
+@pytest.mark.asyncio
+async def test_logcat_filters_and_stops(fake_device):
+    async with WireClient(fake_device.url, 'jwt', timeout=2) as wire:
+        entries = []
+        async for entry in wire.device('serial', 'channel').logcat({'ActivityManager': 4}, overflow='error'):
+            entries.append(entry)
+            if len(entries) == 10:
+                break
+        await asyncio.wait_for(fake_device.stopped.wait(), 2)
+
+    equal({entry.serial for entry in entries}, {'serial'})
+    equal({entry.message for entry in entries}, {'Start proc'})
+    equal([entry.tid for entry in entries], sorted(entry.tid for entry in entries))
+
+
+@pytest.mark.asyncio
+async def test_logcat_bounded_buffer_drops_oldest(fake_device):
+    async with WireClient(fake_device.url, 'jwt', timeout=2) as wire:
+        stream = wire.device('serial', 'channel').logcat(maxsize=5)
+        await stream.__anext__()
+        await asyncio.sleep(0.2)
+        dropped = wire.dropped('serial')
+        rest = []
+        while len(rest) < 5:
+            rest.append(await stream.__anext__())
+        await stream.aclose()
+
+    # the consumer read one entry, slept while the rest arrived, then found the last 5 in the buffer
+    equal(dropped + 1 + len(rest), fake_device.entries)
+    equal([entry.tid for entry in rest], list(range(fake_device.entries - 5, fake_device.entries)))
+
+
+@pytest.mark.asyncio
+async def test_reader_never_waits_for_an_abandoned_stream(fake_device):
+    async with WireClient(fake_device.url, 'jwt', timeout=2) as wire:
+        device = wire.device('serial', 'channel')
+        shell = device.shell('flood', maxsize=5, keepalive=True)
+        async for line in shell:
+            break
+        # the loop was left without aclose and the generator is still referenced, its buffer overflows
+        await asyncio.sleep(0.2)
+        kicked = await device.kick()
+        equal(wire._streams, {})
+
+        lines = []
+        with pytest.raises(WireError, match='overflowed'):
+            async for line in shell:
+                lines.append(line)
+
+    # the buffered lines are still read before the overflow is raised
+    is_true(kicked.success)
+    is_true(1 <= len(lines) <= 5)
+    equal(lines, [str(i) for i in range(1, len(lines) + 1)])
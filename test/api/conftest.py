@@ -1,18 +1,32 @@
+import asyncio
 import json
+import os
 import random
 import string
-import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from functools import partial
 from http.cookiejar import debug
 
 import pytest
-from devicehub_client.models import GroupPayload, GroupPayloadState, GroupPayloadClass, GroupState
+from devicehub_client.models import GroupPayload, GroupPayloadState, GroupPayloadClass, GroupState, GroupClass, \
+    DevicesPayload, UsersPayload, GroupsPayload
 from devicehub_client.types import Unset, UNSET
 from pytest_check import equal, is_not_none, is_true, is_false, is_in, greater_equal, greater, is_none
 
 from devicehub_client import AuthenticatedClient
-from devicehub_client.api.admin import create_service_user, delete_user, create_user
-from devicehub_client.api.devices import get_devices, get_device_by_serial
-from devicehub_client.api.groups import get_groups, get_group, create_group, delete_group
+from devicehub_client.api.admin import create_service_user, create_user, update_user_groups_quotas, \
+    remove_origin_group_devices, get_user_access_tokens_v2
+from devicehub_client.api.devices import get_devices
+from devicehub_client.api.groups import get_groups, get_group, create_group, delete_groups, remove_group_devices, \
+    remove_group_users, add_group_users, add_group_moderator, remove_group_moderator
+from devicehub_client.api.teams import get_user_teams
+from devicehub_client.api.users import get_user_by_email
+from devicehub_client.bulk import BulkExecutor
+from devicehub_client.instrumentation import LatencyHistogram, LatencyRecorder
+from devicehub_client.pool import get_default_pool
+from devicehub_client.retry import RetryPolicy
+from devicehub_client.waiter import device_groups, wait_until
 
 ADMIN_EMAIL = 'administrator@fakedomain.com'
 ADMIN_NAME = 'administrator'
@@ -26,10 +40,49 @@ DEFAULT_GROUPS_NUMBER = 10
 DEFAULT_GROUPS_DURATION = 1296000000
 DEFAULT_GROUPS_REPETITIONS = 10
 
+# users and groups created at once when a pool runs dry, and in flight while creating them
+DEFAULT_POOL_SIZE = 4
+POOL_CONCURRENCY = 8
+# pooled groups closer than this to their stop date are not lent anymore
+POOLED_GROUP_MIN_TTL = timedelta(minutes=10)
+
+
+# fixtures and parametrization of the benchmarks, see bench/helpers.py
+pytest_plugins = ('pytest_asyncio', 'bench.helpers')
+
+# latencies of every request made through api_client(_custom_token), reported at the end of the session
+LATENCY = LatencyRecorder()
+# time group membership changes took to show up in both devices and groups, reported at the end of the session
+PROPAGATION = LatencyHistogram()
+# seconds the group membership checks wait for devices and groups to agree
+GROUP_CHECK_TIMEOUT = 10
+
 
 def pytest_addoption(parser):
     parser.addoption("--token", action="store")
     parser.addoption("--base-url", action="store")
+    parser.addoption("--latency-report", action="store", help="write p50/p90/p99 per operationId to this JSON file")
+    parser.addoption("--run-bench", action="store_true", help="run the benchmarks against the API stack")
+    parser.addoption("--bench-scales", action="store", default="5,500,5000",
+                     help="comma separated fake fleet sizes of the API stack benchmarks")
+    parser.addoption("--bench-results", action="store", default="bench-results.json",
+                     help="JSON file the API stack benchmark results are written to")
+    parser.addoption("--pool-size", action="store", type=int, default=DEFAULT_POOL_SIZE,
+                     help="users and groups created ahead per xdist worker and reused across tests, 0 disables reuse")
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if PROPAGATION.count:
+        stats = PROPAGATION.summary()
+        terminalreporter.write_sep('-', 'Group membership propagation (ms)')
+        terminalreporter.write_line(f"count {stats['count']} " + ' '.join(
+            f'{key} {stats[key] * 1000:.1f}' for key in ('p50', 'p90', 'p99', 'max')))
+    if not LATENCY.summary():
+        return
+    terminalreporter.write_sep('-', 'API latency per operation (ms)')
+    terminalreporter.write_line(LATENCY.report())
+    if config.option.latency_report:
+        LATENCY.dump(config.option.latency_report)
 
 
 @pytest.fixture(scope='session')
@@ -54,45 +107,241 @@ def base_ws_uri(request):
         pytest.fail(reason='Missed base_url')
     return f'{url.replace("https", "wss")}/socket.io/?EIO=4&transport=websocket'
 
+# the process-wide keep-alive connection pool, every api client borrows connections from it
+@pytest.fixture(scope='session')
+def transport_pool():
+    with get_default_pool() as pool:
+        yield pool
+
+
+# transient failures of idempotent requests are retried, all clients of the session share the retry budget
+@pytest.fixture(scope='session')
+def retry_policy():
+    return RetryPolicy(max_attempts=3)
+
+
 @pytest.fixture()
-def api_client(token_from_params, base_url):
+def api_client(token_from_params, base_url, transport_pool, retry_policy):
     api_client = AuthenticatedClient(
         base_url=base_url,
-        token=token_from_params
+        token=token_from_params,
+        transport_pool=transport_pool,
+        retry=retry_policy,
+        **LATENCY.hooks()
     )
-    return api_client
+    yield api_client
+    api_client.close()
 
 
 # method return api client for make request from custom user(no admin user passed through run parameters)
 @pytest.fixture()
-def api_client_custom_token(base_url):
+def api_client_custom_token(base_url, transport_pool, retry_policy):
+    clients = []
     def api_client_by_token_func(token):
-        api_client = AuthenticatedClient(base_url=base_url, token=token)
+        api_client = AuthenticatedClient(base_url=base_url, token=token, transport_pool=transport_pool,
+                                         retry=retry_policy, **LATENCY.hooks())
+        clients.append(api_client)
         return api_client
 
-    return api_client_by_token_func
+    yield api_client_by_token_func
+    for api_client in clients:
+        api_client.close()
+
+
+def worker_tag():
+    """Tag of this xdist worker in the names of pooled entities, so that workers never share or delete them"""
+    return os.environ.get('PYTEST_XDIST_WORKER', 'main')
+
+
+class EntityPool:
+    """Users or groups created ahead for one xdist worker and lent to one test at a time
+
+    Entities are created pool_size at a time (concurrently) when the pool runs dry. A returned entity is checked,
+    and reset where possible, by check before it is lent again: right away on release, or lazily on the next
+    acquire when its state also depends on the teardown of other fixtures. Entities failing the check are not lent
+    again, nor are idle ones failing usable; with pool_size 0 nothing is ever lent twice.
+    """
+
+    def __init__(self, create, check, pool_size, check_on_release=False, usable=None):
+        self._create = create
+        self._check = check
+        self._usable = usable
+        self._pool_size = pool_size
+        self._check_on_release = check_on_release
+        self._idle = []
+        self._returned = []
+        self.created = []
+
+    def _fill(self):
+        size = max(self._pool_size, 1)
+        with ThreadPoolExecutor(max_workers=min(size, POOL_CONCURRENCY)) as executor:
+            entities = list(executor.map(lambda _: self._create(), range(size)))
+        self.created.extend(entities)
+        self._idle.extend(entities)
+
+    def acquire(self):
+        while self._returned:
+            entity = self._returned.pop()
+            if self._check(entity):
+                return entity
+        while self._idle and self._usable is not None and not self._usable(self._idle[-1]):
+            self._idle.pop()
+        if not self._idle:
+            self._fill()
+        return self._idle.pop()
+
+    def release(self, entity):
+        """Return an entity, False if it may not be lent again"""
+        if not self._pool_size:
+            return False
+        if not self._check_on_release:
+            self._returned.append(entity)
+            return True
+        if self._check(entity):
+            self._idle.append(entity)
+            return True
+        return False
+
+    def forget(self, entity):
+        self.created.remove(entity)
+
+
+def bulk_delete(base_url, token, emails=(), group_ids=()):
+    """Delete users and groups through the plural endpoints, in chunks"""
+    async def delete():
+        async with AuthenticatedClient(base_url=base_url, token=token) as client:
+            executor = BulkExecutor(client)
+            return await executor.delete_groups(group_ids), await executor.delete_users(emails)
+
+    return asyncio.run(delete())
+
 
+@pytest.fixture(scope='session')
+def pool_size(request):
+    return request.config.option.pool_size
 
-class Keeper():
-    def __init__(self):
-        self.ls = []
 
-    def size(self):
-        return len(self.ls)
+# base_url for the session-scoped fixtures, base_url itself is module-scoped
+@pytest.fixture(scope='session')
+def session_base_url(request):
+    url = request.config.option.base_url
+    if url is None:
+        pytest.fail(reason='Missed base_url')
+    return f'{url}/api/v1'
 
-    def add_obj(self, obj):
-        self.ls.append(obj)
 
-    def pop_obj(self):
-        return self.ls.pop()
+@pytest.fixture(scope='session')
+def session_api_client(session_base_url, token_from_params, transport_pool, retry_policy):
+    api_client = AuthenticatedClient(
+        base_url=session_base_url,
+        token=token_from_params,
+        transport_pool=transport_pool,
+        retry=retry_policy,
+        **LATENCY.hooks()
+    )
+    yield api_client
+    api_client.close()
+
+
+def user_state(api_client, email):
+    response = get_user_by_email.sync_detailed(email, client=api_client)
+    if response.status_code != 200 or not response.parsed.user:
+        return None
+    user = response.parsed.user.to_dict()
+    groups = user.get('groups', {})
+    quotas = groups.get('quotas', {})
+    tokens = get_user_access_tokens_v2.sync_detailed(email, client=api_client)
+    teams = get_user_teams.sync_detailed(email, client=api_client)
+    if tokens.status_code != 200 or teams.status_code != 200:
+        return None
+    return {
+        'privilege': user.get('privilege'),
+        'subscribed': sorted(groups.get('subscribed', [])),
+        'allocated': quotas.get('allocated'),
+        'repetitions': quotas.get('repetitions'),
+        'tokens': sorted((token.id for token in tokens.parsed.tokens), key=str),
+        'teams': sorted((team.id for team in teams.parsed.teams or []), key=str),
+    }
+
+
+def user_pool(api_client, pool_size, create_func):
+    """Pool of users created by create_func(user), reset to the state they were created in
+
+    Quotas are restored in place. Users whose privilege, subscriptions, access tokens or teams changed are discarded.
+    """
+    snapshots = {}
+
+    def create():
+        user = create_func(User(email=f'pool-{worker_tag()}-{random_string()}@test.com', name=random_string(),
+                                privilege=USER_PRIVILEGE))
+        snapshots[user.email] = user_state(api_client, user.email)
+        return user
+
+    def check(user):
+        state = user_state(api_client, user.email)
+        snapshot = snapshots[user.email]
+        if state is None or any(state[key] != snapshot[key] for key in ('privilege', 'subscribed', 'tokens', 'teams')):
+            return False
+        if (state['allocated'], state['repetitions']) == (snapshot['allocated'], snapshot['repetitions']):
+            return True
+        allocated = snapshot['allocated'] or {}
+        response = update_user_groups_quotas.sync_detailed(
+            user.email,
+            client=api_client,
+            number=int(allocated.get('number', DEFAULT_GROUPS_NUMBER)),
+            duration=int(allocated.get('duration', DEFAULT_GROUPS_DURATION)),
+            repetitions=snapshot['repetitions'] if snapshot['repetitions'] is not None else UNSET
+        )
+        return response.status_code == 200
+
+    return EntityPool(create, check, pool_size)
+
+
+def create_service_user_func(api_client, user):
+    response = create_service_user.sync_detailed(
+        client=api_client,
+        email=user.email,
+        name=user.name,
+        admin=user.privilege == ADMIN_PRIVILEGE,
+        secret=STF_SECRET
+    )
+    assert response.status_code == 201, response.content
+    user.token = response.parsed.service_user_info.to_dict().get('token')
+    return user
+
+
+def create_user_func(api_client, user):
+    response = create_user.sync_detailed(client=api_client, email=user.email, name=user.name)
+    assert response.status_code == 201, response.content
+    return user
+
+
+# service users (with a token) lent to service_user_creating, deleted in bulk at the end of the session
+@pytest.fixture(scope='session')
+def service_user_pool(session_api_client, session_base_url, token_from_params, pool_size):
+    pool = user_pool(session_api_client, pool_size, partial(create_service_user_func, session_api_client))
+    yield pool
+    bulk_delete(session_base_url, token_from_params, emails=[user.email for user in pool.created])
 
 
-# method create service user and return User and remove one after test
+# regular users lent to regular_user, deleted in bulk at the end of the session
+@pytest.fixture(scope='session')
+def regular_user_pool(session_api_client, session_base_url, token_from_params, pool_size):
+    pool = user_pool(session_api_client, pool_size, partial(create_user_func, session_api_client))
+    yield pool
+    bulk_delete(session_base_url, token_from_params, emails=[user.email for user in pool.created])
+
+
+# method return service user (from the pool unless a user is given) and give it back or remove it after test
 @pytest.fixture()
-def service_user_creating(request, api_client, stf_secret, random_user, successful_response_check):
-    request.param = Keeper()
-    def service_user_creating_func(user=random_user()):
-        request.param.add_obj(user)
+def service_user_creating(api_client, stf_secret, successful_response_check, service_user_pool):
+    lent = []
+    def service_user_creating_func(user=None):
+        if user is None:
+            user = service_user_pool.acquire()
+            lent.append(user)
+            return user
+        service_user_pool.created.append(user)
         response = create_service_user.sync_detailed(
             client=api_client,
             email=user.email,
@@ -115,18 +364,21 @@ def service_user_creating(request, api_client, stf_secret, random_user, successf
         return user
 
     yield service_user_creating_func
-    # remove service user auto tests
-    while request.param.size() != 0:
-        response = delete_user.sync_detailed(client=api_client, email=request.param.pop_obj().email)
-        successful_response_check(response, description='Deleted (users)')
+    # users given by the test and dirty pooled users are removed in bulk at the end of the session
+    for user in lent:
+        service_user_pool.release(user)
 
 
-# method create regular user and return User and remove one after test
+# method return regular user (from the pool unless a user is given) and give it back or remove it after test
 @pytest.fixture()
-def regular_user(request, api_client, stf_secret, random_user, successful_response_check):
-    request.param = Keeper()
-    def regular_user_func(user=random_user()):
-        request.param.add_obj(user)
+def regular_user(api_client, successful_response_check, regular_user_pool):
+    lent = []
+    def regular_user_func(user=None):
+        if user is None:
+            user = regular_user_pool.acquire()
+            lent.append(user)
+            return user
+        regular_user_pool.created.append(user)
         response = create_user.sync_detailed(
             client=api_client,
             email=user.email,
@@ -148,15 +400,14 @@ def regular_user(request, api_client, stf_secret, random_user, successful_respon
         return user
 
     yield regular_user_func
-    # remove regular user auto tests
-    while request.param.size() != 0:
-        response = delete_user.sync_detailed(client=api_client, email=request.param.pop_obj().email)
-        successful_response_check(response, description='Deleted (users)')
+    for user in lent:
+        regular_user_pool.release(user)
 
 @pytest.fixture()
-def api_client_with_bad_token(base_url):
-    api_client = AuthenticatedClient(base_url=base_url, token='bad_token')
-    return api_client
+def api_client_with_bad_token(base_url, transport_pool):
+    api_client = AuthenticatedClient(base_url=base_url, token='bad_token', transport_pool=transport_pool)
+    yield api_client
+    api_client.close()
 
 
 class User:
@@ -188,12 +439,13 @@ def random_user(random_str):
     return random_user_func
 
 
+def random_string(size=10, chars=string.ascii_uppercase + string.ascii_lowercase + string.digits):
+    return ''.join(random.choice(chars) for _ in range(size))
+
+
 @pytest.fixture()
 def random_str():
-    def random_str_func(size=10, chars=string.ascii_uppercase + string.ascii_lowercase + string.digits):
-        return ''.join(random.choice(chars) for _ in range(size))
-
-    return random_str_func
+    return random_string
 
 @pytest.fixture()
 def random_num():
@@ -299,50 +551,58 @@ def fake_device_certain_field_check():
     return fake_device_certain_field_check_func
 
 
-@pytest.fixture()
-def __device_has_group_check(api_client, successful_response_check):
-    def device_has_group_check_func(serial, group_id, group_name=None):
-        response = get_device_by_serial.sync_detailed(serial=serial, client=api_client)
-        successful_response_check(response, description='Device Information')
-        is_not_none(response.parsed.device)
-        device_dict = response.parsed.device.to_dict()
-        equal(device_dict.get('group').get('id'), group_id)
-        if group_name is not None:
-            equal(device_dict.get('group').get('name'), group_name)
+def wait_for_group_membership(api_client, serials, group_id):
+    """Poll until the devices and the group agree that serials are in group_id
 
-    return device_has_group_check_func
+    Every attempt costs one field-projected get_devices call for all serials and one get_group call. Returns the
+    Convergence holding the last (device groups, get_group response), its elapsed time is recorded in PROPAGATION.
+    """
+    serials = list(serials)
 
+    def probe():
+        return device_groups(api_client, serials), get_group.sync_detailed(id=group_id, client=api_client)
 
-# method check that device belongs to group(two requests check data in devices and groups tables)
-@pytest.fixture()
-def device_in_group_check(api_client, successful_response_check, __device_has_group_check):
-    def device_in_group_check_func(serial, group_id, group_name=None):
-        __device_has_group_check(serial, group_id, group_name)
-        response = get_group.sync_detailed(id=group_id, client=api_client)
-        successful_response_check(response, description='Group Information')
-        is_not_none(response.parsed.group)
-        group_dict = response.parsed.group.to_dict()
-        is_in(serial, group_dict.get('devices'))
+    def converged(value):
+        groups, response = value
+        members = response.parsed.group.devices if response.status_code == 200 else None
+        return set(serials) <= set(members or []) and \
+            all(groups[serial] is not None and groups[serial][0] == group_id for serial in serials)
 
-    return device_in_group_check_func
+    convergence = wait_until(probe, converged, timeout=GROUP_CHECK_TIMEOUT)
+    if convergence.converged:
+        PROPAGATION.record(convergence.elapsed)
+    return convergence
 
 
+# method check that devices belong to group(data in devices and groups tables), waits until both agree
 @pytest.fixture()
-def devices_in_group_check(api_client, successful_response_check, __device_has_group_check):
+def devices_in_group_check(api_client, successful_response_check):
     def devices_in_group_check_func(serials, group_id, group_name=None):
-        # add timeout to wait while devices move to group in DB
-        time.sleep(1)
-        response = get_group.sync_detailed(id=group_id, client=api_client)
+        convergence = wait_for_group_membership(api_client, serials, group_id)
+        groups, response = convergence.value
         successful_response_check(response, description='Group Information')
         is_not_none(response.parsed.group)
         group_dict = response.parsed.group.to_dict()
         for serial in serials:
             is_in(serial, group_dict.get('devices'))
-            __device_has_group_check(serial, group_id, group_name)
+            is_not_none(groups[serial], f'{serial} is not listed')
+            if groups[serial] is not None:
+                equal(groups[serial][0], group_id)
+                if group_name is not None:
+                    equal(groups[serial][1], group_name)
+        return convergence
 
     return devices_in_group_check_func
 
 
+@pytest.fixture()
+def device_in_group_check(devices_in_group_check):
+    def device_in_group_check_func(serial, group_id, group_name=None):
+        return devices_in_group_check([serial], group_id, group_name)
+
+    return device_in_group_check_func
+
+
 @pytest.fixture()
 def common_group_id(api_client):
     response = get_groups.sync_detailed(client=api_client)
@@ -353,10 +613,108 @@ def common_group_id(api_client):
     return common_group.to_dict()['id']
 
 
-# method create group and remove one after test
+def group_state(group):
+    return (group.name, group.class_, group.state, group.repetitions,
+            [(date.start, date.stop) for date in group.dates or []])
+
+
+def group_members(group):
+    return set(group.users or []), set(group.moderators or [])
+
+
+def group_usable(group):
+    stop = max((date.stop for date in group.dates or []), default=None)
+    return stop is None or stop - datetime.now(timezone.utc) >= POOLED_GROUP_MIN_TTL
+
+
+def create_pooled_group(api_client, group_class):
+    response = create_group.sync_detailed(
+        client=api_client,
+        body=GroupPayload(name=f'Group_{group_class.name}-{worker_tag()}-{random_string()}', class_=group_class)
+    )
+    assert response.status_code == 201, response.content
+    assert response.parsed.description == 'Created', response.content
+    group = response.parsed.group
+    assert group is not None, response.content
+    assert group.class_ == group_class, group.class_
+    assert group.state == GroupState.READY, group.state
+    return group
+
+
+def restore_group_members(api_client, group_id, current, snapshot):
+    """Put back the users and moderators of a group, False if one of the requests failed"""
+    (users, moderators), (current_users, current_moderators) = snapshot, group_members(current)
+    responses = [remove_group_moderator.sync_detailed(group_id, email, client=api_client)
+                 for email in current_moderators - moderators]
+    if current_users - users:
+        responses.append(remove_group_users.sync_detailed(
+            group_id, client=api_client, body=UsersPayload(emails=','.join(current_users - users))))
+    if users - current_users:
+        responses.append(add_group_users.sync_detailed(
+            group_id, client=api_client, body=UsersPayload(emails=','.join(users - current_users))))
+    responses += [add_group_moderator.sync_detailed(group_id, email, client=api_client)
+                  for email in moderators - current_moderators]
+    return all(response.status_code == 200 for response in responses)
+
+
+def reset_group(api_client, snapshots, group):
+    """Take the devices, users and moderators changed by a test back out of a pooled group
+
+    False if that is not enough and the group has to be discarded.
+    """
+    response = get_group.sync_detailed(client=api_client, id=group.id)
+    if response.status_code != 200:
+        return False
+    current = response.parsed.group
+    state, members = snapshots[group.id]
+    if group_state(current) != state or not group_usable(group):
+        return False
+    if current.devices:
+        remove_devices = (remove_origin_group_devices if current.class_ in (GroupClass.BOOKABLE, GroupClass.STANDARD)
+                          else remove_group_devices)
+        response = remove_devices.sync_detailed(group.id, client=api_client,
+                                                body=DevicesPayload(serials=','.join(current.devices)))
+        if response.status_code != 200:
+            return False
+    if group_members(current) == members:
+        return True
+    if not restore_group_members(api_client, group.id, current, members):
+        return False
+    response = get_group.sync_detailed(client=api_client, id=group.id)
+    return response.status_code == 200 and group_members(response.parsed.group) == members
+
+
+# per class pools of groups owned by the admin, lent to group_creating for its default arguments
+@pytest.fixture(scope='session')
+def group_pools(session_api_client, session_base_url, token_from_params, pool_size):
+    pools = {}
+    snapshots = {}
+
+    def create(group_class):
+        group = create_pooled_group(session_api_client, group_class)
+        # the members as the server lists them, the creation response may leave the moderators out
+        response = get_group.sync_detailed(client=session_api_client, id=group.id)
+        assert response.status_code == 200, response.content
+        snapshots[group.id] = (group_state(group), group_members(response.parsed.group))
+        return group
+
+    def group_pool(group_class):
+        if group_class not in pools:
+            pools[group_class] = EntityPool(partial(create, group_class),
+                                            partial(reset_group, session_api_client, snapshots),
+                                            pool_size, check_on_release=True, usable=group_usable)
+        return pools[group_class]
+
+    yield group_pool
+    bulk_delete(session_base_url, token_from_params,
+                group_ids=[group.id for pool in pools.values() for group in pool.created])
+
+
+# method create group (or take an admin group from the pool) and remove or reset one after test
 @pytest.fixture()
-def group_creating(request, api_client, stf_secret, successful_response_check, random_str, unsuccess_response_check):
-    request.param = Keeper()
+def group_creating(api_client, successful_response_check, random_str, group_pools):
+    created = []
+    lent = []
     def group_creating_func(
             custom_api_client=api_client,
             group_class=GroupPayloadClass.ONCE,
@@ -365,6 +723,10 @@ def group_creating(request, api_client, stf_secret, successful_response_check, r
             stop_time=UNSET,
             repetitions=UNSET
     ):
+        if custom_api_client is api_client and all(value is UNSET for value in (state, start_time, stop_time, repetitions)):
+            group = group_pools(group_class).acquire()
+            lent.append((group_class, group))
+            return group
         group_response = create_group.sync_detailed(
             client=custom_api_client,
             body=GroupPayload(
@@ -381,17 +743,19 @@ def group_creating(request, api_client, stf_secret, successful_response_check, r
         is_not_none(group)
         equal(group.class_, group_class)
         equal(group.state, GroupState.READY if state is UNSET else state)
-        request.param.add_obj(group)
+        created.append(group)
         return group
 
     yield group_creating_func
-    # remove groups or get response group not found
-    while request.param.size() != 0:
-        response = delete_group.sync_detailed(client=api_client, id=request.param.pop_obj().id)
-        if response.status_code == 200:
-            successful_response_check(response, description='Deleted (groups)')
-        else:
-            unsuccess_response_check(response, status_code=404, description='Not Found (groups)')
+    # give pooled groups back, remove the others (or get response group not found) in one request
+    for group_class, group in lent:
+        if not group_pools(group_class).release(group):
+            group_pools(group_class).forget(group)
+            created.append(group)
+    if created:
+        response = delete_groups.sync_detailed(client=api_client,
+                                               body=GroupsPayload(ids=','.join(group.id for group in created)))
+        is_in(response.status_code, (200, 404))
 
 
 @pytest.fixture()
@@ -1,8 +1,12 @@
 """A client library for accessing DeviceHub"""
 
 from .client import AuthenticatedClient, Client
+from .pool import TransportPool
+from .ratelimit import RateLimiter
 
 __all__ = (
     "AuthenticatedClient",
     "Client",
+    "RateLimiter",
+    "TransportPool",
 )
@@ -1 +1,34 @@
-"""Contains methods for accessing the API"""
+"""Contains methods for accessing the API
+
+Tag packages and their endpoint modules are imported on first attribute access (PEP 562), so
+``devicehub_client.api.devices.get_devices`` works after a plain ``import devicehub_client.api``.
+"""
+
+import pkgutil
+import sys
+from importlib import import_module
+from types import ModuleType
+from typing import Callable, Iterable, List, Tuple
+
+
+def _lazy_submodules(package: str, path: Iterable[str]) -> Tuple[Callable[[str], ModuleType], Callable[[], List[str]]]:
+    """Module ``__getattr__`` and ``__dir__`` importing the submodules of ``package`` on first access"""
+
+    def __getattr__(name: str) -> ModuleType:
+        if name.startswith("__"):
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        try:
+            return import_module(f"{package}.{name}")
+        except ModuleNotFoundError as e:
+            if e.name != f"{package}.{name}":
+                raise
+            raise AttributeError(f"module {package!r} has no attribute {name!r}") from None
+
+    def __dir__() -> List[str]:
+        submodules = {module.name for module in pkgutil.iter_modules(path)}
+        return sorted(set(vars(sys.modules[package])) | submodules)
+
+    return __getattr__, __dir__
+
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
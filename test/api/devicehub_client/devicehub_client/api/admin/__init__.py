@@ -0,0 +1,42 @@
+"""Endpoints tagged "admin", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "deleteUsers": ("DELETE", "/users"),
+    "updateUsersAlertMessage": ("PUT", "/users/alertMessage"),
+    "updateDefaultUserGroupsQuotas": ("PUT", "/users/groupsQuotas"),
+    "grantAdmin": ("POST", "/users/grantAdmin/{email}"),
+    "revokeAdmin": ("DELETE", "/users/revokeAdmin/{email}"),
+    "createUser": ("POST", "/users/{email}"),
+    "deleteUser": ("DELETE", "/users/{email}"),
+    "createServiceUser": ("POST", "/users/service/{email}"),
+    "updateUserGroupsQuotas": ("PUT", "/users/{email}/groupsQuotas"),
+    "getUserDevicesV2": ("GET", "/users/{email}/devices"),
+    "getUserDevice": ("GET", "/users/{email}/devices/{serial}"),
+    "addUserDeviceV3": ("POST", "/users/{email}/devices/{serial}"),
+    "deleteUserDevice": ("DELETE", "/users/{email}/devices/{serial}"),
+    "remoteConnectUserDevice": ("POST", "/users/{email}/devices/{serial}/remoteConnect"),
+    "remoteDisconnectUserDevice": ("DELETE", "/users/{email}/devices/{serial}/remoteConnect"),
+    "getUserAccessTokensV2": ("GET", "/users/{email}/accessTokens"),
+    "createUserAccessToken": ("POST", "/users/{email}/accessTokens"),
+    "deleteUserAccessTokens": ("DELETE", "/users/{email}/accessTokens"),
+    "getUserAccessToken": ("GET", "/users/{email}/accessTokens/{id}"),
+    "deleteUserAccessToken": ("DELETE", "/users/{email}/accessTokens/{id}"),
+    "deleteDevices": ("DELETE", "/devices"),
+    "putDeviceBySerial": ("PUT", "/devices/{serial}"),
+    "deleteDevice": ("DELETE", "/devices/{serial}"),
+    "updateStorageInfo": ("PUT", "/devices/{serial}/updateStorageInfo"),
+    "useDeviceByUser": ("POST", "/devices/{serial}/use"),
+    "addOriginGroupDevices": ("PUT", "/devices/groups/{id}"),
+    "removeOriginGroupDevices": ("DELETE", "/devices/groups/{id}"),
+    "renewAdbPort": ("PUT", "/devices/{serial}/adbPort"),
+    "getDeviceGroups": ("GET", "/devices/{serial}/groups"),
+    "addOriginGroupDevice": ("PUT", "/devices/{serial}/groups/{id}"),
+    "removeOriginGroupDevice": ("DELETE", "/devices/{serial}/groups/{id}"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
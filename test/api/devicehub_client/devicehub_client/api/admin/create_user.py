@@ -31,7 +31,7 @@ def _get_kwargs(
 
 def _parse_response(*, client: Union[AuthenticatedClient, Client], response: httpx.Response) -> Optional[UserResponse]:
     if response.status_code == 201:
-        response_201 = UserResponse.from_dict(response.json())
+        response_201 = UserResponse.from_dict(client.decode_json(response))
 
         return response_201
     if client.raise_on_unexpected_status:
@@ -45,7 +45,7 @@ def _build_response(*, client: Union[AuthenticatedClient, Client], response: htt
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
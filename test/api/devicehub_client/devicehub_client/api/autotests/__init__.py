@@ -0,0 +1,16 @@
+"""Endpoints tagged "autotests", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "captureDevices": ("GET", "/autotests"),
+    "freeDevices": ("DELETE", "/autotests"),
+    "addDevices": ("GET", "/autotests/{id}/addDevices/"),
+    "installOnDevice": ("POST", "/autotests/install/{serial}"),
+    "useAndConnectDevice": ("POST", "/autotests/useDevice"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
@@ -6,7 +6,7 @@ import httpx
 from ... import errors
 from ...client import AuthenticatedClient, Client
 from ...models.adb_install_flags_payload import AdbInstallFlagsPayload
-from ...models.remote_connect_user_device_response import RemoteConnectUserDeviceResponse
+from ...models.default_response import DefaultResponse
 from ...types import Response
 
 
@@ -33,9 +33,9 @@ def _get_kwargs(
 
 def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Optional[RemoteConnectUserDeviceResponse]:
+) -> Optional[DefaultResponse]:
     if response.status_code == 200:
-        response_200 = RemoteConnectUserDeviceResponse.from_dict(response.json())
+        response_200 = DefaultResponse.from_dict(client.decode_json(response))
 
         return response_200
     if client.raise_on_unexpected_status:
@@ -46,12 +46,12 @@ def _parse_response(
 
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Response[RemoteConnectUserDeviceResponse]:
+) -> Response[DefaultResponse]:
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
@@ -60,7 +60,7 @@ def sync_detailed(
     *,
     client: Union[AuthenticatedClient, Client],
     body: AdbInstallFlagsPayload,
-) -> Response[RemoteConnectUserDeviceResponse]:
+) -> Response[DefaultResponse]:
     """install apk on device by serial
 
      Installing apk to device from url
@@ -74,7 +74,7 @@ def sync_detailed(
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[RemoteConnectUserDeviceResponse]
+        Response[DefaultResponse]
     """
 
     kwargs = _get_kwargs(
@@ -94,7 +94,7 @@ def sync(
     *,
     client: Union[AuthenticatedClient, Client],
     body: AdbInstallFlagsPayload,
-) -> Optional[RemoteConnectUserDeviceResponse]:
+) -> Optional[DefaultResponse]:
     """install apk on device by serial
 
      Installing apk to device from url
@@ -108,7 +108,7 @@ def sync(
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        RemoteConnectUserDeviceResponse
+        DefaultResponse
     """
 
     return sync_detailed(
@@ -123,7 +123,7 @@ async def asyncio_detailed(
     *,
     client: Union[AuthenticatedClient, Client],
     body: AdbInstallFlagsPayload,
-) -> Response[RemoteConnectUserDeviceResponse]:
+) -> Response[DefaultResponse]:
     """install apk on device by serial
 
      Installing apk to device from url
@@ -137,7 +137,7 @@ async def asyncio_detailed(
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[RemoteConnectUserDeviceResponse]
+        Response[DefaultResponse]
     """
 
     kwargs = _get_kwargs(
@@ -155,7 +155,7 @@ async def asyncio(
     *,
     client: Union[AuthenticatedClient, Client],
     body: AdbInstallFlagsPayload,
-) -> Optional[RemoteConnectUserDeviceResponse]:
+) -> Optional[DefaultResponse]:
     """install apk on device by serial
 
      Installing apk to device from url
@@ -169,7 +169,7 @@ async def asyncio(
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        RemoteConnectUserDeviceResponse
+        DefaultResponse
     """
 
     return (
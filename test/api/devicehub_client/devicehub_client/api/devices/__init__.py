@@ -0,0 +1,17 @@
+"""Endpoints tagged "devices", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "getDevices": ("GET", "/devices"),
+    "getAdbRange": ("GET", "/devices/adbRange"),
+    "getDeviceChanges": ("GET", "/devices/changes"),
+    "getDeviceBySerial": ("GET", "/devices/{serial}"),
+    "getDeviceBookings": ("GET", "/devices/{serial}/bookings"),
+    "generateFakeDevice": ("GET", "/devices/fake"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
@@ -32,7 +32,7 @@ def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Optional[GenerateFakeDeviceResponse200]:
     if response.status_code == 200:
-        response_200 = GenerateFakeDeviceResponse200.from_dict(response.json())
+        response_200 = GenerateFakeDeviceResponse200.from_dict(client.decode_json(response))
 
         return response_200
     if client.raise_on_unexpected_status:
@@ -48,7 +48,7 @@ def _build_response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
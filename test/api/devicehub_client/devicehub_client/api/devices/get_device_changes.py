@@ -0,0 +1,198 @@
+from http import HTTPStatus
+from typing import Any, Dict, Optional, Union
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.device_changes_response import DeviceChangesResponse
+from ...models.unexpected_error_response import UnexpectedErrorResponse
+from ...types import UNSET, Response, Unset
+
+
+def _get_kwargs(
+    *,
+    cursor: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = 1000,
+) -> Dict[str, Any]:
+    params: Dict[str, Any] = {}
+
+    params["cursor"] = cursor
+
+    params["limit"] = limit
+
+    params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
+
+    _kwargs: Dict[str, Any] = {
+        "method": "get",
+        "url": "/devices/changes",
+        "params": params,
+    }
+
+    return _kwargs
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    if response.status_code == 200:
+        response_200 = DeviceChangesResponse.from_dict(client.decode_json(response))
+
+        return response_200
+    if response.status_code == 410:
+        response_410 = UnexpectedErrorResponse.from_dict(client.decode_json(response))
+
+        return response_410
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=client.parse_response(response, _parse_response),
+    )
+
+
+def sync_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = 1000,
+) -> Response[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    """Device Changes
+
+     Changes of presence, status, owner, group and identity fields of the devices visible to the user,
+    in the order they were made. Call without a cursor to get the current position of the feed, then
+    pass
+    the returned cursor to get the changes made since then.
+
+    Args:
+        cursor (Union[Unset, str]):
+        limit (Union[Unset, int]):  Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[DeviceChangesResponse, UnexpectedErrorResponse]]
+    """
+
+    kwargs = _get_kwargs(
+        cursor=cursor,
+        limit=limit,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = 1000,
+) -> Optional[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    """Device Changes
+
+     Changes of presence, status, owner, group and identity fields of the devices visible to the user,
+    in the order they were made. Call without a cursor to get the current position of the feed, then
+    pass
+    the returned cursor to get the changes made since then.
+
+    Args:
+        cursor (Union[Unset, str]):
+        limit (Union[Unset, int]):  Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[DeviceChangesResponse, UnexpectedErrorResponse]
+    """
+
+    return sync_detailed(
+        client=client,
+        cursor=cursor,
+        limit=limit,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = 1000,
+) -> Response[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    """Device Changes
+
+     Changes of presence, status, owner, group and identity fields of the devices visible to the user,
+    in the order they were made. Call without a cursor to get the current position of the feed, then
+    pass
+    the returned cursor to get the changes made since then.
+
+    Args:
+        cursor (Union[Unset, str]):
+        limit (Union[Unset, int]):  Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[Union[DeviceChangesResponse, UnexpectedErrorResponse]]
+    """
+
+    kwargs = _get_kwargs(
+        cursor=cursor,
+        limit=limit,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    cursor: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = 1000,
+) -> Optional[Union[DeviceChangesResponse, UnexpectedErrorResponse]]:
+    """Device Changes
+
+     Changes of presence, status, owner, group and identity fields of the devices visible to the user,
+    in the order they were made. Call without a cursor to get the current position of the feed, then
+    pass
+    the returned cursor to get the changes made since then.
+
+    Args:
+        cursor (Union[Unset, str]):
+        limit (Union[Unset, int]):  Default: 1000.
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Union[DeviceChangesResponse, UnexpectedErrorResponse]
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            cursor=cursor,
+            limit=limit,
+        )
+    ).parsed
@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union, cast
 
 import httpx
 
@@ -14,7 +14,25 @@ def _get_kwargs(
     *,
     target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
     fields: Union[Unset, str] = UNSET,
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+    owner: Union[Unset, List[str]] = UNSET,
+    owner_name: Union[Unset, List[str]] = UNSET,
+    group_id: Union[Unset, List[str]] = UNSET,
+    group_name: Union[Unset, List[str]] = UNSET,
+    status: Union[Unset, List[int]] = UNSET,
+    present: Union[Unset, bool] = UNSET,
+    using: Union[Unset, bool] = UNSET,
+    abi: Union[Unset, List[str]] = UNSET,
+    sdk: Union[Unset, List[str]] = UNSET,
+    model: Union[Unset, List[str]] = UNSET,
+    platform: Union[Unset, List[str]] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
 ) -> Dict[str, Any]:
+    headers: Dict[str, Any] = {}
+    if not isinstance(if_none_match, Unset):
+        headers["If-None-Match"] = if_none_match
+
     params: Dict[str, Any] = {}
 
     json_target: Union[Unset, str] = UNSET
@@ -25,6 +43,68 @@ def _get_kwargs(
 
     params["fields"] = fields
 
+    params["limit"] = limit
+
+    params["cursor"] = cursor
+
+    json_owner: Union[Unset, List[str]] = UNSET
+    if not isinstance(owner, Unset):
+        json_owner = owner
+
+    params["owner"] = json_owner
+
+    json_owner_name: Union[Unset, List[str]] = UNSET
+    if not isinstance(owner_name, Unset):
+        json_owner_name = owner_name
+
+    params["ownerName"] = json_owner_name
+
+    json_group_id: Union[Unset, List[str]] = UNSET
+    if not isinstance(group_id, Unset):
+        json_group_id = group_id
+
+    params["groupId"] = json_group_id
+
+    json_group_name: Union[Unset, List[str]] = UNSET
+    if not isinstance(group_name, Unset):
+        json_group_name = group_name
+
+    params["groupName"] = json_group_name
+
+    json_status: Union[Unset, List[int]] = UNSET
+    if not isinstance(status, Unset):
+        json_status = status
+
+    params["status"] = json_status
+
+    params["present"] = present
+
+    params["using"] = using
+
+    json_abi: Union[Unset, List[str]] = UNSET
+    if not isinstance(abi, Unset):
+        json_abi = abi
+
+    params["abi"] = json_abi
+
+    json_sdk: Union[Unset, List[str]] = UNSET
+    if not isinstance(sdk, Unset):
+        json_sdk = sdk
+
+    params["sdk"] = json_sdk
+
+    json_model: Union[Unset, List[str]] = UNSET
+    if not isinstance(model, Unset):
+        json_model = model
+
+    params["model"] = json_model
+
+    json_platform: Union[Unset, List[str]] = UNSET
+    if not isinstance(platform, Unset):
+        json_platform = platform
+
+    params["platform"] = json_platform
+
     params = {k: v for k, v in params.items() if v is not UNSET and v is not None}
 
     _kwargs: Dict[str, Any] = {
@@ -33,16 +113,20 @@ def _get_kwargs(
         "params": params,
     }
 
+    _kwargs["headers"] = headers
     return _kwargs
 
 
 def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Optional[DeviceListResponse]:
+) -> Optional[Union[Any, DeviceListResponse]]:
     if response.status_code == 200:
-        response_200 = DeviceListResponse.from_dict(response.json())
+        response_200 = DeviceListResponse.from_dict(client.decode_json(response), lazy=client.lazy_models)
 
         return response_200
+    if response.status_code == 304:
+        response_304 = cast(Any, None)
+        return response_304
     if client.raise_on_unexpected_status:
         raise errors.UnexpectedStatus(response.status_code, response.content)
     else:
@@ -51,12 +135,12 @@ def _parse_response(
 
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Response[DeviceListResponse]:
+) -> Response[Union[Any, DeviceListResponse]]:
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
@@ -65,7 +149,21 @@ def sync_detailed(
     client: Union[AuthenticatedClient, Client],
     target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
     fields: Union[Unset, str] = UNSET,
-) -> Response[DeviceListResponse]:
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+    owner: Union[Unset, List[str]] = UNSET,
+    owner_name: Union[Unset, List[str]] = UNSET,
+    group_id: Union[Unset, List[str]] = UNSET,
+    group_name: Union[Unset, List[str]] = UNSET,
+    status: Union[Unset, List[int]] = UNSET,
+    present: Union[Unset, bool] = UNSET,
+    using: Union[Unset, bool] = UNSET,
+    abi: Union[Unset, List[str]] = UNSET,
+    sdk: Union[Unset, List[str]] = UNSET,
+    model: Union[Unset, List[str]] = UNSET,
+    platform: Union[Unset, List[str]] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Response[Union[Any, DeviceListResponse]]:
     """Device List
 
      The devices endpoint return list of all the STF devices including Disconnected and Offline
@@ -73,24 +171,57 @@ def sync_detailed(
     Args:
         target (Union[Unset, GetDevicesTarget]):  Default: GetDevicesTarget.USER.
         fields (Union[Unset, str]):
+        limit (Union[Unset, int]):
+        cursor (Union[Unset, str]):
+        owner (Union[Unset, List[str]]):
+        owner_name (Union[Unset, List[str]]):
+        group_id (Union[Unset, List[str]]):
+        group_name (Union[Unset, List[str]]):
+        status (Union[Unset, List[int]]):
+        present (Union[Unset, bool]):
+        using (Union[Unset, bool]):
+        abi (Union[Unset, List[str]]):
+        sdk (Union[Unset, List[str]]):
+        model (Union[Unset, List[str]]):
+        platform (Union[Unset, List[str]]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[DeviceListResponse]
+        Response[Union[Any, DeviceListResponse]]
     """
 
     kwargs = _get_kwargs(
         target=target,
         fields=fields,
+        limit=limit,
+        cursor=cursor,
+        owner=owner,
+        owner_name=owner_name,
+        group_id=group_id,
+        group_name=group_name,
+        status=status,
+        present=present,
+        using=using,
+        abi=abi,
+        sdk=sdk,
+        model=model,
+        platform=platform,
+        if_none_match=if_none_match,
     )
 
+    if client.response_cache is not None:
+        client.response_cache.prepare(client, kwargs)
+
     response = client.get_httpx_client().request(
         **kwargs,
     )
 
+    if client.response_cache is not None:
+        return client.response_cache.resolve(client, kwargs, _build_response(client=client, response=response))
     return _build_response(client=client, response=response)
 
 
@@ -99,7 +230,21 @@ def sync(
     client: Union[AuthenticatedClient, Client],
     target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
     fields: Union[Unset, str] = UNSET,
-) -> Optional[DeviceListResponse]:
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+    owner: Union[Unset, List[str]] = UNSET,
+    owner_name: Union[Unset, List[str]] = UNSET,
+    group_id: Union[Unset, List[str]] = UNSET,
+    group_name: Union[Unset, List[str]] = UNSET,
+    status: Union[Unset, List[int]] = UNSET,
+    present: Union[Unset, bool] = UNSET,
+    using: Union[Unset, bool] = UNSET,
+    abi: Union[Unset, List[str]] = UNSET,
+    sdk: Union[Unset, List[str]] = UNSET,
+    model: Union[Unset, List[str]] = UNSET,
+    platform: Union[Unset, List[str]] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Optional[Union[Any, DeviceListResponse]]:
     """Device List
 
      The devices endpoint return list of all the STF devices including Disconnected and Offline
@@ -107,19 +252,47 @@ def sync(
     Args:
         target (Union[Unset, GetDevicesTarget]):  Default: GetDevicesTarget.USER.
         fields (Union[Unset, str]):
+        limit (Union[Unset, int]):
+        cursor (Union[Unset, str]):
+        owner (Union[Unset, List[str]]):
+        owner_name (Union[Unset, List[str]]):
+        group_id (Union[Unset, List[str]]):
+        group_name (Union[Unset, List[str]]):
+        status (Union[Unset, List[int]]):
+        present (Union[Unset, bool]):
+        using (Union[Unset, bool]):
+        abi (Union[Unset, List[str]]):
+        sdk (Union[Unset, List[str]]):
+        model (Union[Unset, List[str]]):
+        platform (Union[Unset, List[str]]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        DeviceListResponse
+        Union[Any, DeviceListResponse]
     """
 
     return sync_detailed(
         client=client,
         target=target,
         fields=fields,
+        limit=limit,
+        cursor=cursor,
+        owner=owner,
+        owner_name=owner_name,
+        group_id=group_id,
+        group_name=group_name,
+        status=status,
+        present=present,
+        using=using,
+        abi=abi,
+        sdk=sdk,
+        model=model,
+        platform=platform,
+        if_none_match=if_none_match,
     ).parsed
 
 
@@ -128,7 +301,21 @@ async def asyncio_detailed(
     client: Union[AuthenticatedClient, Client],
     target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
     fields: Union[Unset, str] = UNSET,
-) -> Response[DeviceListResponse]:
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+    owner: Union[Unset, List[str]] = UNSET,
+    owner_name: Union[Unset, List[str]] = UNSET,
+    group_id: Union[Unset, List[str]] = UNSET,
+    group_name: Union[Unset, List[str]] = UNSET,
+    status: Union[Unset, List[int]] = UNSET,
+    present: Union[Unset, bool] = UNSET,
+    using: Union[Unset, bool] = UNSET,
+    abi: Union[Unset, List[str]] = UNSET,
+    sdk: Union[Unset, List[str]] = UNSET,
+    model: Union[Unset, List[str]] = UNSET,
+    platform: Union[Unset, List[str]] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Response[Union[Any, DeviceListResponse]]:
     """Device List
 
      The devices endpoint return list of all the STF devices including Disconnected and Offline
@@ -136,22 +323,55 @@ async def asyncio_detailed(
     Args:
         target (Union[Unset, GetDevicesTarget]):  Default: GetDevicesTarget.USER.
         fields (Union[Unset, str]):
+        limit (Union[Unset, int]):
+        cursor (Union[Unset, str]):
+        owner (Union[Unset, List[str]]):
+        owner_name (Union[Unset, List[str]]):
+        group_id (Union[Unset, List[str]]):
+        group_name (Union[Unset, List[str]]):
+        status (Union[Unset, List[int]]):
+        present (Union[Unset, bool]):
+        using (Union[Unset, bool]):
+        abi (Union[Unset, List[str]]):
+        sdk (Union[Unset, List[str]]):
+        model (Union[Unset, List[str]]):
+        platform (Union[Unset, List[str]]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[DeviceListResponse]
+        Response[Union[Any, DeviceListResponse]]
     """
 
     kwargs = _get_kwargs(
         target=target,
         fields=fields,
+        limit=limit,
+        cursor=cursor,
+        owner=owner,
+        owner_name=owner_name,
+        group_id=group_id,
+        group_name=group_name,
+        status=status,
+        present=present,
+        using=using,
+        abi=abi,
+        sdk=sdk,
+        model=model,
+        platform=platform,
+        if_none_match=if_none_match,
     )
 
+    if client.response_cache is not None:
+        client.response_cache.prepare(client, kwargs)
+
     response = await client.get_async_httpx_client().request(**kwargs)
 
+    if client.response_cache is not None:
+        return client.response_cache.resolve(client, kwargs, _build_response(client=client, response=response))
     return _build_response(client=client, response=response)
 
 
@@ -160,7 +380,21 @@ async def asyncio(
     client: Union[AuthenticatedClient, Client],
     target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
     fields: Union[Unset, str] = UNSET,
-) -> Optional[DeviceListResponse]:
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+    owner: Union[Unset, List[str]] = UNSET,
+    owner_name: Union[Unset, List[str]] = UNSET,
+    group_id: Union[Unset, List[str]] = UNSET,
+    group_name: Union[Unset, List[str]] = UNSET,
+    status: Union[Unset, List[int]] = UNSET,
+    present: Union[Unset, bool] = UNSET,
+    using: Union[Unset, bool] = UNSET,
+    abi: Union[Unset, List[str]] = UNSET,
+    sdk: Union[Unset, List[str]] = UNSET,
+    model: Union[Unset, List[str]] = UNSET,
+    platform: Union[Unset, List[str]] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Optional[Union[Any, DeviceListResponse]]:
     """Device List
 
      The devices endpoint return list of all the STF devices including Disconnected and Offline
@@ -168,13 +402,27 @@ async def asyncio(
     Args:
         target (Union[Unset, GetDevicesTarget]):  Default: GetDevicesTarget.USER.
         fields (Union[Unset, str]):
+        limit (Union[Unset, int]):
+        cursor (Union[Unset, str]):
+        owner (Union[Unset, List[str]]):
+        owner_name (Union[Unset, List[str]]):
+        group_id (Union[Unset, List[str]]):
+        group_name (Union[Unset, List[str]]):
+        status (Union[Unset, List[int]]):
+        present (Union[Unset, bool]):
+        using (Union[Unset, bool]):
+        abi (Union[Unset, List[str]]):
+        sdk (Union[Unset, List[str]]):
+        model (Union[Unset, List[str]]):
+        platform (Union[Unset, List[str]]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        DeviceListResponse
+        Union[Any, DeviceListResponse]
     """
 
     return (
@@ -182,5 +430,19 @@ async def asyncio(
             client=client,
             target=target,
             fields=fields,
+            limit=limit,
+            cursor=cursor,
+            owner=owner,
+            owner_name=owner_name,
+            group_id=group_id,
+            group_name=group_name,
+            status=status,
+            present=present,
+            using=using,
+            abi=abi,
+            sdk=sdk,
+            model=model,
+            platform=platform,
+            if_none_match=if_none_match,
         )
     ).parsed
@@ -0,0 +1,31 @@
+"""Endpoints tagged "groups", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "getGroups": ("GET", "/groups"),
+    "createGroup": ("POST", "/groups"),
+    "deleteGroups": ("DELETE", "/groups"),
+    "getGroup": ("GET", "/groups/{id}"),
+    "updateGroup": ("PUT", "/groups/{id}"),
+    "deleteGroup": ("DELETE", "/groups/{id}"),
+    "getGroupDevices": ("GET", "/groups/{id}/devices"),
+    "addGroupDevices": ("PUT", "/groups/{id}/devices"),
+    "removeGroupDevices": ("DELETE", "/groups/{id}/devices"),
+    "getGroupDevice": ("GET", "/groups/{id}/devices/{serial}"),
+    "addGroupDevice": ("PUT", "/groups/{id}/devices/{serial}"),
+    "removeGroupDevice": ("DELETE", "/groups/{id}/devices/{serial}"),
+    "getGroupUsers": ("GET", "/groups/{id}/users"),
+    "addGroupUsers": ("PUT", "/groups/{id}/users"),
+    "removeGroupUsers": ("DELETE", "/groups/{id}/users"),
+    "getGroupUser": ("GET", "/groups/{id}/users/{email}"),
+    "addGroupUser": ("PUT", "/groups/{id}/users/{email}"),
+    "removeGroupUser": ("DELETE", "/groups/{id}/users/{email}"),
+    "addGroupModerator": ("PUT", "/groups/{id}/moderators/{email}"),
+    "removeGroupModerator": ("DELETE", "/groups/{id}/moderators/{email}"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
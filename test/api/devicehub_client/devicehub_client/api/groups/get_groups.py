@@ -1,5 +1,5 @@
 from http import HTTPStatus
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Union, cast
 
 import httpx
 
@@ -13,7 +13,12 @@ def _get_kwargs(
     *,
     fields: Union[Unset, str] = UNSET,
     owner: Union[Unset, bool] = UNSET,
+    if_none_match: Union[Unset, str] = UNSET,
 ) -> Dict[str, Any]:
+    headers: Dict[str, Any] = {}
+    if not isinstance(if_none_match, Unset):
+        headers["If-None-Match"] = if_none_match
+
     params: Dict[str, Any] = {}
 
     params["fields"] = fields
@@ -28,16 +33,20 @@ def _get_kwargs(
         "params": params,
     }
 
+    _kwargs["headers"] = headers
     return _kwargs
 
 
 def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Optional[GroupListResponse]:
+) -> Optional[Union[Any, GroupListResponse]]:
     if response.status_code == 200:
-        response_200 = GroupListResponse.from_dict(response.json())
+        response_200 = GroupListResponse.from_dict(client.decode_json(response))
 
         return response_200
+    if response.status_code == 304:
+        response_304 = cast(Any, None)
+        return response_304
     if client.raise_on_unexpected_status:
         raise errors.UnexpectedStatus(response.status_code, response.content)
     else:
@@ -46,12 +55,12 @@ def _parse_response(
 
 def _build_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
-) -> Response[GroupListResponse]:
+) -> Response[Union[Any, GroupListResponse]]:
     return Response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
@@ -60,7 +69,8 @@ def sync_detailed(
     client: Union[AuthenticatedClient, Client],
     fields: Union[Unset, str] = UNSET,
     owner: Union[Unset, bool] = UNSET,
-) -> Response[GroupListResponse]:
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Response[Union[Any, GroupListResponse]]:
     """Gets groups
 
      Returns the groups to which you belong
@@ -68,24 +78,31 @@ def sync_detailed(
     Args:
         fields (Union[Unset, str]):
         owner (Union[Unset, bool]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[GroupListResponse]
+        Response[Union[Any, GroupListResponse]]
     """
 
     kwargs = _get_kwargs(
         fields=fields,
         owner=owner,
+        if_none_match=if_none_match,
     )
 
+    if client.response_cache is not None:
+        client.response_cache.prepare(client, kwargs)
+
     response = client.get_httpx_client().request(
         **kwargs,
     )
 
+    if client.response_cache is not None:
+        return client.response_cache.resolve(client, kwargs, _build_response(client=client, response=response))
     return _build_response(client=client, response=response)
 
 
@@ -94,7 +111,8 @@ def sync(
     client: Union[AuthenticatedClient, Client],
     fields: Union[Unset, str] = UNSET,
     owner: Union[Unset, bool] = UNSET,
-) -> Optional[GroupListResponse]:
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Optional[Union[Any, GroupListResponse]]:
     """Gets groups
 
      Returns the groups to which you belong
@@ -102,19 +120,21 @@ def sync(
     Args:
         fields (Union[Unset, str]):
         owner (Union[Unset, bool]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        GroupListResponse
+        Union[Any, GroupListResponse]
     """
 
     return sync_detailed(
         client=client,
         fields=fields,
         owner=owner,
+        if_none_match=if_none_match,
     ).parsed
 
 
@@ -123,7 +143,8 @@ async def asyncio_detailed(
     client: Union[AuthenticatedClient, Client],
     fields: Union[Unset, str] = UNSET,
     owner: Union[Unset, bool] = UNSET,
-) -> Response[GroupListResponse]:
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Response[Union[Any, GroupListResponse]]:
     """Gets groups
 
      Returns the groups to which you belong
@@ -131,22 +152,29 @@ async def asyncio_detailed(
     Args:
         fields (Union[Unset, str]):
         owner (Union[Unset, bool]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        Response[GroupListResponse]
+        Response[Union[Any, GroupListResponse]]
     """
 
     kwargs = _get_kwargs(
         fields=fields,
         owner=owner,
+        if_none_match=if_none_match,
     )
 
+    if client.response_cache is not None:
+        client.response_cache.prepare(client, kwargs)
+
     response = await client.get_async_httpx_client().request(**kwargs)
 
+    if client.response_cache is not None:
+        return client.response_cache.resolve(client, kwargs, _build_response(client=client, response=response))
     return _build_response(client=client, response=response)
 
 
@@ -155,7 +183,8 @@ async def asyncio(
     client: Union[AuthenticatedClient, Client],
     fields: Union[Unset, str] = UNSET,
     owner: Union[Unset, bool] = UNSET,
-) -> Optional[GroupListResponse]:
+    if_none_match: Union[Unset, str] = UNSET,
+) -> Optional[Union[Any, GroupListResponse]]:
     """Gets groups
 
      Returns the groups to which you belong
@@ -163,13 +192,14 @@ async def asyncio(
     Args:
         fields (Union[Unset, str]):
         owner (Union[Unset, bool]):
+        if_none_match (Union[Unset, str]):
 
     Raises:
         errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
         httpx.TimeoutException: If the request takes longer than Client.timeout.
 
     Returns:
-        GroupListResponse
+        Union[Any, GroupListResponse]
     """
 
     return (
@@ -177,5 +207,6 @@ async def asyncio(
             client=client,
             fields=fields,
             owner=owner,
+            if_none_match=if_none_match,
         )
     ).parsed
@@ -36,11 +36,11 @@ def _parse_response(
     *, client: Union[AuthenticatedClient, Client], response: httpx.Response
 ) -> Optional[Union[ConflictsResponse, GroupResponse]]:
     if response.status_code == 200:
-        response_200 = GroupResponse.from_dict(response.json())
+        response_200 = GroupResponse.from_dict(client.decode_json(response))
 
         return response_200
     if response.status_code == 409:
-        response_409 = ConflictsResponse.from_dict(response.json())
+        response_409 = ConflictsResponse.from_dict(client.decode_json(response))
 
         return response_409
     if client.raise_on_unexpected_status:
@@ -56,7 +56,7 @@ def _build_response(
         status_code=HTTPStatus(response.status_code),
         content=response.content,
         headers=response.headers,
-        parsed=_parse_response(client=client, response=response),
+        parsed=client.parse_response(response, _parse_response),
     )
 
 
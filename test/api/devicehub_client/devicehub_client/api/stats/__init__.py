@@ -0,0 +1,13 @@
+"""Endpoints tagged "stats", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "writeStats": ("POST", "/stats"),
+    "writeStatsBatch": ("POST", "/stats/batch"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
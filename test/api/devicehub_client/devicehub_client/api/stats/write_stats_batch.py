@@ -0,0 +1,175 @@
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+
+from ... import errors
+from ...client import AuthenticatedClient, Client
+from ...models.stats_batch_response import StatsBatchResponse
+from ...models.stats_event import StatsEvent
+from ...types import Response
+
+
+def _get_kwargs(
+    *,
+    body: List["StatsEvent"],
+) -> Dict[str, Any]:
+    headers: Dict[str, Any] = {}
+
+    _kwargs: Dict[str, Any] = {
+        "method": "post",
+        "url": "/stats/batch",
+    }
+
+    _body = []
+    for body_item_data in body:
+        body_item = body_item_data.to_dict()
+        _body.append(body_item)
+
+    _kwargs["json"] = _body
+    headers["Content-Type"] = "application/json"
+
+    _kwargs["headers"] = headers
+    return _kwargs
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Optional[StatsBatchResponse]:
+    if response.status_code == 200:
+        response_200 = StatsBatchResponse.from_dict(client.decode_json(response))
+
+        return response_200
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response
+) -> Response[StatsBatchResponse]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=client.parse_response(response, _parse_response),
+    )
+
+
+def sync_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: List["StatsEvent"],
+) -> Response[StatsBatchResponse]:
+    """Write actions to stats in one request
+
+     Write many actions with their device to the stats table, as a JSON array or as NDJSON (one event per
+    line), at most 5000 events
+
+    Args:
+        body (List['StatsEvent']):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[StatsBatchResponse]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+    )
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response)
+
+
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: List["StatsEvent"],
+) -> Optional[StatsBatchResponse]:
+    """Write actions to stats in one request
+
+     Write many actions with their device to the stats table, as a JSON array or as NDJSON (one event per
+    line), at most 5000 events
+
+    Args:
+        body (List['StatsEvent']):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        StatsBatchResponse
+    """
+
+    return sync_detailed(
+        client=client,
+        body=body,
+    ).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: List["StatsEvent"],
+) -> Response[StatsBatchResponse]:
+    """Write actions to stats in one request
+
+     Write many actions with their device to the stats table, as a JSON array or as NDJSON (one event per
+    line), at most 5000 events
+
+    Args:
+        body (List['StatsEvent']):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[StatsBatchResponse]
+    """
+
+    kwargs = _get_kwargs(
+        body=body,
+    )
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    body: List["StatsEvent"],
+) -> Optional[StatsBatchResponse]:
+    """Write actions to stats in one request
+
+     Write many actions with their device to the stats table, as a JSON array or as NDJSON (one event per
+    line), at most 5000 events
+
+    Args:
+        body (List['StatsEvent']):
+
+    Raises:
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        StatsBatchResponse
+    """
+
+    return (
+        await asyncio_detailed(
+            client=client,
+            body=body,
+        )
+    ).parsed
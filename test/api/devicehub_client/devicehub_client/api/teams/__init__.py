@@ -0,0 +1,21 @@
+"""Endpoints tagged "teams", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "getGroupsTeams": ("GET", "/groups/{id}/teams"),
+    "getUserTeams": ("GET", "/user/{email}/teams"),
+    "getTeams": ("GET", "/teams"),
+    "createTeam": ("POST", "/team"),
+    "getTeamById": ("GET", "/team/{id}"),
+    "updateTeam": ("POST", "/team/{id}"),
+    "removeFromTeam": ("DELETE", "/team/{id}"),
+    "removeUserFromTeam": ("DELETE", "/team/{id}/user/{email}"),
+    "removeGroupFromTeam": ("DELETE", "/team/{id}/group/{group}"),
+    "deleteTeam": ("DELETE", "/team/{id}/delete"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
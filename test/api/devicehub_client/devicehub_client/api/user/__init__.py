@@ -0,0 +1,31 @@
+"""Endpoints tagged "user", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "getUser": ("GET", "/user"),
+    "getUserDevices": ("GET", "/user/devices"),
+    "addUserDevice": ("POST", "/user/devices"),
+    "getUserDeviceBySerial": ("GET", "/user/devices/{serial}"),
+    "addUserDeviceV2": ("POST", "/user/devices/{serial}"),
+    "deleteUserDeviceBySerial": ("DELETE", "/user/devices/{serial}"),
+    "remoteConnectUserDeviceBySerial": ("POST", "/user/devices/{serial}/remoteConnect"),
+    "remoteDisconnectUserDeviceBySerial": ("DELETE", "/user/devices/{serial}/remoteConnect"),
+    "getAccessTokens": ("GET", "/user/fullAccessTokens"),
+    "getUserAccessTokens": ("GET", "/user/accessTokens"),
+    "createAccessToken": ("POST", "/user/accessTokens"),
+    "deleteAccessTokens": ("DELETE", "/user/accessTokens"),
+    "getAccessTokenByTitle": ("POST", "/user/accessTokens/byTitle"),
+    "getAccessToken": ("GET", "/user/accessTokens/{id}"),
+    "deleteAccessToken": ("DELETE", "/user/accessTokens/{id}"),
+    "addAdbPublicKey": ("POST", "/user/adbPublicKeys"),
+    "removeAdbPublicKey": ("DELETE", "/user/adbPublicKeys"),
+    "getDeviceSize": ("GET", "/devices/{serial}/size"),
+    "getDeviceOwner": ("GET", "/devices/{serial}/owner"),
+    "getDeviceType": ("GET", "/devices/{serial}/type"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
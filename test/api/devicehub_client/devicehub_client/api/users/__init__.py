@@ -0,0 +1,14 @@
+"""Endpoints tagged "users", imported on first attribute access"""
+
+from typing import Dict, Tuple
+
+from .. import _lazy_submodules
+
+# operationId: (method, path template relative to the base URL), collected by devicehub_client.operations
+OPERATIONS: Dict[str, Tuple[str, str]] = {
+    "getUsers": ("GET", "/users"),
+    "getUsersAlertMessage": ("GET", "/users/alertMessage"),
+    "getUserByEmail": ("GET", "/users/{email}"),
+}
+
+__getattr__, __dir__ = _lazy_submodules(__name__, __path__)
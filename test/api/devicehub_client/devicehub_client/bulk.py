@@ -0,0 +1,253 @@
+"""Bulk group membership and deletion operations
+
+Moving many devices or users with the per-item endpoints costs one round trip each. ``BulkExecutor`` sends serial
+and email lists to the plural endpoints and runs the requests concurrently:
+
+    executor = BulkExecutor(client, chunk_size=200, concurrency=8)
+    report = await executor.add_group_devices(group_id, serials)
+    report.failed  # serials which were not added, report.results[serial] tells why
+
+The server rewrites the member list of a group from the copy it loaded, so chunks of one group could only be sent
+one after another. A membership change of a group is therefore sent as a single request, and concurrent calls on
+the same group and executor wait for each other. ``delete_devices``/``delete_users``/``delete_groups`` are split
+into chunks of ``chunk_size``. Requests of different groups and the chunks share the ``concurrency`` limit. Items
+are deduplicated and an empty list never reaches the server, where a missing list means "all devices/users".
+"""
+
+import asyncio
+import json
+from http import HTTPStatus
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Union
+
+from attrs import define, field
+
+from .api.admin import add_origin_group_devices as _add_origin_group_devices
+from .api.admin import delete_devices as _delete_devices
+from .api.admin import delete_users as _delete_users
+from .api.admin import remove_origin_group_devices as _remove_origin_group_devices
+from .api.groups import add_group_devices as _add_group_devices
+from .api.groups import add_group_users as _add_group_users
+from .api.groups import delete_groups as _delete_groups
+from .api.groups import remove_group_devices as _remove_group_devices
+from .api.groups import remove_group_users as _remove_group_users
+from .client import AuthenticatedClient, Client
+from .models.conflicts_response import ConflictsResponse
+from .models.devices_payload import DevicesPayload
+from .models.groups_payload import GroupsPayload
+from .models.users_payload import UsersPayload
+from .types import Response
+
+DEFAULT_CHUNK_SIZE = 200
+DEFAULT_CONCURRENCY = 8
+
+
+@define
+class ItemResult:
+    """Outcome of a single serial or email
+
+    Attributes:
+        item: The serial or email.
+        success: Whether the chunk holding the item succeeded.
+        status_code: Status code of the chunk, None if the request itself failed.
+        description: Description returned by the server or the request error.
+    """
+
+    item: str
+    success: bool
+    status_code: Optional[int]
+    description: str
+
+
+@define
+class BulkReport:
+    """Per-item results of a bulk operation, in the order the items were given"""
+
+    results: Dict[str, ItemResult] = field(factory=dict)
+
+    @property
+    def succeeded(self) -> List[str]:
+        return [item for item, result in self.results.items() if result.success]
+
+    @property
+    def failed(self) -> List[str]:
+        return [item for item, result in self.results.items() if not result.success]
+
+    @property
+    def ok(self) -> bool:
+        return all(result.success for result in self.results.values())
+
+
+def _describe(response: Response[Any]) -> str:
+    description = getattr(response.parsed, "description", None)
+    if description is None:
+        # error bodies the endpoint does not parse still carry {"success": false, "description": ...}
+        try:
+            description = json.loads(response.content).get("description")
+        except (ValueError, AttributeError):
+            pass
+    return description if isinstance(description, str) else response.content.decode(errors="ignore")
+
+
+def _chunk_results(chunk: List[str], response: Response[Any]) -> List[ItemResult]:
+    description = _describe(response)
+    if response.status_code == HTTPStatus.OK:
+        return [ItemResult(item, True, response.status_code, description) for item in chunk]
+    conflicting = set()
+    if isinstance(response.parsed, ConflictsResponse):
+        for conflict in response.parsed.conflicts:
+            conflicting.update(conflict.devices or [])
+    return [
+        ItemResult(
+            item,
+            False,
+            response.status_code,
+            f"{description} (conflicting booking)" if item in conflicting else description,
+        )
+        for item in chunk
+    ]
+
+
+class BulkExecutor:
+    """Runs bulk operations for a client with bounded concurrency
+
+    Args:
+        client: The client used for the requests, its async httpx client is shared by all chunks.
+        chunk_size: The maximum number of serials, emails or ids per deletion request.
+        concurrency: The maximum number of requests in flight for this executor.
+    """
+
+    def __init__(
+        self,
+        client: Union[AuthenticatedClient, Client],
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        if chunk_size < 1 or concurrency < 1:
+            raise ValueError("chunk_size and concurrency must be positive")
+        self._client = client
+        self._chunk_size = chunk_size
+        self._concurrency = concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._lanes: Dict[Hashable, asyncio.Lock] = {}
+
+    @staticmethod
+    def _unique(items: Iterable[str]) -> List[str]:
+        return list(dict.fromkeys(item for item in items if item))
+
+    def _chunks(self, items: Iterable[str]) -> List[List[str]]:
+        unique = self._unique(items)
+        return [unique[i : i + self._chunk_size] for i in range(0, len(unique), self._chunk_size)]
+
+    async def _send(self, chunk: List[str], call: Callable[[str], Awaitable[Response[Any]]]) -> List[ItemResult]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._concurrency)
+        async with self._semaphore:
+            try:
+                response = await call(",".join(chunk))
+            except Exception as e:
+                return [ItemResult(item, False, None, repr(e)) for item in chunk]
+        return _chunk_results(chunk, response)
+
+    async def _lane(
+        self, lane: Hashable, items: List[str], call: Callable[[str], Awaitable[Response[Any]]]
+    ) -> List[ItemResult]:
+        if not items:
+            return []
+        async with self._lanes.setdefault(lane, asyncio.Lock()):
+            return await self._send(items, call)
+
+    async def _run(
+        self, items: Iterable[str], call: Callable[[str], Awaitable[Response[Any]]], lane: Optional[Hashable]
+    ) -> BulkReport:
+        if lane is None:
+            batches = await asyncio.gather(*(self._send(chunk, call) for chunk in self._chunks(items)))
+        else:
+            batches = [await self._lane(lane, self._unique(items), call)]
+        report = BulkReport()
+        for batch in batches:
+            for result in batch:
+                report.results[result.item] = result
+        return report
+
+    async def add_group_devices(self, group_id: str, serials: Iterable[str]) -> BulkReport:
+        """Add devices to a group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = DevicesPayload(serials=joined)
+            return _add_group_devices.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(serials, call, ("group", group_id))
+
+    async def remove_group_devices(self, group_id: str, serials: Iterable[str]) -> BulkReport:
+        """Remove devices from a group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = DevicesPayload(serials=joined)
+            return _remove_group_devices.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(serials, call, ("group", group_id))
+
+    async def add_group_users(self, group_id: str, emails: Iterable[str]) -> BulkReport:
+        """Add users to a group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = UsersPayload(emails=joined)
+            return _add_group_users.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(emails, call, ("group", group_id))
+
+    async def remove_group_users(self, group_id: str, emails: Iterable[str]) -> BulkReport:
+        """Remove users from a group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = UsersPayload(emails=joined)
+            return _remove_group_users.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(emails, call, ("group", group_id))
+
+    async def add_origin_group_devices(self, group_id: str, serials: Iterable[str]) -> BulkReport:
+        """Add devices to an origin group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = DevicesPayload(serials=joined)
+            return _add_origin_group_devices.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(serials, call, ("group", group_id))
+
+    async def remove_origin_group_devices(self, group_id: str, serials: Iterable[str]) -> BulkReport:
+        """Remove devices from an origin group"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = DevicesPayload(serials=joined)
+            return _remove_origin_group_devices.asyncio_detailed(group_id, client=self._client, body=body)
+
+        return await self._run(serials, call, ("group", group_id))
+
+    async def delete_devices(self, serials: Iterable[str], **kwargs: Any) -> BulkReport:
+        """Delete devices, ``kwargs`` (present, booked, annotated, controlled) are passed to every request"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = DevicesPayload(serials=joined)
+            return _delete_devices.asyncio_detailed(client=self._client, body=body, **kwargs)
+
+        return await self._run(serials, call, None)
+
+    async def delete_users(self, emails: Iterable[str], **kwargs: Any) -> BulkReport:
+        """Delete users, ``kwargs`` (group_owner) are passed to every request"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            body = UsersPayload(emails=joined)
+            return _delete_users.asyncio_detailed(client=self._client, body=body, **kwargs)
+
+        return await self._run(emails, call, None)
+
+    async def delete_groups(self, ids: Iterable[str]) -> BulkReport:
+        """Delete groups, a chunk holding an unknown id answers 404 although its other groups are deleted"""
+
+        def call(joined: str) -> Awaitable[Response[Any]]:
+            return _delete_groups.asyncio_detailed(client=self._client, body=GroupsPayload(ids=joined))
+
+        return await self._run(ids, call, None)
+
+
+__all__ = ["BulkExecutor", "BulkReport", "ItemResult", "DEFAULT_CHUNK_SIZE", "DEFAULT_CONCURRENCY"]
@@ -0,0 +1,90 @@
+"""Conditional GET cache for listings which support ETag revalidation"""
+
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, Dict, Hashable, Tuple, TypeVar, Union
+
+from .types import Response
+
+if TYPE_CHECKING:
+    from .client import AuthenticatedClient, Client
+
+T = TypeVar("T")
+
+
+class ResponseCache:
+    """Remembers the ETag and parsed response of the last 200 per request
+
+    Clients constructed with ``response_cache=`` send ``If-None-Match`` on the endpoints which accept it
+    (``get_devices``, ``get_groups`` and ``get_group_devices``). When the server answers 304 the previously parsed
+    object is served again, so an unchanged listing costs a header round-trip instead of a transfer and a parse.
+    The returned Response keeps the 304 status code so callers can tell a revalidated listing from a fresh one.
+    Parsed objects are shared between calls and must not be mutated.
+
+    Args:
+        max_entries: How many distinct requests (base URL, path, query and token) are remembered, least recently
+            used entries are evicted first. A cache can be shared by clients of different servers.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Tuple[str, Response[Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(client: Union["AuthenticatedClient", "Client"], kwargs: Dict[str, Any]) -> Hashable:
+        params = tuple(sorted((k, str(v)) for k, v in kwargs.get("params", {}).items()))
+        return client._base_url, kwargs["method"], kwargs["url"], params, getattr(client, "token", None)
+
+    def prepare(self, client: Union["AuthenticatedClient", "Client"], kwargs: Dict[str, Any]) -> None:
+        """Add If-None-Match to the request kwargs if a response is cached and no validator was given"""
+        headers = kwargs.setdefault("headers", {})
+        if "If-None-Match" in headers:
+            return
+        with self._lock:
+            entry = self._entries.get(self._key(client, kwargs))
+        if entry is not None:
+            headers["If-None-Match"] = entry[0]
+
+    def resolve(
+        self, client: Union["AuthenticatedClient", "Client"], kwargs: Dict[str, Any], response: Response[T]
+    ) -> Response[T]:
+        """Serve the cached response on 304, remember a 200 carrying an ETag"""
+        key = self._key(client, kwargs)
+        with self._lock:
+            if response.status_code == HTTPStatus.NOT_MODIFIED:
+                entry = self._entries.get(key)
+                if entry is None:
+                    return response
+                self._entries.move_to_end(key)
+                self.hits += 1
+                cached = entry[1]
+                return Response(
+                    status_code=response.status_code,
+                    content=cached.content,
+                    headers=response.headers,
+                    parsed=cached.parsed,
+                )
+            self.misses += 1
+            etag = response.headers.get("ETag")
+            if response.status_code == HTTPStatus.OK and etag and response.parsed is not None:
+                self._entries[key] = (etag, response)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self._max_entries:
+                    self._entries.popitem(last=False)
+            else:
+                self._entries.pop(key, None)
+        return response
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+__all__ = ["ResponseCache"]
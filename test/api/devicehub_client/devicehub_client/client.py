@@ -1,9 +1,27 @@
 import ssl
-from typing import Any, Dict, Optional, Union
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar, Union
 
 import httpx
 from attrs import define, evolve, field
 
+from .cache import ResponseCache
+from .compression import Compression, accept_encoding
+from .decoders import JsonDecoder
+from .instrumentation import (
+    TIMINGS_EXTENSION,
+    InstrumentedAsyncTransport,
+    InstrumentedTransport,
+    RequestTimings,
+    TimingsHook,
+)
+from .pool import TransportPool
+from .ratelimit import RateLimitedAsyncTransport, RateLimitedTransport, RateLimiter, get_rate_limiter
+from .retry import RetryAsyncTransport, RetryPolicy, RetryTransport
+from .transports import ConcurrencyLimitedAsyncTransport
+
+T = TypeVar("T")
+
 
 @define
 class Client:
@@ -27,14 +45,58 @@ class Client:
 
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
 
+        ``transport_pool``: A ``TransportPool`` to borrow connections from instead of opening a private connection pool.
+        Clients sharing a pool reuse keep-alive connections and TLS sessions, closing the client leaves them open.
+
+        ``http2``: Whether or not to negotiate HTTP/2 so concurrent requests are multiplexed over one connection.
+        Requires the ``h2`` package (``devicehub_client[http2]``). For plain ``http://`` base URLs there is no
+        negotiation, HTTP/2 is spoken with prior knowledge and the server must support it. Default value is False.
+
+        ``max_concurrent_streams``: The maximum number of requests the async client keeps in flight at once,
+        further requests wait for a free slot. Mostly useful together with ``http2``. Default value is unlimited.
+
+        ``limits``: An ``httpx.Limits`` with the connection pool limits for the ``httpx.Client`` and ``httpx.AsyncClient``.
+
+        ``rate_limit``: Whether or not to pace requests to the budget the server reports in its ``RateLimit`` headers.
+        ``True`` shares the limiter of the host (``ratelimit.get_rate_limiter``) with every other client of that
+        host, a ``RateLimiter`` is used as is. Default value is False.
+
+        ``retry``: A ``RetryPolicy`` repeating requests which failed transiently, see ``devicehub_client.retry`` for
+        which operations are repeated. Default value is a single attempt.
+
+        ``compression``: Whether or not to accept compressed responses, or the encodings to accept by preference, see
+        ``devicehub_client.compression``. Default value is every encoding the installed packages can decode.
+
 
     Attributes:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        lazy_models: Whether or not device list responses keep the raw devices and build each ``Device`` (and parse
+            its timestamps) only when it is accessed. Can also be provided as a keyword argument to the constructor.
+        structs: Whether or not device and group listings are decoded straight into the msgspec Structs of
+            ``devicehub_client.structs``, ``parsed`` is then a Struct instead of an attrs model. Requires msgspec.
+            Can also be provided as a keyword argument to the constructor.
+        json_decoder: A callable decoding response bodies from bytes, e.g. ``decoders.get_decoder("orjson")``.
+            httpx's own decoding is used if not set. Can also be provided as a keyword argument to the constructor.
+        response_cache: A ``ResponseCache`` used to revalidate device and group listings with ETags instead of
+            downloading and parsing them again. Can also be provided as a keyword argument to the constructor.
+        on_request: Called with the ``RequestTimings`` of every request before it is sent, see
+            ``devicehub_client.instrumentation``. Can also be provided as a keyword argument to the constructor.
+        on_response: Called with the ``RequestTimings`` of every request once its body is downloaded. Can also be
+            provided as a keyword argument to the constructor.
+        on_parse_done: Called with the ``RequestTimings`` of every request once the endpoint function has parsed
+            its body. Can also be provided as a keyword argument to the constructor.
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    lazy_models: bool = field(default=False, kw_only=True)
+    structs: bool = field(default=False, kw_only=True)
+    json_decoder: Optional[JsonDecoder] = field(default=None, kw_only=True)
+    response_cache: Optional[ResponseCache] = field(default=None, kw_only=True)
+    on_request: Optional[TimingsHook] = field(default=None, kw_only=True)
+    on_response: Optional[TimingsHook] = field(default=None, kw_only=True)
+    on_parse_done: Optional[TimingsHook] = field(default=None, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: Dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: Dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
@@ -42,6 +104,13 @@ class Client:
     _verify_ssl: Union[str, bool, ssl.SSLContext] = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
     _httpx_args: Dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
+    _transport_pool: Optional[TransportPool] = field(default=None, kw_only=True, alias="transport_pool")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _max_concurrent_streams: Optional[int] = field(default=None, kw_only=True, alias="max_concurrent_streams")
+    _limits: Optional[httpx.Limits] = field(default=None, kw_only=True, alias="limits")
+    _rate_limit: Union[bool, RateLimiter] = field(default=False, kw_only=True, alias="rate_limit")
+    _retry: Optional[RetryPolicy] = field(default=None, kw_only=True, alias="retry")
+    _compression: Compression = field(default=True, kw_only=True, alias="compression")
     _client: Optional[httpx.Client] = field(default=None, init=False)
     _async_client: Optional[httpx.AsyncClient] = field(default=None, init=False)
 
@@ -69,6 +138,94 @@ class Client:
             self._async_client.timeout = timeout
         return evolve(self, timeout=timeout)
 
+    def _transport_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {}
+        if self._http2:
+            options["http2"] = True
+            if httpx.URL(self._base_url).scheme == "http":
+                options["http1"] = False
+        if self._limits is not None:
+            options["limits"] = self._limits
+        return options
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The limiter pacing the requests of this client, if any"""
+        if isinstance(self._rate_limit, RateLimiter):
+            return self._rate_limit
+        return get_rate_limiter(self._base_url) if self._rate_limit else None
+
+    @property
+    def _instrumented(self) -> bool:
+        return self.on_request is not None or self.on_response is not None or self.on_parse_done is not None
+
+    def _transport_args(self) -> Dict[str, Any]:
+        limiter = self.rate_limiter
+        transport: Optional[httpx.BaseTransport] = self._httpx_args.get("transport")
+        if transport is None:
+            options = self._transport_options()
+            if self._transport_pool is not None:
+                transport = self._transport_pool.transport(self._base_url, verify=self._verify_ssl, **options)
+            elif limiter is not None or self._retry is not None or self._instrumented:
+                transport = httpx.HTTPTransport(verify=self._verify_ssl, **options)
+            else:
+                return options
+        if self._instrumented:
+            transport = InstrumentedTransport(transport, self.on_request, self.on_response)
+        if limiter is not None:
+            transport = RateLimitedTransport(transport, limiter)
+        if self._retry is not None:
+            transport = RetryTransport(transport, self._retry)
+        return {"transport": transport}
+
+    def _async_transport_args(self) -> Dict[str, Any]:
+        limiter = self.rate_limiter
+        transport: Optional[httpx.AsyncBaseTransport] = self._httpx_args.get("transport")
+        if transport is None:
+            options = self._transport_options()
+            if self._transport_pool is not None:
+                transport = self._transport_pool.async_transport(self._base_url, verify=self._verify_ssl, **options)
+            elif (
+                self._max_concurrent_streams is not None
+                or limiter is not None
+                or self._retry is not None
+                or self._instrumented
+            ):
+                transport = httpx.AsyncHTTPTransport(verify=self._verify_ssl, **options)
+            else:
+                return options
+        if self._instrumented:
+            transport = InstrumentedAsyncTransport(transport, self.on_request, self.on_response)
+        if self._max_concurrent_streams is not None and "transport" not in self._httpx_args:
+            transport = ConcurrencyLimitedAsyncTransport(transport, self._max_concurrent_streams)
+        if limiter is not None:
+            transport = RateLimitedAsyncTransport(transport, limiter)
+        if self._retry is not None:
+            transport = RetryAsyncTransport(transport, self._retry)
+        return {"transport": transport}
+
+    def decode_json(self, response: httpx.Response) -> Any:
+        """Decode the JSON body of a response with json_decoder, or httpx's decoding if it is not set"""
+        if self.json_decoder is None:
+            return response.json()
+        return self.json_decoder(response.content)
+
+    def parse_response(self, response: httpx.Response, parse: Callable[..., T]) -> T:
+        """Run the ``_parse_response`` of an endpoint, timing it for ``on_parse_done``"""
+        if self.structs:
+            from .structs import struct_parser
+
+            parse = struct_parser(parse)
+        timings: Optional[RequestTimings] = response.extensions.get(TIMINGS_EXTENSION)
+        if timings is None or self.on_parse_done is None:
+            return parse(client=self, response=response)
+        started = time.perf_counter()
+        try:
+            return parse(client=self, response=response)
+        finally:
+            timings.parse = time.perf_counter() - started
+            self.on_parse_done(timings)
+
     def set_httpx_client(self, client: httpx.Client) -> "Client":
         """Manually set the underlying httpx.Client
 
@@ -83,11 +240,11 @@ class Client:
             self._client = httpx.Client(
                 base_url=self._base_url,
                 cookies=self._cookies,
-                headers=self._headers,
+                headers={"Accept-Encoding": accept_encoding(self._compression), **self._headers},
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **{**self._httpx_args, **self._transport_args()},
             )
         return self._client
 
@@ -114,11 +271,11 @@ class Client:
             self._async_client = httpx.AsyncClient(
                 base_url=self._base_url,
                 cookies=self._cookies,
-                headers=self._headers,
+                headers={"Accept-Encoding": accept_encoding(self._compression), **self._headers},
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **{**self._httpx_args, **self._async_transport_args()},
             )
         return self._async_client
 
@@ -131,6 +288,19 @@ class Client:
         """Exit a context manager for underlying httpx.AsyncClient (see httpx docs)"""
         await self.get_async_httpx_client().__aexit__(*args, **kwargs)
 
+    def close(self) -> None:
+        """Close the underlying httpx.Client, connections borrowed from a TransportPool stay open"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both underlying httpx clients, connections borrowed from a TransportPool stay open"""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+
 
 @define
 class AuthenticatedClient:
@@ -154,17 +324,61 @@ class AuthenticatedClient:
 
         ``httpx_args``: A dictionary of additional arguments to be passed to the ``httpx.Client`` and ``httpx.AsyncClient`` constructor.
 
+        ``transport_pool``: A ``TransportPool`` to borrow connections from instead of opening a private connection pool.
+        Clients sharing a pool reuse keep-alive connections and TLS sessions, closing the client leaves them open.
+
+        ``http2``: Whether or not to negotiate HTTP/2 so concurrent requests are multiplexed over one connection.
+        Requires the ``h2`` package (``devicehub_client[http2]``). For plain ``http://`` base URLs there is no
+        negotiation, HTTP/2 is spoken with prior knowledge and the server must support it. Default value is False.
+
+        ``max_concurrent_streams``: The maximum number of requests the async client keeps in flight at once,
+        further requests wait for a free slot. Mostly useful together with ``http2``. Default value is unlimited.
+
+        ``limits``: An ``httpx.Limits`` with the connection pool limits for the ``httpx.Client`` and ``httpx.AsyncClient``.
+
+        ``rate_limit``: Whether or not to pace requests to the budget the server reports in its ``RateLimit`` headers.
+        ``True`` shares the limiter of the host (``ratelimit.get_rate_limiter``) with every other client of that
+        host, a ``RateLimiter`` is used as is. Default value is False.
+
+        ``retry``: A ``RetryPolicy`` repeating requests which failed transiently, see ``devicehub_client.retry`` for
+        which operations are repeated. Default value is a single attempt.
+
+        ``compression``: Whether or not to accept compressed responses, or the encodings to accept by preference, see
+        ``devicehub_client.compression``. Default value is every encoding the installed packages can decode.
+
 
     Attributes:
         raise_on_unexpected_status: Whether or not to raise an errors.UnexpectedStatus if the API returns a
             status code that was not documented in the source OpenAPI document. Can also be provided as a keyword
             argument to the constructor.
+        lazy_models: Whether or not device list responses keep the raw devices and build each ``Device`` (and parse
+            its timestamps) only when it is accessed. Can also be provided as a keyword argument to the constructor.
+        structs: Whether or not device and group listings are decoded straight into the msgspec Structs of
+            ``devicehub_client.structs``, ``parsed`` is then a Struct instead of an attrs model. Requires msgspec.
+            Can also be provided as a keyword argument to the constructor.
+        json_decoder: A callable decoding response bodies from bytes, e.g. ``decoders.get_decoder("orjson")``.
+            httpx's own decoding is used if not set. Can also be provided as a keyword argument to the constructor.
+        response_cache: A ``ResponseCache`` used to revalidate device and group listings with ETags instead of
+            downloading and parsing them again. Can also be provided as a keyword argument to the constructor.
+        on_request: Called with the ``RequestTimings`` of every request before it is sent, see
+            ``devicehub_client.instrumentation``. Can also be provided as a keyword argument to the constructor.
+        on_response: Called with the ``RequestTimings`` of every request once its body is downloaded. Can also be
+            provided as a keyword argument to the constructor.
+        on_parse_done: Called with the ``RequestTimings`` of every request once the endpoint function has parsed
+            its body. Can also be provided as a keyword argument to the constructor.
         token: The token to use for authentication
         prefix: The prefix to use for the Authorization header
         auth_header_name: The name of the Authorization header
     """
 
     raise_on_unexpected_status: bool = field(default=False, kw_only=True)
+    lazy_models: bool = field(default=False, kw_only=True)
+    structs: bool = field(default=False, kw_only=True)
+    json_decoder: Optional[JsonDecoder] = field(default=None, kw_only=True)
+    response_cache: Optional[ResponseCache] = field(default=None, kw_only=True)
+    on_request: Optional[TimingsHook] = field(default=None, kw_only=True)
+    on_response: Optional[TimingsHook] = field(default=None, kw_only=True)
+    on_parse_done: Optional[TimingsHook] = field(default=None, kw_only=True)
     _base_url: str = field(alias="base_url")
     _cookies: Dict[str, str] = field(factory=dict, kw_only=True, alias="cookies")
     _headers: Dict[str, str] = field(factory=dict, kw_only=True, alias="headers")
@@ -172,6 +386,13 @@ class AuthenticatedClient:
     _verify_ssl: Union[str, bool, ssl.SSLContext] = field(default=True, kw_only=True, alias="verify_ssl")
     _follow_redirects: bool = field(default=False, kw_only=True, alias="follow_redirects")
     _httpx_args: Dict[str, Any] = field(factory=dict, kw_only=True, alias="httpx_args")
+    _transport_pool: Optional[TransportPool] = field(default=None, kw_only=True, alias="transport_pool")
+    _http2: bool = field(default=False, kw_only=True, alias="http2")
+    _max_concurrent_streams: Optional[int] = field(default=None, kw_only=True, alias="max_concurrent_streams")
+    _limits: Optional[httpx.Limits] = field(default=None, kw_only=True, alias="limits")
+    _rate_limit: Union[bool, RateLimiter] = field(default=False, kw_only=True, alias="rate_limit")
+    _retry: Optional[RetryPolicy] = field(default=None, kw_only=True, alias="retry")
+    _compression: Compression = field(default=True, kw_only=True, alias="compression")
     _client: Optional[httpx.Client] = field(default=None, init=False)
     _async_client: Optional[httpx.AsyncClient] = field(default=None, init=False)
 
@@ -203,6 +424,94 @@ class AuthenticatedClient:
             self._async_client.timeout = timeout
         return evolve(self, timeout=timeout)
 
+    def _transport_options(self) -> Dict[str, Any]:
+        options: Dict[str, Any] = {}
+        if self._http2:
+            options["http2"] = True
+            if httpx.URL(self._base_url).scheme == "http":
+                options["http1"] = False
+        if self._limits is not None:
+            options["limits"] = self._limits
+        return options
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The limiter pacing the requests of this client, if any"""
+        if isinstance(self._rate_limit, RateLimiter):
+            return self._rate_limit
+        return get_rate_limiter(self._base_url) if self._rate_limit else None
+
+    @property
+    def _instrumented(self) -> bool:
+        return self.on_request is not None or self.on_response is not None or self.on_parse_done is not None
+
+    def _transport_args(self) -> Dict[str, Any]:
+        limiter = self.rate_limiter
+        transport: Optional[httpx.BaseTransport] = self._httpx_args.get("transport")
+        if transport is None:
+            options = self._transport_options()
+            if self._transport_pool is not None:
+                transport = self._transport_pool.transport(self._base_url, verify=self._verify_ssl, **options)
+            elif limiter is not None or self._retry is not None or self._instrumented:
+                transport = httpx.HTTPTransport(verify=self._verify_ssl, **options)
+            else:
+                return options
+        if self._instrumented:
+            transport = InstrumentedTransport(transport, self.on_request, self.on_response)
+        if limiter is not None:
+            transport = RateLimitedTransport(transport, limiter)
+        if self._retry is not None:
+            transport = RetryTransport(transport, self._retry)
+        return {"transport": transport}
+
+    def _async_transport_args(self) -> Dict[str, Any]:
+        limiter = self.rate_limiter
+        transport: Optional[httpx.AsyncBaseTransport] = self._httpx_args.get("transport")
+        if transport is None:
+            options = self._transport_options()
+            if self._transport_pool is not None:
+                transport = self._transport_pool.async_transport(self._base_url, verify=self._verify_ssl, **options)
+            elif (
+                self._max_concurrent_streams is not None
+                or limiter is not None
+                or self._retry is not None
+                or self._instrumented
+            ):
+                transport = httpx.AsyncHTTPTransport(verify=self._verify_ssl, **options)
+            else:
+                return options
+        if self._instrumented:
+            transport = InstrumentedAsyncTransport(transport, self.on_request, self.on_response)
+        if self._max_concurrent_streams is not None and "transport" not in self._httpx_args:
+            transport = ConcurrencyLimitedAsyncTransport(transport, self._max_concurrent_streams)
+        if limiter is not None:
+            transport = RateLimitedAsyncTransport(transport, limiter)
+        if self._retry is not None:
+            transport = RetryAsyncTransport(transport, self._retry)
+        return {"transport": transport}
+
+    def decode_json(self, response: httpx.Response) -> Any:
+        """Decode the JSON body of a response with json_decoder, or httpx's decoding if it is not set"""
+        if self.json_decoder is None:
+            return response.json()
+        return self.json_decoder(response.content)
+
+    def parse_response(self, response: httpx.Response, parse: Callable[..., T]) -> T:
+        """Run the ``_parse_response`` of an endpoint, timing it for ``on_parse_done``"""
+        if self.structs:
+            from .structs import struct_parser
+
+            parse = struct_parser(parse)
+        timings: Optional[RequestTimings] = response.extensions.get(TIMINGS_EXTENSION)
+        if timings is None or self.on_parse_done is None:
+            return parse(client=self, response=response)
+        started = time.perf_counter()
+        try:
+            return parse(client=self, response=response)
+        finally:
+            timings.parse = time.perf_counter() - started
+            self.on_parse_done(timings)
+
     def set_httpx_client(self, client: httpx.Client) -> "AuthenticatedClient":
         """Manually set the underlying httpx.Client
 
@@ -218,11 +527,11 @@ class AuthenticatedClient:
             self._client = httpx.Client(
                 base_url=self._base_url,
                 cookies=self._cookies,
-                headers=self._headers,
+                headers={"Accept-Encoding": accept_encoding(self._compression), **self._headers},
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **{**self._httpx_args, **self._transport_args()},
             )
         return self._client
 
@@ -250,11 +559,11 @@ class AuthenticatedClient:
             self._async_client = httpx.AsyncClient(
                 base_url=self._base_url,
                 cookies=self._cookies,
-                headers=self._headers,
+                headers={"Accept-Encoding": accept_encoding(self._compression), **self._headers},
                 timeout=self._timeout,
                 verify=self._verify_ssl,
                 follow_redirects=self._follow_redirects,
-                **self._httpx_args,
+                **{**self._httpx_args, **self._async_transport_args()},
             )
         return self._async_client
 
@@ -266,3 +575,16 @@ class AuthenticatedClient:
     async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
         """Exit a context manager for underlying httpx.AsyncClient (see httpx docs)"""
         await self.get_async_httpx_client().__aexit__(*args, **kwargs)
+
+    def close(self) -> None:
+        """Close the underlying httpx.Client, connections borrowed from a TransportPool stay open"""
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self) -> None:
+        """Close both underlying httpx clients, connections borrowed from a TransportPool stay open"""
+        self.close()
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
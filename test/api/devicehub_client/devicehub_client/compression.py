@@ -0,0 +1,52 @@
+"""Compressed responses
+
+The API compresses responses of at least 1 KiB with the encoding the client prefers in ``Accept-Encoding``.
+httpx decodes gzip and deflate itself, brotli with the ``brotli`` or ``brotlicffi`` package and zstd with the
+``zstandard`` package on httpx 0.27.1 and later (``devicehub_client[compression]``). By default a client
+advertises every encoding it can decode, in the order of ``PREFERENCE``:
+
+    AuthenticatedClient(base_url=..., token=..., compression=["zstd", "gzip"])
+    AuthenticatedClient(base_url=..., token=..., compression=False)  # next to the server, where CPU costs more
+"""
+
+from typing import List, Sequence, Union
+
+# zstd decodes fastest for a ratio close to brotli's, gzip is understood everywhere
+PREFERENCE = ("zstd", "br", "gzip", "deflate")
+
+Compression = Union[bool, Sequence[str]]
+
+
+def available_encodings() -> List[str]:
+    """The content encodings httpx can decode with the installed packages, by preference"""
+    try:
+        from httpx._decoders import SUPPORTED_DECODERS
+    except ImportError:  # pragma: no cover - httpx moved its decoders
+        return ["gzip", "deflate"]
+    return [encoding for encoding in PREFERENCE if encoding in SUPPORTED_DECODERS]
+
+
+def accept_encoding(compression: Compression = True) -> str:
+    """The ``Accept-Encoding`` header for the ``compression`` argument of a client
+
+    Encodings are sent with decreasing qualities, so the server picks the first one it supports.
+
+    Raises:
+        ValueError: If ``compression`` lists an encoding which httpx cannot decode.
+    """
+    available = available_encodings()
+    if compression is False:
+        encodings: List[str] = []
+    elif compression is True:
+        encodings = available
+    else:
+        encodings = list(dict.fromkeys(compression))
+        missing = [encoding for encoding in encodings if encoding not in available]
+        if missing:
+            raise ValueError(f"Cannot decode {', '.join(missing)}, install devicehub_client[compression]")
+    if not encodings:
+        return "identity"
+    return ", ".join(encoding if i == 0 else f"{encoding};q={1 - i / 10:.1f}" for i, encoding in enumerate(encodings))
+
+
+__all__ = ["PREFERENCE", "Compression", "accept_encoding", "available_encodings"]
@@ -0,0 +1,54 @@
+"""JSON decoders the clients can use to decode response bodies"""
+
+import json
+from typing import Any, Callable, Dict
+
+JsonDecoder = Callable[[bytes], Any]
+
+
+def stdlib_decoder(content: bytes) -> Any:
+    """Decode with the standard library ``json`` module"""
+    return json.loads(content)
+
+
+def _orjson_decoder() -> JsonDecoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec_decoder() -> JsonDecoder:
+    import msgspec
+
+    return msgspec.json.Decoder().decode
+
+
+_BACKENDS: Dict[str, Callable[[], JsonDecoder]] = {
+    "orjson": _orjson_decoder,
+    "msgspec": _msgspec_decoder,
+    "json": lambda: stdlib_decoder,
+}
+
+
+def get_decoder(backend: str = "auto") -> JsonDecoder:
+    """Get a decoder for ``backend`` ("orjson", "msgspec" or "json")
+
+    "auto" picks the fastest installed backend in that order, falling back to the standard library.
+
+    Raises:
+        ValueError: If the backend is unknown.
+        ImportError: If the requested backend is not installed.
+    """
+    if backend == "auto":
+        for name in ("orjson", "msgspec"):
+            try:
+                return _BACKENDS[name]()
+            except ImportError:
+                continue
+        return stdlib_decoder
+    if backend not in _BACKENDS:
+        raise ValueError(f"Unknown JSON backend {backend!r}, expected one of: auto, {', '.join(_BACKENDS)}")
+    return _BACKENDS[backend]()
+
+
+__all__ = ["JsonDecoder", "get_decoder", "stdlib_decoder"]
@@ -0,0 +1,228 @@
+"""Uploading an APK to the storage unit once and installing it on many devices
+
+``install_on_device`` only takes the URL of an APK the device side downloads. ``upload_apk`` streams a local APK or
+AAB into the storage unit (``POST /s/upload/apk``) as a multipart body read from disk chunk by chunk, and
+``install_apk`` sends the stored file to ``/autotests/install/{serial}`` for many devices concurrently:
+
+    apk = await async_upload_apk(client, "app-release.apk", progress=lambda sent, total: ...)
+    report = await install_apk(client, apk.href, serials, install_flags=["-r"], on_installed=print)
+    report.failed  # serials the app was not installed on, report.results[serial].description tells why
+
+The storage unit is served next to the API (``https://host/s/...`` for ``https://host/api/v1``) and accepts the
+same token. AAB files are converted to APKs by the storage unit.
+"""
+
+import asyncio
+import os
+import uuid
+from http import HTTPStatus
+from pathlib import Path
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import httpx
+from attrs import define
+
+from .api.autotests import install_on_device as _install_on_device
+from .bulk import BulkReport, ItemResult, _describe
+from .client import AuthenticatedClient, Client
+from .errors import UnexpectedStatus
+from .models.adb_install_flags_payload import AdbInstallFlagsPayload
+from .operations import BASE_PATH
+
+DEFAULT_CHUNK_SIZE = 256 * 1024
+DEFAULT_CONCURRENCY = 8
+UPLOAD_FIELD = "file"
+
+Progress = Callable[[int, int], None]
+InstalledHook = Callable[[ItemResult], None]
+
+
+@define
+class StoredApk:
+    """File stored by the storage unit
+
+    Attributes:
+        id: Storage id of the file.
+        name: Stored name, the md5 of the uploaded file name.
+        href: Path of the file on the storage unit, what ``install_apk`` sends to the devices.
+        plugin: Storage plugin the file was uploaded for.
+    """
+
+    id: str
+    name: str
+    href: str
+    plugin: str
+
+
+def storage_url(client: Union[AuthenticatedClient, Client]) -> str:
+    """Base URL of the storage unit served next to the API of ``client``"""
+    base_url = client._base_url.rstrip("/")
+    if base_url.endswith(BASE_PATH):
+        base_url = base_url[: -len(BASE_PATH)]
+    return base_url
+
+
+class _Multipart:
+    """``multipart/form-data`` body of a single file, streamed from disk with a known length"""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"], chunk_size: int, progress: Optional[Progress]):
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.progress = progress
+        boundary = uuid.uuid4().hex
+        self.head = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="{UPLOAD_FIELD}"; filename="{self.path.name}"\r\n'
+            f"Content-Type: application/octet-stream\r\n\r\n"
+        ).encode()
+        self.tail = f"\r\n--{boundary}--\r\n".encode()
+        self.size = self.path.stat().st_size
+        self.headers = {
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+            "Content-Length": str(len(self.head) + self.size + len(self.tail)),
+        }
+        self.sent = 0
+
+    def _report(self, chunk: bytes) -> bytes:
+        self.sent += len(chunk)
+        if self.progress is not None:
+            self.progress(self.sent, self.size)
+        return chunk
+
+    def __iter__(self) -> Iterator[bytes]:
+        # iterated again from the start when httpx retries the request
+        self.sent = 0
+        yield self.head
+        with open(self.path, "rb") as file:
+            while True:
+                chunk = file.read(self.chunk_size)
+                if not chunk:
+                    break
+                yield self._report(chunk)
+        yield self.tail
+
+    async def aiter(self) -> AsyncIterator[bytes]:
+        loop = asyncio.get_running_loop()
+        self.sent = 0
+        yield self.head
+        with open(self.path, "rb") as file:
+            while True:
+                chunk = await loop.run_in_executor(None, file.read, self.chunk_size)
+                if not chunk:
+                    break
+                yield self._report(chunk)
+        yield self.tail
+
+
+class _AsyncMultipart:
+    """Async view of a ``_Multipart``, httpx takes any body with ``__iter__`` for a sync one"""
+
+    def __init__(self, body: _Multipart):
+        self.body = body
+
+    def __aiter__(self) -> AsyncIterator[bytes]:
+        return self.body.aiter()
+
+
+def _upload_request(
+    client: Union[AuthenticatedClient, Client], path: Union[str, "os.PathLike[str]"], chunk_size: int,
+    progress: Optional[Progress],
+) -> Tuple[str, _Multipart]:
+    return f"{storage_url(client)}/s/upload/apk", _Multipart(path, chunk_size, progress)
+
+
+def _stored(response: httpx.Response) -> StoredApk:
+    if response.status_code != HTTPStatus.CREATED:
+        raise UnexpectedStatus(response.status_code, response.content)
+    resource = response.json()["resources"][UPLOAD_FIELD]
+    return StoredApk(id=resource["id"], name=resource["name"], href=resource["href"], plugin=resource["plugin"])
+
+
+def upload_apk(
+    client: Union[AuthenticatedClient, Client],
+    path: Union[str, "os.PathLike[str]"],
+    progress: Optional[Progress] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StoredApk:
+    """Upload an APK or AAB to the storage unit, ``progress`` is called with the bytes sent and the file size
+
+    Raises:
+        errors.UnexpectedStatus: If the storage unit did not store the file.
+    """
+    url, body = _upload_request(client, path, chunk_size, progress)
+    response = client.get_httpx_client().post(url, content=body, headers=body.headers)
+    return _stored(response)
+
+
+async def async_upload_apk(
+    client: Union[AuthenticatedClient, Client],
+    path: Union[str, "os.PathLike[str]"],
+    progress: Optional[Progress] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> StoredApk:
+    """Async version of ``upload_apk``, the file is read in a thread"""
+    url, body = _upload_request(client, path, chunk_size, progress)
+    response = await client.get_async_httpx_client().post(url, content=_AsyncMultipart(body), headers=body.headers)
+    return _stored(response)
+
+
+async def install_apk(
+    client: Union[AuthenticatedClient, Client],
+    href: str,
+    serials: List[str],
+    install_flags: Optional[List[str]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    on_installed: Optional[InstalledHook] = None,
+) -> BulkReport:
+    """Install the stored APK at ``href`` on every device, at most ``concurrency`` at a time
+
+    ``on_installed`` is called with the result of each device as soon as it is known.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be positive")
+    semaphore = asyncio.Semaphore(concurrency)
+    body = AdbInstallFlagsPayload(url=href)
+    if install_flags:
+        body.install_flags = install_flags
+
+    async def install(serial: str) -> ItemResult:
+        async with semaphore:
+            try:
+                response = await _install_on_device.asyncio_detailed(serial, client=client, body=body)
+            except Exception as e:
+                result = ItemResult(serial, False, None, repr(e))
+            else:
+                result = ItemResult(serial, response.status_code == HTTPStatus.OK, response.status_code,
+                                    _describe(response))
+        if on_installed is not None:
+            on_installed(result)
+        return result
+
+    unique = list(dict.fromkeys(serials))
+    results: Dict[str, ItemResult] = {result.item: result for result in await asyncio.gather(*map(install, unique))}
+    return BulkReport(results=results)
+
+
+async def upload_and_install(
+    client: Union[AuthenticatedClient, Client],
+    path: Union[str, "os.PathLike[str]"],
+    serials: List[str],
+    install_flags: Optional[List[str]] = None,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    progress: Optional[Progress] = None,
+    on_installed: Optional[InstalledHook] = None,
+) -> Tuple[StoredApk, BulkReport]:
+    """Upload a file once with ``async_upload_apk`` and install it on every device with ``install_apk``"""
+    apk = await async_upload_apk(client, path, progress=progress)
+    return apk, await install_apk(client, apk.href, serials, install_flags, concurrency, on_installed)
+
+
+__all__ = [
+    "DEFAULT_CHUNK_SIZE",
+    "StoredApk",
+    "async_upload_apk",
+    "install_apk",
+    "storage_url",
+    "upload_and_install",
+    "upload_apk",
+]
@@ -0,0 +1,357 @@
+"""Request timings and latency histograms per operation
+
+Clients accept three hooks, each called with the ``RequestTimings`` of a request:
+
+    ``on_request``: before the request is sent.
+    ``on_response``: once the response body has been downloaded, with ``connect``, ``ttfb`` and ``download`` set.
+    ``on_parse_done``: once the endpoint function has decoded the body into models, with ``parse`` set.
+
+The hooks run for every attempt of a request (see ``retry``), after the rate limiter let it go. ``LatencyRecorder``
+is a ready-made collector keeping a log-linear (HDR-style) histogram per operationId and phase:
+
+    recorder = LatencyRecorder()
+    client = AuthenticatedClient(base_url, token=token, **recorder.hooks())
+    ...
+    print(recorder.report())
+"""
+
+import json
+import math
+import threading
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional
+
+import httpx
+from attrs import define, field
+
+from .operations import operation_id
+
+TIMINGS_EXTENSION = "devicehub_timings"
+PHASES = ("network", "connect", "ttfb", "download", "parse")
+
+TimingsHook = Callable[["RequestTimings"], None]
+
+
+@define
+class RequestTimings:
+    """Where the time of a request went, durations in seconds
+
+    Attributes:
+        operation_id: The operationId of the request, ``"METHOD /path"`` for paths the API does not document.
+        method: The request method.
+        url: The request URL.
+        started: ``time.perf_counter()`` when the request was handed to the transport.
+        status_code: The response status, None until the response headers arrive.
+        connect: Time spent opening connections (TCP and TLS), 0 on a reused connection.
+        ttfb: From sending the request to receiving the response headers, including ``connect``.
+        download: From the response headers to the end of the body.
+        parse: Time the endpoint function spent decoding the body into models, None until it is done.
+        received: Bytes of the body as received, before the content encoding is decoded.
+    """
+
+    operation_id: str
+    method: str
+    url: str
+    started: float
+    status_code: Optional[int] = None
+    connect: float = 0.0
+    ttfb: float = 0.0
+    download: float = 0.0
+    parse: Optional[float] = None
+    received: int = 0
+
+    @property
+    def network(self) -> float:
+        return self.ttfb + self.download
+
+    @property
+    def total(self) -> float:
+        return self.network + (self.parse or 0.0)
+
+
+def _timings(request: httpx.Request) -> RequestTimings:
+    operation = operation_id(request.method, request.url.path) or f"{request.method} {request.url.path}"
+    return RequestTimings(operation, request.method, str(request.url), time.perf_counter())
+
+
+class _Trace:
+    """httpcore trace callback collecting the connect and response header events"""
+
+    def __init__(self, timings: RequestTimings, chained: Optional[Callable[..., Any]]):
+        self.timings = timings
+        self.chained = chained
+        self.headers_at: Optional[float] = None
+        self._connect_started: Optional[float] = None
+
+    def event(self, name: str) -> None:
+        now = time.perf_counter()
+        if name.startswith("connection.") and name.endswith(".started"):
+            self._connect_started = now
+        elif name.startswith("connection.") and name.endswith(".complete") and self._connect_started is not None:
+            self.timings.connect += now - self._connect_started
+            self._connect_started = None
+        elif name.endswith("receive_response_headers.complete"):
+            self.headers_at = now
+
+    def __call__(self, name: str, info: Dict[str, Any]) -> None:
+        self.event(name)
+        if self.chained is not None:
+            self.chained(name, info)
+
+    async def atrace(self, name: str, info: Dict[str, Any]) -> None:
+        self.event(name)
+        if self.chained is not None:
+            await self.chained(name, info)
+
+
+def _trace(request: httpx.Request, timings: RequestTimings) -> _Trace:
+    # a retried request still carries the trace of its previous attempt
+    chained = request.extensions.get("trace")
+    owner = getattr(chained, "__self__", chained)
+    if isinstance(owner, _Trace):
+        chained = owner.chained
+    return _Trace(timings, chained)
+
+
+def _headers_received(trace: _Trace, response: httpx.Response) -> None:
+    timings = trace.timings
+    timings.status_code = response.status_code
+    timings.ttfb = (trace.headers_at or time.perf_counter()) - timings.started
+
+
+class _TimedStream(httpx.SyncByteStream):
+    def __init__(self, stream: httpx.SyncByteStream, timings: RequestTimings, on_response: Optional[TimingsHook]):
+        self._stream = stream
+        self._timings = timings
+        self._on_response = on_response
+        self._done = False
+
+    def __iter__(self) -> Iterator[bytes]:
+        for chunk in self._stream:
+            self._timings.received += len(chunk)
+            yield chunk
+
+    def close(self) -> None:
+        try:
+            self._stream.close()
+        finally:
+            if not self._done:
+                self._done = True
+                self._timings.download = time.perf_counter() - self._timings.started - self._timings.ttfb
+                if self._on_response is not None:
+                    self._on_response(self._timings)
+
+
+class _TimedAsyncStream(httpx.AsyncByteStream):
+    def __init__(self, stream: httpx.AsyncByteStream, timings: RequestTimings, on_response: Optional[TimingsHook]):
+        self._stream = stream
+        self._timings = timings
+        self._on_response = on_response
+        self._done = False
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            self._timings.received += len(chunk)
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if not self._done:
+                self._done = True
+                self._timings.download = time.perf_counter() - self._timings.started - self._timings.ttfb
+                if self._on_response is not None:
+                    self._on_response(self._timings)
+
+
+class InstrumentedTransport(httpx.BaseTransport):
+    """Times each request and reports it to the hooks, the timings travel in the response extensions"""
+
+    def __init__(
+        self,
+        transport: httpx.BaseTransport,
+        on_request: Optional[TimingsHook] = None,
+        on_response: Optional[TimingsHook] = None,
+    ):
+        self._transport = transport
+        self._on_request = on_request
+        self._on_response = on_response
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _trace(request, _timings(request))
+        request.extensions["trace"] = trace
+        if self._on_request is not None:
+            self._on_request(trace.timings)
+        response = self._transport.handle_request(request)
+        _headers_received(trace, response)
+        assert isinstance(response.stream, httpx.SyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TimedStream(response.stream, trace.timings, self._on_response),
+            extensions={**response.extensions, TIMINGS_EXTENSION: trace.timings},
+        )
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class InstrumentedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async version of ``InstrumentedTransport``"""
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        on_request: Optional[TimingsHook] = None,
+        on_response: Optional[TimingsHook] = None,
+    ):
+        self._transport = transport
+        self._on_request = on_request
+        self._on_response = on_response
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = _trace(request, _timings(request))
+        request.extensions["trace"] = trace.atrace
+        if self._on_request is not None:
+            self._on_request(trace.timings)
+        response = await self._transport.handle_async_request(request)
+        _headers_received(trace, response)
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TimedAsyncStream(response.stream, trace.timings, self._on_response),
+            extensions={**response.extensions, TIMINGS_EXTENSION: trace.timings},
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations with a bounded relative error
+
+    Values are bucketed like HdrHistogram: each power of two of microseconds is split into ``2 ** precision``
+    linear sub-buckets, so percentiles are off by less than ``2 ** -precision`` whatever the range.
+
+    Args:
+        precision: Number of sub-bucket bits, 7 keeps the relative error under 1%.
+    """
+
+    def __init__(self, precision: int = 7):
+        self._precision = precision
+        self._counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def _index(self, micros: int) -> int:
+        shift = max(0, micros.bit_length() - self._precision - 1)
+        return (shift << self._precision) + (micros >> shift)
+
+    def _upper(self, index: int) -> float:
+        shift, sub = index >> self._precision, index & ((1 << self._precision) - 1)
+        if shift:
+            sub += 1 << self._precision
+            shift -= 1
+        return (((sub + 1) << shift) - 1) / 1e6
+
+    def record(self, seconds: float) -> None:
+        index = self._index(max(0, int(seconds * 1e6)))
+        self._counts[index] = self._counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, percent: float) -> float:
+        """The duration below which ``percent`` of the values fall, 0 if empty"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self._counts):
+            seen += self._counts[index]
+            if seen >= rank:
+                return min(self._upper(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
+
+
+@define
+class LatencyRecorder:
+    """Collects ``RequestTimings`` into one ``LatencyHistogram`` per operationId and phase
+
+    Phases are ``network`` (``ttfb`` + ``download``), ``connect``, ``ttfb``, ``download`` and ``parse``.
+    """
+
+    precision: int = 7
+    _histograms: Dict[str, Dict[str, LatencyHistogram]] = field(factory=dict, init=False)
+    _lock: threading.Lock = field(factory=threading.Lock, init=False)
+
+    def hooks(self) -> Dict[str, TimingsHook]:
+        """Keyword arguments installing the recorder on a client"""
+        return {"on_response": self.record_response, "on_parse_done": self.record_parse}
+
+    def _histogram(self, operation: str, phase: str) -> LatencyHistogram:
+        phases = self._histograms.setdefault(operation, {})
+        if phase not in phases:
+            phases[phase] = LatencyHistogram(self.precision)
+        return phases[phase]
+
+    def record_response(self, timings: RequestTimings) -> None:
+        with self._lock:
+            for phase in ("network", "connect", "ttfb", "download"):
+                self._histogram(timings.operation_id, phase).record(getattr(timings, phase))
+
+    def record_parse(self, timings: RequestTimings) -> None:
+        with self._lock:
+            self._histogram(timings.operation_id, "parse").record(timings.parse or 0.0)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """``{operationId: {phase: {count, mean, p50, p90, p99, max}}}`` in seconds"""
+        with self._lock:
+            return {
+                operation: {phase: phases[phase].summary() for phase in PHASES if phase in phases}
+                for operation, phases in sorted(self._histograms.items())
+            }
+
+    def report(self) -> str:
+        """A table of the p50/p90/p99 of every operation and phase, in milliseconds"""
+        lines: List[str] = [f"{'operation':<32} {'phase':<9} {'count':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}"]
+        for operation, phases in self.summary().items():
+            for phase, stats in phases.items():
+                values = " ".join(f"{stats[key] * 1000:9.2f}" for key in ("p50", "p90", "p99", "max"))
+                lines.append(f"{operation:<32} {phase:<9} {stats['count']:>6} {values}")
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Write ``summary()`` as JSON"""
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+__all__ = [
+    "InstrumentedAsyncTransport",
+    "InstrumentedTransport",
+    "LatencyHistogram",
+    "LatencyRecorder",
+    "PHASES",
+    "RequestTimings",
+    "TIMINGS_EXTENSION",
+]
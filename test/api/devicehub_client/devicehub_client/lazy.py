@@ -0,0 +1,119 @@
+"""Lazily materialized models for large list responses"""
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Type, TypeVar, Union, overload
+
+from attrs import fields
+from dateutil.parser import isoparse
+
+from .models.device import Device
+
+T = TypeVar("T")
+
+
+class LazyList(Sequence[T]):
+    """A read-only sequence which keeps the raw dicts and builds a model only when an item is accessed
+
+    Materialized items are cached, so indexing the same position twice returns the same object.
+    Use ``raw()`` to inspect an item (e.g. to filter on a field) without building the model at all.
+    """
+
+    __slots__ = ("_raw", "_factory", "_items")
+
+    def __init__(self, raw: List[Dict[str, Any]], factory: Callable[[Dict[str, Any]], T]):
+        self._raw = raw
+        self._factory = factory
+        self._items: List[Optional[T]] = [None] * len(raw)
+
+    def __len__(self) -> int:
+        return len(self._raw)
+
+    @overload
+    def __getitem__(self, index: int) -> T: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[T]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[T, List[T]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._factory(self._raw[index])
+        return item
+
+    def __iter__(self) -> Iterator[T]:
+        for index in range(len(self._raw)):
+            yield self[index]
+
+    def raw(self, index: int) -> Dict[str, Any]:
+        """Get the undecoded dict of an item"""
+        return self._raw[index]
+
+    @property
+    def materialized(self) -> int:
+        """The number of items built so far"""
+        return sum(item is not None for item in self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"LazyList(len={len(self)}, materialized={self.materialized})"
+
+
+_DEVICE_TIMESTAMPS = (
+    ("presenceChangedAt", "presence_changed_at"),
+    ("statusChangedAt", "status_changed_at"),
+    ("createdAt", "created_at"),
+    ("usageChangedAt", "usage_changed_at"),
+    ("releasedAt", "released_at"),
+)
+
+L = TypeVar("L", bound="LazyDevice")
+
+
+class LazyDevice(Device):
+    """A Device which keeps its timestamps as ISO strings until the attribute is first read"""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_dict(cls: Type[L], src_dict: Dict[str, Any]) -> L:
+        d = src_dict.copy()
+        raw_timestamps = [(name, d.pop(key)) for key, name in _DEVICE_TIMESTAMPS if key in d]
+        device = super().from_dict(d)
+        for name, value in raw_timestamps:
+            setattr(device, name, value)
+        return device
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Device):
+            return NotImplemented
+        return all(getattr(self, a.name) == getattr(other, a.name) for a in fields(Device))
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+
+def _lazy_timestamp(slot: Any) -> property:
+    def fget(self: Device) -> Any:
+        value = slot.__get__(self, type(self))
+        if isinstance(value, str):
+            value = isoparse(value)
+            slot.__set__(self, value)
+        return value
+
+    def fset(self: Device, value: Any) -> None:
+        slot.__set__(self, value)
+
+    return property(fget, fset)
+
+
+for _key, _name in _DEVICE_TIMESTAMPS:
+    setattr(LazyDevice, _name, _lazy_timestamp(Device.__dict__[_name]))
+
+
+__all__ = ["LazyDevice", "LazyList"]
@@ -0,0 +1,173 @@
+"""Iterating over the device list without holding all of it
+
+``get_devices`` returns the whole farm in one JSON document which is decoded and turned into models at once.
+``iter_devices`` asks for ``application/x-ndjson`` instead and yields each device as its line arrives, so memory
+stays flat whatever the farm size and the first device is available before the last one is sent:
+
+    for device in iter_devices(client, target=GetDevicesTarget.ORIGIN):
+        ...
+    async for record in aiter_devices(client, fields="serial,present,group.id", group_name=["Common"]):
+        record.group_id
+
+With ``page_size`` the list is read with ``limit``/``cursor`` pages of regular JSON instead, e.g. behind a proxy
+which buffers streamed responses. Devices are ``Device`` models (``LazyDevice`` with ``lazy_models``), or
+``projection`` records when ``fields`` is given. Servers answering with a single JSON document (older versions,
+``target=standardizable``) are handled too. As an iterator has nothing to return, an unexpected status always
+raises ``errors.UnexpectedStatus``.
+"""
+
+import json
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import httpx
+
+from . import errors
+from .api.devices import get_devices
+from .client import AuthenticatedClient, Client
+from .models.device import Device
+from .models.get_devices_target import GetDevicesTarget
+from .projection import record_type
+from .types import UNSET, Unset
+
+NDJSON = "application/x-ndjson"
+
+Parser = Callable[[Dict[str, Any]], Any]
+
+
+def _parser(client: Union[AuthenticatedClient, Client], fields: Optional[Union[str, Iterable[str]]]) -> Parser:
+    if fields is not None:
+        return record_type(fields).from_dict
+    if client.lazy_models:
+        from .lazy import LazyDevice
+
+        return LazyDevice.from_dict
+    return Device.from_dict
+
+
+def _decoder(client: Union[AuthenticatedClient, Client]) -> Callable[[bytes], Any]:
+    return client.json_decoder if client.json_decoder is not None else json.loads
+
+
+def _kwargs(
+    target: Union[Unset, GetDevicesTarget],
+    fields: Optional[Union[str, Iterable[str]]],
+    filters: Dict[str, Any],
+    limit: Union[Unset, int] = UNSET,
+    cursor: Union[Unset, str] = UNSET,
+) -> Dict[str, Any]:
+    projected = UNSET if fields is None else record_type(fields)._fields
+    return get_devices._get_kwargs(target=target, fields=projected, limit=limit, cursor=cursor, **filters)
+
+
+def _split_lines(buffer: bytearray, chunk: bytes) -> List[bytes]:
+    buffer.extend(chunk)
+    end = buffer.rfind(b"\n")
+    if end == -1:
+        return []
+    lines = bytes(buffer[:end]).split(b"\n")
+    del buffer[: end + 1]
+    return lines
+
+
+def _check(response: httpx.Response) -> None:
+    if response.status_code != 200:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+
+
+def _is_ndjson(response: httpx.Response) -> bool:
+    return response.headers.get("content-type", "").split(";")[0].strip() == NDJSON
+
+
+def _page(response: httpx.Response, decode: Callable[[bytes], Any]) -> Dict[str, Any]:
+    _check(response)
+    return decode(response.content)
+
+
+def iter_devices(
+    client: Union[AuthenticatedClient, Client],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    fields: Optional[Union[str, Iterable[str]]] = None,
+    page_size: Optional[int] = None,
+    **filters: Any,
+) -> Iterator[Any]:
+    """Yield the devices of ``get_devices`` one by one, see the module documentation
+
+    ``filters`` are the filter arguments of ``get_devices.sync_detailed``, e.g. ``status=[3], present=True``.
+
+    Raises:
+        errors.UnexpectedStatus: If the server answers with another status than 200.
+        httpx.TimeoutException: If a read takes longer than Client.timeout.
+    """
+    parse, decode = _parser(client, fields), _decoder(client)
+    http = client.get_httpx_client()
+    if page_size is not None:
+        cursor: Union[Unset, str] = UNSET
+        while True:
+            page = _page(http.request(**_kwargs(target, fields, filters, page_size, cursor)), decode)
+            for device in page["devices"]:
+                yield parse(device)
+            if not page.get("hasMore") or not page.get("cursor"):
+                return
+            cursor = page["cursor"]
+
+    kwargs = _kwargs(target, fields, filters)
+    kwargs["headers"]["Accept"] = f"{NDJSON}, application/json;q=0.5"
+    with http.stream(**kwargs) as response:
+        if response.status_code != 200:
+            response.read()
+        _check(response)
+        if not _is_ndjson(response):
+            response.read()
+            for device in decode(response.content)["devices"]:
+                yield parse(device)
+            return
+        buffer = bytearray()
+        for chunk in response.iter_bytes():
+            for line in _split_lines(buffer, chunk):
+                if line.strip():
+                    yield parse(decode(line))
+        if buffer.strip():
+            yield parse(decode(bytes(buffer)))
+
+
+async def aiter_devices(
+    client: Union[AuthenticatedClient, Client],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    fields: Optional[Union[str, Iterable[str]]] = None,
+    page_size: Optional[int] = None,
+    **filters: Any,
+) -> AsyncIterator[Any]:
+    """Async version of ``iter_devices``"""
+    parse, decode = _parser(client, fields), _decoder(client)
+    http = client.get_async_httpx_client()
+    if page_size is not None:
+        cursor: Union[Unset, str] = UNSET
+        while True:
+            page = _page(await http.request(**_kwargs(target, fields, filters, page_size, cursor)), decode)
+            for device in page["devices"]:
+                yield parse(device)
+            if not page.get("hasMore") or not page.get("cursor"):
+                return
+            cursor = page["cursor"]
+
+    kwargs = _kwargs(target, fields, filters)
+    kwargs["headers"]["Accept"] = f"{NDJSON}, application/json;q=0.5"
+    async with http.stream(**kwargs) as response:
+        if response.status_code != 200:
+            await response.aread()
+        _check(response)
+        if not _is_ndjson(response):
+            await response.aread()
+            for device in decode(response.content)["devices"]:
+                yield parse(device)
+            return
+        buffer = bytearray()
+        async for chunk in response.aiter_bytes():
+            for line in _split_lines(buffer, chunk):
+                if line.strip():
+                    yield parse(decode(line))
+        if buffer.strip():
+            yield parse(decode(bytes(buffer)))
+
+
+__all__ = ["aiter_devices", "iter_devices"]
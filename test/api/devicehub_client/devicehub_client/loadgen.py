@@ -0,0 +1,579 @@
+"""Load generator simulating CI runs which capture and free devices through the autotests API
+
+Each simulated run asks ``GET /autotests`` for devices matching one of the requirements of the profile, keeps
+asking while the server answers 409 (not enough free devices) until ``capture_deadline``, holds the devices for a
+time drawn from the hold distribution and frees them with ``DELETE /autotests``:
+
+    profile = LoadProfile(runs=20, arrival_rate=0.5, duration=600, hold=HoldTime.exponential(60),
+                          requirements=[Requirement(amount=2, abi="arm64-v8a", weight=3), Requirement(sdk="34")])
+    report = await LoadGenerator(client, profile).run()
+    print(report.report())
+
+Without ``arrival_rate`` the ``runs`` CI runs start their next run as soon as the previous one freed its devices
+(closed loop), with it runs arrive as a Poisson process and ``runs`` caps how many are in flight (open loop, the
+time spent waiting for a slot counts as waiting for devices). Arrivals stop after ``duration``, runs still waiting
+for devices are then abandoned and held devices are freed at once.
+
+The same is available from the command line, ``python -m devicehub_client.loadgen --help``.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from attrs import define, field
+
+from . import projection
+from .api.autotests import capture_devices as _capture_devices
+from .api.autotests import free_devices as _free_devices
+from .client import AuthenticatedClient, Client
+from .instrumentation import LatencyHistogram
+from .types import UNSET
+
+CAPTURED = "captured"
+TIMEOUT = "timeout"
+REJECTED = "rejected"
+ABANDONED = "abandoned"
+ERROR = "error"
+OUTCOMES = (CAPTURED, TIMEOUT, REJECTED, ABANDONED, ERROR)
+# a closed loop worker waits retry_interval after a rejected or failed run, doubled up to MAX_BACKOFF for each
+# further one, and stops after MAX_REJECTED rejected runs in a row as its quota will not change during the load
+MAX_BACKOFF = 30.0
+MAX_REJECTED = 5
+
+_POOL_FIELDS = "serial,present,ready,status,owner.email,group.class"
+_HOLD_KINDS = {"fixed": 1, "uniform": 2, "exp": 1, "exponential": 1, "lognormal": 2}
+
+
+@define(frozen=True)
+class HoldTime:
+    """Distribution of the time a run keeps its devices, in seconds
+
+    Use the constructors: ``fixed(30)``, ``uniform(10, 60)``, ``exponential(mean)`` or ``lognormal(median, sigma)``,
+    or ``parse("exp:30")`` for the same spelled as ``kind:param[:param]``.
+    """
+
+    kind: str = "fixed"
+    params: Sequence[float] = (30.0,)
+
+    @classmethod
+    def fixed(cls, seconds: float) -> "HoldTime":
+        return cls("fixed", (seconds,))
+
+    @classmethod
+    def uniform(cls, low: float, high: float) -> "HoldTime":
+        return cls("uniform", (low, high))
+
+    @classmethod
+    def exponential(cls, mean: float) -> "HoldTime":
+        return cls("exponential", (mean,))
+
+    @classmethod
+    def lognormal(cls, median: float, sigma: float) -> "HoldTime":
+        return cls("lognormal", (median, sigma))
+
+    @classmethod
+    def parse(cls, spec: str) -> "HoldTime":
+        kind, *params = spec.split(":")
+        if not params:
+            kind, params = "fixed", [kind]
+        if _HOLD_KINDS.get(kind) != len(params):
+            raise ValueError(f"Invalid hold time {spec!r}")
+        return cls("exponential" if kind == "exp" else kind, tuple(float(param) for param in params))
+
+    def sample(self, rng: random.Random) -> float:
+        if self.kind == "uniform":
+            return rng.uniform(*self.params)
+        if self.kind == "exponential":
+            return rng.expovariate(1 / self.params[0]) if self.params[0] > 0 else 0.0
+        if self.kind == "lognormal":
+            return rng.lognormvariate(math.log(self.params[0]), self.params[1])
+        return self.params[0]
+
+    def __str__(self) -> str:
+        return ":".join([self.kind, *(f"{param:g}" for param in self.params)])
+
+
+@define(frozen=True)
+class Requirement:
+    """Devices one CI run asks for, picked with a probability proportional to ``weight``
+
+    ``parse("amount=2,abi=arm64-v8a*3")`` reads the same as ``key=value`` pairs with an optional ``*weight``.
+    """
+
+    amount: int = 1
+    need_amount: bool = True
+    abi: Optional[str] = None
+    sdk: Optional[str] = None
+    model: Optional[str] = None
+    weight: float = 1.0
+
+    @classmethod
+    def parse(cls, spec: str) -> "Requirement":
+        spec, _, weight = spec.partition("*")
+        values: Dict[str, Any] = {"weight": float(weight) if weight else 1.0}
+        for pair in filter(None, spec.split(",")):
+            key, _, value = pair.partition("=")
+            if key == "amount":
+                values[key] = int(value)
+            elif key == "need_amount":
+                values[key] = value.lower() in ("1", "true", "yes")
+            elif key in ("abi", "sdk", "model"):
+                values[key] = value
+            else:
+                raise ValueError(f"Invalid requirement {pair!r}")
+        return cls(**values)
+
+    def __str__(self) -> str:
+        filters = [f"{key}={getattr(self, key)}" for key in ("abi", "sdk", "model") if getattr(self, key) is not None]
+        return ",".join([f"amount={self.amount}", *filters])
+
+
+@define
+class LoadProfile:
+    """What the simulated CI runs do
+
+    Attributes:
+        runs: Number of concurrent CI runs.
+        duration: Seconds during which new runs arrive.
+        arrival_rate: Runs per second of a Poisson arrival process, None for back to back runs.
+        requirements: The device requirement mix.
+        hold: How long a run keeps its devices.
+        capture_deadline: Seconds a run waits for devices before it counts as timed out.
+        retry_interval: Seconds between capture attempts answered with 409, and the first back off of a closed loop
+            run after a rejected or failed one.
+        group_timeout: ``timeout`` sent with the capture, after which the server frees forgotten groups.
+        sample_interval: Seconds between two samples of the device pool.
+        seed: Seed of the random choices, for repeatable runs.
+    """
+
+    runs: int = 10
+    duration: float = 60.0
+    arrival_rate: Optional[float] = None
+    requirements: Sequence[Requirement] = (Requirement(),)
+    hold: HoldTime = HoldTime.exponential(30.0)
+    capture_deadline: float = 120.0
+    retry_interval: float = 1.0
+    group_timeout: int = 600
+    sample_interval: float = 1.0
+    seed: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "runs": self.runs,
+            "duration": self.duration,
+            "arrival_rate": self.arrival_rate,
+            "requirements": {str(requirement): requirement.weight for requirement in self.requirements},
+            "hold": str(self.hold),
+            "capture_deadline": self.capture_deadline,
+            "seed": self.seed,
+        }
+
+
+@define
+class RunResult:
+    """Outcome of one simulated CI run
+
+    Attributes:
+        name: The ``run`` sent with the capture.
+        requirement: The requirement the run asked for.
+        outcome: One of ``captured``, ``timeout`` (no devices before the deadline), ``rejected`` (403, quota),
+            ``abandoned`` (still waiting when the load stopped) and ``error``.
+        attempts: Number of capture requests.
+        wait: Seconds from the arrival of the run to its outcome.
+        devices: Serials of the captured devices.
+        status_code: Status of the last capture, None if the request itself failed.
+        description: Description of the last capture or the request error.
+    """
+
+    name: str
+    requirement: Requirement
+    outcome: str = ABANDONED
+    attempts: int = 0
+    wait: float = 0.0
+    devices: List[str] = field(factory=list)
+    status_code: Optional[int] = None
+    description: str = ""
+
+
+@define
+class PoolSample:
+    """Pool state seen by the generator, ``elapsed`` seconds after the start"""
+
+    elapsed: float
+    held: int
+    active: int
+    waiting: int
+
+
+@define
+class LoadReport:
+    """Everything measured by a ``LoadGenerator`` run, latencies in seconds"""
+
+    profile: LoadProfile
+    pool_size: Optional[int] = None
+    elapsed: float = 0.0
+    runs: List[RunResult] = field(factory=list)
+    samples: List[PoolSample] = field(factory=list)
+    capture_latency: LatencyHistogram = field(factory=LatencyHistogram)
+    wait_latency: LatencyHistogram = field(factory=LatencyHistogram)
+    free_latency: LatencyHistogram = field(factory=LatencyHistogram)
+    free_failures: int = 0
+    stopped_workers: int = 0
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for run in self.runs if run.outcome == outcome)
+
+    def rate(self, outcome: str) -> float:
+        """Share of the finished (not abandoned) runs with ``outcome``"""
+        finished = len(self.runs) - self.count(ABANDONED)
+        return self.count(outcome) / finished if finished else 0.0
+
+    def utilisation(self) -> List[Dict[str, float]]:
+        """Held devices over time, as a share of ``pool_size`` when it is known"""
+        return [
+            {
+                "elapsed": sample.elapsed,
+                "held": sample.held,
+                "active": sample.active,
+                "waiting": sample.waiting,
+                "utilisation": sample.held / self.pool_size if self.pool_size else 0.0,
+            }
+            for sample in self.samples
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        utilisation = [sample["utilisation"] for sample in self.utilisation()]
+        return {
+            "profile": self.profile.to_dict(),
+            "pool_size": self.pool_size,
+            "elapsed": self.elapsed,
+            "runs": len(self.runs),
+            "outcomes": {outcome: self.count(outcome) for outcome in OUTCOMES},
+            "success_rate": self.rate(CAPTURED),
+            "timeout_rate": self.rate(TIMEOUT),
+            "capture_latency": self.capture_latency.summary(),
+            "wait_latency": self.wait_latency.summary(),
+            "free_latency": self.free_latency.summary(),
+            "free_failures": self.free_failures,
+            "stopped_workers": self.stopped_workers,
+            "utilisation": {
+                "mean": sum(utilisation) / len(utilisation) if utilisation else 0.0,
+                "max": max(utilisation, default=0.0),
+            },
+        }
+
+    def report(self) -> str:
+        """A human readable summary, latencies in milliseconds"""
+        summary = self.summary()
+        outcomes = " ".join(f"{outcome}={count}" for outcome, count in summary["outcomes"].items())
+        lines = [
+            f"{summary['runs']} runs in {self.elapsed:.1f}s: {outcomes}",
+            f"success {summary['success_rate']:.1%}, timeout {summary['timeout_rate']:.1%}",
+        ]
+        if self.stopped_workers:
+            lines.append(f"{self.stopped_workers} of {self.profile.runs} runs stopped after {MAX_REJECTED} rejections")
+        for name in ("capture_latency", "wait_latency", "free_latency"):
+            stats = summary[name]
+            values = " ".join(f"{key} {stats[key] * 1000:.1f}" for key in ("p50", "p90", "p99", "max"))
+            lines.append(f"{name:<16} n={stats['count']:<6} {values}")
+        if self.pool_size:
+            utilisation = summary["utilisation"]
+            lines.append(
+                f"pool of {self.pool_size}: mean utilisation {utilisation['mean']:.1%}, max {utilisation['max']:.1%}"
+            )
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        """Write ``summary()`` with the utilisation samples and the run outcomes as JSON"""
+        data = {
+            **self.summary(),
+            "samples": self.utilisation(),
+            "results": [
+                {
+                    "name": run.name,
+                    "requirement": str(run.requirement),
+                    "outcome": run.outcome,
+                    "attempts": run.attempts,
+                    "wait": run.wait,
+                    "devices": run.devices,
+                    "status_code": run.status_code,
+                }
+                for run in self.runs
+            ],
+        }
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+
+
+class LoadGenerator:
+    """Runs a ``LoadProfile`` against the autotests API
+
+    Args:
+        client: The client used for the requests, use a token allowed to capture as many devices as the
+            requirements ask for (non admins get at most 2).
+        profile: What the simulated runs do.
+        pool_size: Number of capturable devices, counted from the device list when None.
+        prefix: Prefix of the run names, random when None so that concurrent generators do not collide.
+    """
+
+    _stopping: asyncio.Event  # created by run(), in the loop it runs in
+
+    def __init__(
+        self,
+        client: Union[AuthenticatedClient, Client],
+        profile: LoadProfile,
+        pool_size: Optional[int] = None,
+        prefix: Optional[str] = None,
+    ):
+        if profile.runs < 1 or not profile.requirements:
+            raise ValueError("runs must be positive and requirements not empty")
+        self._client = client
+        self._profile = profile
+        self._pool_size = pool_size
+        self._prefix = prefix or f"loadgen-{uuid.uuid4().hex[:8]}"
+        self._rng = random.Random(profile.seed)
+        self._report = LoadReport(profile)
+        self._started = 0.0
+        self._held = 0
+        self._active = 0
+        self._waiting = 0
+
+    async def count_pool(self) -> int:
+        """Number of devices a capture could get right now"""
+        devices = await projection.asyncio(client=self._client, fields=_POOL_FIELDS) or []
+        return sum(
+            1
+            for device in devices
+            if device.present is True
+            and device.ready is True
+            and device.status == 3
+            and device.owner_email in (None, UNSET)
+            and device.group_class == "bookable"
+        )
+
+    def _elapsed(self) -> float:
+        return time.perf_counter() - self._started
+
+    def _requirement(self) -> Requirement:
+        requirements = self._profile.requirements
+        return self._rng.choices(requirements, weights=[requirement.weight for requirement in requirements])[0]
+
+    async def _sleep(self, seconds: float) -> bool:
+        """Sleep unless the load stops first, True if it did"""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), max(0.0, seconds))
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def _capture(self, result: RunResult, arrived: float) -> Optional[str]:
+        profile = self._profile
+        requirement = result.requirement
+        while True:
+            if result.attempts and self._stopping.is_set():
+                # devices freed when the load stops must not be captured by an attempt started after it
+                result.outcome = ABANDONED
+                return None
+            started = time.perf_counter()
+            try:
+                response = await _capture_devices.asyncio_detailed(
+                    client=self._client,
+                    timeout=profile.group_timeout,
+                    amount=requirement.amount,
+                    need_amount=requirement.need_amount,
+                    abi=UNSET if requirement.abi is None else requirement.abi,
+                    sdk=UNSET if requirement.sdk is None else requirement.sdk,
+                    model=UNSET if requirement.model is None else requirement.model,
+                    run=result.name,
+                )
+            except Exception as e:
+                result.attempts += 1
+                result.outcome, result.status_code, result.description = ERROR, None, repr(e)
+                return None
+            self._report.capture_latency.record(time.perf_counter() - started)
+            result.attempts += 1
+            result.status_code = response.status_code
+            parsed = response.parsed
+            description = getattr(parsed, "description", None)
+            result.description = description if description is not None else response.content.decode(errors="ignore")
+            group = getattr(parsed, "group", UNSET)
+            if response.status_code == HTTPStatus.OK and group and isinstance(group.id, str):
+                result.outcome = CAPTURED
+                result.devices = [device.serial for device in group.devices or [] if isinstance(device.serial, str)]
+                return group.id
+            if response.status_code == HTTPStatus.FORBIDDEN:
+                result.outcome = REJECTED
+                return None
+            if response.status_code != HTTPStatus.CONFLICT:
+                result.outcome = ERROR
+                return None
+            if time.perf_counter() - arrived + profile.retry_interval > profile.capture_deadline:
+                result.outcome = TIMEOUT
+                return None
+            if await self._sleep(profile.retry_interval):
+                result.outcome = ABANDONED
+                return None
+
+    async def _free(self, group_id: str) -> None:
+        started = time.perf_counter()
+        try:
+            response = await _free_devices.asyncio_detailed(client=self._client, group=group_id)
+        except Exception:
+            self._report.free_failures += 1
+            return
+        self._report.free_latency.record(time.perf_counter() - started)
+        if response.status_code != HTTPStatus.OK:
+            self._report.free_failures += 1
+
+    async def _run(self, index: int, arrived: float, slots: Optional[asyncio.Semaphore] = None) -> RunResult:
+        result = RunResult(f"{self._prefix}-{index}", self._requirement())
+        self._report.runs.append(result)
+        self._waiting += 1
+        waiting = True
+        if slots is not None:
+            await slots.acquire()
+        self._active += 1
+        try:
+            group_id = None if self._stopping.is_set() else await self._capture(result, arrived)
+            result.wait = time.perf_counter() - arrived
+            self._waiting -= 1
+            waiting = False
+            if group_id is None:
+                return result
+            self._report.wait_latency.record(result.wait)
+            self._held += len(result.devices)
+            try:
+                await self._sleep(self._profile.hold.sample(self._rng))
+            finally:
+                await self._free(group_id)
+                self._held -= len(result.devices)
+            return result
+        finally:
+            self._waiting -= waiting
+            self._active -= 1
+            if slots is not None:
+                slots.release()
+
+    async def _closed_loop(self, worker: int) -> None:
+        failures = 0
+        rejected = 0
+        for index in range(worker, sys.maxsize, self._profile.runs):
+            if self._stopping.is_set():
+                return
+            result = await self._run(index, time.perf_counter())
+            if result.outcome not in (REJECTED, ERROR):
+                failures = rejected = 0
+                continue
+            # a failed capture returns at once, back off instead of hammering the API with the next run
+            failures += 1
+            rejected = rejected + 1 if result.outcome == REJECTED else 0
+            if rejected >= MAX_REJECTED:
+                self._report.stopped_workers += 1
+                return
+            if await self._sleep(min(self._profile.retry_interval * 2 ** (failures - 1), MAX_BACKOFF)):
+                return
+
+    async def _open_loop(self) -> None:
+        slots = asyncio.Semaphore(self._profile.runs)
+        tasks = []
+        index = 0
+        while not await self._sleep(self._rng.expovariate(self._profile.arrival_rate or 1.0)):
+            tasks.append(asyncio.ensure_future(self._run(index, time.perf_counter(), slots)))
+            index += 1
+        await asyncio.gather(*tasks)
+
+    async def _sample(self) -> None:
+        while True:
+            self._report.samples.append(PoolSample(self._elapsed(), self._held, self._active, self._waiting))
+            if await self._sleep(self._profile.sample_interval):
+                return
+
+    async def _stop_after(self, duration: float) -> None:
+        await asyncio.sleep(duration)
+        self._stopping.set()
+
+    async def run(self) -> LoadReport:
+        """Run the profile and return what was measured"""
+        report = self._report
+        self._stopping = asyncio.Event()
+        report.pool_size = self._pool_size if self._pool_size is not None else await self.count_pool()
+        self._started = time.perf_counter()
+        stopper = asyncio.ensure_future(self._stop_after(self._profile.duration))
+        sampler = asyncio.ensure_future(self._sample())
+        try:
+            if self._profile.arrival_rate is None:
+                await asyncio.gather(*(self._closed_loop(worker) for worker in range(self._profile.runs)))
+            else:
+                await self._open_loop()
+        finally:
+            self._stopping.set()
+            stopper.cancel()
+            await sampler
+        report.elapsed = self._elapsed()
+        return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate CI runs capturing and freeing devices")
+    parser.add_argument("--base-url", required=True, help="API root, e.g. http://localhost:7100/api/v1")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--runs", type=int, default=10, help="concurrent CI runs")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds during which runs arrive")
+    parser.add_argument("--rate", type=float, help="Poisson arrivals per second, back to back runs if omitted")
+    parser.add_argument(
+        "--mix",
+        action="append",
+        help="requirement like amount=2,abi=arm64-v8a,sdk=34*3 (*weight), repeat for a mix; amount=1 if omitted",
+    )
+    parser.add_argument("--hold", default="exp:30", help="fixed:S, uniform:LOW:HIGH, exp:MEAN or lognormal:MEDIAN:SIGMA")
+    parser.add_argument("--deadline", type=float, default=120.0, help="seconds a run waits for devices")
+    parser.add_argument("--retry-interval", type=float, default=1.0)
+    parser.add_argument("--pool-size", type=int, help="capturable devices, counted from the device list if omitted")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--json", help="write the summary, utilisation samples and run outcomes to this file")
+    args = parser.parse_args(argv)
+
+    profile = LoadProfile(
+        runs=args.runs,
+        duration=args.duration,
+        arrival_rate=args.rate,
+        requirements=[Requirement.parse(spec) for spec in args.mix or ["amount=1"]],
+        hold=HoldTime.parse(args.hold),
+        capture_deadline=args.deadline,
+        retry_interval=args.retry_interval,
+        seed=args.seed,
+    )
+
+    async def run() -> LoadReport:
+        async with AuthenticatedClient(base_url=args.base_url, token=args.token) as client:
+            return await LoadGenerator(client, profile, pool_size=args.pool_size).run()
+
+    report = asyncio.run(run())
+    print(report.report())
+    if args.json:
+        report.dump(args.json)
+    return 0 if report.count(ERROR) == 0 else 1
+
+
+__all__ = [
+    "HoldTime",
+    "LoadGenerator",
+    "LoadProfile",
+    "LoadReport",
+    "PoolSample",
+    "Requirement",
+    "RunResult",
+]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
+
@@ -0,0 +1,223 @@
+"""Local copy of the device list kept up to date from the device change feed
+
+Polling ``get_devices`` to notice presence, status or owner changes downloads the whole farm every time. A
+``DeviceMirror`` downloads it once, then only applies the changes returned by ``GET /devices/changes``:
+
+    mirror = DeviceMirror(client)
+    mirror.reload()
+    ...
+    mirror.refresh()
+    devices = mirror.find(free=True, abi="arm64-v8a")
+
+Lookups go through in-memory indexes keyed by serial and by the values of the indexed fields, so queries do not
+depend on the size of the farm. The feed carries presence, status, owner, group and identity fields; other fields
+(battery, display...) keep the values of the last ``reload()``. A mirror is not thread-safe.
+"""
+
+from http import HTTPStatus
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Optional, Set, Union
+
+from attrs import fields, has
+
+from . import errors
+from .api.devices import get_device_changes, get_devices
+from .client import AuthenticatedClient, Client
+from .models.device import Device
+from .models.device_change import DeviceChange
+from .models.device_change_action import DeviceChangeAction
+from .models.device_changes_response import DeviceChangesResponse
+from .models.device_list_response import DeviceListResponse
+from .types import UNSET, Response
+
+Index = Callable[[Device], Hashable]
+
+DEFAULT_INDEXES: Dict[str, Index] = {
+    "abi": lambda device: device.abi,
+    "sdk": lambda device: device.sdk,
+    "model": lambda device: device.model,
+    "manufacturer": lambda device: device.manufacturer,
+    "platform": lambda device: device.platform,
+    "present": lambda device: device.present,
+    "ready": lambda device: device.ready,
+    "status": lambda device: device.status,
+    "group_id": lambda device: device.group.id if device.group else UNSET,
+    "owner_email": lambda device: device.owner.email if device.owner else None,
+    "free": lambda device: bool(device.present and device.ready and not device.owner),
+}
+
+
+def _merge(target: Any, source: Any) -> None:
+    """Copy the set attributes of ``source`` onto ``target``, merging nested models of the same type"""
+    for attribute in fields(type(source)):
+        value = getattr(source, attribute.name)
+        if value is UNSET or attribute.name == "additional_properties":
+            continue
+        current = getattr(target, attribute.name)
+        if type(current) is type(value) and has(type(value)):
+            _merge(current, value)
+        else:
+            setattr(target, attribute.name, value)
+    target.additional_properties.update(source.additional_properties)
+
+
+class DeviceMirror:
+    """In-memory device list of a client, updated incrementally from the device change feed
+
+    Args:
+        client: The client used for ``get_devices`` and ``get_device_changes``.
+        indexes: Named functions of a Device whose values can be queried with ``find``, ``DEFAULT_INDEXES`` if
+            not given.
+        limit: The maximum number of changes requested per call.
+    """
+
+    def __init__(
+        self,
+        client: Union[AuthenticatedClient, Client],
+        indexes: Optional[Dict[str, Index]] = None,
+        limit: int = 1000,
+    ):
+        self._client = client
+        self._indexes = dict(DEFAULT_INDEXES if indexes is None else indexes)
+        self._limit = limit
+        self._devices: Dict[str, Device] = {}
+        self._keys: Dict[str, Dict[str, Hashable]] = {}
+        self._index: Dict[str, Dict[Hashable, Set[str]]] = {name: {} for name in self._indexes}
+        self.cursor: Optional[str] = None
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def __contains__(self, serial: object) -> bool:
+        return serial in self._devices
+
+    def __iter__(self) -> Iterator[Device]:
+        return iter(list(self._devices.values()))
+
+    def get(self, serial: str) -> Optional[Device]:
+        return self._devices.get(serial)
+
+    def find(self, **criteria: Hashable) -> List[Device]:
+        """Get the devices matching all ``criteria``, e.g. ``find(free=True, abi="arm64-v8a")``
+
+        Raises:
+            ValueError: If a criterion is not an index of the mirror.
+        """
+        unknown = set(criteria) - set(self._indexes)
+        if unknown:
+            raise ValueError(f"Not indexed: {', '.join(sorted(unknown))}")
+        if not criteria:
+            return list(self._devices.values())
+        matches = sorted((self._index[name].get(value, set()) for name, value in criteria.items()), key=len)
+        serials = matches[0].intersection(*matches[1:])
+        return [self._devices[serial] for serial in serials]
+
+    def _unindex(self, serial: str) -> None:
+        for name, key in self._keys.pop(serial, {}).items():
+            serials = self._index[name][key]
+            serials.discard(serial)
+            if not serials:
+                del self._index[name][key]
+
+    def _store(self, serial: str, device: Device) -> None:
+        self._unindex(serial)
+        self._devices[serial] = device
+        keys = self._keys[serial] = {name: index(device) for name, index in self._indexes.items()}
+        for name, key in keys.items():
+            self._index[name].setdefault(key, set()).add(serial)
+
+    def apply(self, change: DeviceChange) -> None:
+        """Apply a single change of the feed"""
+        if change.action == DeviceChangeAction.DELETED:
+            self._unindex(change.serial)
+            self._devices.pop(change.serial, None)
+            return
+        device = self._devices.get(change.serial)
+        if device is None:
+            device = change.device
+        else:
+            _merge(device, change.device)
+        self._store(change.serial, device)
+
+    def _reset(self, cursor: str, devices: DeviceListResponse) -> None:
+        self._devices.clear()
+        self._keys.clear()
+        for index in self._index.values():
+            index.clear()
+        for device in devices.devices:
+            if device.serial:
+                self._store(device.serial, device)
+        self.cursor = cursor
+
+    @staticmethod
+    def _check(response: Response[Any], expected: type) -> Any:
+        if not isinstance(response.parsed, expected):
+            raise errors.UnexpectedStatus(response.status_code, response.content)
+        return response.parsed
+
+    def _apply_page(self, page: DeviceChangesResponse) -> int:
+        for change in page.changes:
+            self.apply(change)
+        self.cursor = page.cursor
+        return len(page.changes)
+
+    def reload(self) -> None:
+        """Download the whole device list and start following the feed from there
+
+        Raises:
+            errors.UnexpectedStatus: If the server does not return the device list or the feed position.
+        """
+        position = self._check(get_device_changes.sync_detailed(client=self._client), DeviceChangesResponse)
+        devices = self._check(get_devices.sync_detailed(client=self._client), DeviceListResponse)
+        self._reset(position.cursor, devices)
+
+    def refresh(self) -> int:
+        """Apply the changes made since the last call, reloading if the cursor has expired
+
+        Returns:
+            The number of changes applied, or -1 if the device list was reloaded.
+
+        Raises:
+            errors.UnexpectedStatus: If the server does not return the changes.
+        """
+        if self.cursor is None:
+            self.reload()
+            return -1
+        applied = 0
+        while True:
+            response = get_device_changes.sync_detailed(client=self._client, cursor=self.cursor, limit=self._limit)
+            if response.status_code == HTTPStatus.GONE:
+                self.reload()
+                return -1
+            page = self._check(response, DeviceChangesResponse)
+            applied += self._apply_page(page)
+            if not page.has_more:
+                return applied
+
+    async def areload(self) -> None:
+        """Async version of ``reload``"""
+        position = self._check(
+            await get_device_changes.asyncio_detailed(client=self._client), DeviceChangesResponse
+        )
+        devices = self._check(await get_devices.asyncio_detailed(client=self._client), DeviceListResponse)
+        self._reset(position.cursor, devices)
+
+    async def arefresh(self) -> int:
+        """Async version of ``refresh``"""
+        if self.cursor is None:
+            await self.areload()
+            return -1
+        applied = 0
+        while True:
+            response = await get_device_changes.asyncio_detailed(
+                client=self._client, cursor=self.cursor, limit=self._limit
+            )
+            if response.status_code == HTTPStatus.GONE:
+                await self.areload()
+                return -1
+            page = self._check(response, DeviceChangesResponse)
+            applied += self._apply_page(page)
+            if not page.has_more:
+                return applied
+
+
+__all__ = ["DEFAULT_INDEXES", "DeviceMirror"]
@@ -1,102 +1,233 @@
-"""Contains all the data models used in inputs/outputs"""
+"""Contains all the data models used in inputs/outputs
+
+Models are imported on first access (PEP 562), so importing an endpoint only imports the models it uses.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, List
+
+if TYPE_CHECKING:
+    from .access_tokens_response import AccessTokensResponse
+    from .adb_install_flags_payload import AdbInstallFlagsPayload
+    from .adb_key_added_response import AdbKeyAddedResponse
+    from .adb_port_response import AdbPortResponse
+    from .adb_range_response import AdbRangeResponse
+    from .add_adb_public_key_body import AddAdbPublicKeyBody
+    from .add_user_device_payload import AddUserDevicePayload
+    from .alert_message import AlertMessage
+    from .alert_message_level import AlertMessageLevel
+    from .alert_message_payload import AlertMessagePayload
+    from .alert_message_payload_activation import AlertMessagePayloadActivation
+    from .alert_message_payload_level import AlertMessagePayloadLevel
+    from .alert_message_response import AlertMessageResponse
+    from .auto_test_response import AutoTestResponse
+    from .auto_test_response_group import AutoTestResponseGroup
+    from .conflict import Conflict
+    from .conflict_date import ConflictDate
+    from .conflict_owner import ConflictOwner
+    from .conflicts_response import ConflictsResponse
+    from .default_response import DefaultResponse
+    from .device import Device
+    from .device_battery import DeviceBattery
+    from .device_browser import DeviceBrowser
+    from .device_browser_apps_item import DeviceBrowserAppsItem
+    from .device_capabilities import DeviceCapabilities
+    from .device_change import DeviceChange
+    from .device_change_action import DeviceChangeAction
+    from .device_changes_response import DeviceChangesResponse
+    from .device_cpu import DeviceCpu
+    from .device_display import DeviceDisplay
+    from .device_group import DeviceGroup
+    from .device_group_life_time_type_0 import DeviceGroupLifeTimeType0
+    from .device_group_owner_type_0 import DeviceGroupOwnerType0
+    from .device_list_response import DeviceListResponse
+    from .device_memory import DeviceMemory
+    from .device_network import DeviceNetwork
+    from .device_owner_type_0 import DeviceOwnerType0
+    from .device_payload import DevicePayload
+    from .device_payload_status import DevicePayloadStatus
+    from .device_phone import DevicePhone
+    from .device_provider import DeviceProvider
+    from .device_response import DeviceResponse
+    from .device_reverse_forwards_item import DeviceReverseForwardsItem
+    from .device_service import DeviceService
+    from .devices_payload import DevicesPayload
+    from .error_response import ErrorResponse
+    from .finger_print_payload import FingerPrintPayload
+    from .generate_fake_device_response_200 import GenerateFakeDeviceResponse200
+    from .get_access_token_by_title_body import GetAccessTokenByTitleBody
+    from .get_devices_target import GetDevicesTarget
+    from .group import Group
+    from .group_class import GroupClass
+    from .group_dates_item import GroupDatesItem
+    from .group_list_response import GroupListResponse
+    from .group_lock import GroupLock
+    from .group_owner import GroupOwner
+    from .group_payload import GroupPayload
+    from .group_payload_class import GroupPayloadClass
+    from .group_payload_state import GroupPayloadState
+    from .group_response import GroupResponse
+    from .group_state import GroupState
+    from .groups_payload import GroupsPayload
+    from .owner_response import OwnerResponse
+    from .remote_connect_user_device_response import RemoteConnectUserDeviceResponse
+    from .service_user_response import ServiceUserResponse
+    from .service_user_response_service_user_info import ServiceUserResponseServiceUserInfo
+    from .size_response import SizeResponse
+    from .stats_batch_response import StatsBatchResponse
+    from .stats_event import StatsEvent
+    from .team import Team
+    from .team_payload import TeamPayload
+    from .team_response import TeamResponse
+    from .teams_response import TeamsResponse
+    from .token import Token
+    from .type_response import TypeResponse
+    from .unexpected_error_response import UnexpectedErrorResponse
+    from .use_and_connect_device_body import UseAndConnectDeviceBody
+    from .use_device_by_user_body import UseDeviceByUserBody
+    from .user import User
+    from .user_access_token_response import UserAccessTokenResponse
+    from .user_access_tokens_response import UserAccessTokensResponse
+    from .user_adb_keys_item import UserAdbKeysItem
+    from .user_group_device_data import UserGroupDeviceData
+    from .user_group_device_data_columns import UserGroupDeviceDataColumns
+    from .user_group_device_data_sort import UserGroupDeviceDataSort
+    from .user_groups import UserGroups
+    from .user_groups_quotas import UserGroupsQuotas
+    from .user_groups_quotas_allocated import UserGroupsQuotasAllocated
+    from .user_groups_quotas_consumed import UserGroupsQuotasConsumed
+    from .user_list_response import UserListResponse
+    from .user_response import UserResponse
+    from .user_settings import UserSettings
+    from .user_settings_alert_message import UserSettingsAlertMessage
+    from .user_settings_alert_message_level import UserSettingsAlertMessageLevel
+    from .user_settings_device_list_columns_item import UserSettingsDeviceListColumnsItem
+    from .user_settings_device_list_sort import UserSettingsDeviceListSort
+    from .user_settings_device_list_sort_fixed_item import UserSettingsDeviceListSortFixedItem
+    from .user_settings_device_list_sort_user_item import UserSettingsDeviceListSortUserItem
+    from .user_settings_group_items_per_page import UserSettingsGroupItemsPerPage
+    from .users_payload import UsersPayload
+    from .write_stats_data_body import WriteStatsDataBody
+    from .write_stats_files_body import WriteStatsFilesBody
+
+_MODULES = {
+    "AccessTokensResponse": "access_tokens_response",
+    "AdbInstallFlagsPayload": "adb_install_flags_payload",
+    "AdbKeyAddedResponse": "adb_key_added_response",
+    "AdbPortResponse": "adb_port_response",
+    "AdbRangeResponse": "adb_range_response",
+    "AddAdbPublicKeyBody": "add_adb_public_key_body",
+    "AddUserDevicePayload": "add_user_device_payload",
+    "AlertMessage": "alert_message",
+    "AlertMessageLevel": "alert_message_level",
+    "AlertMessagePayload": "alert_message_payload",
+    "AlertMessagePayloadActivation": "alert_message_payload_activation",
+    "AlertMessagePayloadLevel": "alert_message_payload_level",
+    "AlertMessageResponse": "alert_message_response",
+    "AutoTestResponse": "auto_test_response",
+    "AutoTestResponseGroup": "auto_test_response_group",
+    "Conflict": "conflict",
+    "ConflictDate": "conflict_date",
+    "ConflictOwner": "conflict_owner",
+    "ConflictsResponse": "conflicts_response",
+    "DefaultResponse": "default_response",
+    "Device": "device",
+    "DeviceBattery": "device_battery",
+    "DeviceBrowser": "device_browser",
+    "DeviceBrowserAppsItem": "device_browser_apps_item",
+    "DeviceCapabilities": "device_capabilities",
+    "DeviceChange": "device_change",
+    "DeviceChangeAction": "device_change_action",
+    "DeviceChangesResponse": "device_changes_response",
+    "DeviceCpu": "device_cpu",
+    "DeviceDisplay": "device_display",
+    "DeviceGroup": "device_group",
+    "DeviceGroupLifeTimeType0": "device_group_life_time_type_0",
+    "DeviceGroupOwnerType0": "device_group_owner_type_0",
+    "DeviceListResponse": "device_list_response",
+    "DeviceMemory": "device_memory",
+    "DeviceNetwork": "device_network",
+    "DeviceOwnerType0": "device_owner_type_0",
+    "DevicePayload": "device_payload",
+    "DevicePayloadStatus": "device_payload_status",
+    "DevicePhone": "device_phone",
+    "DeviceProvider": "device_provider",
+    "DeviceResponse": "device_response",
+    "DeviceReverseForwardsItem": "device_reverse_forwards_item",
+    "DeviceService": "device_service",
+    "DevicesPayload": "devices_payload",
+    "ErrorResponse": "error_response",
+    "FingerPrintPayload": "finger_print_payload",
+    "GenerateFakeDeviceResponse200": "generate_fake_device_response_200",
+    "GetAccessTokenByTitleBody": "get_access_token_by_title_body",
+    "GetDevicesTarget": "get_devices_target",
+    "Group": "group",
+    "GroupClass": "group_class",
+    "GroupDatesItem": "group_dates_item",
+    "GroupListResponse": "group_list_response",
+    "GroupLock": "group_lock",
+    "GroupOwner": "group_owner",
+    "GroupPayload": "group_payload",
+    "GroupPayloadClass": "group_payload_class",
+    "GroupPayloadState": "group_payload_state",
+    "GroupResponse": "group_response",
+    "GroupState": "group_state",
+    "GroupsPayload": "groups_payload",
+    "OwnerResponse": "owner_response",
+    "RemoteConnectUserDeviceResponse": "remote_connect_user_device_response",
+    "ServiceUserResponse": "service_user_response",
+    "ServiceUserResponseServiceUserInfo": "service_user_response_service_user_info",
+    "SizeResponse": "size_response",
+    "StatsBatchResponse": "stats_batch_response",
+    "StatsEvent": "stats_event",
+    "Team": "team",
+    "TeamPayload": "team_payload",
+    "TeamResponse": "team_response",
+    "TeamsResponse": "teams_response",
+    "Token": "token",
+    "TypeResponse": "type_response",
+    "UnexpectedErrorResponse": "unexpected_error_response",
+    "UseAndConnectDeviceBody": "use_and_connect_device_body",
+    "UseDeviceByUserBody": "use_device_by_user_body",
+    "User": "user",
+    "UserAccessTokenResponse": "user_access_token_response",
+    "UserAccessTokensResponse": "user_access_tokens_response",
+    "UserAdbKeysItem": "user_adb_keys_item",
+    "UserGroupDeviceData": "user_group_device_data",
+    "UserGroupDeviceDataColumns": "user_group_device_data_columns",
+    "UserGroupDeviceDataSort": "user_group_device_data_sort",
+    "UserGroups": "user_groups",
+    "UserGroupsQuotas": "user_groups_quotas",
+    "UserGroupsQuotasAllocated": "user_groups_quotas_allocated",
+    "UserGroupsQuotasConsumed": "user_groups_quotas_consumed",
+    "UserListResponse": "user_list_response",
+    "UserResponse": "user_response",
+    "UserSettings": "user_settings",
+    "UserSettingsAlertMessage": "user_settings_alert_message",
+    "UserSettingsAlertMessageLevel": "user_settings_alert_message_level",
+    "UserSettingsDeviceListColumnsItem": "user_settings_device_list_columns_item",
+    "UserSettingsDeviceListSort": "user_settings_device_list_sort",
+    "UserSettingsDeviceListSortFixedItem": "user_settings_device_list_sort_fixed_item",
+    "UserSettingsDeviceListSortUserItem": "user_settings_device_list_sort_user_item",
+    "UserSettingsGroupItemsPerPage": "user_settings_group_items_per_page",
+    "UsersPayload": "users_payload",
+    "WriteStatsDataBody": "write_stats_data_body",
+    "WriteStatsFilesBody": "write_stats_files_body",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
 
-from .access_tokens_response import AccessTokensResponse
-from .adb_install_flags_payload import AdbInstallFlagsPayload
-from .adb_key_added_response import AdbKeyAddedResponse
-from .adb_port_response import AdbPortResponse
-from .adb_range_response import AdbRangeResponse
-from .add_adb_public_key_body import AddAdbPublicKeyBody
-from .add_user_device_payload import AddUserDevicePayload
-from .alert_message import AlertMessage
-from .alert_message_level import AlertMessageLevel
-from .alert_message_payload import AlertMessagePayload
-from .alert_message_payload_activation import AlertMessagePayloadActivation
-from .alert_message_payload_level import AlertMessagePayloadLevel
-from .alert_message_response import AlertMessageResponse
-from .auto_test_response import AutoTestResponse
-from .auto_test_response_group import AutoTestResponseGroup
-from .conflict import Conflict
-from .conflict_date import ConflictDate
-from .conflict_owner import ConflictOwner
-from .conflicts_response import ConflictsResponse
-from .default_response import DefaultResponse
-from .device import Device
-from .device_battery import DeviceBattery
-from .device_browser import DeviceBrowser
-from .device_browser_apps_item import DeviceBrowserAppsItem
-from .device_capabilities import DeviceCapabilities
-from .device_cpu import DeviceCpu
-from .device_display import DeviceDisplay
-from .device_group import DeviceGroup
-from .device_group_life_time_type_0 import DeviceGroupLifeTimeType0
-from .device_group_owner_type_0 import DeviceGroupOwnerType0
-from .device_list_response import DeviceListResponse
-from .device_memory import DeviceMemory
-from .device_network import DeviceNetwork
-from .device_owner_type_0 import DeviceOwnerType0
-from .device_payload import DevicePayload
-from .device_payload_status import DevicePayloadStatus
-from .device_phone import DevicePhone
-from .device_provider import DeviceProvider
-from .device_response import DeviceResponse
-from .device_reverse_forwards_item import DeviceReverseForwardsItem
-from .device_service import DeviceService
-from .devices_payload import DevicesPayload
-from .error_response import ErrorResponse
-from .finger_print_payload import FingerPrintPayload
-from .generate_fake_device_response_200 import GenerateFakeDeviceResponse200
-from .get_access_token_by_title_body import GetAccessTokenByTitleBody
-from .get_devices_target import GetDevicesTarget
-from .group import Group
-from .group_class import GroupClass
-from .group_dates_item import GroupDatesItem
-from .group_list_response import GroupListResponse
-from .group_lock import GroupLock
-from .group_owner import GroupOwner
-from .group_payload import GroupPayload
-from .group_payload_class import GroupPayloadClass
-from .group_payload_state import GroupPayloadState
-from .group_response import GroupResponse
-from .group_state import GroupState
-from .groups_payload import GroupsPayload
-from .owner_response import OwnerResponse
-from .remote_connect_user_device_response import RemoteConnectUserDeviceResponse
-from .service_user_response import ServiceUserResponse
-from .service_user_response_service_user_info import ServiceUserResponseServiceUserInfo
-from .size_response import SizeResponse
-from .team import Team
-from .team_payload import TeamPayload
-from .team_response import TeamResponse
-from .teams_response import TeamsResponse
-from .token import Token
-from .type_response import TypeResponse
-from .unexpected_error_response import UnexpectedErrorResponse
-from .use_and_connect_device_body import UseAndConnectDeviceBody
-from .use_device_by_user_body import UseDeviceByUserBody
-from .user import User
-from .user_access_token_response import UserAccessTokenResponse
-from .user_access_tokens_response import UserAccessTokensResponse
-from .user_adb_keys_item import UserAdbKeysItem
-from .user_group_device_data import UserGroupDeviceData
-from .user_group_device_data_columns import UserGroupDeviceDataColumns
-from .user_group_device_data_sort import UserGroupDeviceDataSort
-from .user_groups import UserGroups
-from .user_groups_quotas import UserGroupsQuotas
-from .user_groups_quotas_allocated import UserGroupsQuotasAllocated
-from .user_groups_quotas_consumed import UserGroupsQuotasConsumed
-from .user_list_response import UserListResponse
-from .user_response import UserResponse
-from .user_settings import UserSettings
-from .user_settings_alert_message import UserSettingsAlertMessage
-from .user_settings_alert_message_level import UserSettingsAlertMessageLevel
-from .user_settings_device_list_columns_item import UserSettingsDeviceListColumnsItem
-from .user_settings_device_list_sort import UserSettingsDeviceListSort
-from .user_settings_device_list_sort_fixed_item import UserSettingsDeviceListSortFixedItem
-from .user_settings_device_list_sort_user_item import UserSettingsDeviceListSortUserItem
-from .user_settings_group_items_per_page import UserSettingsGroupItemsPerPage
-from .users_payload import UsersPayload
-from .write_stats_data_body import WriteStatsDataBody
-from .write_stats_files_body import WriteStatsFilesBody
 
 __all__ = (
     "AccessTokensResponse",
@@ -124,6 +255,9 @@ __all__ = (
     "DeviceBrowser",
     "DeviceBrowserAppsItem",
     "DeviceCapabilities",
+    "DeviceChange",
+    "DeviceChangeAction",
+    "DeviceChangesResponse",
     "DeviceCpu",
     "DeviceDisplay",
     "DeviceGroup",
@@ -163,6 +297,8 @@ __all__ = (
     "ServiceUserResponse",
     "ServiceUserResponseServiceUserInfo",
     "SizeResponse",
+    "StatsBatchResponse",
+    "StatsEvent",
     "Team",
     "TeamPayload",
     "TeamResponse",
@@ -0,0 +1,92 @@
+import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+from dateutil.parser import isoparse
+
+from ..models.device_change_action import DeviceChangeAction
+
+if TYPE_CHECKING:
+    from ..models.device import Device
+
+
+T = TypeVar("T", bound="DeviceChange")
+
+
+@_attrs_define
+class DeviceChange:
+    """
+    Attributes:
+        serial (str):
+        action (DeviceChangeAction):
+        changed_at (datetime.datetime):
+        device (Device):
+    """
+
+    serial: str
+    action: DeviceChangeAction
+    changed_at: datetime.datetime
+    device: "Device"
+    additional_properties: Dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        serial = self.serial
+
+        action = self.action.value
+
+        changed_at = self.changed_at.isoformat()
+
+        device = self.device.to_dict()
+
+        field_dict: Dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update(
+            {
+                "serial": serial,
+                "action": action,
+                "changedAt": changed_at,
+                "device": device,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
+        from ..models.device import Device
+
+        d = src_dict.copy()
+        serial = d.pop("serial")
+
+        action = DeviceChangeAction(d.pop("action"))
+
+        changed_at = isoparse(d.pop("changedAt"))
+
+        device = Device.from_dict(d.pop("device"))
+
+        device_change = cls(
+            serial=serial,
+            action=action,
+            changed_at=changed_at,
+            device=device,
+        )
+
+        device_change.additional_properties = d
+        return device_change
+
+    @property
+    def additional_keys(self) -> List[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
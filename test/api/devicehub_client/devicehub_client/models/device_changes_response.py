@@ -0,0 +1,104 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+if TYPE_CHECKING:
+    from ..models.device_change import DeviceChange
+
+
+T = TypeVar("T", bound="DeviceChangesResponse")
+
+
+@_attrs_define
+class DeviceChangesResponse:
+    """
+    Attributes:
+        success (bool):
+        description (str):
+        cursor (str):
+        has_more (bool):
+        changes (List['DeviceChange']):
+    """
+
+    success: bool
+    description: str
+    cursor: str
+    has_more: bool
+    changes: List["DeviceChange"]
+    additional_properties: Dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        success = self.success
+
+        description = self.description
+
+        cursor = self.cursor
+
+        has_more = self.has_more
+
+        changes = []
+        for changes_item_data in self.changes:
+            changes_item = changes_item_data.to_dict()
+            changes.append(changes_item)
+
+        field_dict: Dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update(
+            {
+                "success": success,
+                "description": description,
+                "cursor": cursor,
+                "hasMore": has_more,
+                "changes": changes,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
+        from ..models.device_change import DeviceChange
+
+        d = src_dict.copy()
+        success = d.pop("success")
+
+        description = d.pop("description")
+
+        cursor = d.pop("cursor")
+
+        has_more = d.pop("hasMore")
+
+        changes = []
+        _changes = d.pop("changes")
+        for changes_item_data in _changes:
+            changes_item = DeviceChange.from_dict(changes_item_data)
+
+            changes.append(changes_item)
+
+        device_changes_response = cls(
+            success=success,
+            description=description,
+            cursor=cursor,
+            has_more=has_more,
+            changes=changes,
+        )
+
+        device_changes_response.additional_properties = d
+        return device_changes_response
+
+    @property
+    def additional_keys(self) -> List[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
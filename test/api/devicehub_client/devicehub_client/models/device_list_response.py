@@ -1,8 +1,10 @@
-from typing import TYPE_CHECKING, Any, Dict, List, Type, TypeVar
+from typing import TYPE_CHECKING, Any, Dict, List, Sequence, Type, TypeVar, Union, cast
 
 from attrs import define as _attrs_define
 from attrs import field as _attrs_field
 
+from ..types import UNSET, Unset
+
 if TYPE_CHECKING:
     from ..models.device import Device
 
@@ -16,12 +18,16 @@ class DeviceListResponse:
     Attributes:
         success (bool):
         description (str):
-        devices (List['Device']):
+        devices (Sequence['Device']): A list, or a ``LazyList`` of ``LazyDevice`` when parsed with ``lazy=True``.
+        cursor (Union[None, Unset, str]): Cursor of the next page when limit was given, null on the last page
+        has_more (Union[Unset, bool]): Whether more devices follow this page
     """
 
     success: bool
     description: str
-    devices: List["Device"]
+    devices: Sequence["Device"]
+    cursor: Union[None, Unset, str] = UNSET
+    has_more: Union[Unset, bool] = UNSET
     additional_properties: Dict[str, Any] = _attrs_field(init=False, factory=dict)
 
     def to_dict(self) -> Dict[str, Any]:
@@ -34,6 +40,14 @@ class DeviceListResponse:
             devices_item = devices_item_data.to_dict()
             devices.append(devices_item)
 
+        cursor: Union[None, Unset, str]
+        if isinstance(self.cursor, Unset):
+            cursor = UNSET
+        else:
+            cursor = self.cursor
+
+        has_more = self.has_more
+
         field_dict: Dict[str, Any] = {}
         field_dict.update(self.additional_properties)
         field_dict.update(
@@ -43,11 +57,15 @@ class DeviceListResponse:
                 "devices": devices,
             }
         )
+        if cursor is not UNSET:
+            field_dict["cursor"] = cursor
+        if has_more is not UNSET:
+            field_dict["hasMore"] = has_more
 
         return field_dict
 
     @classmethod
-    def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
+    def from_dict(cls: Type[T], src_dict: Dict[str, Any], lazy: bool = False) -> T:
         from ..models.device import Device
 
         d = src_dict.copy()
@@ -55,17 +73,36 @@ class DeviceListResponse:
 
         description = d.pop("description")
 
-        devices = []
+        devices: Sequence[Device]
         _devices = d.pop("devices")
-        for devices_item_data in _devices:
-            devices_item = Device.from_dict(devices_item_data)
+        if lazy:
+            from ..lazy import LazyDevice, LazyList
 
-            devices.append(devices_item)
+            devices = LazyList(_devices, LazyDevice.from_dict)
+        else:
+            devices = []
+            for devices_item_data in _devices:
+                devices_item = Device.from_dict(devices_item_data)
+
+                devices.append(devices_item)
+
+        def _parse_cursor(data: object) -> Union[None, Unset, str]:
+            if data is None:
+                return data
+            if isinstance(data, Unset):
+                return data
+            return cast(Union[None, Unset, str], data)
+
+        cursor = _parse_cursor(d.pop("cursor", UNSET))
+
+        has_more = d.pop("hasMore", UNSET)
 
         device_list_response = cls(
             success=success,
             description=description,
             devices=devices,
+            cursor=cursor,
+            has_more=has_more,
         )
 
         device_list_response.additional_properties = d
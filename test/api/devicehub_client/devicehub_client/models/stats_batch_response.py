@@ -0,0 +1,74 @@
+from typing import Any, Dict, List, Type, TypeVar
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+T = TypeVar("T", bound="StatsBatchResponse")
+
+
+@_attrs_define
+class StatsBatchResponse:
+    """
+    Attributes:
+        success (bool):
+        description (str):
+        written (int):
+    """
+
+    success: bool
+    description: str
+    written: int
+    additional_properties: Dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        success = self.success
+
+        description = self.description
+
+        written = self.written
+
+        field_dict: Dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update(
+            {
+                "success": success,
+                "description": description,
+                "written": written,
+            }
+        )
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
+        d = src_dict.copy()
+        success = d.pop("success")
+
+        description = d.pop("description")
+
+        written = d.pop("written")
+
+        stats_batch_response = cls(
+            success=success,
+            description=description,
+            written=written,
+        )
+
+        stats_batch_response.additional_properties = d
+        return stats_batch_response
+
+    @property
+    def additional_keys(self) -> List[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
@@ -0,0 +1,78 @@
+from typing import Any, Dict, List, Type, TypeVar, Union
+
+from attrs import define as _attrs_define
+from attrs import field as _attrs_field
+
+from ..types import UNSET, Unset
+
+T = TypeVar("T", bound="StatsEvent")
+
+
+@_attrs_define
+class StatsEvent:
+    """
+    Attributes:
+        serial (str): serial of device, which used in action
+        action (str): action which happened
+        timestamp (Union[Unset, int]): when the action happened, in milliseconds since the epoch; the time of the
+            request if missing
+    """
+
+    serial: str
+    action: str
+    timestamp: Union[Unset, int] = UNSET
+    additional_properties: Dict[str, Any] = _attrs_field(init=False, factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        serial = self.serial
+
+        action = self.action
+
+        timestamp = self.timestamp
+
+        field_dict: Dict[str, Any] = {}
+        field_dict.update(self.additional_properties)
+        field_dict.update(
+            {
+                "serial": serial,
+                "action": action,
+            }
+        )
+        if timestamp is not UNSET:
+            field_dict["timestamp"] = timestamp
+
+        return field_dict
+
+    @classmethod
+    def from_dict(cls: Type[T], src_dict: Dict[str, Any]) -> T:
+        d = src_dict.copy()
+        serial = d.pop("serial")
+
+        action = d.pop("action")
+
+        timestamp = d.pop("timestamp", UNSET)
+
+        stats_event = cls(
+            serial=serial,
+            action=action,
+            timestamp=timestamp,
+        )
+
+        stats_event.additional_properties = d
+        return stats_event
+
+    @property
+    def additional_keys(self) -> List[str]:
+        return list(self.additional_properties.keys())
+
+    def __getitem__(self, key: str) -> Any:
+        return self.additional_properties[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self.additional_properties[key] = value
+
+    def __delitem__(self, key: str) -> None:
+        del self.additional_properties[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.additional_properties
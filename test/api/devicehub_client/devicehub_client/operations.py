@@ -0,0 +1,52 @@
+"""operationIds of the API, as (method, path template relative to the base URL)
+
+The generated endpoint functions only know their method and URL, this table lets transports and hooks tell which
+operation a request belongs to. It is collected from the ``OPERATIONS`` of the generated tag packages of ``api``,
+which ``just regen-schema`` writes from ``api_v1.yaml``.
+"""
+
+import pkgutil
+import re
+from functools import lru_cache
+from importlib import import_module
+from typing import Dict, List, Optional, Tuple
+
+from . import api
+
+
+def _collect() -> Dict[str, Tuple[str, str]]:
+    operations: Dict[str, Tuple[str, str]] = {}
+    for tag in pkgutil.iter_modules(api.__path__):
+        operations.update(import_module(f"{api.__name__}.{tag.name}").OPERATIONS)
+    return operations
+
+
+OPERATIONS: Dict[str, Tuple[str, str]] = _collect()
+
+BASE_PATH = "/api/v1"
+
+
+def _pattern(template: str) -> "re.Pattern[str]":
+    return re.compile(re.sub(r"\\\{[^}]+\\\}", "[^/]+", re.escape(template)) + "/?")
+
+
+# static segments first, so /devices/changes is not taken for /devices/{serial}
+_MATCHERS: List[Tuple[str, str, "re.Pattern[str]"]] = sorted(
+    ((operation_id, method, _pattern(path)) for operation_id, (method, path) in OPERATIONS.items()),
+    key=lambda matcher: matcher[2].pattern.count("[^/]+"),
+)
+
+
+@lru_cache(maxsize=1024)
+def operation_id(method: str, path: str) -> Optional[str]:
+    """Get the operationId of a request, ``path`` may include the base URL path (``/api/v1``)"""
+    method = method.upper()
+    if BASE_PATH in path:
+        path = path.split(BASE_PATH, 1)[1]
+    for operation, operation_method, pattern in _MATCHERS:
+        if operation_method == method and pattern.fullmatch(path):
+            return operation
+    return None
+
+
+__all__ = ["BASE_PATH", "OPERATIONS", "operation_id"]
@@ -0,0 +1,178 @@
+"""Process-wide pool of httpx transports shared between clients"""
+
+import asyncio
+import ssl
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple, Union
+
+import httpx
+
+DEFAULT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+class _BorrowedTransport(httpx.BaseTransport):
+    """Forwards requests to a pooled transport, closing it is left to the pool"""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self._transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self._transport.handle_request(request)
+
+    def close(self) -> None:
+        pass
+
+
+class _BorrowedAsyncTransport(httpx.AsyncBaseTransport):
+    """Forwards requests to the pooled async transport of the running loop, closing it is left to the pool"""
+
+    def __init__(self, transport: Callable[[], httpx.AsyncBaseTransport]):
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+def _pool_key(base_url: str, verify: Union[str, bool, ssl.SSLContext], transport_args: Dict[str, Any]) -> Hashable:
+    url = httpx.URL(base_url)
+    verify_key = ("ctx", id(verify)) if isinstance(verify, ssl.SSLContext) else verify
+    return (url.scheme, url.host, url.port, verify_key, tuple(sorted((k, repr(v)) for k, v in transport_args.items())))
+
+
+class TransportPool:
+    """Keeps one keep-alive connection pool per base_url/TLS settings
+
+    Clients constructed with ``transport_pool=`` borrow their transport from here instead of building their own,
+    so any number of per-token clients pointing at the same server share TLS sessions and idle connections.
+    Async connections belong to the event loop they were opened in, so async transports are pooled per running
+    loop and dropped once their loop is closed. Borrowed transports are never closed by the clients themselves,
+    call ``close()`` outside of an event loop or ``aclose()`` inside one (or use the pool as a context manager)
+    once all clients are done.
+
+    Args:
+        limits: Connection limits applied to every pooled transport unless overridden per transport.
+    """
+
+    def __init__(self, limits: httpx.Limits = DEFAULT_LIMITS):
+        self._limits = limits
+        self._lock = threading.Lock()
+        self._transports: Dict[Hashable, httpx.HTTPTransport] = {}
+        self._async_transports: Dict[Hashable, httpx.AsyncHTTPTransport] = {}
+        self._closed = False
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise RuntimeError("Cannot borrow a transport from a closed TransportPool")
+
+    def transport(
+        self, base_url: str, verify: Union[str, bool, ssl.SSLContext] = True, **transport_args: Any
+    ) -> httpx.BaseTransport:
+        """Borrow the sync transport for ``base_url``, creating the underlying connection pool on first use"""
+        transport_args.setdefault("limits", self._limits)
+        key = _pool_key(base_url, verify, transport_args)
+        with self._lock:
+            self._check_open()
+            transport = self._transports.get(key)
+            if transport is None:
+                transport = self._transports[key] = httpx.HTTPTransport(verify=verify, **transport_args)
+        return _BorrowedTransport(transport)
+
+    def async_transport(
+        self, base_url: str, verify: Union[str, bool, ssl.SSLContext] = True, **transport_args: Any
+    ) -> httpx.AsyncBaseTransport:
+        """Borrow the async transport for ``base_url``, each event loop using it gets its own connection pool"""
+        transport_args.setdefault("limits", self._limits)
+        key = _pool_key(base_url, verify, transport_args)
+        with self._lock:
+            self._check_open()
+        return _BorrowedAsyncTransport(lambda: self._loop_transport(key, verify, transport_args))
+
+    def _loop_transport(
+        self, key: Hashable, verify: Union[str, bool, ssl.SSLContext], transport_args: Dict[str, Any]
+    ) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            self._check_open()
+            # the connections of a closed loop cannot be closed anymore, their sockets are closed when collected
+            for closed in [loop_key for loop_key in self._async_transports if loop_key[1].is_closed()]:
+                del self._async_transports[closed]
+            transport = self._async_transports.get((key, loop))
+            if transport is None:
+                transport = httpx.AsyncHTTPTransport(verify=verify, **transport_args)
+                self._async_transports[(key, loop)] = transport
+        return transport
+
+    def __len__(self) -> int:
+        return len(self._transports) + len(self._async_transports)
+
+    def _drain(self) -> Tuple[Dict[Hashable, httpx.HTTPTransport], Dict[Hashable, httpx.AsyncHTTPTransport]]:
+        with self._lock:
+            self._closed = True
+            transports, self._transports = self._transports, {}
+            async_transports, self._async_transports = self._async_transports, {}
+        return transports, async_transports
+
+    def close(self) -> None:
+        """Close every connection pool, the async ones in an event loop of their own
+
+        Raises:
+            RuntimeError: If async connection pools are open and an event loop is running, await ``aclose()``.
+        """
+        if self._async_transports and _running_loop() is not None:
+            raise RuntimeError("Cannot close async transports from a running event loop, await aclose() instead")
+        transports, async_transports = self._drain()
+        for transport in transports.values():
+            transport.close()
+        if async_transports:
+            asyncio.run(_aclose_all(async_transports))
+
+    async def aclose(self) -> None:
+        """Close every connection pool, both sync and async"""
+        transports, async_transports = self._drain()
+        for transport in transports.values():
+            transport.close()
+        await _aclose_all(async_transports)
+
+    def __enter__(self) -> "TransportPool":
+        return self
+
+    def __exit__(self, *args: Any, **kwargs: Any) -> None:
+        self.close()
+
+    async def __aenter__(self) -> "TransportPool":
+        return self
+
+    async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
+        await self.aclose()
+
+
+def _running_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+async def _aclose_all(transports: Dict[Hashable, httpx.AsyncHTTPTransport]) -> None:
+    for (_, loop), transport in transports.items():
+        if not loop.is_closed():
+            await transport.aclose()
+
+
+_default_pool: Optional[TransportPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> TransportPool:
+    """Get the process-wide TransportPool, creating a new one if the previous was closed"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None or _default_pool._closed:
+            _default_pool = TransportPool()
+        return _default_pool
+
+
+__all__ = ["DEFAULT_LIMITS", "TransportPool", "get_default_pool"]
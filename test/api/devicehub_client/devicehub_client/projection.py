@@ -0,0 +1,202 @@
+"""Field-projected device listings
+
+``get_devices`` accepts a ``fields`` query (e.g. ``"present,status,serial,group.owner.name,using"``) and the server
+only returns those paths, yet the generated client still builds the full ``Device`` model for them. The functions
+here send the same query but decode each device into a compact slotted record holding only the requested paths:
+
+    devices = projection.sync(client=client, fields="serial,status,group.owner.name")
+    devices[0].group_owner_name
+
+Record attributes are the snake_case paths joined with ``_`` (``_id`` becomes ``field_id``), missing values are
+``UNSET`` and timestamps stay ISO strings. Record types are cached per field list.
+"""
+
+import keyword
+import re
+from functools import lru_cache, partial
+from http import HTTPStatus
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type, Union
+
+import httpx
+
+from . import errors
+from .api.devices import get_devices
+from .client import AuthenticatedClient, Client
+from .models.get_devices_target import GetDevicesTarget
+from .types import UNSET, Response, Unset
+
+_CAMEL_BOUNDARY = re.compile(r"(?<=[a-z0-9])(?=[A-Z])")
+
+
+def _attribute_name(path: Tuple[str, ...]) -> str:
+    parts = ["field_id" if part == "_id" else _CAMEL_BOUNDARY.sub("_", part).lower() for part in path]
+    name = "_".join(parts)
+    return f"{name}_" if keyword.iskeyword(name) else name
+
+
+class ProjectedRecord:
+    """Base class of the generated record types"""
+
+    __slots__ = ()
+    _paths: Tuple[Tuple[str, ...], ...] = ()
+    _fields: str = ""
+
+    def __init__(self, **values: Any):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name, UNSET))
+
+    @classmethod
+    def from_dict(cls, src_dict: Dict[str, Any]) -> "ProjectedRecord":
+        record = cls.__new__(cls)
+        for name, path in zip(cls.__slots__, cls._paths):
+            value: Any = src_dict
+            for part in path:
+                if not isinstance(value, dict) or part not in value:
+                    value = UNSET
+                    break
+                value = value[part]
+            setattr(record, name, value)
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        field_dict: Dict[str, Any] = {}
+        for name, path in zip(self.__slots__, self._paths):
+            value = getattr(self, name)
+            if value is UNSET:
+                continue
+            target = field_dict
+            for part in path[:-1]:
+                target = target.setdefault(part, {})
+            target[path[-1]] = value
+        return field_dict
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{self.__class__.__name__}({values})"
+
+
+def normalize_fields(fields: Union[str, Iterable[str]]) -> Tuple[str, ...]:
+    """Split, strip and deduplicate a field list, keeping its order"""
+    if isinstance(fields, str):
+        fields = fields.split(",")
+    normalized = tuple(dict.fromkeys(field.strip() for field in fields if field and field.strip()))
+    if not normalized:
+        raise ValueError("At least one field is required for a projection")
+    return normalized
+
+
+@lru_cache(maxsize=128)
+def _record_type(fields: Tuple[str, ...]) -> Type[ProjectedRecord]:
+    paths = tuple(tuple(field.split(".")) for field in fields)
+    names = tuple(_attribute_name(path) for path in paths)
+    if len(set(names)) != len(names):
+        raise ValueError(f"Fields {fields} map to clashing attribute names {names}")
+    return type(
+        "DeviceProjection",
+        (ProjectedRecord,),
+        {"__slots__": names, "_paths": paths, "_fields": ",".join(fields)},
+    )
+
+
+def record_type(fields: Union[str, Iterable[str]]) -> Type[ProjectedRecord]:
+    """Get the cached record type for a field list"""
+    return _record_type(normalize_fields(fields))
+
+
+def _parse_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response, record: Type[ProjectedRecord]
+) -> Optional[List[ProjectedRecord]]:
+    if response.status_code == 200:
+        return [record.from_dict(device) for device in client.decode_json(response)["devices"]]
+    if client.raise_on_unexpected_status:
+        raise errors.UnexpectedStatus(response.status_code, response.content)
+    else:
+        return None
+
+
+def _build_response(
+    *, client: Union[AuthenticatedClient, Client], response: httpx.Response, record: Type[ProjectedRecord]
+) -> Response[List[ProjectedRecord]]:
+    return Response(
+        status_code=HTTPStatus(response.status_code),
+        content=response.content,
+        headers=response.headers,
+        parsed=client.parse_response(response, partial(_parse_response, record=record)),
+    )
+
+
+def sync_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    fields: Union[str, Iterable[str]],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    **filters: Any,
+) -> Response[List[ProjectedRecord]]:
+    """Device List projected on ``fields``, ``filters`` are the filter arguments of ``get_devices.sync_detailed``
+
+    Raises:
+        ValueError: If ``fields`` is empty.
+        errors.UnexpectedStatus: If the server returns an undocumented status code and Client.raise_on_unexpected_status is True.
+        httpx.TimeoutException: If the request takes longer than Client.timeout.
+
+    Returns:
+        Response[List[ProjectedRecord]]
+    """
+
+    record = record_type(fields)
+    kwargs = get_devices._get_kwargs(target=target, fields=record._fields, **filters)
+
+    response = client.get_httpx_client().request(
+        **kwargs,
+    )
+
+    return _build_response(client=client, response=response, record=record)
+
+
+def sync(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    fields: Union[str, Iterable[str]],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    **filters: Any,
+) -> Optional[List[ProjectedRecord]]:
+    """Device List projected on ``fields``, see ``sync_detailed``"""
+
+    return sync_detailed(client=client, fields=fields, target=target, **filters).parsed
+
+
+async def asyncio_detailed(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    fields: Union[str, Iterable[str]],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    **filters: Any,
+) -> Response[List[ProjectedRecord]]:
+    """Device List projected on ``fields``, see ``sync_detailed``"""
+
+    record = record_type(fields)
+    kwargs = get_devices._get_kwargs(target=target, fields=record._fields, **filters)
+
+    response = await client.get_async_httpx_client().request(**kwargs)
+
+    return _build_response(client=client, response=response, record=record)
+
+
+async def asyncio(
+    *,
+    client: Union[AuthenticatedClient, Client],
+    fields: Union[str, Iterable[str]],
+    target: Union[Unset, GetDevicesTarget] = GetDevicesTarget.USER,
+    **filters: Any,
+) -> Optional[List[ProjectedRecord]]:
+    """Device List projected on ``fields``, see ``sync_detailed``"""
+
+    return (await asyncio_detailed(client=client, fields=fields, target=target, **filters)).parsed
+
+
+__all__ = ["ProjectedRecord", "asyncio", "asyncio_detailed", "normalize_fields", "record_type", "sync", "sync_detailed"]
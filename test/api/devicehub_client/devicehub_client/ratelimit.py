@@ -0,0 +1,193 @@
+"""Client-side pacing of requests against the API rate limit
+
+The API answers 429 once an address sends more than 2800 requests per minute (``lib/units/ratelimit``) and reports
+its budget in the ``RateLimit`` headers of every response. Clients constructed with ``rate_limit=True`` pace their
+requests through a ``RateLimiter`` shared by every client of the same host, so concurrent bulk jobs spread their
+requests over the window instead of exhausting it and failing:
+
+    client = AuthenticatedClient(base_url, token=token, rate_limit=True)
+
+The limiter is a token bucket kept as a theoretical arrival time (GCRA): up to ``burst`` requests go out at once,
+then one every ``window / limit`` seconds. Both the draft-7 ``RateLimit: limit=…, remaining=…, reset=…`` header and
+the separate ``RateLimit-Remaining``/``RateLimit-Reset`` headers are understood. When the server reports fewer
+requests remaining than the nominal pace would send before the reset, requests are spaced to spread the remaining
+budget until then; ``RateLimit-Policy`` updates the nominal pace and a 429 holds every request until the reset.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Callable, Dict, Hashable, Mapping, Optional
+
+import httpx
+
+DEFAULT_LIMIT = 2800
+DEFAULT_WINDOW = 60.0
+
+
+def _parse_items(value: str) -> Dict[str, str]:
+    items = {}
+    for part in value.replace(";", ",").split(","):
+        key, _, item = part.strip().partition("=")
+        if item:
+            items[key.strip().lower()] = item.strip().strip('"')
+    return items
+
+
+def _number(value: Optional[str]) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RateLimiter:
+    """Thread-safe token bucket usable from sync code and any number of event loops
+
+    Args:
+        limit: Requests allowed per ``window``, until ``RateLimit-Policy`` says otherwise.
+        window: Length of the server window in seconds.
+        burst: Requests which may be sent back to back, ``limit // 20`` if not given.
+        clock: Monotonic clock in seconds.
+    """
+
+    def __init__(
+        self,
+        limit: int = DEFAULT_LIMIT,
+        window: float = DEFAULT_WINDOW,
+        burst: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if limit < 1 or window <= 0:
+            raise ValueError("limit and window must be positive")
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._fixed_burst = burst
+        self._set_policy(limit, window)
+        self._tat = clock()
+        self._interval = self._nominal
+        self._interval_until = 0.0
+        self.waits = 0
+        self.waited = 0.0
+        self.throttled = 0
+
+    def _set_policy(self, limit: int, window: float) -> None:
+        self.limit = limit
+        self.window = window
+        self.burst = self._fixed_burst if self._fixed_burst is not None else max(1, limit // 20)
+        self._nominal = window / limit
+
+    def reserve(self) -> float:
+        """Take a slot for one request, return how many seconds to wait before sending it"""
+        with self._lock:
+            now = self._clock()
+            interval = self._interval if now < self._interval_until else self._nominal
+            tolerance = (self.burst - 1) * self._nominal
+            send_at = max(now, self._tat - tolerance)
+            self._tat = max(self._tat, now) + interval
+            delay = send_at - now
+            if delay > 0:
+                self.waits += 1
+                self.waited += delay
+            return delay
+
+    def update(self, status_code: int, headers: Mapping[str, str]) -> None:
+        """Adapt the pace to the budget reported by a response"""
+        combined = _parse_items(headers.get("RateLimit", ""))
+        remaining = _number(combined.get("remaining", headers.get("RateLimit-Remaining")))
+        reset = _number(combined.get("reset", headers.get("RateLimit-Reset")))
+        policy = headers.get("RateLimit-Policy")
+        with self._lock:
+            now = self._clock()
+            if policy:
+                limit, _, rest = policy.partition(";")
+                window = _number(_parse_items(rest).get("w"))
+                if _number(limit) and window:
+                    self._set_policy(int(float(limit)), window)
+            if status_code == 429:
+                self.throttled += 1
+                retry_after = _number(headers.get("Retry-After"))
+                remaining, reset = 0, retry_after if retry_after is not None else (reset or self.window)
+            if remaining is None or reset is None:
+                return
+            if remaining < 1:
+                # nothing may go out before the reset, then resume at the nominal pace without a burst
+                tolerance = (self.burst - 1) * self._nominal
+                self._tat = max(self._tat, now + reset + tolerance)
+                self._interval_until = 0.0
+            elif reset > 0:
+                self._interval = max(self._nominal, reset / remaining)
+                self._interval_until = now + reset
+
+    def acquire(self) -> None:
+        """Wait for a slot, blocking the thread"""
+        delay = self.reserve()
+        if delay > 0:
+            time.sleep(delay)
+
+    async def aacquire(self) -> None:
+        """Wait for a slot without blocking the event loop"""
+        delay = self.reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+
+class RateLimitedTransport(httpx.BaseTransport):
+    """Waits for a limiter slot before each request and feeds the response headers back to it"""
+
+    def __init__(self, transport: httpx.BaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        self.limiter.acquire()
+        response = self._transport.handle_request(request)
+        self.limiter.update(response.status_code, response.headers)
+        return response
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class RateLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async version of ``RateLimitedTransport``"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, limiter: RateLimiter):
+        self._transport = transport
+        self.limiter = limiter
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await self.limiter.aacquire()
+        response = await self._transport.handle_async_request(request)
+        self.limiter.update(response.status_code, response.headers)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_limiters: Dict[Hashable, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(base_url: str) -> RateLimiter:
+    """Get the process-wide limiter of the host of ``base_url``, creating it on first use"""
+    url = httpx.URL(base_url)
+    key = (url.scheme, url.host, url.port)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter()
+        return limiter
+
+
+__all__ = [
+    "DEFAULT_LIMIT",
+    "DEFAULT_WINDOW",
+    "RateLimitedAsyncTransport",
+    "RateLimitedTransport",
+    "RateLimiter",
+    "get_rate_limiter",
+]
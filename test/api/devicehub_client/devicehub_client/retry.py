@@ -0,0 +1,215 @@
+"""Retries of transient failures for operations which are safe to repeat
+
+The generated endpoint functions make a single attempt. Clients constructed with ``retry=RetryPolicy()`` repeat
+requests which failed with a connection error, a timeout, a 429 or a transient 5xx, waiting a jittered exponential
+backoff between attempts:
+
+    client = AuthenticatedClient(base_url, token=token, retry=RetryPolicy(max_attempts=4))
+
+Only idempotent operations are repeated once the request may have reached the server: GET, HEAD, OPTIONS, PUT and
+DELETE, except ``captureDevices`` (``GET /autotests`` books devices on every call), and POSTs which only read
+(``getAccessTokenByTitle``). Other requests (``createGroup``, ``createUser``...) are repeated only when they carry an
+``Idempotency-Key`` header, a connection error before the request was sent, or a 429, which the server answers
+without handling the request. The API itself does not deduplicate ``Idempotency-Key`` requests, set it only for
+calls whose repetition is harmless to you or when a gateway deduplicates them.
+
+All clients of a policy draw their retries from one ``RetryBudget``, so a failing server sees at most ``ratio``
+extra requests per request instead of ``max_attempts`` times the load.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Callable, Collection, FrozenSet, Optional, Union
+
+import httpx
+
+from .operations import operation_id
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# operationIds whose method says otherwise
+NON_IDEMPOTENT_OPERATIONS = frozenset({"captureDevices"})
+IDEMPOTENT_OPERATIONS = frozenset({"getAccessTokenByTitle"})
+
+# the request never reached the server, repeating it is safe whatever the operation
+_NOT_SENT = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# the request may have been handled
+_MAYBE_SENT = (httpx.ReadTimeout, httpx.WriteTimeout, httpx.ReadError, httpx.WriteError, httpx.RemoteProtocolError)
+
+
+def is_idempotent(request: httpx.Request) -> bool:
+    """Whether repeating ``request`` has the same effect as sending it once"""
+    if IDEMPOTENCY_KEY_HEADER in request.headers:
+        return True
+    operation = operation_id(request.method, request.url.path)
+    if operation in NON_IDEMPOTENT_OPERATIONS:
+        return False
+    return request.method in IDEMPOTENT_METHODS or operation in IDEMPOTENT_OPERATIONS
+
+
+class RetryBudget:
+    """Token bucket of retries: every first attempt deposits ``ratio``, every retry withdraws one
+
+    Args:
+        ratio: Retries allowed per request in the long run.
+        reserve: Retries available up front, also the size of the bucket.
+    """
+
+    def __init__(self, ratio: float = 0.2, reserve: int = 10):
+        self.ratio = ratio
+        self.reserve = reserve
+        self._balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        with self._lock:
+            self._balance = min(float(self.reserve), self._balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        with self._lock:
+            if self._balance < 1:
+                return False
+            self._balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """When and how long to wait before repeating a request
+
+    Args:
+        max_attempts: Attempts per request, including the first one.
+        backoff_base: Upper bound of the first backoff in seconds, doubled on every attempt.
+        backoff_max: Upper bound of any backoff in seconds, ``Retry-After`` is honoured up to this value too.
+        retry_statuses: Status codes repeated for idempotent operations, 429 is repeated for every operation.
+        budget: Shared budget of retries.
+        rng: Source of the jitter.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10.0,
+        retry_statuses: Collection[int] = (500, 502, 503, 504),
+        budget: Optional[RetryBudget] = None,
+        rng: Optional[random.Random] = None,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_statuses: FrozenSet[int] = frozenset(retry_statuses)
+        self.budget = budget if budget is not None else RetryBudget()
+        self._rng = rng if rng is not None else random.Random()
+        self.retries = 0
+        self.exhausted = 0
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after the ``attempt``-th failure (1-based), full jitter"""
+        delay = self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.backoff_max))
+        return delay
+
+    def _should_retry(self, request: httpx.Request, attempt: int, outcome: Union[httpx.Response, Exception]) -> bool:
+        if isinstance(outcome, httpx.Response):
+            retryable = outcome.status_code == 429 or (
+                outcome.status_code in self.retry_statuses and is_idempotent(request)
+            )
+        else:
+            retryable = isinstance(outcome, _NOT_SENT) or (isinstance(outcome, _MAYBE_SENT) and is_idempotent(request))
+        if not retryable or attempt >= self.max_attempts:
+            return False
+        if not self.budget.withdraw():
+            self.exhausted += 1
+            return False
+        self.retries += 1
+        return True
+
+    def delay(self, request: httpx.Request, attempt: int, outcome: Union[httpx.Response, Exception]) -> Optional[float]:
+        """Seconds to wait before repeating ``request``, None if the outcome is final"""
+        if attempt == 1:
+            self.budget.deposit()
+        if not self._should_retry(request, attempt, outcome):
+            return None
+        retry_after = None
+        if isinstance(outcome, httpx.Response):
+            try:
+                retry_after = float(outcome.headers.get("Retry-After", ""))
+            except ValueError:
+                pass
+        return self.backoff(attempt, retry_after)
+
+
+class RetryTransport(httpx.BaseTransport):
+    """Repeats the requests a ``RetryPolicy`` deems safe and transient"""
+
+    def __init__(self, transport: httpx.BaseTransport, policy: RetryPolicy, sleep: Callable[[float], None] = time.sleep):
+        self._transport = transport
+        self.policy = policy
+        self._sleep = sleep
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = self._transport.handle_request(request)
+            except httpx.TransportError as e:
+                delay = self.policy.delay(request, attempt, e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.delay(request, attempt, response)
+                if delay is None:
+                    return response
+                response.close()
+            self._sleep(delay)
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+class RetryAsyncTransport(httpx.AsyncBaseTransport):
+    """Async version of ``RetryTransport``"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: RetryPolicy):
+        self._transport = transport
+        self.policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                response = await self._transport.handle_async_request(request)
+            except httpx.TransportError as e:
+                delay = self.policy.delay(request, attempt, e)
+                if delay is None:
+                    raise
+            else:
+                delay = self.policy.delay(request, attempt, response)
+                if delay is None:
+                    return response
+                await response.aclose()
+            await asyncio.sleep(delay)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+__all__ = [
+    "IDEMPOTENCY_KEY_HEADER",
+    "IDEMPOTENT_OPERATIONS",
+    "NON_IDEMPOTENT_OPERATIONS",
+    "RetryAsyncTransport",
+    "RetryBudget",
+    "RetryPolicy",
+    "RetryTransport",
+    "is_idempotent",
+]
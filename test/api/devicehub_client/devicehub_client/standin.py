@@ -0,0 +1,711 @@
+"""In-process stand-in for the DeviceHub API, for client tests and benchmarks without the docker stack
+
+``StandIn`` answers the operations of ``api_v1.yaml`` from an in-memory ``FakeFarm`` whose devices look like the
+ones ``GET /devices/fake`` creates (``lib/util/fakedevice.js``), at any scale:
+
+    standin = StandIn(FakeFarm(devices=5000), latency=Latency(base=0.005))
+    client = AuthenticatedClient(base_url=STANDIN_URL, token="t", httpx_args={"transport": standin.transport()})
+
+    with standin.serve() as base_url:  # or over real sockets, to measure connection pooling
+        client = AuthenticatedClient(base_url=base_url, token="t")
+
+Device, group and user listings and lookups (with ``fields``, filters, ``ETag``, device pages and NDJSON streaming),
+``/devices/fake``, the device change feed and autotests capture/free are implemented. Every other operation is routed
+through ``OPERATIONS`` and answered with a body synthesized from the schema of its first 2xx response in
+``api_v1.yaml`` (needs PyYAML), or 501 without the spec. ``Latency`` delays responses by a base time plus a time per
+KiB of body, with a lognormal spread, in both the sync and the async transport. With ``compression_threshold``
+bodies are compressed like the API does, with the codecs installed for ``devicehub_client[compression]``.
+"""
+
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import uuid
+import zlib
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import httpx
+from attrs import define, field
+
+from .compression import PREFERENCE
+from .operations import BASE_PATH, OPERATIONS, operation_id
+
+STANDIN_URL = f"http://devicehub.standin{BASE_PATH}"
+DEFAULT_SPEC = Path(__file__).resolve().parents[4] / "lib" / "units" / "api" / "swagger" / "api_v1.yaml"
+
+ADMIN_EMAIL = "administrator@fakedomain.com"
+ADMIN_NAME = "administrator"
+ONE_YEAR = timedelta(days=365)
+DEVICES_PAGE_MAX = 5000
+NDJSON = "application/x-ndjson"
+# filter parameters of the device listings and the device fields they match, as apiutil.getDeviceFilter
+DEVICE_FILTERS = {
+    "owner": "owner.email",
+    "ownerName": "owner.name",
+    "groupId": "group.id",
+    "groupName": "group.name",
+    "status": "status",
+    "abi": "abi",
+    "sdk": "sdk",
+    "model": "model",
+    "platform": "platform",
+}
+
+Payload = Tuple[int, Dict[str, Any]]
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def _serial() -> str:
+    return f"fake-{uuid.uuid4().hex}"
+
+
+@define
+class Latency:
+    """Response delay: ``(base + per_kb * KiB of body) * lognormal(0, sigma)`` seconds"""
+
+    base: float = 0.005
+    per_kb: float = 0.00002
+    sigma: float = 0.25
+    seed: Optional[int] = None
+    _rng: random.Random = field(init=False, repr=False, eq=False)
+    _lock: threading.Lock = field(init=False, repr=False, eq=False, factory=threading.Lock)
+
+    def __attrs_post_init__(self) -> None:
+        self._rng = random.Random(self.seed)
+
+    def delay(self, size: int) -> float:
+        with self._lock:
+            spread = self._rng.lognormvariate(0, self.sigma) if self.sigma else 1.0
+        return (self.base + self.per_kb * size / 1024) * spread
+
+
+class FakeFarm:
+    """Devices, groups and users served by a ``StandIn``
+
+    Args:
+        devices: Number of fake devices in the Common group.
+        seed: Seed of the random device attributes.
+    """
+
+    def __init__(self, devices: int = 5, seed: Optional[int] = None):
+        self._rng = random.Random(seed)
+        self._lock = threading.RLock()
+        self.version = 0
+        now = datetime.now(timezone.utc)
+        self.admin = {
+            "email": ADMIN_EMAIL,
+            "name": ADMIN_NAME,
+            "privilege": "admin",
+            "createdAt": _now(),
+            "groups": {"subscribed": [], "lock": False, "quotas": {"allocated": {"number": 10, "duration": 0}}},
+        }
+        self.common = self._group("Common", "bookable", now, now + ONE_YEAR, privilege="root")
+        self.groups: Dict[str, Dict[str, Any]] = {self.common["id"]: self.common}
+        self.users: Dict[str, Dict[str, Any]] = {ADMIN_EMAIL: self.admin}
+        self.devices: Dict[str, Dict[str, Any]] = {}
+        self.changes: List[Dict[str, Any]] = []
+        self.add_devices(devices)
+
+    def _group(self, name: str, class_: str, start: datetime, stop: datetime, privilege: str = "admin") -> Dict[str, Any]:
+        group_id = uuid.uuid4().hex
+        self.admin["groups"]["subscribed"].append(group_id)
+        dates = [{"start": start.isoformat(), "stop": stop.isoformat()}]
+        return {
+            "id": group_id,
+            "name": name,
+            "owner": {"email": ADMIN_EMAIL, "name": ADMIN_NAME},
+            "users": [ADMIN_EMAIL],
+            "privilege": privilege,
+            "class": class_,
+            "repetitions": 0,
+            "duration": 0,
+            "isActive": True,
+            "state": "ready",
+            "dates": dates,
+            "devices": [],
+            "moderators": [],
+            "lock": {"user": False, "admin": False},
+        }
+
+    def _device(self, serial: str, model: str) -> Dict[str, Any]:
+        now = _now()
+        common = self.common
+        return {
+            "serial": serial,
+            "present": True,
+            "presenceChangedAt": now,
+            "provider": {"name": "FAKE/1", "channel": "*fake"},
+            "owner": None,
+            "channel": None,
+            "status": 3,
+            "statusChangedAt": now,
+            "bookedBefore": 0,
+            "ready": True,
+            "reverseForwards": [],
+            "remoteConnect": False,
+            "remoteConnectUrl": None,
+            "usage": None,
+            "logs_enabled": False,
+            "createdAt": now,
+            "group": {
+                "id": common["id"],
+                "name": common["name"],
+                "lifeTime": common["dates"][0],
+                "owner": common["owner"],
+                "origin": common["id"],
+                "class": common["class"],
+                "repetitions": 0,
+                "originName": common["name"],
+                "lock": False,
+            },
+            "platform": "Android",
+            "manufacturer": "Foo Electronics",
+            "operator": "Loss Networks",
+            "model": model,
+            "version": "4.1.2",
+            "abi": "armeabi-v7a",
+            "sdk": str(8 + self._rng.randrange(12)),
+            "display": {
+                "density": 3,
+                "fps": 60,
+                "height": 1920,
+                "id": 0,
+                "rotation": 0,
+                "secure": True,
+                "url": "/404.jpg",
+                "width": 1080,
+                "xdpi": 442,
+                "ydpi": 439,
+            },
+            "phone": {
+                "iccid": "1234567890123456789",
+                "imei": "123456789012345",
+                "imsi": "123456789012345",
+                "network": "LTE",
+                "phoneNumber": "0000000000",
+            },
+            "product": model,
+            "cpuPlatform": "msm8996",
+            "openGLESVersion": "3.1",
+            "marketName": "Bar F9+",
+            "macAddress": "123abc",
+            "ram": 0,
+            "using": False,
+        }
+
+    def touch(self, serial: Optional[str] = None, action: str = "updated") -> None:
+        """Record a change, listings get a new ETag and the change feed reports the device"""
+        self.version += 1
+        if serial is not None:
+            device = self.devices.get(serial)
+            self.changes.append({"serial": serial, "action": action, "changedAt": _now(), "device": device or {}})
+
+    def add_devices(self, number: int, model: Optional[str] = None) -> List[str]:
+        with self._lock:
+            serials = [_serial() for _ in range(number)]
+            for serial in serials:
+                self.devices[serial] = self._device(serial, model or "FakeDeviceModel")
+                self.common["devices"].append(serial)
+                self.touch(serial, "created")
+            return serials
+
+    def move(self, serials: List[str], group: Dict[str, Any]) -> None:
+        """Put devices in ``group``, taking them out of the group they were in"""
+        with self._lock:
+            for serial in serials:
+                device = self.devices[serial]
+                current = self.groups.get(device["group"]["id"])
+                if current is not None and current is not self.common and serial in current["devices"]:
+                    current["devices"].remove(serial)
+                if serial not in group["devices"]:
+                    group["devices"].append(serial)
+                device["group"] = {
+                    **device["group"],
+                    "id": group["id"],
+                    "name": group["name"],
+                    "lifeTime": group["dates"][0],
+                    "class": group["class"],
+                }
+                self.touch(serial)
+
+    def create_group(self, name: str, class_: str = "once", lifetime: timedelta = timedelta(hours=1)) -> Dict[str, Any]:
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            group = self._group(name, class_, now, now + lifetime)
+            self.groups[group["id"]] = group
+            self.touch()
+            return group
+
+    def delete_group(self, group_id: str) -> bool:
+        with self._lock:
+            group = self.groups.pop(group_id, None)
+            if group is None:
+                return False
+            self.move(list(group["devices"]), self.common)
+            self.admin["groups"]["subscribed"].remove(group_id)
+            self.touch()
+            return True
+
+    def free_devices(self) -> List[str]:
+        return [serial for serial in self.common["devices"] if self.devices[serial]["group"]["id"] == self.common["id"]]
+
+
+def _pick(document: Dict[str, Any], fields: str) -> Dict[str, Any]:
+    """lodash ``_.pick`` of dotted paths, as the API applies ``fields``"""
+    picked: Dict[str, Any] = {}
+    for path in filter(None, fields.split(",")):
+        source: Any = document
+        parts = path.split(".")
+        for part in parts:
+            if not isinstance(source, dict) or part not in source:
+                break
+            source = source[part]
+        else:
+            target = picked
+            for part in parts[:-1]:
+                target = target.setdefault(part, {})
+            target[parts[-1]] = source
+    return picked
+
+
+def _lookup(document: Dict[str, Any], path: str) -> Any:
+    value: Any = document
+    for part in path.split("."):
+        value = value.get(part) if isinstance(value, dict) else None
+    return value
+
+
+def _filter_devices(devices: List[Dict[str, Any]], query: httpx.QueryParams) -> List[Dict[str, Any]]:
+    for param, path in DEVICE_FILTERS.items():
+        values = query.get_list(param)
+        if values:
+            devices = [device for device in devices if str(_lookup(device, path)) in values]
+    if "present" in query:
+        present = query["present"] == "true"
+        devices = [device for device in devices if device["present"] == present]
+    if "using" in query:
+        # the stand-in user is an administrator, who uses every owned device
+        using = query["using"] == "true"
+        devices = [device for device in devices if (device["owner"] is not None) == using]
+    return devices
+
+
+@lru_cache(maxsize=None)
+def _path_params(template: str) -> "re.Pattern[str]":
+    return re.compile(re.sub(r"\\\{([^}]+)\\\}", r"(?P<\1>[^/]+)", re.escape(template)) + "/?")
+
+
+def _encode(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def _encode_cursor(serial: str) -> str:
+    return base64.urlsafe_b64encode(serial.encode()).rstrip(b"=").decode()
+
+
+def _decode_cursor(cursor: str) -> Optional[str]:
+    try:
+        serial = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+    except ValueError:
+        return None
+    return serial if serial and _encode_cursor(serial) == cursor else None
+
+
+def _encoders() -> Dict[str, Callable[[bytes], bytes]]:
+    """Response encoders whose package is installed, brotli and zstd besides the gzip and deflate of the API"""
+    encoders: Dict[str, Callable[[bytes], bytes]] = {
+        "gzip": lambda body: gzip.compress(body, 6, mtime=0),
+        "deflate": zlib.compress,
+    }
+    try:
+        import brotli
+
+        encoders["br"] = lambda body: brotli.compress(body, quality=4)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+
+        encoders["zstd"] = zstandard.ZstdCompressor(level=3).compress
+    except ImportError:
+        pass
+    return {encoding: encoders[encoding] for encoding in PREFERENCE if encoding in encoders}
+
+
+ENCODERS = _encoders()
+
+
+def _negotiate(header: str) -> Optional[str]:
+    """The encoding of the highest quality in Accept-Encoding, ties broken by ``PREFERENCE``, as the API does"""
+    accepted: Dict[str, float] = {}
+    for part in filter(None, (part.strip() for part in header.lower().split(","))):
+        name, _, params = part.partition(";")
+        quality = params.strip()
+        try:
+            accepted[name.strip()] = float(quality[2:]) if quality.startswith("q=") else 1.0
+        except ValueError:
+            accepted[name.strip()] = 0.0
+    best, best_quality = None, 0.0
+    for encoding in ENCODERS:
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _etag(body: bytes) -> str:
+    return '"' + base64.urlsafe_b64encode(hashlib.sha1(body).digest()).rstrip(b"=").decode() + '"'
+
+
+class _Schema:
+    """Bodies synthesized from the response schemas of ``api_v1.yaml``"""
+
+    def __init__(self, path: Path):
+        import yaml
+
+        with open(path) as file:
+            self._spec = yaml.safe_load(file)
+
+    def _resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        while "$ref" in schema:
+            node: Any = self._spec
+            for part in schema["$ref"].lstrip("#/").split("/"):
+                node = node[part]
+            schema = node
+        return schema
+
+    def example(self, schema: Dict[str, Any], depth: int = 0) -> Any:
+        schema = self._resolve(schema)
+        kind = schema.get("type", "object" if "properties" in schema else None)
+        if "enum" in schema:
+            return schema["enum"][0]
+        if kind == "object":
+            if depth > 4:
+                return {}
+            return {name: self.example(sub, depth + 1) for name, sub in schema.get("properties", {}).items()}
+        if kind == "array":
+            return []
+        if kind == "boolean":
+            return True
+        if kind in ("integer", "number"):
+            return 0
+        if kind == "string":
+            return _now() if schema.get("format") == "date-time" else "string"
+        return None
+
+    def response(self, operation: str) -> Optional[Payload]:
+        method, path = OPERATIONS[operation]
+        responses = self._spec["paths"][path][method.lower()]["responses"]
+        for status in sorted(code for code in responses if str(code).startswith("2")):
+            content = responses[status].get("content", {}).get("application/json")
+            body = self.example(content["schema"]) if content else {}
+            if isinstance(body, dict) and "success" in body:
+                body["success"], body["description"] = True, f"{operation} (stand-in)"
+            return int(status), body
+        return None
+
+
+class StandIn:
+    """Answers API requests from a ``FakeFarm``, see the module documentation
+
+    Args:
+        farm: The devices, groups and users to serve, 5 devices when None.
+        latency: Delay added to every response, none when None.
+        spec: ``api_v1.yaml`` to synthesize the operations without a handler from, None to answer them with 501.
+        compression_threshold: Compress bodies of at least this many bytes with the encoding the request accepts,
+            as the API does with its default of 1024. None, the default, sends every body uncompressed.
+    """
+
+    def __init__(
+        self,
+        farm: Optional[FakeFarm] = None,
+        latency: Optional[Latency] = None,
+        spec: Optional[Path] = DEFAULT_SPEC,
+        compression_threshold: Optional[int] = None,
+    ):
+        self.farm = farm if farm is not None else FakeFarm()
+        self.latency = latency
+        self.compression_threshold = compression_threshold
+        self._schema = _Schema(spec) if spec is not None and spec.exists() else None
+        self._bodies: Dict[Tuple[str, str], Tuple[int, bytes]] = {}
+        self._handlers: Dict[str, Callable[..., Payload]] = {
+            "getDevices": self._get_devices,
+            "getDeviceBySerial": self._get_device,
+            "generateFakeDevice": self._generate_fake_device,
+            "getDeviceChanges": self._get_device_changes,
+            "getGroups": self._get_groups,
+            "getGroup": self._get_group,
+            "getGroupDevices": self._get_group_devices,
+            "getUsers": self._get_users,
+            "getUserByEmail": self._get_user,
+            "captureDevices": self._capture_devices,
+            "freeDevices": self._free_devices,
+        }
+        self.requests: Dict[str, int] = {}
+
+    # handlers, each gets the path parameters and the query string
+
+    def _select_devices(self, query: httpx.QueryParams, paged: bool) -> Payload:
+        target = query.get("target", "user")
+        devices = list(self.farm.devices.values())
+        if target == "bookable":
+            devices = [device for device in devices if device["group"]["class"] == "bookable"]
+        elif target == "standard":
+            devices = [device for device in devices if device["group"]["class"] == "standard"]
+        devices = _filter_devices(devices, query)
+        page: Dict[str, Any] = {}
+        if paged or "limit" in query or "cursor" in query:
+            devices.sort(key=lambda device: device["serial"])
+            if "cursor" in query:
+                after = _decode_cursor(query["cursor"])
+                if after is None:
+                    return 400, {"success": False, "description": "Bad Request (invalid cursor)"}
+                devices = [device for device in devices if device["serial"] > after]
+            if "limit" in query:
+                limit = int(query["limit"])
+                if not 1 <= limit <= DEVICES_PAGE_MAX:
+                    return 400, {"success": False,
+                                 "description": f"Bad Request (limit must be between 1 and {DEVICES_PAGE_MAX})"}
+                has_more = len(devices) > limit
+                devices = devices[:limit]
+                page = {"cursor": _encode_cursor(devices[-1]["serial"]) if has_more else None, "hasMore": has_more}
+        fields = query.get("fields")
+        if fields:
+            devices = [_pick(device, fields) for device in devices]
+        return 200, {"success": True, "description": "Devices Information", "devices": devices, **page}
+
+    def _get_devices(self, query: httpx.QueryParams) -> Payload:
+        return self._select_devices(query, paged=False)
+
+    def _get_device(self, query: httpx.QueryParams, serial: str) -> Payload:
+        device = self.farm.devices.get(serial)
+        if device is None:
+            return 404, {"success": False, "description": "Not Found (device)"}
+        fields = query.get("fields")
+        return 200, {
+            "success": True,
+            "description": "Device Information",
+            "device": _pick(device, fields) if fields else device,
+        }
+
+    def _generate_fake_device(self, query: httpx.QueryParams) -> Payload:
+        self.farm.add_devices(int(query.get("number", 1)))
+        return 200, {"success": True, "description": "Fake devices generated"}
+
+    def _get_device_changes(self, query: httpx.QueryParams) -> Payload:
+        changes = self.farm.changes
+        if "cursor" not in query:
+            return 200, {"success": True, "description": "Device Changes", "cursor": str(len(changes)),
+                         "hasMore": False, "changes": []}
+        if not query["cursor"].isdigit():
+            return 400, {"success": False, "description": "Bad Request (invalid cursor)"}
+        since, limit = int(query["cursor"]), int(query.get("limit", 1000))
+        page = changes[since : since + limit]
+        return 200, {
+            "success": True,
+            "description": "Device Changes",
+            "cursor": str(since + len(page)),
+            "hasMore": since + len(page) < len(changes),
+            "changes": page,
+        }
+
+    def _get_groups(self, query: httpx.QueryParams) -> Payload:
+        return 200, {"success": True, "description": "Groups Information", "groups": list(self.farm.groups.values())}
+
+    def _get_group(self, query: httpx.QueryParams, id: str) -> Payload:
+        group = self.farm.groups.get(id)
+        if group is None:
+            return 404, {"success": False, "description": "Not Found (group)"}
+        return 200, {"success": True, "description": "Group Information", "group": group}
+
+    def _get_group_devices(self, query: httpx.QueryParams, id: str) -> Payload:
+        group = self.farm.groups.get(id)
+        if group is None:
+            return 404, {"success": False, "description": "Not Found (group)"}
+        devices = [self.farm.devices[serial] for serial in group["devices"] if serial in self.farm.devices]
+        devices = _filter_devices(devices, query)
+        fields = query.get("fields")
+        if fields:
+            devices = [_pick(device, fields) for device in devices]
+        return 200, {"success": True, "description": "Devices Information", "devices": devices}
+
+    def _get_users(self, query: httpx.QueryParams) -> Payload:
+        return 200, {"success": True, "description": "Users Information", "users": list(self.farm.users.values())}
+
+    def _get_user(self, query: httpx.QueryParams, email: str) -> Payload:
+        user = self.farm.users.get(email)
+        if user is None:
+            return 404, {"success": False, "description": "Not Found (user)"}
+        return 200, {"success": True, "description": "User Information", "user": user}
+
+    def _capture_devices(self, query: httpx.QueryParams) -> Payload:
+        amount = int(query.get("amount", 1))
+        filters = {key: query[key] for key in ("abi", "sdk", "model") if key in query}
+        with self.farm._lock:
+            free = [
+                serial
+                for serial in self.farm.free_devices()
+                if all(self.farm.devices[serial].get(key) == value for key, value in filters.items())
+            ]
+            if not free or (query.get("need_amount") == "true" and len(free) < amount):
+                return 409, {"success": False, "description": "Cant create group. Not enough free devices"}
+            lifetime = timedelta(seconds=int(query.get("timeout", 3600)))
+            group = self.farm.create_group(query.get("run", "autotests"), lifetime=lifetime)
+            self.farm.move(free[:amount], group)
+            devices = [self.farm.devices[serial] for serial in group["devices"]]
+        return 200, {"success": True, "description": "Added (group devices)",
+                     "group": {"id": group["id"], "devices": devices}}
+
+    def _free_devices(self, query: httpx.QueryParams) -> Payload:
+        if not self.farm.delete_group(query.get("group", "")):
+            return 404, {"success": False, "description": "Not Found (groups)"}
+        return 200, {"success": True, "description": "Deleted (groups)"}
+
+    def respond(self, method: str, url: httpx.URL, headers: httpx.Headers) -> Tuple[int, Dict[str, str], bytes]:
+        """Status, headers and body answering a request, without the latency"""
+        status, response_headers, body = self._respond(method, url, headers)
+        if self.compression_threshold is not None and len(body) >= self.compression_threshold:
+            encoding = _negotiate(headers.get("accept-encoding", ""))
+            if encoding is not None:
+                body = ENCODERS[encoding](body)
+                response_headers = {**response_headers, "content-encoding": encoding, "vary": "Accept-Encoding"}
+        return status, response_headers, body
+
+    def _respond(self, method: str, url: httpx.URL, headers: httpx.Headers) -> Tuple[int, Dict[str, str], bytes]:
+        operation = operation_id(method, url.path)
+        if operation is None:
+            return 404, {"content-type": "application/json"}, _encode({"success": False, "description": "Not Found"})
+        self.requests[operation] = self.requests.get(operation, 0) + 1
+        if operation == "getDevices" and NDJSON in headers.get("accept", ""):
+            status, payload = self._select_devices(url.params, paged=True)
+            if status != 200:
+                return status, {"content-type": "application/json; charset=utf-8"}, _encode(payload)
+            lines = b"".join(_encode(device) + b"\n" for device in payload["devices"])
+            return 200, {"content-type": NDJSON, "cache-control": "no-cache"}, lines
+        handler = self._handlers.get(operation)
+        cacheable = method == "GET" and handler is not None
+        key = (operation, str(url))
+        cached = self._bodies.get(key) if cacheable else None
+        if cached is not None and cached[0] == self.farm.version:
+            body = cached[1]
+            status = 200
+        else:
+            version = self.farm.version
+            if handler is not None:
+                path = url.path.split(BASE_PATH, 1)[-1]
+                match = _path_params(OPERATIONS[operation][1]).fullmatch(path)
+                status, payload = handler(url.params, **(match.groupdict() if match else {}))
+            elif self._schema is not None:
+                status, payload = self._schema.response(operation) or (204, {})
+            else:
+                status, payload = 501, {"success": False, "description": f"Not Implemented ({operation}, stand-in)"}
+            body = _encode(payload)
+            if cacheable and status == 200:
+                self._bodies[key] = (version, body)
+        response_headers = {"content-type": "application/json; charset=utf-8"}
+        if cacheable and status == 200:
+            etag = _etag(body)
+            response_headers.update({"etag": etag, "cache-control": "no-cache"})
+            if headers.get("if-none-match") == etag:
+                return 304, response_headers, b""
+        return status, response_headers, body
+
+    def _delay(self, body: bytes) -> float:
+        return self.latency.delay(len(body)) if self.latency is not None else 0.0
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        status, headers, body = self.respond(request.method, request.url, request.headers)
+        delay = self._delay(body)
+        if delay:
+            time.sleep(delay)
+        return httpx.Response(status, headers=headers, content=body)
+
+    async def ahandle(self, request: httpx.Request) -> httpx.Response:
+        status, headers, body = self.respond(request.method, request.url, request.headers)
+        delay = self._delay(body)
+        if delay:
+            await asyncio.sleep(delay)
+        return httpx.Response(status, headers=headers, content=body)
+
+    def transport(self) -> "StandInTransport":
+        """Transport for the ``transport`` key of ``httpx_args``, serving both the sync and the async client"""
+        return StandInTransport(self)
+
+    @contextmanager
+    def serve(self, host: str = "127.0.0.1") -> Iterator[str]:
+        """Serve over HTTP/1.1 from a thread, yields the base URL"""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _answer(self) -> None:
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    self.rfile.read(length)
+                url = httpx.URL(f"http://{host}{self.path}")
+                status, headers, body = standin.respond(self.command, url, httpx.Headers(dict(self.headers)))
+                delay = standin._delay(body)
+                if delay:
+                    time.sleep(delay)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, 0), Handler)
+        server.daemon_threads = True
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{server.server_port}{BASE_PATH}"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+class StandInTransport(httpx.BaseTransport, httpx.AsyncBaseTransport):
+    """Hands requests to a ``StandIn`` in process, the latency sleeps in the event loop for async clients"""
+
+    def __init__(self, standin: StandIn):
+        self._standin = standin
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        request.read()
+        return self._standin.handle(request)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+        return await self._standin.ahandle(request)
+
+
+__all__ = [
+    "DEFAULT_SPEC",
+    "ENCODERS",
+    "FakeFarm",
+    "Latency",
+    "STANDIN_URL",
+    "StandIn",
+    "StandInTransport",
+]
@@ -0,0 +1,247 @@
+"""Buffered, batched writes to the stats table
+
+Posting every action to ``/stats`` costs one request each and quickly eats the rate limit. ``StatsWriter`` queues
+actions and a background thread sends them to ``POST /stats/batch`` once ``batch_size`` are waiting or the oldest
+one waited ``flush_interval`` seconds:
+
+    with StatsWriter(client, batch_size=500, flush_interval=1.0) as stats:
+        stats.write(serial, "test_started")
+    stats.written, stats.dropped, stats.failed
+
+At most ``max_pending`` actions are kept in memory. When the queue is full ``overflow`` decides: ``BLOCK`` makes
+``write`` wait for room (backpressure, up to ``block_timeout``), ``DROP_NEWEST`` discards the new action and
+``DROP_OLDEST`` the oldest queued one. Actions are timestamped by ``write``, so batching does not shift their time.
+A batch the server rejects is counted in ``failed`` and handed to ``on_error``, it is not retried. Exceptions
+raised by ``on_error`` are logged and do not stop the writer thread.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from enum import Enum
+from http import HTTPStatus
+from typing import Callable, Deque, List, Optional, Union
+
+from .api.stats import write_stats_batch as _write_stats_batch
+from .bulk import _describe
+from .client import AuthenticatedClient, Client
+from .models.stats_event import StatsEvent
+
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0
+DEFAULT_MAX_PENDING = 10000
+MAX_BATCH_SIZE = 5000
+
+logger = logging.getLogger(__name__)
+
+ErrorHook = Callable[[List[StatsEvent], Union[BaseException, str]], None]
+
+
+class Overflow(str, Enum):
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+    def __str__(self) -> str:
+        return str(self.value)
+
+
+class StatsWriter:
+    """Queues stats actions and writes them in batches from a background thread
+
+    Args:
+        client: The client used for the requests, its sync httpx client is used from the writer thread.
+        batch_size: The maximum number of actions per request, at most 5000.
+        flush_interval: Seconds an action may wait for its batch to fill.
+        max_pending: The maximum number of queued actions.
+        overflow: What ``write`` does when ``max_pending`` actions are queued.
+        block_timeout: Seconds ``write`` waits for room with ``Overflow.BLOCK``, None to wait forever.
+        on_error: Called with the actions of a failed batch and the exception or the response description.
+    """
+
+    def __init__(
+        self,
+        client: Union[AuthenticatedClient, Client],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        overflow: Overflow = Overflow.BLOCK,
+        block_timeout: Optional[float] = None,
+        on_error: Optional[ErrorHook] = None,
+    ):
+        if not 0 < batch_size <= MAX_BATCH_SIZE:
+            raise ValueError(f"batch_size must be between 1 and {MAX_BATCH_SIZE}")
+        if max_pending < batch_size:
+            raise ValueError("max_pending must be at least batch_size")
+        self._client = client
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._overflow = Overflow(overflow)
+        self._block_timeout = block_timeout
+        self._on_error = on_error
+        self._pending: Deque[StatsEvent] = deque()
+        self._oldest = 0.0
+        self._sending = 0
+        self._flushing = 0
+        self._closed = False
+        self._stopped = False
+        self._condition = threading.Condition()
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.batches = 0
+        self._thread = threading.Thread(target=self._run, name="devicehub-stats-writer", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self) -> int:
+        """Actions queued or being sent"""
+        with self._condition:
+            return len(self._pending) + self._sending
+
+    def write(self, serial: str, action: str, timestamp: Optional[float] = None) -> bool:
+        """Queue an action, ``timestamp`` in seconds since the epoch defaults to now
+
+        Returns:
+            Whether the action was queued, False if it was dropped or ``block_timeout`` expired.
+
+        Raises:
+            RuntimeError: If the writer is closed or its thread stopped.
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        event = StatsEvent(serial=serial, action=action, timestamp=int(timestamp * 1000))
+        with self._condition:
+            self._check_running()
+            if len(self._pending) >= self._max_pending:
+                if self._overflow == Overflow.DROP_NEWEST:
+                    self.dropped += 1
+                    return False
+                if self._overflow == Overflow.DROP_OLDEST:
+                    self._pending.popleft()
+                    self.dropped += 1
+                elif not self._condition.wait_for(
+                    lambda: len(self._pending) < self._max_pending or self._closed or self._stopped,
+                    self._block_timeout,
+                ):
+                    self.dropped += 1
+                    return False
+                else:
+                    self._check_running()
+            if not self._pending:
+                # the writer thread sleeps until an action arrives, then until its flush_interval expires
+                self._oldest = time.monotonic()
+                self._condition.notify_all()
+            self._pending.append(event)
+            if len(self._pending) >= self._batch_size:
+                self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Send the queued actions now and wait until they are written, False if ``timeout`` expired first
+
+        Raises:
+            RuntimeError: If the writer thread stopped before the queued actions were written.
+        """
+        with self._condition:
+            self._flushing += 1
+            self._condition.notify_all()
+            try:
+                self._condition.wait_for(lambda: (not self._pending and not self._sending) or self._stopped, timeout)
+                unwritten = len(self._pending) + self._sending
+                if unwritten:
+                    if self._stopped or not self._thread.is_alive():
+                        raise RuntimeError(f"StatsWriter thread stopped with {unwritten} actions not written")
+                    return False
+                return True
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """Write the queued actions and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join(timeout)
+
+    def __enter__(self) -> "StatsWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _check_running(self) -> None:
+        if self._closed:
+            raise RuntimeError("StatsWriter is closed")
+        if self._stopped or not self._thread.is_alive():
+            raise RuntimeError("StatsWriter thread stopped")
+
+    def _ready(self) -> bool:
+        if not self._pending:
+            return False
+        return (
+            self._closed
+            or self._flushing > 0
+            or len(self._pending) >= self._batch_size
+            or time.monotonic() - self._oldest >= self._flush_interval
+        )
+
+    def _next_batch(self) -> Optional[List[StatsEvent]]:
+        with self._condition:
+            while not self._ready():
+                if self._closed:
+                    return None
+                timeout = self._oldest + self._flush_interval - time.monotonic() if self._pending else None
+                self._condition.wait(timeout)
+            batch = [self._pending.popleft() for _ in range(min(self._batch_size, len(self._pending)))]
+            if self._pending:
+                self._oldest = time.monotonic()
+            self._sending = len(batch)
+            self._condition.notify_all()
+            return batch
+
+    def _send(self, batch: List[StatsEvent]) -> None:
+        error: Union[BaseException, str, None] = None
+        try:
+            response = _write_stats_batch.sync_detailed(client=self._client, body=batch)
+        except Exception as e:
+            error = e
+        else:
+            if response.status_code != HTTPStatus.OK:
+                error = _describe(response)
+        with self._condition:
+            self.batches += 1
+            if error is None:
+                self.written += len(batch)
+            else:
+                self.failed += len(batch)
+            self._sending = 0
+            self._condition.notify_all()
+        if error is not None and self._on_error is not None:
+            try:
+                self._on_error(batch, error)
+            except Exception:
+                logger.exception("on_error hook failed for a batch of %d stats actions", len(batch))
+
+    def _run(self) -> None:
+        try:
+            while True:
+                batch = self._next_batch()
+                if batch is None:
+                    return
+                self._send(batch)
+        finally:
+            # wakes up write() and flush() waiting for a thread which will not make progress anymore
+            with self._condition:
+                self._stopped = True
+                self._condition.notify_all()
+
+
+__all__ = [
+    "DEFAULT_BATCH_SIZE",
+    "DEFAULT_FLUSH_INTERVAL",
+    "DEFAULT_MAX_PENDING",
+    "Overflow",
+    "StatsWriter",
+]
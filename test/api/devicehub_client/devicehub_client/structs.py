@@ -0,0 +1,207 @@
+"""msgspec Structs for the hottest response models, a faster typed alternative to the attrs models
+
+Requires the ``msgspec`` package (``devicehub_client[msgspec]``). Decoding straight into a Struct validates and
+builds the whole response in one pass over the bytes, without the intermediate dicts and ``from_dict`` walk.
+A client created with ``structs=True`` parses the listings of ``ENDPOINT_STRUCTS`` this way:
+
+    client = AuthenticatedClient(base_url=..., token=..., structs=True)
+    devices = get_devices.sync(client=client).devices  # DeviceStructs
+
+``decode`` does the same for bodies fetched otherwise. Nested objects which are rarely read (display, battery,
+phone...) are kept as plain dicts.
+"""
+
+import datetime
+from http import HTTPStatus
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+import msgspec
+
+S = TypeVar("S", bound=msgspec.Struct)
+
+
+class _Struct(msgspec.Struct, rename="camel", kw_only=True, omit_defaults=True):
+    pass
+
+
+class OwnerStruct(_Struct):
+    email: Optional[str] = None
+    name: Optional[str] = None
+    group: Optional[str] = None
+
+
+class DeviceGroupStruct(_Struct):
+    id: Optional[str] = None
+    name: Optional[str] = None
+    origin: Optional[str] = None
+    origin_name: Optional[str] = None
+    class_: Optional[str] = msgspec.field(default=None, name="class")
+    owner: Optional[OwnerStruct] = None
+    life_time: Optional[Dict[str, Any]] = None
+    lock: Any = None
+    repetitions: Optional[int] = None
+    run_url: Optional[str] = None
+
+
+class DeviceStruct(_Struct):
+    field_id: Optional[str] = msgspec.field(default=None, name="_id")
+    present: Optional[bool] = None
+    presence_changed_at: Optional[datetime.datetime] = None
+    provider: Optional[Dict[str, Any]] = None
+    owner: Optional[OwnerStruct] = None
+    status: Optional[int] = None
+    status_changed_at: Optional[datetime.datetime] = None
+    booked_before: Optional[int] = None
+    ready: Optional[bool] = None
+    reverse_forwards: List[Dict[str, Any]] = msgspec.field(default_factory=list)
+    remote_connect: Optional[bool] = None
+    remote_connect_url: Optional[str] = None
+    usage: Optional[str] = None
+    logs_enabled: Optional[bool] = msgspec.field(default=None, name="logs_enabled")
+    serial: Optional[str] = None
+    created_at: Optional[datetime.datetime] = None
+    group: Optional[DeviceGroupStruct] = None
+    adb_port: Optional[int] = None
+    network: Optional[Dict[str, Any]] = None
+    display: Optional[Dict[str, Any]] = None
+    airplane_mode: Optional[bool] = None
+    battery: Optional[Dict[str, Any]] = None
+    browser: Optional[Dict[str, Any]] = None
+    service: Optional[Dict[str, Any]] = None
+    channel: Optional[str] = None
+    abi: Optional[str] = None
+    cpu_platform: Optional[str] = None
+    mac_address: Optional[str] = None
+    manufacturer: Optional[str] = None
+    market_name: Optional[str] = None
+    model: Optional[str] = None
+    open_gles_version: Optional[str] = msgspec.field(default=None, name="openGLESVersion")
+    operator: Optional[str] = None
+    phone: Optional[Dict[str, Any]] = None
+    platform: Optional[str] = None
+    ios_client_channel: Optional[str] = None
+    product: Optional[str] = None
+    # ram, sdk and version come as numbers or strings depending on the provider
+    ram: Any = None
+    sdk: Any = None
+    version: Any = None
+    usage_changed_at: Optional[datetime.datetime] = None
+    notes: Optional[str] = None
+    place: Optional[str] = None
+    storage_id: Optional[str] = None
+    screen_port: Optional[float] = None
+    connect_port: Optional[float] = None
+    cpu: Optional[Dict[str, Any]] = None
+    memory: Optional[Dict[str, Any]] = None
+    image: Optional[str] = None
+    released_at: Optional[datetime.datetime] = None
+    name: Optional[str] = None
+    device_type: Optional[str] = None
+    likely_leave_reason: Optional[str] = None
+    using: Optional[bool] = None
+    capabilities: Optional[Dict[str, Any]] = None
+
+
+class GroupStruct(_Struct):
+    field_id: Optional[str] = msgspec.field(default=None, name="_id")
+    id: Optional[str] = None
+    name: Optional[str] = None
+    owner: Optional[OwnerStruct] = None
+    users: Optional[List[str]] = None
+    privilege: Optional[str] = None
+    class_: Optional[str] = msgspec.field(default=None, name="class")
+    repetitions: Optional[int] = None
+    duration: Optional[int] = None
+    is_active: Optional[bool] = None
+    state: Optional[str] = None
+    dates: Optional[List[Dict[str, Any]]] = None
+    env_user_groups_number: Optional[int] = None
+    env_user_groups_duration: Optional[int] = None
+    env_user_groups_repetitions: Optional[int] = None
+    # serials in group listings, whole device objects in autotests responses
+    devices: Optional[List[Any]] = None
+    lock: Any = None
+    run_url: Optional[str] = None
+    moderators: Optional[List[str]] = None
+
+
+class UserStruct(_Struct):
+    field_id: Optional[str] = msgspec.field(default=None, name="_id")
+    email: Optional[str] = None
+    name: Optional[str] = None
+    ip: Optional[str] = None
+    group: Optional[str] = None
+    last_logged_in_at: Optional[datetime.datetime] = None
+    created_at: Optional[datetime.datetime] = None
+    forwards: Optional[List[Any]] = None
+    group_device_data: Optional[Dict[str, Any]] = None
+    adb_keys: Optional[List[Dict[str, Any]]] = None
+    settings: Optional[Dict[str, Any]] = None
+    accepted_policy: Optional[bool] = None
+    privilege: Optional[str] = None
+    groups: Optional[Dict[str, Any]] = None
+
+
+class DeviceListResponseStruct(_Struct):
+    success: bool
+    description: str
+    devices: List[DeviceStruct]
+    cursor: Optional[str] = None
+    has_more: bool = False
+
+
+class GroupListResponseStruct(_Struct):
+    success: bool
+    description: str
+    groups: List[GroupStruct]
+
+
+# endpoint modules (below devicehub_client.api) whose 200 responses a client with structs=True decodes into a Struct
+ENDPOINT_STRUCTS: Dict[str, Type[msgspec.Struct]] = {
+    "devices.get_devices": DeviceListResponseStruct,
+    "groups.get_group_devices": DeviceListResponseStruct,
+    "groups.get_groups": GroupListResponseStruct,
+    "user.get_user_devices": DeviceListResponseStruct,
+    "admin.get_user_devices_v2": DeviceListResponseStruct,
+}
+
+_decoders: Dict[type, msgspec.json.Decoder] = {}
+
+
+def decode(type_: Type[S], content: bytes) -> S:
+    """Decode a JSON body straight into ``type_``
+
+    Raises:
+        msgspec.ValidationError: If the body does not match the Struct.
+    """
+    decoder = _decoders.get(type_)
+    if decoder is None:
+        decoder = _decoders[type_] = msgspec.json.Decoder(type_)
+    return decoder.decode(content)
+
+
+def struct_parser(parse: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap the ``_parse_response`` of an endpoint to decode its 200 responses with ``decode``, if it has a Struct"""
+    type_ = ENDPOINT_STRUCTS.get(parse.__module__.partition(".api.")[2])
+    if type_ is None:
+        return parse
+
+    def parse_struct(*, client: Any, response: Any) -> Any:
+        if response.status_code == HTTPStatus.OK:
+            return decode(type_, response.content)
+        return parse(client=client, response=response)
+
+    return parse_struct
+
+
+__all__ = [
+    "DeviceGroupStruct",
+    "DeviceListResponseStruct",
+    "DeviceStruct",
+    "ENDPOINT_STRUCTS",
+    "GroupListResponseStruct",
+    "GroupStruct",
+    "OwnerStruct",
+    "UserStruct",
+    "decode",
+]
@@ -0,0 +1,65 @@
+"""httpx transport wrappers used by the clients to shape outgoing traffic"""
+
+import asyncio
+from typing import AsyncIterator, Optional
+
+import httpx
+
+
+class _ReleasingStream(httpx.AsyncByteStream):
+    """Response body stream which releases a semaphore slot once the body is closed"""
+
+    def __init__(self, stream: httpx.AsyncByteStream, semaphore: asyncio.Semaphore):
+        self._stream = stream
+        self._semaphore: Optional[asyncio.Semaphore] = semaphore
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self) -> None:
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._semaphore is not None:
+                self._semaphore.release()
+                self._semaphore = None
+
+
+class ConcurrencyLimitedAsyncTransport(httpx.AsyncBaseTransport):
+    """Caps the number of requests in flight, a slot is held until the response body is closed
+
+    Used to bound the number of concurrent HTTP/2 streams a client opens, the connection pool itself
+    only limits the number of connections.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_concurrency: int):
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be >= 1")
+        self._transport = transport
+        self._max_concurrency = max_concurrency
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self._max_concurrency)
+        semaphore = self._semaphore
+        await semaphore.acquire()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except BaseException:
+            semaphore.release()
+            raise
+        assert isinstance(response.stream, httpx.AsyncByteStream)
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_ReleasingStream(response.stream, semaphore),
+            extensions=response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+__all__ = ["ConcurrencyLimitedAsyncTransport"]
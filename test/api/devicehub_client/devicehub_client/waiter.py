@@ -0,0 +1,138 @@
+"""Waiting for the server to converge on a state, instead of sleeping a fixed time
+
+Changes such as moving devices between groups reach every collection a little after the request answered. Rather
+than sleeping long enough, poll with a deadline and stop as soon as the condition holds:
+
+    convergence = wait_until(lambda: device_groups(client, serials), lambda groups: ..., timeout=10)
+    convergence.converged, convergence.elapsed  # how long the change took to show up
+
+``wait_until`` never raises on timeout, the last probed value is returned with ``converged=False`` so that callers
+can report what was still off. ``device_groups`` looks up the current group of many devices with a single
+field-projected ``get_devices`` call.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, Generic, Iterable, List, Optional, Tuple, TypeVar, Union
+
+from attrs import define
+
+from . import projection
+from .client import AuthenticatedClient, Client
+from .models.get_devices_target import GetDevicesTarget
+
+T = TypeVar("T")
+
+DEFAULT_TIMEOUT = 10.0
+DEFAULT_INTERVAL = 0.05
+DEFAULT_MAX_INTERVAL = 1.0
+
+_GROUP_FIELDS = "serial,group.id,group.name"
+
+
+@define
+class Convergence(Generic[T]):
+    """Outcome of a wait
+
+    Attributes:
+        value: The last value returned by the probe.
+        converged: Whether the condition held before the deadline.
+        elapsed: Seconds from the first probe to the last one.
+        attempts: Number of probes.
+    """
+
+    value: T
+    converged: bool
+    elapsed: float
+    attempts: int
+
+
+def wait_until(
+    probe: Callable[[], T],
+    condition: Callable[[T], bool] = bool,
+    timeout: float = DEFAULT_TIMEOUT,
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> Convergence[T]:
+    """Call ``probe`` until ``condition`` holds for its value or ``timeout`` seconds passed
+
+    The first probe is immediate, the pause between probes doubles from ``interval`` up to ``max_interval``.
+    """
+    started = clock()
+    attempts = 0
+    pause = interval
+    while True:
+        value = probe()
+        attempts += 1
+        elapsed = clock() - started
+        if condition(value):
+            return Convergence(value, True, elapsed, attempts)
+        if elapsed >= timeout:
+            return Convergence(value, False, elapsed, attempts)
+        sleep(min(pause, timeout - elapsed))
+        pause = min(pause * 2, max_interval)
+
+
+async def async_wait_until(
+    probe: Callable[[], Awaitable[T]],
+    condition: Callable[[T], bool] = bool,
+    timeout: float = DEFAULT_TIMEOUT,
+    interval: float = DEFAULT_INTERVAL,
+    max_interval: float = DEFAULT_MAX_INTERVAL,
+    clock: Callable[[], float] = time.monotonic,
+) -> Convergence[T]:
+    """Async version of ``wait_until``"""
+    started = clock()
+    attempts = 0
+    pause = interval
+    while True:
+        value = await probe()
+        attempts += 1
+        elapsed = clock() - started
+        if condition(value):
+            return Convergence(value, True, elapsed, attempts)
+        if elapsed >= timeout:
+            return Convergence(value, False, elapsed, attempts)
+        await asyncio.sleep(min(pause, timeout - elapsed))
+        pause = min(pause * 2, max_interval)
+
+
+def _groups(
+    records: Optional[List[projection.ProjectedRecord]], serials: Iterable[str]
+) -> Dict[str, Optional[Tuple[str, str]]]:
+    found = {
+        record.serial: (record.group_id, record.group_name)
+        for record in records or []
+        if isinstance(record.group_id, str)
+    }
+    return {serial: found.get(serial) for serial in serials}
+
+
+def device_groups(
+    client: Union[AuthenticatedClient, Client],
+    serials: Iterable[str],
+    target: GetDevicesTarget = GetDevicesTarget.ORIGIN,
+) -> Dict[str, Optional[Tuple[str, str]]]:
+    """``(group id, group name)`` of each serial, None for devices the listing does not show, in one request"""
+    return _groups(projection.sync(client=client, fields=_GROUP_FIELDS, target=target), serials)
+
+
+async def async_device_groups(
+    client: Union[AuthenticatedClient, Client],
+    serials: Iterable[str],
+    target: GetDevicesTarget = GetDevicesTarget.ORIGIN,
+) -> Dict[str, Optional[Tuple[str, str]]]:
+    """Async version of ``device_groups``"""
+    return _groups(await projection.asyncio(client=client, fields=_GROUP_FIELDS, target=target), serials)
+
+
+__all__ = [
+    "Convergence",
+    "DEFAULT_TIMEOUT",
+    "async_device_groups",
+    "async_wait_until",
+    "device_groups",
+    "wait_until",
+]
@@ -0,0 +1,519 @@
+"""Async client for the Socket.IO endpoint of the websocket unit
+
+Requires the ``websockets`` package (``devicehub_client[websocket]``). Device control (group invite/kick, shell,
+logcat...) goes through the websocket unit rather than the REST API. Requests are answered on a ``tx.<uuid>``
+response channel, ``WireClient`` keeps a future per channel so any number of transactions can be in flight on one
+socket, each with its own timeout:
+
+    async with WireClient(socket_url(base_url), jwt) as wire:
+        results = await asyncio.gather(*(wire.group_kick(channel, serial) for serial, channel in devices))
+
+Shell output and logcat entries of a device are async iterators fed through bounded buffers:
+
+    device = wire.device(serial, channel)
+    async for line in device.shell("getprop"):
+        ...
+    async for entry in device.logcat({"ActivityManager": 4}):
+        ...
+
+The socket reader never waits for a consumer, so pings, transaction replies and the other streams of the socket are
+not held up by a slow one. When a buffer is full the stream either fails ("error", the default for shell, a
+``WireError`` is raised once the buffered items are consumed) or drops its oldest item ("drop", the default for
+logcat, counted in ``dropped``), so memory stays bounded whatever the number of devices followed. A loop left with
+``break`` holds its stream until the iterator is closed or collected, use ``contextlib.aclosing`` to release it
+right away.
+
+Only the parts of Engine.IO v4 / Socket.IO v5 used by the websocket unit are implemented: the websocket transport,
+ping/pong and text events without acknowledgements.
+"""
+
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Hashable, List, Mapping, Optional
+
+from attrs import define
+from websockets.asyncio.client import ClientConnection, connect
+from websockets.exceptions import ConnectionClosed
+
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_BUFFER = 1000
+SHELL_TIMEOUT = 10000
+
+EventHandler = Callable[..., Any]
+
+
+def socket_url(base_url: str) -> str:
+    """Get the Socket.IO websocket URL from the base URL of the API (``https://host/api/v1``)"""
+    root = base_url.rstrip("/")
+    if root.endswith("/api/v1"):
+        root = root[: -len("/api/v1")]
+    if root.startswith("http"):
+        root = "ws" + root[len("http") :]
+    return f"{root}/socket.io/?EIO=4&transport=websocket"
+
+
+def device_requirements(serial: str) -> Dict[str, Any]:
+    """Requirements matching a single device"""
+    return {"serial": {"value": serial, "match": "exact"}}
+
+
+class WireError(Exception):
+    """Raised when the socket is refused or closed while transactions are pending"""
+
+
+class TransactionTimeout(asyncio.TimeoutError):
+    """Raised when a transaction gets no reply in time"""
+
+    def __init__(self, channel: str, timeout: float):
+        self.channel = channel
+        super().__init__(f"No reply on {channel} within {timeout}s")
+
+
+@define
+class TransactionResult:
+    """The ``tx.done`` reply of a transaction
+
+    Attributes:
+        channel: The ``tx.<uuid>`` response channel.
+        success: Whether the device handled the request.
+        source: The channel of the device which replied.
+        data: The result description (e.g. an error) if any.
+        body: The result payload if any.
+    """
+
+    channel: str
+    success: bool
+    source: Optional[str] = None
+    data: Any = None
+    body: Any = None
+
+
+@define
+class LogcatEntry:
+    """A ``logcat.entry`` of a device
+
+    Attributes:
+        serial: The serial of the device.
+        date: Time of the entry, in seconds since the epoch.
+        pid: Process id.
+        tid: Thread id.
+        priority: Android log priority (2 verbose ... 7 assert).
+        tag: Log tag.
+        message: Log message.
+    """
+
+    serial: str
+    date: float
+    pid: int
+    tid: int
+    priority: int
+    tag: str
+    message: str
+
+
+_LOGCAT_FIELDS = ("serial", "date", "pid", "tid", "priority", "tag", "message")
+
+_END = object()
+
+
+class _Stream:
+    """Bounded buffer between the socket reader and the consumer of one stream"""
+
+    def __init__(self, maxsize: int, overflow: str):
+        if overflow not in ("error", "drop"):
+            raise ValueError(f"Unknown overflow policy {overflow!r}, expected 'error' or 'drop'")
+        self._queue: "asyncio.Queue[Any]" = asyncio.Queue(maxsize)
+        self._overflow = overflow
+        self._error: Optional[Exception] = None
+        self._closed = False
+        self.dropped = 0
+        self.keepalive: Optional["asyncio.Task[None]"] = None
+
+    def put(self, item: Any) -> bool:
+        """Buffer an item without waiting, False once the stream is closed (e.g. it overflowed)"""
+        if self._closed:
+            return False
+        if self._queue.full():
+            if self._overflow == "error":
+                maxsize = self._queue.maxsize
+                self.close(WireError(f"Stream buffer of {maxsize} items overflowed, the consumer fell behind"))
+                return False
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(item)
+        return True
+
+    def close(self, error: Optional[Exception] = None) -> None:
+        if self._closed:
+            return
+        self._error = error
+        self._closed = True
+        if self.keepalive is not None:
+            self.keepalive.cancel()
+        if not self._queue.full():
+            self._queue.put_nowait(_END)
+
+    async def get(self) -> Any:
+        """Get the next item, ``_END`` once closed and drained
+
+        Raises:
+            WireError: If the stream was closed by a socket error.
+        """
+        if self._closed and self._queue.empty():
+            item = _END
+        else:
+            item = await self._queue.get()
+        if item is _END:
+            if self._error is not None:
+                raise self._error
+            self._queue.put_nowait(_END)
+        return item
+
+
+class WireClient:
+    """Socket.IO client of the websocket unit
+
+    Args:
+        url: The Socket.IO websocket URL, see ``socket_url``.
+        token: A JWT of the user, sent in the Socket.IO handshake.
+        timeout: Default time to wait for a transaction reply, in seconds.
+        connect_args: Passed to ``websockets.connect`` (e.g. ``ssl``, ``additional_headers``).
+    """
+
+    def __init__(self, url: str, token: str, timeout: float = DEFAULT_TIMEOUT, **connect_args: Any):
+        self.url = url
+        self.timeout = timeout
+        self._token = token
+        self._connect_args = connect_args
+        self._ws: Optional[ClientConnection] = None
+        self._reader: Optional["asyncio.Task[None]"] = None
+        self._connected: Optional["asyncio.Future[None]"] = None
+        self._pending: Dict[str, "asyncio.Future[TransactionResult]"] = {}
+        self._progress: Dict[str, EventHandler] = {}
+        self._streams: Dict[Hashable, _Stream] = {}
+        self._handlers: Dict[str, List[EventHandler]] = {}
+
+    @property
+    def pending(self) -> int:
+        """The number of transactions waiting for a reply"""
+        return len(self._pending)
+
+    async def connect(self) -> None:
+        """Open the socket and wait for the Socket.IO handshake
+
+        Raises:
+            WireError: If the server refuses the token.
+        """
+        self._ws = await connect(self.url, **self._connect_args)
+        self._connected = asyncio.get_running_loop().create_future()
+        self._reader = asyncio.create_task(self._read())
+        await self._send("40" + json.dumps({"token": self._token}))
+        try:
+            await asyncio.wait_for(asyncio.shield(self._connected), self.timeout)
+        except BaseException:
+            await self.close()
+            raise
+
+    async def close(self) -> None:
+        if self._ws is not None:
+            await self._ws.close()
+        if self._reader is not None:
+            await asyncio.gather(self._reader, return_exceptions=True)
+        self._ws = None
+        self._reader = None
+
+    async def __aenter__(self) -> "WireClient":
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.close()
+
+    def on(self, event: str, handler: EventHandler) -> None:
+        """Call ``handler(*args)`` for every ``event`` emitted by the server"""
+        self._handlers.setdefault(event, []).append(handler)
+
+    def off(self, event: str, handler: EventHandler) -> None:
+        handlers = self._handlers.get(event, [])
+        if handler in handlers:
+            handlers.remove(handler)
+
+    async def _send(self, packet: str) -> None:
+        if self._ws is None:
+            raise WireError("Not connected")
+        await self._ws.send(packet)
+
+    async def emit(self, event: str, *args: Any) -> None:
+        """Emit a Socket.IO event"""
+        await self._send("42" + json.dumps([event, *args], separators=(",", ":")))
+
+    async def transaction(
+        self,
+        event: str,
+        channel: str,
+        data: Any,
+        timeout: Optional[float] = None,
+        on_progress: Optional[EventHandler] = None,
+    ) -> TransactionResult:
+        """Emit ``event`` to a device channel and wait for its ``tx.done`` reply
+
+        Args:
+            event: The request, e.g. ``group.kick``.
+            channel: The channel of the device.
+            data: The request payload.
+            timeout: Time to wait for the reply, ``self.timeout`` if not given.
+            on_progress: Called with every ``tx.progress`` message of the transaction.
+
+        Raises:
+            TransactionTimeout: If no reply came in time.
+            WireError: If the socket was closed before the reply.
+        """
+        response_channel = f"tx.{uuid.uuid4()}"
+        future = asyncio.get_running_loop().create_future()
+        self._pending[response_channel] = future
+        if on_progress is not None:
+            self._progress[response_channel] = on_progress
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            await self.emit(event, channel, response_channel, data)
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            raise TransactionTimeout(response_channel, timeout) from None
+        finally:
+            self._pending.pop(response_channel, None)
+            self._progress.pop(response_channel, None)
+            await self._emit_quietly("tx.cleanup", response_channel)
+
+    async def group_invite(
+        self, channel: str, serial: str, lifetime: int = 900000, timeout: Optional[float] = None
+    ) -> TransactionResult:
+        """Take a device into use for ``lifetime`` milliseconds"""
+        data = {"requirements": device_requirements(serial), "timeout": lifetime}
+        return await self.transaction("group.invite", channel, data, timeout)
+
+    async def group_kick(self, channel: str, serial: str, timeout: Optional[float] = None) -> TransactionResult:
+        """Release a device"""
+        return await self.transaction("group.kick", channel, {"requirements": device_requirements(serial)}, timeout)
+
+    def device(self, serial: str, channel: str) -> "WireDevice":
+        """Get a handle for the requests of one device"""
+        return WireDevice(self, serial, channel)
+
+    async def _emit_quietly(self, event: str, *args: Any) -> None:
+        if self._ws is not None:
+            try:
+                await self.emit(event, *args)
+            except ConnectionClosed:
+                pass
+
+    async def shell(
+        self,
+        channel: str,
+        command: str,
+        timeout: int = SHELL_TIMEOUT,
+        keepalive: bool = False,
+        maxsize: int = DEFAULT_BUFFER,
+        overflow: str = "error",
+        reply_timeout: Optional[float] = None,
+    ) -> AsyncIterator[str]:
+        """Run a shell command on a device in use and yield its output line by line
+
+        Args:
+            channel: The channel of the device.
+            command: The command line.
+            timeout: Milliseconds after which the device stops the command.
+            keepalive: Send ``shell.keepalive`` every ``timeout / 2`` so long-running commands are not stopped.
+            maxsize: The maximum number of output chunks buffered.
+            overflow: "error" or "drop" when the buffer is full.
+            reply_timeout: Time to wait for the first and every next reply, ``self.timeout`` if not given. The
+                device does not reply at all when it is not in use by the user.
+
+        Raises:
+            TransactionTimeout: If no reply came in time.
+            WireError: If the command failed, the buffer overflowed or the socket was closed.
+        """
+        response_channel = f"tx.{uuid.uuid4()}"
+        stream = self._streams[response_channel] = _Stream(maxsize, overflow)
+        reply_timeout = self.timeout if reply_timeout is None else reply_timeout
+        try:
+            await self.emit("shell.command", channel, response_channel, {"command": command, "timeout": timeout})
+            if keepalive:
+                stream.keepalive = asyncio.create_task(self._keepalive(channel, timeout))
+            partial = ""
+            while True:
+                try:
+                    item = await asyncio.wait_for(stream.get(), reply_timeout)
+                except asyncio.TimeoutError:
+                    raise TransactionTimeout(response_channel, reply_timeout) from None
+                if item is _END:
+                    break
+                event, message = item
+                if event == "tx.done":
+                    if not message.get("success"):
+                        raise WireError(f"Shell command failed: {message.get('data')}")
+                    break
+                lines = (partial + (message.get("data") or "")).split("\n")
+                partial = lines.pop()
+                for line in lines:
+                    yield line
+            if partial:
+                yield partial
+        finally:
+            self._streams.pop(response_channel, None)
+            stream.close()
+            await self._emit_quietly("tx.cleanup", response_channel)
+
+    async def _keepalive(self, channel: str, timeout: int) -> None:
+        while True:
+            await asyncio.sleep(timeout / 2000)
+            await self.emit("shell.keepalive", channel, {"timeout": timeout})
+
+    async def logcat(
+        self,
+        channel: str,
+        serial: str,
+        filters: Optional[Mapping[str, int]] = None,
+        maxsize: int = DEFAULT_BUFFER,
+        overflow: str = "drop",
+    ) -> AsyncIterator[LogcatEntry]:
+        """Start logcat on a device in use and yield its entries until the iteration stops
+
+        Args:
+            channel: The channel of the device.
+            serial: The serial of the device, entries of other devices are ignored.
+            filters: Minimum priority per tag (``{"*": 2}`` or ``{"ActivityManager": 4}``), everything if empty.
+            maxsize: The maximum number of entries buffered.
+            overflow: "error" or "drop" when the buffer is full.
+
+        Raises:
+            WireError: If logcat could not be started, the buffer overflowed or the socket was closed.
+        """
+        key = ("logcat", serial)
+        if key in self._streams:
+            raise WireError(f"Logcat of {serial} is already followed")
+        stream = self._streams[key] = _Stream(maxsize, overflow)
+        try:
+            payload = {"filters": [{"tag": tag, "priority": priority} for tag, priority in (filters or {}).items()]}
+            started = await self.transaction("logcat.start", channel, payload)
+            if not started.success:
+                raise WireError(f"Unable to start logcat on {serial}: {started.data}")
+            while True:
+                item = await stream.get()
+                if item is _END:
+                    break
+                yield item
+        finally:
+            self._streams.pop(key, None)
+            stream.close()
+            if self._ws is not None:
+                try:
+                    await self.transaction("logcat.stop", channel, None)
+                except (WireError, ConnectionClosed, asyncio.TimeoutError):
+                    pass
+
+    def dropped(self, serial: str) -> int:
+        """The number of logcat entries of ``serial`` dropped because the consumer fell behind"""
+        stream = self._streams.get(("logcat", serial))
+        return stream.dropped if stream is not None else 0
+
+    def _feed(self, key: Hashable, item: Any) -> None:
+        # a stream which overflowed is closed, forget it so its events are ignored until its iterator is done
+        if not self._streams[key].put(item):
+            self._streams.pop(key, None)
+
+    def _dispatch(self, event: str, args: List[Any]) -> None:
+        """Deliver an event without waiting, so a slow consumer never holds back the socket reader"""
+        if event == "tx.done" and len(args) >= 2 and args[0] in self._pending:
+            future = self._pending[args[0]]
+            message = args[1] or {}
+            if not future.done():
+                future.set_result(
+                    TransactionResult(
+                        channel=args[0],
+                        success=bool(message.get("success")),
+                        source=message.get("source"),
+                        data=message.get("data"),
+                        body=message.get("body"),
+                    )
+                )
+        elif event in ("tx.progress", "tx.done") and len(args) >= 2 and args[0] in self._streams:
+            self._feed(args[0], (event, args[1] or {}))
+        elif event == "logcat.entry" and args:
+            key = ("logcat", args[0].get("serial"))
+            if key in self._streams:
+                self._feed(key, LogcatEntry(**{name: args[0].get(name) for name in _LOGCAT_FIELDS}))
+        elif event == "tx.progress" and len(args) >= 2 and args[0] in self._progress:
+            self._progress[args[0]](args[1])
+        for handler in list(self._handlers.get(event, [])):
+            handler(*args)
+
+    def _packet(self, packet: str) -> Optional[str]:
+        """Handle a Socket.IO packet, return the pong to send for Engine.IO pings"""
+        if packet == "2":
+            return "3"
+        if packet.startswith("40"):
+            if self._connected is not None and not self._connected.done():
+                self._connected.set_result(None)
+        elif packet.startswith("44"):
+            reason = json.loads(packet[2:] or "{}").get("message", "connection refused")
+            if self._connected is not None and not self._connected.done():
+                self._connected.set_exception(WireError(reason))
+        elif packet.startswith("42"):
+            payload = json.loads(packet[2:])
+            self._dispatch(payload[0], payload[1:])
+        return None
+
+    async def _read(self) -> None:
+        assert self._ws is not None
+        error: Exception = WireError("Socket closed")
+        try:
+            async for packet in self._ws:
+                reply = self._packet(packet if isinstance(packet, str) else packet.decode())
+                if reply is not None:
+                    await self._ws.send(reply)
+        except ConnectionClosed as e:
+            error = WireError(f"Socket closed: {e}")
+        finally:
+            if self._connected is not None and not self._connected.done():
+                self._connected.set_exception(error)
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            for stream in self._streams.values():
+                stream.close(error)
+
+
+class WireDevice:
+    """Requests of a single device, see ``WireClient.device``"""
+
+    def __init__(self, wire: WireClient, serial: str, channel: str):
+        self.wire = wire
+        self.serial = serial
+        self.channel = channel
+
+    async def invite(self, lifetime: int = 900000, timeout: Optional[float] = None) -> TransactionResult:
+        return await self.wire.group_invite(self.channel, self.serial, lifetime, timeout)
+
+    async def kick(self, timeout: Optional[float] = None) -> TransactionResult:
+        return await self.wire.group_kick(self.channel, self.serial, timeout)
+
+    def shell(self, command: str, **kwargs: Any) -> AsyncIterator[str]:
+        """See ``WireClient.shell``"""
+        return self.wire.shell(self.channel, command, **kwargs)
+
+    def logcat(self, filters: Optional[Mapping[str, int]] = None, **kwargs: Any) -> AsyncIterator[LogcatEntry]:
+        """See ``WireClient.logcat``"""
+        return self.wire.logcat(self.channel, self.serial, filters, **kwargs)
+
+
+__all__ = [
+    "LogcatEntry",
+    "TransactionResult",
+    "TransactionTimeout",
+    "WireClient",
+    "WireDevice",
+    "WireError",
+    "device_requirements",
+    "socket_url",
+]
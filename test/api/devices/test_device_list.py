@@ -1,9 +1,13 @@
 from enum import Enum
 
 import pytest
-from pytest_check import is_not_none, equal, is_none
+from pytest_check import is_not_none, equal, is_none, is_true, is_false, is_in
 
-from devicehub_client.api.devices import get_devices
+from devicehub_client import AuthenticatedClient, projection
+from devicehub_client.api.devices import get_device_changes, get_devices
+from devicehub_client.compression import available_encodings
+from devicehub_client.listing import iter_devices
+from devicehub_client.mirror import DeviceMirror
 from devicehub_client.models import GetDevicesTarget
 
 
@@ -82,6 +86,95 @@ class TestDeviceListEndpoint:
             device_dict = device.to_dict()
             fake_device_certain_field_check(device_dict)
 
+    def test_get_devices_projection(self, api_client):
+        """Test device listing decoded into projected records"""
+        response = projection.sync_detailed(client=api_client, fields='present,status,serial,group.owner.name,using')
+
+        equal(response.status_code, 200)
+        is_not_none(response.parsed)
+        equal(len(response.parsed), 5)
+
+        for device in response.parsed:
+            is_true(device.present)
+            equal(device.status, 3)
+            is_in('fake-', device.serial)
+            equal(device.group_owner_name, 'administrator')
+            is_false(device.using)
+
+    def test_get_device_changes(self, api_client):
+        """Test device change feed position and a mirror built from it"""
+        response = get_device_changes.sync_detailed(client=api_client)
+
+        cursor = response.parsed.cursor
+        equal(response.status_code, 200)
+        equal(response.parsed.changes, [])
+
+        response = get_device_changes.sync_detailed(client=api_client, cursor=cursor)
+        equal(response.status_code, 200)
+        is_false(response.parsed.has_more)
+
+        mirror = DeviceMirror(api_client)
+        mirror.reload()
+        equal(len(mirror), 5)
+        equal(len(mirror.find(present=True)), 5)
+
+    def test_get_devices_pages(self, api_client):
+        """Test device listing split in pages with limit and cursor"""
+        first = get_devices.sync_detailed(client=api_client, fields='serial', limit=3)
+        equal(first.status_code, 200)
+        equal(len(first.parsed.devices), 3)
+        is_true(first.parsed.has_more)
+        is_not_none(first.parsed.cursor)
+
+        second = get_devices.sync_detailed(client=api_client, fields='serial', limit=3, cursor=first.parsed.cursor)
+        equal(second.status_code, 200)
+        equal(len(second.parsed.devices), 2)
+        is_false(second.parsed.has_more)
+        is_none(second.parsed.cursor)
+
+        serials = [device.serial for device in first.parsed.devices + second.parsed.devices]
+        equal(serials, sorted(serials))
+        equal([device.serial for device in iter_devices(api_client, fields='serial', page_size=2)], serials)
+
+    def test_get_devices_filters(self, api_client, successful_response_check):
+        """Test device listing filtered by the server"""
+        response = get_devices.sync_detailed(client=api_client, status=[3], present=True, group_name=['Common'],
+                                             platform=['Android'])
+        successful_response_check(response, description='Devices Information')
+        equal(len(response.parsed.devices), 5)
+
+        sdk = response.parsed.devices[0].sdk
+        response = get_devices.sync_detailed(client=api_client, sdk=[sdk], fields='sdk')
+        is_true(all(device.sdk == sdk for device in response.parsed.devices))
+
+        for filters in ({'present': False}, {'status': [1]}, {'using': True}, {'owner_name': ['nobody']}):
+            response = get_devices.sync_detailed(client=api_client, **filters)
+            equal(response.status_code, 200)
+            equal(response.parsed.devices, [], filters)
+
+    def test_get_devices_compressed(self, api_client, base_url, token_from_params):
+        """Test device listing compressed with the encoding the client accepts"""
+        response = get_devices.sync_detailed(client=api_client)
+        equal(response.status_code, 200)
+        is_in(response.headers.get('content-encoding'), available_encodings())
+        is_in('Accept-Encoding', response.headers.get('vary', ''))
+        equal(len(response.parsed.devices), 5)
+
+        with AuthenticatedClient(base_url=base_url, token=token_from_params, compression=False) as client:
+            response = get_devices.sync_detailed(client=client)
+        equal(response.status_code, 200)
+        is_none(response.headers.get('content-encoding'))
+
+    def test_iter_devices_stream(self, api_client):
+        """Test device listing streamed as NDJSON"""
+        devices = list(iter_devices(api_client, target=GetDevicesTarget.ORIGIN))
+
+        equal(len(devices), 5)
+        serials = [device.serial for device in devices]
+        equal(serials, sorted(serials))
+        for device in devices:
+            is_in('fake-', device.serial)
+
 
 @pytest.mark.regression
 class TestDeviceListErrorHandling:
@@ -121,3 +214,14 @@ class TestDeviceListErrorHandling:
         )
         equal(response.status_code, 400)
         is_none(response.parsed)
+
+    @pytest.mark.parametrize("params", [
+        {'limit': 0},
+        {'limit': 5001},
+        {'cursor': '!'},
+    ])
+    def test_get_devices_with_invalid_page(self, api_client, params):
+        """Test device listing with an invalid limit or cursor"""
+        response = get_devices.sync_detailed(client=api_client, **params)
+        equal(response.status_code, 400)
+        is_none(response.parsed)
@@ -1,5 +1,3 @@
-from time import sleep
-
 import pytest
 
 from devicehub_client.api.admin import add_origin_group_devices
@@ -57,7 +55,6 @@ class TestGroupDeviceManagement:
         # Delete bookable group
         response = delete_group.sync_detailed(id=bookable_group.id, client=api_client)
         successful_response_check(response, description='Deleted (groups)')
-        sleep(1)
 
         # Check device returned to common group
         device_in_group_check(serial=first_device_serial, group_id=common_group_id, group_name='Common')
@@ -1,11 +1,13 @@
 from datetime import datetime, timezone, timedelta
-from time import sleep
 
 import pytest
 from pytest_check import is_not_none, equal
 
 from devicehub_client.api.groups import create_group, delete_group, update_group, get_group, add_group_devices
 from devicehub_client.models import GroupPayload, GroupPayloadState, DevicesPayload, GroupState
+from devicehub_client.waiter import wait_until
+
+SCHEDULER_TIMEOUT = 30
 
 
 @pytest.mark.integration
@@ -53,11 +55,11 @@ class TestGroupSchedulingAndConflicts:
         successful_response_check(response, description='Updated (group)')
 
         # Wait for scheduler to work
-        sleep(3)
+        convergence = wait_until(lambda: get_group.sync_detailed(client=api_client, id=group.id),
+                                 lambda response: response.status_code == 404, timeout=SCHEDULER_TIMEOUT)
 
         # Check that scheduler deleted group
-        response = get_group.sync_detailed(client=api_client, id=group.id)
-        unsuccess_response_check(response, status_code=404, description='Not Found (group)')
+        unsuccess_response_check(convergence.value, status_code=404, description='Not Found (group)')
 
     def test_group_time_conflict_detection(self, api_client, api_client_custom_token, devices_serial, group_creating,
                                            service_user_creating, successful_response_check, unsuccess_response_check):
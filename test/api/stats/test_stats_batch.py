@@ -0,0 +1,45 @@
+import pytest
+from pytest_check import equal
+
+from devicehub_client.api.stats import write_stats_batch
+from devicehub_client.models import StatsEvent
+from devicehub_client.stats import StatsWriter
+
+
+@pytest.mark.integration
+class TestStatsBatch:
+    """Test suite for batched stats writes"""
+
+    def test_write_stats_batch_json(self, api_client, successful_response_check, first_device_serial):
+        """Test writing a JSON array of stats events"""
+        events = [StatsEvent(serial=first_device_serial, action=f'api_test_{i}', timestamp=1700000000000 + i)
+                  for i in range(3)]
+        response = write_stats_batch.sync_detailed(client=api_client, body=events)
+        successful_response_check(response, description='Stats written')
+        equal(response.parsed.written, 3)
+
+    def test_write_stats_batch_ndjson(self, api_client, successful_response_check, unsuccess_response_check,
+                                      first_device_serial):
+        """Test writing NDJSON stats events and rejecting invalid lines"""
+        httpx_client = api_client.get_httpx_client()
+        lines = [f'{{"serial": "{first_device_serial}", "action": "api_test_ndjson"}}'] * 2
+        response = httpx_client.post('/stats/batch', content='\n'.join(lines) + '\n',
+                                     headers={'Content-Type': 'application/x-ndjson'})
+        equal(response.status_code, 200)
+        equal(response.json()['written'], 2)
+
+        response = httpx_client.post('/stats/batch', content=lines[0] + '\n{"serial":',
+                                     headers={'Content-Type': 'application/x-ndjson'})
+        unsuccess_response_check(response, description='Bad Request (invalid NDJSON line)')
+
+        response = write_stats_batch.sync_detailed(client=api_client, body=[StatsEvent(serial='', action='x')])
+        unsuccess_response_check(response, description='Bad Request (invalid stats event at index 0)')
+
+    def test_stats_writer(self, api_client, first_device_serial):
+        """Test the buffered writer against the batch endpoint"""
+        with StatsWriter(api_client, batch_size=20, flush_interval=0.1) as stats:
+            for i in range(50):
+                stats.write(first_device_serial, 'api_test_writer')
+        equal(stats.written, 50)
+        equal(stats.batches, 3)
+        equal(stats.failed, 0)
@@ -1,4 +1,3 @@
-from time import sleep
 import pytest
 from pytest_check import greater, equal, is_not_none, is_not_in, is_none, between_equal, is_in
 